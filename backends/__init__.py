@@ -0,0 +1,35 @@
+"""
+Paquete de backends de almacenamiento
+
+Cada backend encapsula el driver de base de datos y las diferencias de
+dialecto SQL (secuencias, paginación, jerarquía de excepciones) para que
+los DAO puedan ejecutarse sin cambios sobre Oracle o SQLite.
+"""
+import importlib
+from .base import Backend
+
+_BACKENDS = {
+    "oracle": ("backends.oracle", "BackendOracle"),
+    "sqlite": ("backends.sqlite", "BackendSQLite"),
+}
+
+
+def crear_backend(nombre: str, **opciones) -> Backend:
+    """
+    Crea un backend por nombre importando su driver sólo cuando se usa.
+
+    Args:
+        nombre: "oracle" o "sqlite"
+        **opciones: Parámetros propios del backend (credenciales, ruta, etc.)
+
+    Raises:
+        ValueError: Si el backend no existe
+    """
+    try:
+        modulo, clase = _BACKENDS[nombre.lower()]
+    except KeyError:
+        raise ValueError(f"Backend desconocido '{nombre}'. Opciones: {', '.join(_BACKENDS)}")
+    return getattr(importlib.import_module(modulo), clase)(**opciones)
+
+
+__all__ = ["Backend", "crear_backend"]
@@ -0,0 +1,129 @@
+"""
+Módulo: backends/base.py
+Interfaz común de los backends de almacenamiento
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, List, Sequence, Tuple
+
+
+class Backend(ABC):
+    """
+    Clase base de un backend de base de datos.
+
+    Las subclases definen el driver (conexión y excepciones) y las
+    construcciones SQL que cambian entre motores; deben implementar todos
+    los métodos abstractos para poder instanciarse.
+    """
+
+    nombre = "base"
+    descripcion = "Base de datos"
+
+    # Jerarquía de excepciones del driver (IntegrityError hereda de DatabaseError)
+    DatabaseError: type = Exception
+    IntegrityError: type = Exception
+
+    # Consulta usada por test_connection() para obtener la fecha del servidor
+    sql_fecha_servidor = ""
+
+    # Expresión SQL con la fecha y hora actual del servidor (marcas de cambio)
+    sql_ahora = ""
+
+    # Tabla de migraciones aplicadas (ver migrar.py), para BD creadas sin ella
+    sql_tabla_versiones = ""
+
+    @abstractmethod
+    def conectar(self) -> Any:
+        """Abre una conexión física nueva"""
+
+    def validar(self, conexion: Any):
+        """Verifica que la conexión siga viva; lanza excepción si no"""
+        conexion.ping()
+
+    @abstractmethod
+    def limitar(self, sql: str, limite: int) -> str:
+        """Agrega al SELECT la cláusula para retornar como máximo `limite` filas"""
+
+    @abstractmethod
+    def siguiente_valor(self, cursor: Any, secuencia: str) -> int:
+        """Obtiene el siguiente valor de una secuencia usando el cursor dado"""
+
+    @abstractmethod
+    def reservar_valores(self, cursor: Any, secuencia: str, cantidad: int) -> List[int]:
+        """Obtiene `cantidad` valores de una secuencia en un solo viaje a la BD"""
+
+    @abstractmethod
+    def insertar_retornando_id(
+        self, cursor: Any, sql: str, parametros: dict, clave_id: str, secuencia: str, columna_id: str
+    ) -> int:
+        """
+        Ejecuta un INSERT tomando el ID de la secuencia dentro de la misma sentencia.
+
+        Args:
+            sql: INSERT con el parámetro `:<clave_id>` en la posición del ID
+            parametros: Parámetros del INSERT (el valor de `clave_id` se ignora)
+            clave_id: Nombre del parámetro del ID (p. ej. "id" o "id_empleado")
+            secuencia: Secuencia que genera el ID
+            columna_id: Columna de clave primaria
+
+        Returns:
+            int: ID asignado a la fila insertada
+        """
+
+    @abstractmethod
+    def ejecutar_lote(self, cursor: Any, sql: str, filas: Sequence) -> List[Tuple[int, str]]:
+        """
+        Ejecuta `sql` una vez por fila con array binding (executemany).
+
+        Las filas que violan restricciones no abortan el lote: se omiten y se
+        informan como pares (posición en `filas`, mensaje). No confirma.
+        """
+
+    @abstractmethod
+    def bloquear_veterinario(self, cursor: Any, id_veterinario: int):
+        """
+        Impide que otra conexión reserve citas del veterinario hasta que
+        termine la transacción de `cursor`, para verificar cruces de horario
+        e insertar sin carreras. No confirma.
+        """
+
+    @abstractmethod
+    def viola_indice(self, cursor: Any, error: Exception, indice: str) -> bool:
+        """
+        Indica si `error` (IntegrityError) lo causó el índice único `indice`.
+
+        Puede consultar el diccionario de datos con `cursor`, pero no confirma.
+        """
+
+    @abstractmethod
+    def existe_tabla(self, cursor: Any, tabla: str) -> bool:
+        """Indica si la tabla existe en el esquema del usuario conectado"""
+
+    @abstractmethod
+    def existe_columna(self, cursor: Any, tabla: str, columna: str) -> bool:
+        """Indica si la tabla tiene la columna"""
+
+    @abstractmethod
+    def existe_indice(self, cursor: Any, indice: str) -> bool:
+        """Indica si el índice existe en el esquema del usuario conectado"""
+
+    @abstractmethod
+    def ejecutar_script(self, conexion: Any, script: str):
+        """
+        Ejecuta un script SQL de varias sentencias (migraciones).
+
+        Si el motor lo permite, el script queda dentro de una transacción
+        abierta que confirma quien llama; en Oracle cada DDL se confirma solo.
+        """
+
+    @abstractmethod
+    def explicar(self, cursor: Any, sql: str, parametros: Any = None) -> List[str]:
+        """
+        Plan de ejecución de `sql` como líneas de texto, sin ejecutarla.
+
+        Puede ejecutar sentencias auxiliares con `cursor`, pero no confirma.
+        """
+
+    def mensaje_error(self, error: Exception) -> str:
+        """Texto legible de una excepción del driver"""
+        return str(error)
@@ -0,0 +1,144 @@
+"""
+Módulo: backends/oracle.py
+Backend para Oracle Database usando python-oracledb
+"""
+
+import re
+import oracledb
+from typing import Any, List, Optional, Sequence, Tuple
+from .base import Backend
+
+
+class BackendOracle(Backend):
+    """Backend de producción sobre Oracle Database"""
+
+    nombre = "oracle"
+    descripcion = "Oracle"
+
+    DatabaseError = oracledb.DatabaseError
+    IntegrityError = oracledb.IntegrityError
+
+    sql_fecha_servidor = "SELECT SYSDATE FROM DUAL"
+    sql_ahora = "SYSTIMESTAMP"
+
+    sql_tabla_versiones = (
+        "CREATE TABLE esquema_version (version NUMBER PRIMARY KEY, nombre VARCHAR2(200) NOT NULL, "
+        "aplicada TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL)"
+    )
+
+    def __init__(self, user: Optional[str] = None, password: Optional[str] = None, dsn: Optional[str] = None):
+        self._user = user
+        self._password = password
+        self._dsn = dsn
+
+    def conectar(self) -> Any:
+        return oracledb.connect(user=self._user, password=self._password, dsn=self._dsn)
+
+    def limitar(self, sql: str, limite: int) -> str:
+        return f"{sql} FETCH FIRST {int(limite)} ROWS ONLY"
+
+    def siguiente_valor(self, cursor: Any, secuencia: str) -> int:
+        cursor.execute(f"SELECT {secuencia}.NEXTVAL FROM DUAL")
+        return cursor.fetchone()[0]
+
+    def reservar_valores(self, cursor: Any, secuencia: str, cantidad: int) -> List[int]:
+        cursor.execute(f"SELECT {secuencia}.NEXTVAL FROM DUAL CONNECT BY LEVEL <= :cantidad", {"cantidad": cantidad})
+        return [fila[0] for fila in cursor.fetchall()]
+
+    def insertar_retornando_id(
+        self, cursor: Any, sql: str, parametros: dict, clave_id: str, secuencia: str, columna_id: str
+    ) -> int:
+        sql = re.sub(rf":{clave_id}\b", f"{secuencia}.NEXTVAL", sql, count=1)
+        sql = f"{sql.rstrip()} RETURNING {columna_id} INTO :{clave_id}"
+        nuevo_id = cursor.var(int)
+        cursor.execute(sql, {**parametros, clave_id: nuevo_id})
+        return nuevo_id.getvalue()[0]
+
+    def ejecutar_lote(self, cursor: Any, sql: str, filas: Sequence) -> List[Tuple[int, str]]:
+        cursor.executemany(sql, filas, batcherrors=True)
+        return [(error.offset, error.message) for error in cursor.getbatcherrors()]
+
+    def bloquear_veterinario(self, cursor: Any, id_veterinario: int):
+        # El bloqueo de la fila del veterinario serializa sus reservas: otra
+        # sesión espera aquí hasta el commit y luego ve la cita ya insertada
+        cursor.execute("SELECT id_veterinario FROM veterinario WHERE id_veterinario = :id FOR UPDATE",
+                       {"id": id_veterinario})
+        cursor.fetchall()
+
+    def viola_indice(self, cursor: Any, error: Exception, indice: str) -> bool:
+        # ORA-00001: unique constraint (ESQUEMA.UK_CITA_VET_HORARIO) violated
+        mensaje = self.mensaje_error(error).upper()
+        return mensaje.startswith("ORA-00001") and re.search(rf"[(.]{re.escape(indice.upper())}\)", mensaje) is not None
+
+    def existe_tabla(self, cursor: Any, tabla: str) -> bool:
+        cursor.execute("SELECT COUNT(*) FROM user_tables WHERE table_name = UPPER(:tabla)", {"tabla": tabla})
+        return cursor.fetchone()[0] > 0
+
+    def existe_columna(self, cursor: Any, tabla: str, columna: str) -> bool:
+        cursor.execute(
+            "SELECT COUNT(*) FROM user_tab_columns WHERE table_name = UPPER(:tabla) AND column_name = UPPER(:columna)",
+            {"tabla": tabla, "columna": columna}
+        )
+        return cursor.fetchone()[0] > 0
+
+    def existe_indice(self, cursor: Any, indice: str) -> bool:
+        cursor.execute("SELECT COUNT(*) FROM user_indexes WHERE index_name = UPPER(:indice)", {"indice": indice})
+        return cursor.fetchone()[0] > 0
+
+    def ejecutar_script(self, conexion: Any, script: str):
+        with conexion.cursor() as cursor:
+            for sentencia in dividir_script(script):
+                cursor.execute(sentencia)
+
+    def explicar(self, cursor: Any, sql: str, parametros: Any = None) -> List[str]:
+        # EXPLAIN PLAN no necesita los valores de los parámetros. PLAN_TABLE es
+        # temporal por sesión; igual se borran las filas para no acumularlas.
+        cursor.execute(f"EXPLAIN PLAN SET STATEMENT_ID = 'consulta_lenta' FOR {sql}")
+        cursor.execute(
+            "SELECT plan_table_output FROM TABLE(DBMS_XPLAN.DISPLAY('PLAN_TABLE', 'consulta_lenta', 'TYPICAL'))"
+        )
+        lineas = [fila[0] for fila in cursor.fetchall()]
+        cursor.execute("DELETE FROM plan_table WHERE statement_id = 'consulta_lenta'")
+        return lineas
+
+    def mensaje_error(self, error: Exception) -> str:
+        detalle = error.args[0] if error.args else error
+        return getattr(detalle, "message", str(detalle))
+
+
+_INICIO_BLOQUE = re.compile(
+    r"(BEGIN|DECLARE|CREATE\s+(OR\s+REPLACE\s+)?(TRIGGER|PROCEDURE|FUNCTION|PACKAGE|TYPE))\b", re.IGNORECASE
+)
+
+
+def dividir_script(script: str) -> List[str]:
+    """
+    Separa un script al estilo SQL*Plus en sentencias ejecutables.
+
+    Las sentencias SQL terminan en ';' al final de la línea (el ';' se
+    quita). Los bloques PL/SQL (BEGIN, DECLARE, CREATE TRIGGER, ...) terminan
+    en una línea con '/' y conservan sus ';' internos. Se omiten las líneas
+    de comentario entre sentencias.
+    """
+    sentencias: List[str] = []
+    actual: List[str] = []
+    bloque = False
+    for linea in script.splitlines():
+        limpia = linea.strip()
+        if not actual and (not limpia or limpia.startswith("--")):
+            continue
+        if limpia == "/":
+            if actual:
+                sentencias.append("\n".join(actual).strip())
+            actual, bloque = [], False
+            continue
+        if not actual:
+            bloque = bool(_INICIO_BLOQUE.match(limpia))
+        actual.append(linea)
+        if not bloque and limpia.endswith(";"):
+            sentencias.append("\n".join(actual).strip()[:-1].rstrip())
+            actual = []
+    if actual:
+        sentencia = "\n".join(actual).strip()
+        sentencias.append(sentencia if bloque else sentencia.rstrip(";").rstrip())
+    return sentencias
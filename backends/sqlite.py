@@ -0,0 +1,216 @@
+"""
+Módulo: backends/sqlite.py
+Backend SQLite para ejecuciones locales y benchmarks sin Oracle
+
+Traduce las diferencias de dialecto con Oracle:
+- Secuencias: se emulan con la tabla `secuencia` (nombre, valor).
+- Paginación: LIMIT en lugar de FETCH FIRST n ROWS ONLY.
+- Fechas: columnas DATE y TIMESTAMP se guardan en ISO 8601 y se leen como
+  date y datetime respectivamente.
+- Lotes: executemany aborta en el primer error, así que ante una violación
+  de restricción el lote se deshace hasta un SAVEPOINT y se reintenta fila
+  a fila para aislar las erróneas.
+- Cursores: se pueden usar con `with conn.cursor() as cursor:` como en oracledb.
+"""
+
+import itertools
+import os
+import sqlite3
+from datetime import date, datetime
+from typing import Any, List, Sequence, Tuple
+from .base import Backend
+
+RUTA_ESQUEMA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "schema_sqlite.sql")
+
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda valor: valor.isoformat(" "))
+sqlite3.register_converter("DATE", lambda valor: date.fromisoformat(valor[:10].decode()))
+sqlite3.register_converter("TIMESTAMP", lambda valor: datetime.fromisoformat(valor.decode()))
+
+_contador_memoria = itertools.count(1)
+
+
+class CursorSQLite(sqlite3.Cursor):
+    """Cursor de sqlite3 usable como context manager, igual que en oracledb"""
+
+    # oracledb usa prefetchrows para el primer viaje de red; aquí no aplica
+    prefetchrows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ConexionSQLite(sqlite3.Connection):
+    """Conexión de sqlite3 con la interfaz que esperan los DAO"""
+
+    def cursor(self, factory=CursorSQLite):
+        return super().cursor(factory)
+
+    def ping(self):
+        self.execute("SELECT 1").fetchone()
+
+
+class BackendSQLite(Backend):
+    """
+    Backend sobre SQLite.
+
+    Args:
+        ruta: Archivo de base de datos o ":memory:" para una base compartida
+            en memoria que vive mientras exista el backend
+        crear_esquema: Ejecuta schema_sqlite.sql si las tablas no existen
+    """
+
+    nombre = "sqlite"
+    descripcion = "SQLite"
+
+    DatabaseError = sqlite3.DatabaseError
+    IntegrityError = sqlite3.IntegrityError
+
+    sql_fecha_servidor = "SELECT date('now')"
+    sql_ahora = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+    sql_tabla_versiones = (
+        "CREATE TABLE esquema_version (version INTEGER PRIMARY KEY, nombre VARCHAR(200) NOT NULL, "
+        "aplicada TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')))"
+    )
+
+    def __init__(self, ruta: str = ":memory:", crear_esquema: bool = True):
+        if ruta == ":memory:":
+            self._ruta = f"file:veterinaria_{next(_contador_memoria)}?mode=memory&cache=shared"
+            self._uri = True
+        else:
+            self._ruta = ruta
+            self._uri = False
+        self._crear_esquema = crear_esquema
+        self._esquema_listo = False
+        # Una base en memoria desaparece al cerrar su última conexión
+        self._ancla = self.conectar() if self._uri else None
+
+    def conectar(self) -> Any:
+        conexion = sqlite3.connect(
+            self._ruta,
+            uri=self._uri,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+            factory=ConexionSQLite
+        )
+        conexion.execute("PRAGMA foreign_keys = ON")
+        if self._crear_esquema and not self._esquema_listo:
+            self._inicializar(conexion)
+        return conexion
+
+    def _inicializar(self, conexion: sqlite3.Connection):
+        existe = conexion.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cliente'"
+        ).fetchone()
+        if not existe:
+            with open(RUTA_ESQUEMA, encoding="utf-8") as archivo:
+                conexion.executescript(archivo.read())
+        self._esquema_listo = True
+
+    def limitar(self, sql: str, limite: int) -> str:
+        return f"{sql} LIMIT {int(limite)}"
+
+    def siguiente_valor(self, cursor: Any, secuencia: str) -> int:
+        return self.reservar_valores(cursor, secuencia, 1)[0]
+
+    def reservar_valores(self, cursor: Any, secuencia: str, cantidad: int) -> List[int]:
+        # Fuera de una transacción el avance se confirma de inmediato, como un
+        # NEXTVAL de Oracle; dentro de una, se confirma junto con las filas.
+        en_transaccion = cursor.connection.in_transaction
+        cursor.execute(
+            "UPDATE secuencia SET valor = valor + :cantidad WHERE nombre = :nombre RETURNING valor",
+            {"cantidad": cantidad, "nombre": secuencia}
+        )
+        filas = cursor.fetchall()
+        if not filas:
+            raise sqlite3.OperationalError(f"La secuencia {secuencia} no existe")
+        if not en_transaccion:
+            cursor.connection.commit()
+        ultimo = filas[0][0]
+        return list(range(ultimo - cantidad + 1, ultimo + 1))
+
+    def insertar_retornando_id(
+        self, cursor: Any, sql: str, parametros: dict, clave_id: str, secuencia: str, columna_id: str
+    ) -> int:
+        nuevo_id = self.siguiente_valor(cursor, secuencia)
+        cursor.execute(sql, {**parametros, clave_id: nuevo_id})
+        return nuevo_id
+
+    def bloquear_veterinario(self, cursor: Any, id_veterinario: int):
+        # SQLite admite un solo escritor: BEGIN IMMEDIATE toma el bloqueo de
+        # escritura de toda la BD. Si la transacción ya escribió, ya lo tiene
+        if not cursor.connection.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+
+    def viola_indice(self, cursor: Any, error: Exception, indice: str) -> bool:
+        # SQLite nombra el índice sólo si es de expresiones; si es de columnas
+        # informa "tabla.columna, ...", que se compara con las del índice
+        mensaje = str(error)
+        prefijo = "UNIQUE constraint failed: "
+        if not mensaje.startswith(prefijo):
+            return False
+        if mensaje == f"{prefijo}index '{indice}'":
+            return True
+        cursor.execute("SELECT tbl_name FROM sqlite_master WHERE type = 'index' AND name = :indice", {"indice": indice})
+        tabla = cursor.fetchone()
+        if tabla is None:
+            return False
+        cursor.execute("SELECT name FROM pragma_index_info(:indice) ORDER BY seqno", {"indice": indice})
+        columnas = ", ".join(f"{tabla[0]}.{columna}" for (columna,) in cursor.fetchall())
+        return mensaje[len(prefijo):] == columnas
+
+    def existe_tabla(self, cursor: Any, tabla: str) -> bool:
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = :tabla", {"tabla": tabla})
+        return cursor.fetchone()[0] > 0
+
+    def existe_columna(self, cursor: Any, tabla: str, columna: str) -> bool:
+        cursor.execute("SELECT COUNT(*) FROM pragma_table_info(:tabla) WHERE name = :columna",
+                       {"tabla": tabla, "columna": columna})
+        return cursor.fetchone()[0] > 0
+
+    def existe_indice(self, cursor: Any, indice: str) -> bool:
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND name = :indice", {"indice": indice})
+        return cursor.fetchone()[0] > 0
+
+    def ejecutar_script(self, conexion: Any, script: str):
+        # executescript confirma lo pendiente antes de empezar; con BEGIN el
+        # script completo (DDL incluido) queda en una transacción que se
+        # confirma o deshace junto con el registro de la versión
+        conexion.executescript(f"BEGIN;\n{script}")
+
+    def explicar(self, cursor: Any, sql: str, parametros: Any = None) -> List[str]:
+        # Filas (id, padre, -, detalle): se sangra cada paso bajo su padre
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parametros or {})
+        niveles = {0: -1}
+        lineas = []
+        for id_paso, padre, _, detalle in cursor.fetchall():
+            niveles[id_paso] = niveles.get(padre, -1) + 1
+            lineas.append("  " * niveles[id_paso] + detalle)
+        return lineas
+
+    def ejecutar_lote(self, cursor: Any, sql: str, filas: Sequence) -> List[Tuple[int, str]]:
+        # Fuera de una transacción el SAVEPOINT sería el más externo y su
+        # RELEASE confirmaría el lote: con BEGIN el commit o rollback queda en
+        # manos de quien llama (insertar_en_lotes atómico deshace todos los lotes)
+        if not cursor.connection.in_transaction:
+            cursor.execute("BEGIN")
+        cursor.execute("SAVEPOINT lote")
+        try:
+            cursor.executemany(sql, filas)
+            cursor.execute("RELEASE SAVEPOINT lote")
+            return []
+        except sqlite3.IntegrityError:
+            cursor.execute("ROLLBACK TO SAVEPOINT lote")
+            cursor.execute("RELEASE SAVEPOINT lote")
+
+        errores = []
+        for posicion, fila in enumerate(filas):
+            try:
+                cursor.execute(sql, fila)
+            except sqlite3.IntegrityError as e:
+                errores.append((posicion, str(e)))
+        return errores
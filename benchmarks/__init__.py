@@ -0,0 +1 @@
+"""Benchmarks del Sistema de Gestión Veterinaria (se ejecutan sobre SQLite)"""
@@ -0,0 +1,93 @@
+"""
+Benchmark: tiempo de arranque (imports) del menú y del modo por comandos
+
+Ejecuta cada punto de entrada en un proceso nuevo con `python -X importtime`
+y suma el tiempo acumulado de los imports de primer nivel. Además verifica
+que al arrancar no se cargan módulos que sólo necesitan algunos comandos:
+el driver de Oracle (se carga al abrir la primera conexión), NumPy
+(importación y lotes de citas), los módulos de importación/lotes y los
+DAO, la agenda y la exportación (se cargan en el menú o comando que los usa).
+
+Termina con código 1 si se carga alguno de esos módulos o si un punto de
+entrada supera el presupuesto en milisegundos.
+
+Uso:
+    python -m benchmarks.bench_arranque [PRESUPUESTO_MS]
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict, List, Set, Tuple
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PUNTOS_DE_ENTRADA = {
+    "menú (main.py)": "import main",
+    "comandos": "import comandos",
+}
+
+# Módulos que no deben cargarse al arrancar
+PESADOS = (
+    "oracledb", "numpy", "dao.importacion", "models.validacion", "models.cita_batch",
+    "dao.cliente_dao", "dao.mascota_dao", "dao.veterinario_dao", "dao.cita_dao",
+    "dao.agenda", "dao.exportacion",
+)
+
+REPETICIONES = 5
+
+
+def medir(codigo: str) -> Tuple[float, Dict[str, float], Set[str]]:
+    """Tiempo de imports (ms), tiempo acumulado por módulo y módulos cargados de un arranque"""
+    # -X importtime no registra lo que se carga con importlib.import_module
+    # (los DAO de dao/__init__.py): los módulos cargados salen de sys.modules
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo + "\nimport sys\nprint(*sys.modules, sep='\\n')"],
+        cwd=RAIZ, capture_output=True, text=True, check=True
+    )
+    modulos: Dict[str, float] = {}
+    total = 0.0
+    for linea in proceso.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        modulo = nombre.strip()
+        modulos[modulo] = int(acumulado) / 1000
+        # Sólo los imports de primer nivel (sin sangría) suman al total
+        if not nombre.startswith("  "):
+            total += int(acumulado) / 1000
+    return total, modulos, set(proceso.stdout.split())
+
+
+def main():
+    presupuesto = float(sys.argv[1]) if len(sys.argv) > 1 else None
+    prohibidos = list(PESADOS)
+    if not os.path.exists(os.path.join(RAIZ, ".env")):
+        # Sin .env las variables vienen del entorno: no hace falta cargar dotenv
+        prohibidos.append("dotenv")
+
+    fallas: List[str] = []
+    for nombre, codigo in PUNTOS_DE_ENTRADA.items():
+        # Mediana de varias corridas: la primera suele pagar el disco
+        corridas = sorted((medir(codigo) for _ in range(REPETICIONES)), key=lambda corrida: corrida[0])
+        total, modulos, cargados = corridas[len(corridas) // 2]
+        print(f"{nombre}: {total:.1f} ms en imports ({len(modulos)} módulos)")
+        for modulo, ms in sorted(modulos.items(), key=lambda item: -item[1])[:8]:
+            print(f"    {ms:8.1f} ms  {modulo}")
+
+        pesados = [modulo for modulo in prohibidos if modulo in cargados]
+        if pesados:
+            fallas.append(f"{nombre} carga al arrancar: {', '.join(pesados)}")
+        if presupuesto is not None and total > presupuesto:
+            fallas.append(f"{nombre} supera el presupuesto: {total:.1f} ms > {presupuesto:.0f} ms")
+
+    for falla in fallas:
+        print(f"✗ {falla}")
+    if not fallas:
+        print("✓ Arranque sin módulos pesados")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
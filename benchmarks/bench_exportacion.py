@@ -0,0 +1,103 @@
+"""
+Benchmark: memoria de exportar() con tablas de distinto tamaño
+
+Exporta la tabla cita con N/4 y N filas a CSV, JSONL y CSV comprimido, y
+mide con tracemalloc el pico de memoria de Python de cada exportación.
+Verifica que el pico no crece con N y que no supera un bloque de
+ARRAYSIZE filas (medido aparte con un fetchmany) más el buffer de salida.
+
+Uso:
+    python -m benchmarks.bench_exportacion [N]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import database
+from benchmarks.bench_streaming import cargar_citas
+from dao import ClienteDAO, MascotaDAO, VeterinarioDAO
+from dao.exportacion import ARRAYSIZE, BUFFER, exportar
+from models import Cliente, Mascota, Veterinario
+
+FORMATOS = (("csv", False), ("jsonl", False), ("csv", True))
+
+# Holgura sobre un bloque: filas convertidas a texto, estado de gzip, etc.
+HOLGURA = 0.5
+
+
+def medir_bloque() -> int:
+    """Memoria que ocupa un bloque de ARRAYSIZE filas de cita"""
+    with database.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT * FROM cita")
+            tracemalloc.start()
+            bloque = cursor.fetchmany(ARRAYSIZE)
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    del bloque
+    return pico
+
+
+def medir(ruta: str, formato: str, comprimir: bool):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    exportar("cita", ruta, formato, comprimir)
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico, segundos
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    database.configurar_backend("sqlite")
+    with contextlib.redirect_stdout(io.StringIO()):
+        ClienteDAO.create(Cliente(1, "1-9", "Ana", "Pérez", "", "ana@bench.cl"))
+        MascotaDAO.create(Mascota(1, "Max", "PERRO", "", 3, "", 10.0, 1))
+        VeterinarioDAO.create(Veterinario(1, "Luis", "Soto", "General", "", "luis@bench.cl"))
+
+    resultados = {}
+    cargadas = 0
+    with tempfile.TemporaryDirectory() as carpeta:
+        for total in (n // 4, n):
+            cargar_citas(total - cargadas, cargadas + 1)
+            cargadas = total
+            for formato, comprimir in FORMATOS:
+                ruta = os.path.join(carpeta, f"cita.{formato}" + (".gz" if comprimir else ""))
+                resultados[(total, formato, comprimir)] = medir(ruta, formato, comprimir)
+        bloque = medir_bloque()
+
+    presupuesto = bloque * (1 + HOLGURA) + BUFFER
+    print(f"Bloque de {ARRAYSIZE} filas: {bloque / 1e6:.2f} MB; presupuesto por exportación: "
+          f"{presupuesto / 1e6:.2f} MB (bloque + {HOLGURA:.0%} + buffer de {BUFFER / 1e6:.1f} MB)\n")
+    print(f"{'citas':>10} {'formato':>9} {'pico (MB)':>10} {'tiempo (s)':>11}")
+    for (total, formato, comprimir), (pico, segundos) in resultados.items():
+        nombre = formato + (".gz" if comprimir else "")
+        print(f"{total:>10} {nombre:>9} {pico / 1e6:>10.2f} {segundos:>11.2f}")
+
+    fallas = []
+    for formato, comprimir in FORMATOS:
+        nombre = formato + (".gz" if comprimir else "")
+        pico_chico = resultados[(n // 4, formato, comprimir)][0]
+        pico_grande = resultados[(n, formato, comprimir)][0]
+        # Con 4 veces más filas el pico debe mantenerse (margen 20%)
+        if pico_grande > pico_chico * 1.2:
+            fallas.append(f"{nombre}: el pico crece con la tabla ({pico_chico / 1e6:.2f} MB → {pico_grande / 1e6:.2f} MB)")
+        if pico_grande > presupuesto:
+            fallas.append(f"{nombre}: pico de {pico_grande / 1e6:.2f} MB sobre el presupuesto")
+
+    print()
+    for falla in fallas:
+        print(f"✗ {falla}")
+    if not fallas:
+        print("✓ Memoria de exportar() acotada por un bloque de ARRAYSIZE filas")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
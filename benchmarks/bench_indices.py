@@ -0,0 +1,168 @@
+"""
+Benchmark: plan y latencia de las consultas por clave foránea antes y
+después de la migración 004_indices_fk
+
+Crea una BD SQLite temporal en la versión 3 del esquema (sin
+ix_mascota_cliente, ix_cita_mascota_ts ni ix_cita_fecha), la carga con N
+citas y mide la mediana de cada consulta junto con su plan. Luego aplica
+la migración con migrar.aplicar() y repite la medición.
+
+read_by_veterinario ya tenía su índice (ix_cita_vet_ts) y sirve de control:
+su tiempo no debe cambiar.
+
+Uso:
+    python -m benchmarks.bench_indices [N]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Iterable
+
+import database
+import migrar
+from dao import ClienteDAO, MascotaDAO, VeterinarioDAO, CitaDAO
+
+INDICES_004 = ("ix_mascota_cliente", "ix_cita_mascota_ts", "ix_cita_fecha")
+
+VETERINARIOS = 50
+MASCOTAS_POR_CLIENTE = 2
+CITAS_POR_MASCOTA = 10
+# Horarios de 30 minutos entre las 09:00 y las 18:00
+HORARIOS_POR_DIA = 18
+
+REPETICIONES = 7
+LOTE = 20_000
+
+
+def crear_bd(ruta: str):
+    """BD en la versión 3: el esquema actual sin los índices de la 004"""
+    database.configurar_backend("sqlite", ruta=ruta)
+    with database.get_connection() as conn:
+        with conn.cursor() as cursor:
+            for indice in INDICES_004:
+                cursor.execute(f"DROP INDEX {indice}")
+            cursor.execute("DELETE FROM esquema_version WHERE version = 4")
+        conn.commit()
+
+
+def cargar(n_citas: int):
+    """Carga directa por executemany (sin validaciones: sólo interesa el volumen)"""
+    n_mascotas = max(1, n_citas // CITAS_POR_MASCOTA)
+    n_clientes = max(1, n_mascotas // MASCOTAS_POR_CLIENTE)
+    inicio = datetime(2020, 1, 1, 9, 0)
+    with database.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.executemany(VeterinarioDAO._SQL_INSERT, (
+                {"id": v, "nombre": f"Vet{v}", "apellido": "Bench", "especialidad": "General",
+                 "telefono": "", "email": f"vet{v}@bench.cl"}
+                for v in range(1, VETERINARIOS + 1)
+            ))
+            cursor.executemany(ClienteDAO._SQL_INSERT, (
+                {"id": c, "rut": f"{c}-0", "nombres": "Cliente", "apellidos": str(c), "telefono": "",
+                 "email": f"c{c}@bench.cl", "direccion": ""}
+                for c in range(1, n_clientes + 1)
+            ))
+            cursor.executemany(MascotaDAO._SQL_INSERT, (
+                {"id": m, "nombre": f"M{m}", "especie": "PERRO", "raza": "", "edad": 3, "color": "",
+                 "peso": 10.0, "id_cliente": (m - 1) % n_clientes + 1}
+                for m in range(1, n_mascotas + 1)
+            ))
+            filas = []
+            for n in range(n_citas):
+                # Un horario distinto por veterinario: respeta uk_cita_vet_horario
+                turno = n // VETERINARIOS
+                ts = inicio + timedelta(days=turno // HORARIOS_POR_DIA, minutes=30 * (turno % HORARIOS_POR_DIA))
+                filas.append({
+                    "id": n + 1, "id_mascota": n % n_mascotas + 1, "id_vet": n % VETERINARIOS + 1,
+                    "fecha": ts.date(), "hora": ts.strftime("%H:%M"), "ts": ts,
+                    "motivo": "Control", "estado": "COMPLETADA", "diagnostico": None,
+                })
+                if len(filas) == LOTE:
+                    cursor.executemany(CitaDAO._SQL_INSERT, filas)
+                    filas.clear()
+            if filas:
+                cursor.executemany(CitaDAO._SQL_INSERT, filas)
+        conn.commit()
+    return n_clientes, n_mascotas
+
+
+def mediana_ms(funcion, argumentos) -> float:
+    tiempos = []
+    for argumento in argumentos:
+        inicio = time.perf_counter()
+        funcion(argumento)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def plan(sql: str, parametros: dict) -> str:
+    with database.get_connection() as conn:
+        with conn.cursor() as cursor:
+            return " / ".join(linea.strip() for linea in database.backend().explicar(cursor, sql, parametros))
+
+
+def medir(n_clientes: int, n_mascotas: int, clientes_a_borrar: Iterable[int]) -> dict:
+    mascotas = [n_mascotas * (i + 1) // (REPETICIONES + 1) for i in range(REPETICIONES)]
+    clientes = [n_clientes * (i + 1) // (REPETICIONES + 1) for i in range(REPETICIONES)]
+    medio = date(2020, 1, 1) + timedelta(days=n_mascotas * CITAS_POR_MASCOTA // VETERINARIOS // HORARIOS_POR_DIA // 2)
+    casos = {
+        "read_by_mascota": (
+            CitaDAO.read_by_mascota, mascotas,
+            "SELECT * FROM cita WHERE id_mascota = :id ORDER BY ts DESC", {"id": 1}),
+        "read_detalle_filtrado(mascota)": (
+            lambda id_mascota: CitaDAO.read_detalle_filtrado(id_mascota=id_mascota), mascotas,
+            CitaDAO._SQL_DETALLE + " WHERE c.id_mascota = :id_mascota ORDER BY c.ts DESC", {"id_mascota": 1}),
+        "read_by_cliente": (
+            MascotaDAO.read_by_cliente, clientes,
+            "SELECT * FROM mascota WHERE id_cliente = :id", {"id": 1}),
+        "read_page": (
+            lambda _: CitaDAO.read_page(after_fecha=medio, after_id=0), range(REPETICIONES),
+            database.backend().limitar(
+                "SELECT * FROM cita WHERE fecha >= :fecha AND (fecha > :fecha OR id_cita > :id) "
+                "ORDER BY fecha, id_cita", 20),
+            {"fecha": medio, "id": 0}),
+        # Borra el cliente con sus mascotas y citas (ON DELETE CASCADE)
+        "ClienteDAO.delete": (
+            ClienteDAO.delete, clientes_a_borrar,
+            "DELETE FROM cliente WHERE id_cliente = :id", {"id": 1}),
+        "read_by_veterinario (control)": (
+            CitaDAO.read_by_veterinario, range(1, REPETICIONES + 1),
+            "SELECT * FROM cita WHERE id_veterinario = :id ORDER BY ts DESC", {"id": 1}),
+    }
+    return {nombre: (mediana_ms(funcion, argumentos), plan(sql, parametros))
+            for nombre, (funcion, argumentos, sql, parametros) in casos.items()}
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as carpeta:
+        crear_bd(os.path.join(carpeta, "bench_indices.db"))
+        inicio = time.perf_counter()
+        n_clientes, n_mascotas = cargar(n)
+        print(f"{n} citas, {n_mascotas} mascotas, {n_clientes} clientes cargados en "
+              f"{time.perf_counter() - inicio:.1f} s")
+
+        # Clientes distintos en cada medición: el borrado no se repite sobre el mismo
+        antes = medir(n_clientes, n_mascotas, range(n_clientes, n_clientes - REPETICIONES, -1))
+        inicio = time.perf_counter()
+        aplicadas = migrar.aplicar()
+        print(f"Migraciones aplicadas: {', '.join(m.nombre for m in aplicadas)} "
+              f"({time.perf_counter() - inicio:.1f} s)\n")
+        despues = medir(n_clientes, n_mascotas, range(n_clientes - REPETICIONES, n_clientes - 2 * REPETICIONES, -1))
+        database.cerrar_pool()
+
+    print(f"{'consulta':<32} {'antes (ms)':>11} {'después (ms)':>13} {'mejora':>8}")
+    for nombre, (ms_antes, _) in antes.items():
+        ms_despues = despues[nombre][0]
+        print(f"{nombre:<32} {ms_antes:>11.2f} {ms_despues:>13.2f} {ms_antes / ms_despues:>7.0f}x")
+    print("\nPlanes:")
+    for nombre, (_, plan_antes) in antes.items():
+        print(f"  {nombre}\n    antes:   {plan_antes}\n    después: {despues[nombre][1]}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
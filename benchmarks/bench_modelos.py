@@ -0,0 +1,76 @@
+"""
+Benchmark: memoria y velocidad de construcción de los modelos
+
+Compara, para N filas como las que entrega el cursor:
+- antes: la misma clase sin __slots__ (atributos en __dict__) construida con Clase(*row)
+- después: la clase con __slots__ construida con Clase.from_row(row)
+
+Mide objetos por segundo y bytes por objeto (tracemalloc, sin contar las
+filas de entrada).
+
+Uso:
+    python -m benchmarks.bench_modelos [N]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime
+
+from models import Cliente, Mascota, Veterinario, Cita
+
+
+def sin_slots(clase):
+    """Copia de la clase con atributos en __dict__, como antes de __slots__"""
+    atributos = {nombre: valor for nombre, valor in vars(clase).items() if nombre not in clase.__slots__}
+    atributos.pop("__slots__")
+    atributos.pop("__dict__", None)
+    return type(f"{clase.__name__}SinSlots", (), atributos)
+
+
+def filas_de(clase, n):
+    hoy = date(2025, 1, 1)
+    if clase is Cliente:
+        return [(i, f"{i}-9", "Ana", "Pérez", "912345678", f"ana{i}@mail.cl", "Calle 1") for i in range(n)]
+    if clase is Mascota:
+        return [(i, "Max", "PERRO", "Quiltro", 3, "Café", 12.5, i) for i in range(n)]
+    if clase is Veterinario:
+        return [(i, "Luis", "Soto", "General", "912345678", f"luis{i}@vet.cl") for i in range(n)]
+    ts = datetime(2025, 1, 1, 10, 0)
+    return [(i, i, 1, hoy, "10:00", "Control", "PENDIENTE", None, ts, ts) for i in range(n)]
+
+
+def medir(construir, filas):
+    gc.collect()
+    inicio = time.perf_counter()
+    objetos = [construir(fila) for fila in filas]
+    segundos = time.perf_counter() - inicio
+    del objetos
+    gc.collect()
+
+    tracemalloc.start()
+    objetos = [construir(fila) for fila in filas]
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Descontar la lista que contiene los objetos
+    memoria -= sys.getsizeof(objetos)
+    del objetos
+    return len(filas) / segundos, memoria / len(filas)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"{'modelo':<12} {'antes obj/s':>13} {'después obj/s':>14} {'antes B/obj':>12} {'después B/obj':>14}")
+    for clase in (Cliente, Mascota, Veterinario, Cita):
+        filas = filas_de(clase, n)
+        anterior = sin_slots(clase)
+        vel_antes, mem_antes = medir(lambda fila: anterior(*fila), filas)
+        vel_despues, mem_despues = medir(clase.from_row, filas)
+        print(f"{clase.__name__:<12} {vel_antes:>13,.0f} {vel_despues:>14,.0f} {mem_antes:>12.0f} {mem_despues:>14.0f}")
+        del filas
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Benchmark: memoria de read_by_veterinario (lista) vs iter_by_veterinario (streaming)
+
+Carga N citas de un mismo veterinario en SQLite en memoria y mide con
+tracemalloc el pico de memoria de Python al recorrerlas. Verifica que el
+pico de iter_by_veterinario no crece con N (memoria acotada por arraysize).
+
+Uso:
+    python -m benchmarks.bench_streaming [N]
+"""
+
+import contextlib
+import io
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import database
+from dao import ClienteDAO, MascotaDAO, VeterinarioDAO, CitaDAO
+from models import Cliente, Mascota, Veterinario, Cita
+
+ARRAYSIZE = 500
+
+
+def cargar_citas(cantidad: int, desde_id: int = 1):
+    inicio = date(2020, 1, 1)
+    # Un horario distinto por cita: el veterinario no puede tener dos citas a la misma hora
+    citas = (
+        Cita(n, 1, 1, inicio + timedelta(days=n % 20000), Cita.minutos_a_hora(540 + 30 * (n // 20000 % 18)),
+             "Control", "COMPLETADA")
+        for n in range(desde_id, desde_id + cantidad)
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        CitaDAO.create_many(citas, batch_size=5000)
+
+
+def medir(funcion):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico, segundos
+
+
+def recorrer_lista():
+    for cita in CitaDAO.read_by_veterinario(1):
+        pass
+
+
+def recorrer_iterador():
+    for cita in CitaDAO.iter_by_veterinario(1, arraysize=ARRAYSIZE):
+        pass
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    database.configurar_backend("sqlite")
+    with contextlib.redirect_stdout(io.StringIO()):
+        ClienteDAO.create(Cliente(1, "1-9", "Ana", "Pérez", "", "ana@bench.cl"))
+        MascotaDAO.create(Mascota(1, "Max", "PERRO", "", 3, "", 10.0, 1))
+        VeterinarioDAO.create(Veterinario(1, "Luis", "Soto", "General", "", "luis@bench.cl"))
+
+    resultados = {}
+    cargadas = 0
+    for total in (n // 4, n):
+        cargar_citas(total - cargadas, cargadas + 1)
+        cargadas = total
+        resultados[total] = (medir(recorrer_lista), medir(recorrer_iterador))
+
+    print(f"{'citas':>10} {'lista (MB)':>12} {'lista (s)':>10} {'iter (MB)':>12} {'iter (s)':>10}")
+    for total, ((pico_l, seg_l), (pico_i, seg_i)) in resultados.items():
+        print(f"{total:>10} {pico_l / 1e6:>12.2f} {seg_l:>10.2f} {pico_i / 1e6:>12.2f} {seg_i:>10.2f}")
+
+    (_, (pico_chico, _)), (_, (pico_grande, _)) = resultados.values()
+    # Con 4 veces más filas, el pico del iterador debe mantenerse (margen 50%)
+    acotado = pico_grande <= pico_chico * 1.5
+    print(f"\n{'✓' if acotado else '✗'} Memoria de iter_by_veterinario acotada: "
+          f"{pico_chico / 1e6:.2f} MB → {pico_grande / 1e6:.2f} MB")
+    return 0 if acotado else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
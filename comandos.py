@@ -0,0 +1,432 @@
+"""
+Módulo: comandos.py
+Modo por comandos de main.py, para scripts y tareas programadas
+
+    python main.py citas list --vet 3 --from 2024-12-01 --json
+    python main.py clientes create --rut 12345678-5 --nombres Ana --apellidos Pérez
+    python main.py import clientes clientes.csv
+    python main.py batch < operaciones.txt
+
+Los resultados se escriben en la salida estándar (texto o, con --json, un
+objeto JSON por línea) y los mensajes ✓/✗ de los DAO (ver eventos.py) en
+la salida de errores, de modo que la salida se puede procesar con otras
+herramientas.
+
+`batch` lee un comando por línea desde la entrada estándar y los ejecuta
+todos en el mismo proceso y con el mismo pool de conexiones, sin volver a
+pagar el arranque ni la conexión por cada operación. En este modo sólo se
+muestran los avisos y errores de los DAO, no cada operación exitosa.
+
+Código de salida: 0 si todo resultó, 1 si alguna operación falló, 2 si el
+comando está mal escrito.
+"""
+
+import argparse
+import json
+import os
+import shlex
+import sys
+from contextlib import redirect_stdout
+from datetime import date
+from itertools import islice
+from typing import Iterable, List, TextIO
+import database
+import eventos
+from models import Cliente, Mascota, Veterinario, Cita
+
+
+class ErrorDeUso(Exception):
+    """Comando mal escrito (código de salida 2)"""
+
+
+class _Parser(argparse.ArgumentParser):
+    # En modo batch un error de sintaxis no debe terminar el proceso
+    def error(self, message: str):
+        raise ErrorDeUso(f"{self.prog}: {message}")
+
+
+def ejecutar(argv: List[str]) -> int:
+    """Ejecuta un comando (argv sin el nombre del programa) y retorna el código de salida"""
+    try:
+        with eventos.escuchando(eventos.imprimir):
+            return _ejecutar(_parser().parse_args(argv), sys.stdout)
+    except ErrorDeUso as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 2
+
+
+def ejecutar_lote(entrada: TextIO, salida: TextIO, detener_en_error: bool = False) -> int:
+    """
+    Ejecuta un comando por línea de `entrada` (modo batch).
+
+    Las líneas vacías y las que empiezan con # se ignoran. Retorna 0 si
+    todas las operaciones resultaron y 1 si alguna falló.
+    """
+    with eventos.escuchando(eventos.imprimir, eventos.AVISO):
+        return _ejecutar_lineas(entrada, salida, detener_en_error)
+
+
+def _ejecutar_lineas(entrada: TextIO, salida: TextIO, detener_en_error: bool) -> int:
+    parser = _parser()
+    ejecutadas = fallidas = 0
+    for numero, linea in enumerate(entrada, start=1):
+        linea = linea.strip()
+        if not linea or linea.startswith("#"):
+            continue
+        ejecutadas += 1
+        try:
+            argumentos = shlex.split(linea)
+            if argumentos and argumentos[0] == "batch":
+                raise ErrorDeUso("batch no se puede anidar")
+            # --help imprime la ayuda (en stderr, como los mensajes) y termina con SystemExit
+            with redirect_stdout(sys.stderr):
+                args = parser.parse_args(argumentos)
+            codigo = _ejecutar(args, salida)
+        except SystemExit as e:
+            codigo = e.code if isinstance(e.code, int) else 0 if e.code is None else 1
+        except (ErrorDeUso, ValueError) as e:
+            print(f"✗ Línea {numero}: {e}", file=sys.stderr)
+            codigo = 2
+        except Exception as e:
+            # Un error inesperado en una línea no detiene las demás
+            print(f"✗ Línea {numero}: error inesperado: {type(e).__name__}: {e}", file=sys.stderr)
+            codigo = 1
+        if codigo:
+            fallidas += 1
+            if detener_en_error:
+                break
+    print(f"✓ {ejecutadas} comando(s) ejecutado(s), {fallidas} con error.", file=sys.stderr)
+    return 1 if fallidas else 0
+
+
+def _ejecutar(args, salida: TextIO) -> int:
+    # Los mensajes (propios y de los DAO) van a stderr; `salida` queda sólo para los datos
+    args.salida = salida
+    with redirect_stdout(sys.stderr):
+        try:
+            return args.ejecutar(args)
+        except ValueError as e:
+            print(f"✗ Error de validación: {e}")
+            return 1
+        except OSError as e:
+            print(f"✗ Error: {e}")
+            return 1
+        except database.DatabaseError:
+            # El DAO ya informó el error
+            return 1
+
+
+def _emitir(args, objetos: Iterable) -> int:
+    """Escribe los objetos (texto o JSON por línea); retorna 1 si no había ninguno"""
+    cantidad = 0
+    for objeto in objetos:
+        if objeto is None:
+            continue
+        if args.json:
+            linea = json.dumps(objeto.to_dict() if hasattr(objeto, "to_dict") else objeto, ensure_ascii=False, default=str)
+        else:
+            linea = str(objeto)
+        args.salida.write(linea + "\n")
+        cantidad += 1
+    return 0 if cantidad else 1
+
+
+# ---------------- Clientes ----------------
+
+def _clientes_list(args) -> int:
+    from dao import ClienteDAO
+    _emitir(args, islice(ClienteDAO.iter_all(), args.limit))
+    return 0
+
+
+def _clientes_get(args) -> int:
+    from dao import ClienteDAO
+    return _emitir(args, [ClienteDAO.read_by_id(args.id)])
+
+
+def _clientes_rut(args) -> int:
+    from dao import ClienteDAO
+    return _emitir(args, [ClienteDAO.read_by_rut(args.rut)])
+
+
+def _clientes_create(args) -> int:
+    from dao import ClienteDAO
+    cliente = Cliente(0, args.rut, args.nombres, args.apellidos, args.telefono, args.email, args.direccion)
+    # Los setters normalizan el RUT y validan el email
+    cliente.rut = args.rut
+    if args.email:
+        cliente.email = args.email
+    cliente.id_cliente = ClienteDAO.create_with_sequence()
+    codigo = 0 if ClienteDAO.create(cliente) else 1
+    if not codigo:
+        _emitir(args, [cliente])
+    return codigo
+
+
+def _clientes_delete(args) -> int:
+    from dao import ClienteDAO
+    return 0 if ClienteDAO.delete(args.id) else 1
+
+
+# ---------------- Mascotas ----------------
+
+def _mascotas_list(args) -> int:
+    from dao import MascotaDAO
+    mascotas = MascotaDAO.iter_by_cliente(args.cliente) if args.cliente else MascotaDAO.iter_all()
+    _emitir(args, islice(mascotas, args.limit))
+    return 0
+
+
+def _mascotas_get(args) -> int:
+    from dao import MascotaDAO
+    return _emitir(args, [MascotaDAO.read_by_id(args.id)])
+
+
+def _mascotas_create(args) -> int:
+    from dao import MascotaDAO
+    mascota = Mascota(0, args.nombre, args.especie, args.raza, args.edad, args.color, args.peso, args.cliente)
+    # Los setters validan especie, edad y peso como en el menú
+    mascota.especie = args.especie
+    mascota.edad = args.edad
+    if args.peso is not None:
+        mascota.peso = args.peso
+    mascota.id_mascota = MascotaDAO.create_with_sequence()
+    codigo = 0 if MascotaDAO.create(mascota) else 1
+    if not codigo:
+        _emitir(args, [mascota])
+    return codigo
+
+
+def _mascotas_delete(args) -> int:
+    from dao import MascotaDAO
+    return 0 if MascotaDAO.delete(args.id) else 1
+
+
+# ---------------- Veterinarios ----------------
+
+def _veterinarios_list(args) -> int:
+    from dao import VeterinarioDAO
+    _emitir(args, islice(VeterinarioDAO.iter_all(), args.limit))
+    return 0
+
+
+def _veterinarios_get(args) -> int:
+    from dao import VeterinarioDAO
+    return _emitir(args, [VeterinarioDAO.read_by_id(args.id)])
+
+
+def _veterinarios_create(args) -> int:
+    from dao import VeterinarioDAO
+    vet = Veterinario(0, args.nombre, args.apellido, args.especialidad, args.telefono, args.email)
+    vet.id_veterinario = VeterinarioDAO.create_with_sequence()
+    codigo = 0 if VeterinarioDAO.create(vet) else 1
+    if not codigo:
+        _emitir(args, [vet])
+    return codigo
+
+
+def _veterinarios_delete(args) -> int:
+    from dao import VeterinarioDAO
+    return 0 if VeterinarioDAO.delete(args.id) else 1
+
+
+# ---------------- Citas ----------------
+
+def _citas_list(args) -> int:
+    from dao import CitaDAO
+    citas = CitaDAO.read_detalle_filtrado(args.vet, args.mascota, args.estado, args.desde, args.hasta)
+    _emitir(args, islice(citas, args.limit))
+    return 0
+
+
+def _citas_get(args) -> int:
+    from dao import CitaDAO
+    return _emitir(args, [CitaDAO.read_detalle(args.id)])
+
+
+def _citas_create(args) -> int:
+    from dao import CitaDAO
+    cita = Cita(0, args.mascota, args.vet, args.fecha, args.hora, args.motivo or "")
+    cita.estado = args.estado
+    cita.id_cita = CitaDAO.create_with_sequence()
+    codigo = 0 if CitaDAO.create(cita) else 1
+    if not codigo:
+        _emitir(args, [cita])
+    return codigo
+
+
+def _citas_estado(args) -> int:
+    from dao import CitaDAO
+    cita = CitaDAO.read_by_id(args.id)
+    if cita is None:
+        return 1
+    cita.estado = args.estado
+    if args.diagnostico is not None:
+        cita.diagnostico = args.diagnostico
+    return 0 if CitaDAO.update(cita) else 1
+
+
+def _citas_delete(args) -> int:
+    from dao import CitaDAO
+    return 0 if CitaDAO.delete(args.id) else 1
+
+
+def _citas_libres(args) -> int:
+    from dao import CitaDAO
+    libres = CitaDAO.proximos_libres(args.especialidad, args.desde, args.cantidad)
+    return _emitir(args, ({"fecha": fecha, "hora": hora, "id_veterinario": id_vet} if args.json
+                          else f"{fecha} {hora}  Veterinario ID {id_vet}" for fecha, hora, id_vet in libres))
+
+
+# ---------------- Importación, exportación y batch ----------------
+
+def _importar(args) -> int:
+    # La validación por lotes carga NumPy: sólo se importa para este comando
+    from dao.importacion import importar
+    resultado = importar(args.entidad, args.archivo, formato=args.formato, batch_size=args.lote,
+                         checkpoint=args.checkpoint, rechazos=args.rechazos)
+    if resultado.saltadas:
+        print(f"  (se continuó desde la fila {resultado.saltadas + 1} según el checkpoint)")
+    for fila, mensaje in resultado.rechazos[:10]:
+        print(f"  Fila {fila}: {mensaje}")
+    if resultado.rechazadas > 10:
+        print(f"  ... y {resultado.rechazadas - 10} rechazo(s) más")
+    print(f"✓ {resultado.insertadas} {args.entidad} importado(s), {resultado.rechazadas} rechazado(s) "
+          f"de {resultado.leidas} fila(s) en {resultado.segundos:.2f} s ({resultado.filas_por_segundo:,.0f} filas/s)")
+    return 0
+
+
+def _exportar(args) -> int:
+    from dao.exportacion import ARRAYSIZE, TABLAS, exportar
+    if args.tabla not in TABLAS:
+        # Como choices= en argparse, sin cargar dao.exportacion al armar el parser
+        raise ErrorDeUso(f"export: tabla inválida: '{args.tabla}' (opciones: {', '.join(TABLAS)})")
+    try:
+        # Con "-" los datos van a la salida real y no a stderr con los mensajes
+        with redirect_stdout(args.salida if args.archivo == "-" else sys.stdout):
+            resultado = exportar(args.tabla, args.archivo, formato=args.formato, comprimir=args.gzip or None,
+                                 desde=args.desde, hasta=args.hasta, estado=args.incremental,
+                                 arraysize=args.arraysize or ARRAYSIZE)
+    except BrokenPipeError:
+        # El programa que leía la salida (p. ej. head) terminó antes
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.__stdout__.fileno())
+        return 0
+    print(f"✓ {resultado.filas} fila(s) de {args.tabla} exportada(s) en {resultado.segundos:.2f} s "
+          f"({resultado.filas_por_segundo:,.0f} filas/s)")
+    return 0
+
+
+def _batch(args) -> int:
+    return ejecutar_lote(sys.stdin, args.salida, args.detener)
+
+
+# ---------------- Definición de comandos ----------------
+
+def _fecha(texto: str) -> date:
+    try:
+        return date.fromisoformat(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha inválida '{texto}' (use AAAA-MM-DD)")
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = _Parser(prog="main.py", description="Sistema de Gestión Veterinaria (sin argumentos: menú interactivo)")
+    entidades = parser.add_subparsers(dest="entidad_cmd", required=True, parser_class=_Parser)
+
+    def comando(grupo, nombre: str, funcion, ayuda: str, listado: bool = False):
+        sub = grupo.add_parser(nombre, help=ayuda)
+        sub.add_argument("--json", action="store_true", help="Un objeto JSON por línea")
+        if listado:
+            sub.add_argument("--limit", type=int, default=100, help="Máximo de filas (por defecto 100)")
+        sub.set_defaults(ejecutar=funcion)
+        return sub
+
+    clientes = entidades.add_parser("clientes", help="Clientes").add_subparsers(dest="accion", required=True)
+    comando(clientes, "list", _clientes_list, "Lista clientes", listado=True)
+    comando(clientes, "get", _clientes_get, "Muestra un cliente por ID").add_argument("id", type=int)
+    comando(clientes, "rut", _clientes_rut, "Busca un cliente por RUT").add_argument("rut")
+    crear = comando(clientes, "create", _clientes_create, "Crea un cliente")
+    crear.add_argument("--rut", required=True)
+    crear.add_argument("--nombres", required=True)
+    crear.add_argument("--apellidos", required=True)
+    crear.add_argument("--telefono")
+    crear.add_argument("--email")
+    crear.add_argument("--direccion")
+    comando(clientes, "delete", _clientes_delete, "Elimina un cliente").add_argument("id", type=int)
+
+    mascotas = entidades.add_parser("mascotas", help="Mascotas").add_subparsers(dest="accion", required=True)
+    comando(mascotas, "list", _mascotas_list, "Lista mascotas", listado=True).add_argument(
+        "--cliente", type=int, help="Sólo las de este id_cliente")
+    comando(mascotas, "get", _mascotas_get, "Muestra una mascota por ID").add_argument("id", type=int)
+    crear = comando(mascotas, "create", _mascotas_create, "Crea una mascota")
+    crear.add_argument("--nombre", required=True)
+    crear.add_argument("--especie", required=True)
+    crear.add_argument("--edad", type=int, required=True)
+    crear.add_argument("--cliente", type=int, required=True, help="id_cliente del dueño")
+    crear.add_argument("--raza")
+    crear.add_argument("--color")
+    crear.add_argument("--peso", type=float)
+    comando(mascotas, "delete", _mascotas_delete, "Elimina una mascota").add_argument("id", type=int)
+
+    vets = entidades.add_parser("veterinarios", help="Veterinarios").add_subparsers(dest="accion", required=True)
+    comando(vets, "list", _veterinarios_list, "Lista veterinarios", listado=True)
+    comando(vets, "get", _veterinarios_get, "Muestra un veterinario por ID").add_argument("id", type=int)
+    crear = comando(vets, "create", _veterinarios_create, "Crea un veterinario")
+    crear.add_argument("--nombre", required=True)
+    crear.add_argument("--apellido", required=True)
+    crear.add_argument("--especialidad")
+    crear.add_argument("--telefono")
+    crear.add_argument("--email")
+    comando(vets, "delete", _veterinarios_delete, "Elimina un veterinario").add_argument("id", type=int)
+
+    citas = entidades.add_parser("citas", help="Citas").add_subparsers(dest="accion", required=True)
+    listar = comando(citas, "list", _citas_list, "Lista citas con mascota, dueño y veterinario", listado=True)
+    listar.add_argument("--vet", type=int, help="id_veterinario")
+    listar.add_argument("--mascota", type=int, help="id_mascota")
+    listar.add_argument("--estado", choices=Cita.ESTADOS_VALIDOS)
+    listar.add_argument("--from", dest="desde", type=_fecha, help="Desde AAAA-MM-DD (inclusive)")
+    listar.add_argument("--to", dest="hasta", type=_fecha, help="Hasta AAAA-MM-DD (inclusive)")
+    comando(citas, "get", _citas_get, "Muestra una cita por ID").add_argument("id", type=int)
+    crear = comando(citas, "create", _citas_create, "Agenda una cita")
+    crear.add_argument("--mascota", type=int, required=True)
+    crear.add_argument("--vet", type=int, required=True)
+    crear.add_argument("--fecha", type=_fecha, required=True)
+    crear.add_argument("--hora", required=True, help="HH:MM")
+    crear.add_argument("--motivo")
+    crear.add_argument("--estado", choices=Cita.ESTADOS_VALIDOS, default=Cita.ESTADO_PENDIENTE)
+    estado = comando(citas, "estado", _citas_estado, "Cambia el estado de una cita")
+    estado.add_argument("id", type=int)
+    estado.add_argument("estado", choices=Cita.ESTADOS_VALIDOS)
+    estado.add_argument("--diagnostico")
+    comando(citas, "delete", _citas_delete, "Elimina una cita").add_argument("id", type=int)
+    libres = comando(citas, "libres", _citas_libres, "Próximos horarios libres de una especialidad")
+    libres.add_argument("especialidad")
+    libres.add_argument("--desde", type=_fecha)
+    libres.add_argument("--cantidad", type=int, default=5)
+
+    importacion = entidades.add_parser("import", help="Importa clientes, mascotas o citas desde CSV o JSONL")
+    importacion.add_argument("entidad", choices=("clientes", "mascotas", "citas"))
+    importacion.add_argument("archivo")
+    importacion.add_argument("--formato", choices=("csv", "jsonl"), help="Por defecto según la extensión")
+    importacion.add_argument("--lote", type=int, default=1000, help="Filas por lote (por defecto 1000)")
+    importacion.add_argument("--checkpoint", help="Archivo de avance para reanudar la importación")
+    importacion.add_argument("--rechazos", help="Archivo JSONL con las filas rechazadas")
+    importacion.set_defaults(ejecutar=_importar)
+
+    exportacion = entidades.add_parser("export", help="Exporta una tabla a CSV o JSONL")
+    exportacion.add_argument("tabla", help="cliente, mascota, veterinario, cita, empleado, proyecto o registro_tiempo")
+    exportacion.add_argument("archivo", help="Archivo de salida (.csv, .jsonl, con .gz opcional; - = stdout)")
+    exportacion.add_argument("--formato", choices=("csv", "jsonl"), help="Por defecto según la extensión")
+    exportacion.add_argument("--gzip", action="store_true", help="Comprimir (automático si termina en .gz)")
+    exportacion.add_argument("--desde", type=_fecha, help="Fecha inicial AAAA-MM-DD (inclusive)")
+    exportacion.add_argument("--hasta", type=_fecha, help="Fecha final AAAA-MM-DD (inclusive)")
+    exportacion.add_argument("--incremental", metavar="ESTADO",
+                             help="Archivo de estado: exporta sólo lo nuevo desde la exportación anterior")
+    exportacion.add_argument("--arraysize", type=int,
+                             help="Filas por viaje a la BD (por defecto ARRAYSIZE de dao/exportacion.py)")
+    exportacion.set_defaults(ejecutar=_exportar)
+
+    lote = entidades.add_parser("batch", help="Ejecuta un comando por línea leído desde la entrada estándar")
+    lote.add_argument("--detener", action="store_true", help="Detenerse en el primer comando con error")
+    lote.set_defaults(ejecutar=_batch)
+    return parser
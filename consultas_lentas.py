@@ -0,0 +1,172 @@
+"""
+Módulo: consultas_lentas.py
+Registro de consultas lentas en un archivo JSONL rotativo
+
+Se suscribe a las mediciones de instrumentacion.py: cada sentencia cuya
+ejecución más lectura supera el umbral se escribe como una línea JSON con
+su huella, los parámetros redactados, las filas y el desglose de tiempos.
+Opcionalmente incluye el plan de ejecución (EXPLAIN PLAN + DBMS_XPLAN en
+Oracle, EXPLAIN QUERY PLAN en SQLite), útil para encontrar recorridos
+completos por falta de índices.
+
+Parámetros: los números, fechas y nulos se registran tal cual (así se ve
+qué veterinario o mascota causó la lentitud); los textos se reemplazan por
+su largo, salvo los de BINDS_VISIBLES, que no son datos personales.
+
+Ejemplo:
+    import consultas_lentas
+    consultas_lentas.activar(umbral_ms=100, plan=True)
+"""
+
+import json
+import logging
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional
+import database
+import instrumentacion
+
+UMBRAL_MS = 200.0
+ARCHIVO = "consultas_lentas.jsonl"
+
+# Rotación: tamaño máximo por archivo y cantidad de archivos anteriores
+MAX_BYTES = 10 * 1024 * 1024
+RESPALDOS = 5
+
+# Parámetros de texto que se registran sin redactar
+BINDS_VISIBLES = frozenset({"estado", "especie"})
+
+# Planes recordados por huella: una consulta lenta repetida no vuelve a explicarse
+MAX_PLANES = 256
+
+_EXPLICABLES = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+_logger = logging.getLogger("veterinaria.consultas_lentas")
+_logger.propagate = False
+_logger.setLevel(logging.INFO)
+
+_umbral = UMBRAL_MS / 1000
+_capturar_plan = False
+_planes: Dict[str, List[str]] = {}
+_lock = threading.Lock()
+
+
+def activar(
+    umbral_ms: float = UMBRAL_MS,
+    archivo: str = ARCHIVO,
+    plan: bool = False,
+    max_bytes: int = MAX_BYTES,
+    respaldos: int = RESPALDOS
+):
+    """
+    Empieza a registrar las sentencias que superen el umbral.
+
+    Args:
+        umbral_ms: Milisegundos de ejecución más lectura a partir de los cuales
+            una sentencia se considera lenta
+        archivo: Archivo JSONL de salida
+        plan: Capturar el plan de ejecución de cada consulta lenta
+        max_bytes, respaldos: Rotación del archivo (archivo.1 ... archivo.N)
+    """
+    global _umbral, _capturar_plan
+    if umbral_ms < 0:
+        raise ValueError("El umbral debe ser mayor o igual a 0")
+    desactivar()
+    manejador = RotatingFileHandler(archivo, maxBytes=max_bytes, backupCount=respaldos,
+                                    encoding="utf-8", delay=True)
+    manejador.setFormatter(logging.Formatter("%(message)s"))
+    _logger.addHandler(manejador)
+    _umbral = umbral_ms / 1000
+    _capturar_plan = plan
+    instrumentacion.agregar_oyente(_revisar)
+
+
+def desactivar():
+    """Deja de registrar y cierra el archivo"""
+    instrumentacion.quitar_oyente(_revisar)
+    for manejador in list(_logger.handlers):
+        _logger.removeHandler(manejador)
+        manejador.close()
+    with _lock:
+        _planes.clear()
+
+
+def redactar(parametros: Any, lote: bool = False) -> Any:
+    """
+    Versión de los parámetros apta para el registro.
+
+    Args:
+        parametros: dict de parámetros nombrados, secuencia de posicionales
+            o, con `lote`, la lista de filas de un executemany
+    """
+    if lote:
+        filas = list(parametros or [])
+        return {"filas": len(filas), "primera": redactar(filas[0]) if filas else None}
+    if isinstance(parametros, dict):
+        return {nombre: _redactar_valor(nombre, valor) for nombre, valor in parametros.items()}
+    if isinstance(parametros, (list, tuple)):
+        return [_redactar_valor(None, valor) for valor in parametros]
+    return None if parametros is None else _redactar_valor(None, parametros)
+
+
+def _redactar_valor(nombre: Optional[str], valor: Any) -> Any:
+    if valor is None or isinstance(valor, (bool, int, float)):
+        return valor
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    if isinstance(valor, str):
+        return valor if nombre in BINDS_VISIBLES else f"<texto:{len(valor)}>"
+    if isinstance(valor, (bytes, bytearray)):
+        return f"<bytes:{len(valor)}>"
+    # Variables de salida del driver y otros objetos
+    return f"<{type(valor).__name__}>"
+
+
+def _revisar(medicion: instrumentacion.Medicion):
+    if medicion.total < _umbral:
+        return
+    huella = medicion.huella
+    registro = {
+        "fecha": datetime.now().isoformat(timespec="milliseconds"),
+        "id": instrumentacion.id_huella(huella),
+        "sentencia": huella,
+        "parametros": redactar(medicion.parametros, medicion.lote),
+        "filas": medicion.filas,
+        "ms": {
+            "adquisicion": None if medicion.adquisicion is None else round(medicion.adquisicion * 1000, 3),
+            "ejecucion": round(medicion.ejecucion * 1000, 3),
+            "lectura": round(medicion.lectura * 1000, 3),
+            "total": round(medicion.total * 1000, 3),
+        },
+    }
+    if medicion.error is not None:
+        registro["error"] = str(medicion.error)
+    elif _capturar_plan and medicion.sql.lstrip()[:6].upper().startswith(_EXPLICABLES):
+        registro.update(_plan(medicion, huella))
+    _logger.info(json.dumps(registro, ensure_ascii=False))
+
+
+def _plan(medicion: instrumentacion.Medicion, huella: str) -> dict:
+    with _lock:
+        plan = _planes.get(huella)
+    if plan is not None:
+        return {"plan": plan}
+    parametros = medicion.parametros
+    if medicion.lote:
+        parametros = parametros[0] if parametros else None
+    try:
+        # Cursor directo de la conexión del pool: no se mide ni se registra
+        with medicion.conexion.cursor() as cursor:
+            plan = database.backend().explicar(cursor, medicion.sql, parametros)
+    except Exception as e:
+        # Sin permisos sobre PLAN_TABLE, sentencias que no admiten EXPLAIN, etc.
+        return {"plan_error": str(e)}
+    with _lock:
+        if len(_planes) >= MAX_PLANES:
+            _planes.clear()
+        _planes[huella] = plan
+    return {"plan": plan}
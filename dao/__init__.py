@@ -1,7 +1,37 @@
-"""Paquete DAO del Sistema de Gestión Veterinaria"""
-from .cliente_dao import ClienteDAO
-from .mascota_dao import MascotaDAO
-from .veterinario_dao import VeterinarioDAO
-from .cita_dao import CitaDAO
+"""
+Paquete DAO del Sistema de Gestión Veterinaria
 
-__all__ = ["ClienteDAO", "MascotaDAO", "VeterinarioDAO", "CitaDAO"]
+Los módulos se importan la primera vez que se usa cada nombre (por ejemplo
+`from dao import ClienteDAO`), así un comando corto no paga la carga de
+los DAO que no necesita.
+"""
+import importlib
+
+_NOMBRES = {
+    "ClienteDAO": "dao.cliente_dao",
+    "MascotaDAO": "dao.mascota_dao",
+    "VeterinarioDAO": "dao.veterinario_dao",
+    "CitaDAO": "dao.cita_dao",
+    "ResultadoLote": "dao.lotes",
+    "activar_cache": "dao.cache",
+    "desactivar_cache": "dao.cache",
+    "estadisticas_cache": "dao.cache",
+    "unidad_de_trabajo": "dao.cache",
+}
+
+
+def __getattr__(nombre: str):
+    try:
+        modulo = _NOMBRES[nombre]
+    except KeyError:
+        raise AttributeError(f"module 'dao' has no attribute '{nombre}'")
+    valor = getattr(importlib.import_module(modulo), nombre)
+    globals()[nombre] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_NOMBRES))
+
+
+__all__ = list(_NOMBRES)
@@ -0,0 +1,137 @@
+"""
+Módulo: dao/agenda.py
+Agenda del día (o de la semana) materializada en memoria
+
+La agenda se carga con una sola consulta por rango de fechas para todos los
+veterinarios y luego se mantiene al día leyendo, sólo dentro de su rango,
+las citas cuya marca `modificado` es posterior a la última lectura y las
+bajas registradas en `cita_baja` (citas eliminadas o movidas a otro día,
+por cualquier programa; ver la migración 006).
+"""
+
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+import database
+from models.cita_detalle import CitaDetalle
+from dao.cita_dao import CitaDAO
+
+
+def _dia(fecha) -> date:
+    # Oracle retorna las columnas DATE como datetime
+    return fecha.date() if isinstance(fecha, datetime) else fecha
+
+
+class Agenda:
+    """
+    Citas de todos los veterinarios en un rango de días (thread-safe).
+
+    Args:
+        dias: Días a materializar desde la fecha inicial (1 = día, 7 = semana)
+    """
+
+    # Las marcas se comparan con este margen para no perder cambios de
+    # transacciones que confirmaron después de la lectura de la marca
+    MARGEN = timedelta(seconds=1)
+
+    def __init__(self, dias: int = 1):
+        if dias < 1:
+            raise ValueError("La agenda debe abarcar al menos un día")
+        self._dias = dias
+        self._desde: Optional[date] = None
+        self._seguir_hoy = True
+        self._citas: Dict[int, CitaDetalle] = {}
+        self._marca: Optional[datetime] = None
+        self._backend = None
+        self._lock = threading.Lock()
+        self.cargas = 0
+        self.refrescos = 0
+
+    @property
+    def desde(self) -> Optional[date]:
+        return self._desde
+
+    @property
+    def hasta(self) -> Optional[date]:
+        return self._desde + timedelta(days=self._dias - 1) if self._desde else None
+
+    @property
+    def dias(self) -> int:
+        return self._dias
+
+    def cargar(self, desde: Optional[date] = None, dias: Optional[int] = None):
+        """
+        Carga el rango completo con una consulta.
+
+        Args:
+            desde: Fecha inicial; None para seguir siempre el día de hoy
+            dias: Cambia la cantidad de días de la agenda
+        """
+        with self._lock:
+            if dias is not None:
+                if dias < 1:
+                    raise ValueError("La agenda debe abarcar al menos un día")
+                self._dias = dias
+            self._seguir_hoy = desde is None
+            self._cargar(desde or date.today())
+
+    def refrescar(self) -> int:
+        """
+        Trae los cambios desde la última lectura; retorna cuántas citas cambiaron.
+
+        Si la agenda no está cargada o cambió el día (en modo "hoy"), recarga
+        el rango completo.
+        """
+        with self._lock:
+            if (self._desde is None or self._backend is not database.backend()
+                    or (self._seguir_hoy and self._desde != date.today())):
+                self._cargar(date.today() if self._seguir_hoy or self._desde is None else self._desde)
+                return len(self._citas)
+
+            marca = CitaDAO.marca_cambios()
+            cambios = 0
+            # Con la misma marca también se relee: un cambio en el mismo
+            # milisegundo que la última lectura tiene la misma marca
+            if marca is not None and (self._marca is None or marca >= self._marca):
+                desde_marca = self._marca - self.MARGEN if self._marca else datetime.min
+                # Primero las bajas: una cita que salió del rango y volvió a
+                # entrar está además entre las modificadas, con sus datos actuales
+                bajas = CitaDAO.read_bajas(desde_marca, self._desde, self.hasta)
+                modificadas = CitaDAO.read_detalle_modificadas(desde_marca, self._desde, self.hasta)
+                anteriores = {id_cita: self._citas.pop(id_cita, None) for id_cita in bajas}
+                for cita in modificadas:
+                    anterior = anteriores.pop(cita.id_cita, None) or self._citas.get(cita.id_cita)
+                    if anterior is None or anterior.to_dict() != cita.to_dict():
+                        cambios += 1
+                    self._citas[cita.id_cita] = cita
+                # Las que salieron y no volvieron (lo releído por el margen no cuenta)
+                cambios += sum(1 for anterior in anteriores.values() if anterior is not None)
+                self._marca = marca
+            self.refrescos += 1
+            return cambios
+
+    def citas(self) -> List[CitaDetalle]:
+        """Citas de la agenda ordenadas por fecha y hora"""
+        with self._lock:
+            return sorted(self._citas.values(), key=lambda c: (_dia(c.fecha), c.hora, c.id_veterinario))
+
+    def por_veterinario(self) -> Dict[int, List[CitaDetalle]]:
+        """Citas de la agenda agrupadas por id_veterinario, cada grupo ordenado por fecha y hora"""
+        agrupadas: Dict[int, List[CitaDetalle]] = {}
+        for cita in self.citas():
+            agrupadas.setdefault(cita.id_veterinario, []).append(cita)
+        return agrupadas
+
+    def _cargar(self, desde: date):
+        # La marca se lee antes que las citas: un cambio que ocurra durante la
+        # carga vuelve a leerse en el siguiente refresco
+        self._backend = database.backend()
+        self._marca = CitaDAO.marca_cambios()
+        hasta = desde + timedelta(days=self._dias - 1)
+        self._citas = {cita.id_cita: cita for cita in CitaDAO.read_detalle_by_rango(desde, hasta)}
+        self._desde = desde
+        self.cargas += 1
+
+
+# Agenda compartida por los menús del proceso
+agenda = Agenda()
@@ -0,0 +1,214 @@
+"""
+Módulo: dao/cache.py
+Caché opcional de entidades de referencia para los DAO
+
+Dos niveles, ambos aplicados con el decorador @en_cache sobre read_by_id:
+
+- Caché LRU con TTL por entidad (opt-in con activar_cache()): evita volver a
+  la BD por filas que cambian poco, como veterinarios o departamentos.
+  Guarda copias, de modo que modificar un objeto leído no altera la caché.
+- Mapa de identidad dentro de una unidad de trabajo (with unidad_de_trabajo()):
+  el mismo ID retorna el mismo objeto mientras dure el bloque.
+
+Los update/delete decorados con @invalida_cache descartan la entrada afectada
+(y, si corresponde, las entidades borradas en cascada).
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+_AUSENTE = object()
+
+
+class CacheLRU:
+    """
+    Caché LRU acotada con expiración por tiempo (thread-safe).
+
+    Args:
+        capacidad: Máximo de entradas; al superarlo se desaloja la menos usada
+        ttl: Segundos de validez de cada entrada (0 = sin expiración)
+    """
+
+    def __init__(self, capacidad: int = 1000, ttl: float = 300.0, reloj: Callable[[], float] = time.monotonic):
+        if capacidad < 1:
+            raise ValueError("La capacidad de la caché debe ser mayor a 0")
+        self._capacidad = capacidad
+        self._ttl = ttl
+        self._reloj = reloj
+        self._entradas: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.expirados = 0
+        self.invalidaciones = 0
+
+    def obtener(self, clave: Any) -> Any:
+        """Retorna el valor guardado o _AUSENTE si no está o expiró"""
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return _AUSENTE
+            valor, vence = entrada
+            if self._ttl and self._reloj() >= vence:
+                del self._entradas[clave]
+                self.expirados += 1
+                self.fallos += 1
+                return _AUSENTE
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+
+    def guardar(self, clave: Any, valor: Any):
+        with self._lock:
+            self._entradas[clave] = (valor, self._reloj() + self._ttl)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self._capacidad:
+                self._entradas.popitem(last=False)
+                self.desalojos += 1
+
+    def invalidar(self, clave: Any):
+        with self._lock:
+            if self._entradas.pop(clave, None) is not None:
+                self.invalidaciones += 1
+
+    def limpiar(self):
+        with self._lock:
+            self.invalidaciones += len(self._entradas)
+            self._entradas.clear()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def estadisticas(self) -> dict:
+        consultas = self.aciertos + self.fallos
+        return {
+            "entradas": len(self._entradas), "capacidad": self._capacidad, "ttl": self._ttl,
+            "aciertos": self.aciertos, "fallos": self.fallos, "desalojos": self.desalojos,
+            "expirados": self.expirados, "invalidaciones": self.invalidaciones,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0
+        }
+
+
+# Cachés LRU activas por entidad (sólo las activadas con activar_cache)
+_caches: Dict[str, CacheLRU] = {}
+
+# Mapa de identidad de la unidad de trabajo en curso: {(entidad, id): objeto}
+_identidades: ContextVar[Optional[dict]] = ContextVar("identidades", default=None)
+
+
+def activar_cache(*entidades: str, capacidad: int = 1000, ttl: float = 300.0):
+    """
+    Activa la caché LRU para las entidades indicadas.
+
+    Args:
+        *entidades: "cliente", "mascota", "veterinario", "departamento"
+        capacidad: Máximo de objetos por entidad
+        ttl: Segundos de validez de cada objeto
+    """
+    for entidad in entidades:
+        _caches[entidad] = CacheLRU(capacidad, ttl)
+
+
+def desactivar_cache(*entidades: str):
+    """Desactiva la caché de las entidades indicadas (o de todas si no se indica)"""
+    for entidad in entidades or list(_caches):
+        _caches.pop(entidad, None)
+
+
+def obtener_cache(entidad: str) -> Optional[CacheLRU]:
+    return _caches.get(entidad)
+
+
+def estadisticas_cache() -> Dict[str, dict]:
+    """Contadores de aciertos, fallos y desalojos por entidad, para ajustar tamaño y TTL"""
+    return {entidad: cache.estadisticas() for entidad, cache in _caches.items()}
+
+
+@contextmanager
+def unidad_de_trabajo():
+    """
+    Bloque dentro del cual read_by_id retorna el mismo objeto para el mismo ID.
+
+    Ejemplo:
+        with unidad_de_trabajo():
+            a = VeterinarioDAO.read_by_id(1)
+            b = VeterinarioDAO.read_by_id(1)
+            assert a is b
+    """
+    token = _identidades.set({})
+    try:
+        yield
+    finally:
+        _identidades.reset(token)
+
+
+def en_cache(entidad: str):
+    """Decorador para read_by_id(id): consulta el mapa de identidad y la caché LRU"""
+    def decorador(leer: Callable) -> Callable:
+        @wraps(leer)
+        def envoltura(id_objeto):
+            identidades = _identidades.get()
+            if identidades is not None:
+                objeto = identidades.get((entidad, id_objeto))
+                if objeto is not None:
+                    return objeto
+
+            cache = _caches.get(entidad)
+            objeto = cache.obtener(id_objeto) if cache is not None else _AUSENTE
+            if objeto is not _AUSENTE:
+                objeto = copy.copy(objeto)
+            else:
+                objeto = leer(id_objeto)
+                # Las búsquedas sin resultado no se guardan: un create posterior
+                # debe ser visible de inmediato
+                if objeto is not None and cache is not None:
+                    cache.guardar(id_objeto, copy.copy(objeto))
+
+            if objeto is not None and identidades is not None:
+                identidades[(entidad, id_objeto)] = objeto
+            return objeto
+        return envoltura
+    return decorador
+
+
+def invalida_cache(entidad: str, clave: Callable[[Any], Any], en_cascada: tuple = (), elimina: bool = False):
+    """
+    Decorador para update/delete: descarta la entrada afectada de la caché.
+
+    Args:
+        entidad: Entidad cuya caché se invalida
+        clave: Obtiene el ID a partir del argumento del método
+        en_cascada: Entidades cuyas cachés se vacían por completo porque el
+            ON DELETE CASCADE de la BD puede haber borrado filas suyas
+        elimina: True para delete: también se quita del mapa de identidad
+    """
+    def decorador(modificar: Callable) -> Callable:
+        @wraps(modificar)
+        def envoltura(argumento):
+            try:
+                return modificar(argumento)
+            finally:
+                id_objeto = clave(argumento)
+                cache = _caches.get(entidad)
+                if cache is not None:
+                    cache.invalidar(id_objeto)
+                for dependiente in en_cascada:
+                    cache_dependiente = _caches.get(dependiente)
+                    if cache_dependiente is not None:
+                        cache_dependiente.limpiar()
+                identidades = _identidades.get()
+                if identidades is not None and elimina:
+                    identidades.pop((entidad, id_objeto), None)
+                    for dependiente in en_cascada:
+                        for llave in [k for k in identidades if k[0] == dependiente]:
+                            del identidades[llave]
+        return envoltura
+    return decorador
@@ -1,26 +1,151 @@
 """DAO para Cita"""
-import oracledb
-from typing import List, Optional
-from datetime import datetime
+import database
+import eventos
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional
+from bisect import bisect_left, insort
+from datetime import date, datetime, time, timedelta
 from models.cita import Cita
+from models.cita_detalle import CitaDetalle
 from database import get_connection
+from dao.lotes import ResultadoLote, insertar_en_lotes
+from dao.secuencias import asignador
+from dao.cursores import MAX_IDS_POR_CONSULTA, iterar_filas, leer_por_ids, lista_in
+from dao.disponibilidad import disponibilidad
+
+if TYPE_CHECKING:
+    from models.cita_batch import CitaBatch
 
 class CitaDAO:
+    _SQL_INSERT = "INSERT INTO cita (id_cita, id_mascota, id_veterinario, fecha, hora, ts, motivo, estado, diagnostico) VALUES (:id, :id_mascota, :id_vet, :fecha, :hora, :ts, :motivo, :estado, :diagnostico)"
+    
     @staticmethod
     def create(cita: Cita) -> bool:
-        sql = "INSERT INTO cita (id_cita, id_mascota, id_veterinario, fecha, hora, motivo, estado, diagnostico) VALUES (:id, :id_mascota, :id_vet, :fecha, :hora, :motivo, :estado, :diagnostico)"
+        sql = CitaDAO._SQL_INSERT
         try:
+            if CitaDAO._horario_ocupado(cita):
+                return False
             with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(sql, {"id": cita.id_cita, "id_mascota": cita.id_mascota, "id_vet": cita.id_veterinario, "fecha": cita.fecha, "hora": cita.hora, "motivo": cita.motivo, "estado": cita.estado, "diagnostico": cita.diagnostico})
+                    if CitaDAO._cruce_en_bd(cursor, cita):
+                        conn.rollback()
+                        return False
+                    try:
+                        cursor.execute(sql, CitaDAO._parametros(cita))
+                    except database.IntegrityError as e:
+                        if not CitaDAO._horario_tomado(cursor, e, cita):
+                            raise
+                        conn.rollback()
+                        return False
                     conn.commit()
-                    print(f"✓ Cita creada exitosamente.")
+                    disponibilidad.registrar(cita)
+                    eventos.info("cita.creado", "Cita creada exitosamente.")
                     return True
-        except oracledb.IntegrityError:
-            print(f"✗ Error: La mascota o veterinario no existen.")
+        except database.IntegrityError as e:
+            CitaDAO._avisar_integridad(e)
             return False
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.DatabaseError as e:
+            eventos.error("cita.error_bd", "Error: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def create_many(citas: Iterable[Cita], batch_size: int = 1000) -> ResultadoLote:
+        sql = CitaDAO._SQL_INSERT
+        try:
+            resultado = insertar_en_lotes(sql, citas, CitaDAO._parametros, batch_size)
+            disponibilidad.olvidar()
+            eventos.info("cita.lote_insertado", "{insertados} cita(s) insertado(s) en {lotes} lote(s).", insertados=resultado.insertados, lotes=resultado.lotes)
+            if resultado.errores:
+                eventos.aviso("cita.lote_rechazos", "{rechazadas} fila(s) rechazada(s).", rechazadas=len(resultado.errores))
+            return resultado
+        except database.DatabaseError as e:
+            eventos.error("cita.error_bd", "Error: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def create_programadas(citas: Iterable[Cita], batch_size: int = 1000) -> ResultadoLote:
+        """
+        Inserta una serie de citas (p. ej. de Recurrencia.expandir) en una transacción.
+        
+        Los horarios se verifican con una sola consulta por rango contra las
+        citas existentes de los veterinarios involucrados, en la misma
+        transacción del INSERT y con sus agendas bloqueadas; las citas que
+        chocan (con la BD o entre sí) se informan en `errores` y no se
+        insertan. Los IDs se reservan en bloque y las filas libres se insertan
+        con array binding; si la BD rechaza alguna, no se inserta ninguna.
+        
+        Returns:
+            ResultadoLote: `errores` indica la posición de cada cita rechazada
+        """
+        citas = list(citas)
+        resultado = ResultadoLote()
+        try:
+            # Los IDs se reservan antes de bloquear (la secuencia avanza en otra
+            # conexión); los de las citas que chocan quedan sin usar
+            ids = asignador.reservar("seq_cita", len(citas)) if citas else []
+            motor = database.backend()
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    # En orden, para que dos series con veterinarios en común no se bloqueen mutuamente
+                    for id_vet in sorted({cita.id_veterinario for cita in citas if cita.estado != Cita.ESTADO_CANCELADA}):
+                        motor.bloquear_veterinario(cursor, id_vet)
+                    choques = CitaDAO._choques(cursor, citas)
+                    posiciones = [pos for pos in range(len(citas)) if pos not in choques]
+                    libres = [citas[pos] for pos in posiciones]
+                    for cita, id_cita in zip(libres, ids):
+                        cita.id_cita = id_cita
+                    insercion = insertar_en_lotes(CitaDAO._SQL_INSERT, libres, CitaDAO._parametros, batch_size,
+                                                  cursor=cursor)
+                    if insercion.errores or not libres:
+                        conn.rollback()
+                    else:
+                        conn.commit()
+            if libres:
+                disponibilidad.olvidar()
+                resultado.insertados = 0 if insercion.errores else insercion.insertados
+                resultado.lotes = insercion.lotes
+                resultado.errores.extend((posiciones[pos], msg) for pos, msg in insercion.errores)
+            resultado.errores.extend(choques.items())
+            resultado.errores.sort()
+            eventos.info("cita.serie_programada", "{insertados} cita(s) programada(s).", insertados=resultado.insertados)
+            if choques:
+                eventos.aviso("cita.horario_ocupado", "{cantidad} cita(s) con horario ocupado.", cantidad=len(choques))
+            if len(resultado.errores) > len(choques):
+                eventos.error("cita.serie_rechazada", "La BD rechazó {rechazadas} fila(s): no se insertó la serie.", rechazadas=len(resultado.errores) - len(choques))
+            return resultado
+        except database.DatabaseError as e:
+            eventos.error("cita.error_bd", "Error: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def create_returning_id(cita: Cita) -> int:
+        sql = CitaDAO._SQL_INSERT
+        try:
+            if CitaDAO._horario_ocupado(cita):
+                return -1
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    if CitaDAO._cruce_en_bd(cursor, cita):
+                        conn.rollback()
+                        return -1
+                    try:
+                        nuevo_id = database.backend().insertar_retornando_id(
+                            cursor, sql, CitaDAO._parametros(cita), "id", "seq_cita", "id_cita"
+                        )
+                    except database.IntegrityError as e:
+                        if not CitaDAO._horario_tomado(cursor, e, cita):
+                            raise
+                        conn.rollback()
+                        return -1
+                    conn.commit()
+                    cita.id_cita = nuevo_id
+                    disponibilidad.registrar(cita)
+                    eventos.info("cita.creado", "Cita creada exitosamente.")
+                    return nuevo_id
+        except database.IntegrityError as e:
+            CitaDAO._avisar_integridad(e)
+            return -1
+        except database.DatabaseError as e:
+            eventos.error("cita.error_bd", "Error: {error}", error=e)
             raise
     
     @staticmethod
@@ -32,78 +157,272 @@ class CitaDAO:
                     cursor.execute(sql, {"id": id_cita})
                     row = cursor.fetchone()
                     if not row:
-                        print(f"✗ No se encontró cita con ID {id_cita}")
+                        eventos.aviso("cita.no_encontrado", "No se encontró cita con ID {id_cita}", id_cita=id_cita)
                         return None
-                    id_c, id_m, id_v, fecha, hora, motivo, estado, diag = row
-                    return Cita(id_c, id_m, id_v, fecha, hora, motivo, estado, diag)
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+                    return Cita.from_row(row)
+        except database.DatabaseError as e:
+            eventos.error("cita.error_bd", "Error: {error}", error=e)
             raise
     
+    @staticmethod
+    def read_by_ids(ids: Iterable[int]) -> Dict[int, Optional[Cita]]:
+        return leer_por_ids("cita", "id_cita", ids, Cita.from_row)
+    
     @staticmethod
     def read_all(limit: int = 100) -> List[Cita]:
-        sql = f"SELECT * FROM cita FETCH FIRST {limit} ROWS ONLY"
+        sql = database.backend().limitar("SELECT * FROM cita", limit)
         citas = []
         try:
             with get_connection() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute(sql)
                     for row in cursor:
-                        id_c, id_m, id_v, fecha, hora, motivo, estado, diag = row
-                        citas.append(Cita(id_c, id_m, id_v, fecha, hora, motivo, estado, diag))
-                    print(f"✓ Se encontraron {len(citas)} cita(s).")
+                        citas.append(Cita.from_row(row))
+                    eventos.info("cita.listado", "Se encontraron {cantidad} cita(s).", cantidad=len(citas))
                     return citas
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.DatabaseError as e:
+            eventos.error("cita.error_bd", "Error: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def iter_all(arraysize: Optional[int] = None) -> Iterator[Cita]:
+        sql = "SELECT * FROM cita ORDER BY id_cita"
+        return (Cita.from_row(row) for row in iterar_filas(sql, None, arraysize))
+    
+    @staticmethod
+    def read_batch(desde: Optional[date] = None, hasta: Optional[date] = None, id_vet: Optional[int] = None,
+                   arraysize: Optional[int] = None) -> "CitaBatch":
+        """
+        Historial de citas en formato columnar (CitaBatch) para análisis.
+        
+        Las filas pasan del cursor a las columnas por bloques de `arraysize`
+        sin crear objetos Cita. Fechas inclusive; sin filtros trae todas.
+        """
+        # Se importa aquí: CitaBatch carga NumPy (si está instalado) y no hace
+        # falta pagar ese costo al iniciar la aplicación
+        from models.cita_batch import CitaBatch
+        condiciones, parametros = [], {}
+        if id_vet is not None:
+            condiciones.append("id_veterinario = :id_vet")
+            parametros["id_vet"] = id_vet
+        if desde is not None:
+            condiciones.append("ts >= :desde")
+            parametros["desde"] = datetime.combine(desde, time.min)
+        if hasta is not None:
+            condiciones.append("ts < :hasta")
+            parametros["hasta"] = datetime.combine(hasta + timedelta(days=1), time.min)
+        sql = f"SELECT {CitaBatch.COLUMNAS_SQL} FROM cita"
+        if condiciones:
+            sql += " WHERE " + " AND ".join(condiciones)
+        lote = CitaBatch()
+        lote.agregar_filas(iterar_filas(sql, parametros, arraysize))
+        return lote
+    
+    @staticmethod
+    def read_page(after_fecha: Optional[date] = None, after_id: int = 0, page_size: int = 20) -> List[Cita]:
+        # Paginación por clave (fecha, id_cita): la página siguiente empieza
+        # después de la última cita vista, sin recorrer las páginas anteriores.
+        if after_fecha is None:
+            sql = "SELECT * FROM cita ORDER BY fecha, id_cita"
+            parametros = {}
+        else:
+            sql = "SELECT * FROM cita WHERE fecha >= :fecha AND (fecha > :fecha OR id_cita > :id) ORDER BY fecha, id_cita"
+            parametros = {"fecha": after_fecha, "id": after_id}
+        sql = database.backend().limitar(sql, page_size)
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql, parametros)
+                    return [Cita.from_row(row) for row in cursor]
+        except database.DatabaseError as e:
+            eventos.error("cita.error_bd", "Error: {error}", error=e)
             raise
     
     @staticmethod
     def read_by_mascota(id_mascota: int) -> List[Cita]:
-        sql = "SELECT * FROM cita WHERE id_mascota = :id ORDER BY fecha DESC"
+        sql = "SELECT * FROM cita WHERE id_mascota = :id ORDER BY ts DESC"
         citas = []
         try:
             with get_connection() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute(sql, {"id": id_mascota})
                     for row in cursor:
-                        id_c, id_m, id_v, fecha, hora, motivo, estado, diag = row
-                        citas.append(Cita(id_c, id_m, id_v, fecha, hora, motivo, estado, diag))
+                        citas.append(Cita.from_row(row))
                     return citas
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.DatabaseError as e:
+            eventos.error("cita.error_bd", "Error: {error}", error=e)
             raise
     
+    @staticmethod
+    def iter_by_mascota(id_mascota: int, arraysize: Optional[int] = None) -> Iterator[Cita]:
+        sql = "SELECT * FROM cita WHERE id_mascota = :id ORDER BY ts DESC"
+        return (Cita.from_row(row) for row in iterar_filas(sql, {"id": id_mascota}, arraysize))
+    
     @staticmethod
     def read_by_veterinario(id_vet: int) -> List[Cita]:
-        sql = "SELECT * FROM cita WHERE id_veterinario = :id ORDER BY fecha DESC"
+        sql = "SELECT * FROM cita WHERE id_veterinario = :id ORDER BY ts DESC"
         citas = []
         try:
             with get_connection() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute(sql, {"id": id_vet})
                     for row in cursor:
-                        id_c, id_m, id_v, fecha, hora, motivo, estado, diag = row
-                        citas.append(Cita(id_c, id_m, id_v, fecha, hora, motivo, estado, diag))
+                        citas.append(Cita.from_row(row))
                     return citas
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.DatabaseError as e:
+            eventos.error("cita.error_bd", "Error: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def iter_by_veterinario(id_vet: int, arraysize: Optional[int] = None) -> Iterator[Cita]:
+        sql = "SELECT * FROM cita WHERE id_veterinario = :id ORDER BY ts DESC"
+        return (Cita.from_row(row) for row in iterar_filas(sql, {"id": id_vet}, arraysize))
+    
+    _SQL_DETALLE = (
+        "SELECT c.id_cita, c.fecha, c.hora, c.motivo, c.estado, c.diagnostico, "
+        "m.id_mascota, m.nombre, m.especie, "
+        "cl.id_cliente, cl.nombres, cl.apellidos, cl.telefono, "
+        "v.id_veterinario, v.nombre, v.apellido, v.especialidad "
+        "FROM cita c "
+        "JOIN mascota m ON m.id_mascota = c.id_mascota "
+        "JOIN cliente cl ON cl.id_cliente = m.id_cliente "
+        "JOIN veterinario v ON v.id_veterinario = c.id_veterinario"
+    )
+    
+    @staticmethod
+    def read_detalle(id_cita: int) -> Optional[CitaDetalle]:
+        detalles = CitaDAO._consultar_detalle(["c.id_cita = :id"], {"id": id_cita})
+        if not detalles:
+            eventos.aviso("cita.no_encontrado", "No se encontró cita con ID {id_cita}", id_cita=id_cita)
+            return None
+        return detalles[0]
+    
+    @staticmethod
+    def read_detalle_by_mascota(id_mascota: int, desde: Optional[date] = None, hasta: Optional[date] = None) -> List[CitaDetalle]:
+        return CitaDAO._consultar_detalle(["c.id_mascota = :id"], {"id": id_mascota}, desde, hasta, "c.ts DESC")
+    
+    @staticmethod
+    def read_detalle_by_veterinario(id_vet: int, desde: Optional[date] = None, hasta: Optional[date] = None) -> List[CitaDetalle]:
+        return CitaDAO._consultar_detalle(["c.id_veterinario = :id"], {"id": id_vet}, desde, hasta, "c.ts DESC")
+    
+    @staticmethod
+    def read_detalle_by_rango(desde: date, hasta: date) -> List[CitaDetalle]:
+        """Agenda de todos los veterinarios entre dos fechas (inclusive)"""
+        return CitaDAO._consultar_detalle([], {}, desde, hasta, "c.fecha, c.id_veterinario, c.ts")
+    
+    @staticmethod
+    def read_detalle_filtrado(id_vet: Optional[int] = None, id_mascota: Optional[int] = None, estado: Optional[str] = None,
+                              desde: Optional[date] = None, hasta: Optional[date] = None) -> List[CitaDetalle]:
+        """Citas que cumplen todos los filtros dados, de la más reciente a la más antigua"""
+        condiciones, parametros = [], {}
+        for columna, valor in (("c.id_veterinario", id_vet), ("c.id_mascota", id_mascota), ("c.estado", estado)):
+            if valor is not None:
+                nombre = columna.split(".")[1]
+                condiciones.append(f"{columna} = :{nombre}")
+                parametros[nombre] = valor
+        return CitaDAO._consultar_detalle(condiciones, parametros, desde, hasta, "c.ts DESC")
+    
+    @staticmethod
+    def read_detalle_modificadas(marca: datetime, desde: Optional[date] = None, hasta: Optional[date] = None) -> List[CitaDetalle]:
+        """Citas insertadas o actualizadas desde `marca` (columna modificado), opcionalmente en un rango de fechas"""
+        return CitaDAO._consultar_detalle(["c.modificado >= :marca"], {"marca": marca}, desde, hasta)
+    
+    @staticmethod
+    def read_bajas(marca: datetime, desde: date, hasta: date) -> List[int]:
+        """
+        IDs de las citas que desde `marca` se eliminaron o se movieron a
+        otro día, y cuya fecha anterior está entre `desde` y `hasta` (inclusive).
+        """
+        sql = "SELECT id_cita FROM cita_baja WHERE momento >= :marca AND fecha >= :desde AND fecha < :hasta"
+        # fecha es DATE: límite exclusivo en el día siguiente, por si Oracle guarda hora
+        parametros = {"marca": marca, "desde": desde, "hasta": hasta + timedelta(days=1)}
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql, parametros)
+                    return [fila[0] for fila in cursor]
+        except database.DatabaseError as e:
+            eventos.error("cita.error_bd", "Error: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def marca_cambios() -> Optional[datetime]:
+        """Último cambio de citas: modificado más reciente o última baja (None si no hay)"""
+        motor = database.backend()
+        consultas = (motor.limitar("SELECT modificado FROM cita ORDER BY modificado DESC", 1),
+                     motor.limitar("SELECT momento FROM cita_baja ORDER BY momento DESC", 1))
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    marcas = []
+                    for sql in consultas:
+                        cursor.execute(sql)
+                        row = cursor.fetchone()
+                        if row and row[0] is not None:
+                            marcas.append(row[0])
+                    return max(marcas) if marcas else None
+        except database.DatabaseError as e:
+            eventos.error("cita.error_bd", "Error: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def _consultar_detalle(condiciones: list, parametros: dict, desde: Optional[date] = None,
+                           hasta: Optional[date] = None, orden: str = "c.id_cita") -> List[CitaDetalle]:
+        # Una sola consulta con JOIN entrega mascota, dueño y veterinario
+        condiciones = list(condiciones)
+        parametros = dict(parametros)
+        # Los rangos se aplican sobre ts para que, junto a id_veterinario,
+        # se resuelvan con un rango del índice ix_cita_vet_ts
+        if desde is not None:
+            condiciones.append("c.ts >= :desde")
+            parametros["desde"] = datetime.combine(desde, time.min)
+        if hasta is not None:
+            # Límite exclusivo al inicio del día siguiente
+            condiciones.append("c.ts < :hasta")
+            parametros["hasta"] = datetime.combine(hasta + timedelta(days=1), time.min)
+        sql = CitaDAO._SQL_DETALLE
+        if condiciones:
+            sql += " WHERE " + " AND ".join(condiciones)
+        sql += f" ORDER BY {orden}"
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql, parametros)
+                    return [CitaDetalle(*row) for row in cursor]
+        except database.DatabaseError as e:
+            eventos.error("cita.error_bd", "Error: {error}", error=e)
             raise
     
     @staticmethod
     def update(cita: Cita) -> bool:
-        sql = "UPDATE cita SET id_mascota=:id_mascota, id_veterinario=:id_vet, fecha=:fecha, hora=:hora, motivo=:motivo, estado=:estado, diagnostico=:diagnostico WHERE id_cita=:id"
+        sql = f"UPDATE cita SET id_mascota=:id_mascota, id_veterinario=:id_vet, fecha=:fecha, hora=:hora, ts=:ts, motivo=:motivo, estado=:estado, diagnostico=:diagnostico, modificado={database.backend().sql_ahora} WHERE id_cita=:id"
         try:
+            if CitaDAO._horario_ocupado(cita, excluir=cita.id_cita):
+                return False
             with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(sql, {"id_mascota": cita.id_mascota, "id_vet": cita.id_veterinario, "fecha": cita.fecha, "hora": cita.hora, "motivo": cita.motivo, "estado": cita.estado, "diagnostico": cita.diagnostico, "id": cita.id_cita})
+                    if CitaDAO._cruce_en_bd(cursor, cita):
+                        conn.rollback()
+                        return False
+                    try:
+                        cursor.execute(sql, CitaDAO._parametros(cita))
+                    except database.IntegrityError as e:
+                        if not CitaDAO._horario_tomado(cursor, e, cita):
+                            raise
+                        conn.rollback()
+                        return False
                     if cursor.rowcount == 0:
-                        print(f"✗ No se encontró cita con ID {cita.id_cita}")
+                        eventos.aviso("cita.no_encontrado", "No se encontró cita con ID {id_cita}", id_cita=cita.id_cita)
                         return False
                     conn.commit()
-                    print(f"✓ Cita ID {cita.id_cita} actualizada.")
+                    disponibilidad.registrar(cita)
+                    eventos.info("cita.actualizado", "Cita ID {id_cita} actualizada.", id_cita=cita.id_cita)
                     return True
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.IntegrityError as e:
+            CitaDAO._avisar_integridad(e)
+            return False
+        except database.DatabaseError as e:
+            eventos.error("cita.error_bd", "Error: {error}", error=e)
             raise
     
     @staticmethod
@@ -114,23 +433,117 @@ class CitaDAO:
                 with conn.cursor() as cursor:
                     cursor.execute(sql, {"id": id_cita})
                     if cursor.rowcount == 0:
-                        print(f"✗ No se encontró cita con ID {id_cita}")
+                        eventos.aviso("cita.no_encontrado", "No se encontró cita con ID {id_cita}", id_cita=id_cita)
                         return False
                     conn.commit()
-                    print(f"✓ Cita ID {id_cita} eliminada.")
+                    disponibilidad.quitar(id_cita)
+                    eventos.info("cita.eliminado", "Cita ID {id_cita} eliminada.", id_cita=id_cita)
                     return True
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.DatabaseError as e:
+            eventos.error("cita.error_bd", "Error: {error}", error=e)
             raise
     
     @staticmethod
     def create_with_sequence() -> int:
-        sql = "SELECT seq_cita.NEXTVAL FROM DUAL"
         try:
-            with get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute(sql)
-                    return cursor.fetchone()[0]
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+            return asignador.siguiente("seq_cita")
+        except database.DatabaseError as e:
+            eventos.error("cita.error_bd", "Error: {error}", error=e)
             return -1
+    
+    @staticmethod
+    def proximos_libres(especialidad: str, desde: Optional[date] = None, cantidad: int = 5) -> List[tuple]:
+        """Primeros horarios libres (fecha, hora, id_veterinario) para una especialidad"""
+        try:
+            return disponibilidad.proximos_libres(especialidad, desde or date.today(), cantidad)
+        except database.DatabaseError as e:
+            eventos.error("cita.error_bd", "Error: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def _choques(cursor, citas: List[Cita]) -> Dict[int, str]:
+        # Posición -> motivo de cada cita que se cruza con otra (en la BD o en la misma serie)
+        activas = [(pos, cita) for pos, cita in enumerate(citas) if cita.estado != Cita.ESTADO_CANCELADA]
+        if not activas:
+            return {}
+        duracion = timedelta(minutes=disponibilidad.duracion)
+        origen = datetime(2000, 1, 1)
+        minuto = lambda ts: (ts - origen) // timedelta(minutes=1)
+        
+        ocupadas: Dict[int, List[int]] = {}
+        veterinarios = sorted({cita.id_veterinario for _, cita in activas})
+        rango = {"desde": min(c.ts for _, c in activas) - duracion, "hasta": max(c.ts for _, c in activas) + duracion}
+        for inicio in range(0, len(veterinarios), MAX_IDS_POR_CONSULTA):
+            marcadores, parametros = lista_in(veterinarios[inicio:inicio + MAX_IDS_POR_CONSULTA], "vet")
+            sql = (f"SELECT id_veterinario, ts FROM cita WHERE estado <> 'CANCELADA' "
+                   f"AND id_veterinario IN ({marcadores}) AND ts > :desde AND ts < :hasta")
+            cursor.execute(sql, {**parametros, **rango})
+            for id_vet, ts in cursor.fetchall():
+                ocupadas.setdefault(id_vet, []).append(minuto(ts))
+        for lista in ocupadas.values():
+            lista.sort()
+        
+        choques = {}
+        for pos, cita in sorted(activas, key=lambda par: par[1].ts):
+            lista = ocupadas.setdefault(cita.id_veterinario, [])
+            inicio = minuto(cita.ts)
+            i = bisect_left(lista, inicio - disponibilidad.duracion + 1)
+            if i < len(lista) and lista[i] < inicio + disponibilidad.duracion:
+                choques[pos] = f"Horario ocupado: veterinario {cita.id_veterinario} el {cita.fecha} a las {cita.hora}"
+            else:
+                insort(lista, inicio)
+        return choques
+    
+    _SQL_CRUCE = ("SELECT COUNT(*) FROM cita WHERE id_veterinario = :id_vet AND estado <> 'CANCELADA' "
+                  "AND ts > :desde AND ts < :hasta AND id_cita <> :id")
+    
+    @staticmethod
+    def _cruce_en_bd(cursor, cita: Cita) -> bool:
+        # La misma verificación que el índice en memoria, pero en la transacción
+        # del INSERT/UPDATE y con la agenda del veterinario bloqueada hasta el
+        # commit: de dos reservas concurrentes que se cruzan, sólo pasa una
+        if cita.estado == Cita.ESTADO_CANCELADA:
+            return False
+        database.backend().bloquear_veterinario(cursor, cita.id_veterinario)
+        duracion = timedelta(minutes=disponibilidad.duracion)
+        cursor.execute(CitaDAO._SQL_CRUCE, {"id_vet": cita.id_veterinario, "desde": cita.ts - duracion,
+                                            "hasta": cita.ts + duracion, "id": cita.id_cita})
+        if cursor.fetchone()[0] == 0:
+            return False
+        # Lo reservó otro proceso: el día se relee la próxima vez que se consulte
+        disponibilidad.olvidar(cita.fecha)
+        CitaDAO._avisar_ocupado(cita)
+        return True
+    
+    @staticmethod
+    def _horario_ocupado(cita: Cita, excluir: Optional[int] = None) -> bool:
+        if cita.estado == Cita.ESTADO_CANCELADA:
+            return False
+        if disponibilidad.esta_libre(cita.id_veterinario, cita.fecha, cita.hora, excluir):
+            return False
+        CitaDAO._avisar_ocupado(cita)
+        return True
+    
+    @staticmethod
+    def _horario_tomado(cursor, error: Exception, cita: Cita) -> bool:
+        # Sólo uk_cita_vet_horario significa "horario ocupado" (una reserva de
+        # otro proceso con el mismo inicio); el resto (FK, CHECK) se informa tal cual
+        if not database.backend().viola_indice(cursor, error, "uk_cita_vet_horario"):
+            return False
+        disponibilidad.olvidar(cita.fecha)
+        CitaDAO._avisar_ocupado(cita)
+        return True
+    
+    @staticmethod
+    def _avisar_integridad(error: Exception):
+        eventos.error("cita.integridad", "Error: La mascota o veterinario no existen o hay un problema de integridad.\n   Detalles: {error}", error=error)
+    
+    @staticmethod
+    def _avisar_ocupado(cita: Cita):
+        eventos.aviso("cita.horario_ocupado", "Error: El veterinario {id_veterinario} ya tiene una cita el {fecha} a las {hora}.", id_veterinario=cita.id_veterinario, fecha=cita.fecha, hora=cita.hora)
+    
+    @staticmethod
+    def _parametros(cita: Cita) -> dict:
+        # Cita.hora ya viene normalizada ("9:00" -> "09:00"), de modo que el
+        # índice único uk_cita_vet_horario compara horarios equivalentes
+        return {"id": cita.id_cita, "id_mascota": cita.id_mascota, "id_vet": cita.id_veterinario, "fecha": cita.fecha, "hora": cita.hora, "ts": cita.ts, "motivo": cita.motivo, "estado": cita.estado, "diagnostico": cita.diagnostico}
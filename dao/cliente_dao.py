@@ -1,28 +1,77 @@
 """DAO para Cliente"""
-import oracledb
-from typing import List, Optional
+import database
+import eventos
+from typing import Dict, Iterable, Iterator, List, Optional
 from models.cliente import Cliente
+from models.rut import normalizar_rut, normalizar_rut_guardado
 from database import get_connection
+from dao.lotes import ResultadoLote, insertar_en_lotes
+from dao.secuencias import asignador
+from dao.cache import CacheLRU, en_cache, invalida_cache
+from dao.cursores import ids_por_clave, iterar_filas, leer_por_ids
 
 class ClienteDAO:
+    # Índice en memoria RUT -> id_cliente para las búsquedas de recepción.
+    # Puede quedar desactualizado tras un update/delete: read_by_rut verifica
+    # el RUT del cliente leído y descarta la entrada si ya no coincide.
+    _indice_rut = CacheLRU(capacidad=10000, ttl=0)
+    
+    _SQL_INSERT = "INSERT INTO cliente (id_cliente, rut, nombres, apellidos, telefono, email, direccion) VALUES (:id, :rut, :nombres, :apellidos, :telefono, :email, :direccion)"
+    
     @staticmethod
     def create(cliente: Cliente) -> bool:
-        sql = "INSERT INTO cliente (id_cliente, rut, nombres, apellidos, telefono, email, direccion) VALUES (:id, :rut, :nombres, :apellidos, :telefono, :email, :direccion)"
+        sql = ClienteDAO._SQL_INSERT
         try:
             with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(sql, {"id": cliente.id_cliente, "rut": cliente.rut, "nombres": cliente.nombres, "apellidos": cliente.apellidos, "telefono": cliente.telefono, "email": cliente.email, "direccion": cliente.direccion})
+                    cursor.execute(sql, ClienteDAO._parametros(cliente))
                     conn.commit()
-                    print(f"✓ Cliente '{cliente.obtener_nombre_completo()}' creado exitosamente.")
+                    ClienteDAO._indice_rut.guardar(normalizar_rut(cliente.rut), cliente.id_cliente)
+                    eventos.info("cliente.creado", "Cliente '{nombre}' creado exitosamente.", nombre=cliente.obtener_nombre_completo())
                     return True
-        except oracledb.IntegrityError as e:
-            print(f"✗ Error: El cliente ya existe.")
+        except database.IntegrityError as e:
+            eventos.error("cliente.integridad", "Error: El cliente ya existe.")
             return False
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error de base de datos: {e}")
+        except database.DatabaseError as e:
+            eventos.error("cliente.error_bd", "Error de base de datos: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def create_many(clientes: Iterable[Cliente], batch_size: int = 1000) -> ResultadoLote:
+        sql = ClienteDAO._SQL_INSERT
+        try:
+            resultado = insertar_en_lotes(sql, clientes, ClienteDAO._parametros, batch_size)
+            eventos.info("cliente.lote_insertado", "{insertados} cliente(s) insertado(s) en {lotes} lote(s).", insertados=resultado.insertados, lotes=resultado.lotes)
+            if resultado.errores:
+                eventos.aviso("cliente.lote_rechazos", "{rechazadas} fila(s) rechazada(s).", rechazadas=len(resultado.errores))
+            return resultado
+        except database.DatabaseError as e:
+            eventos.error("cliente.error_bd", "Error: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def create_returning_id(cliente: Cliente) -> int:
+        sql = ClienteDAO._SQL_INSERT
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    nuevo_id = database.backend().insertar_retornando_id(
+                        cursor, sql, ClienteDAO._parametros(cliente), "id", "seq_cliente", "id_cliente"
+                    )
+                    conn.commit()
+                    cliente.id_cliente = nuevo_id
+                    ClienteDAO._indice_rut.guardar(normalizar_rut(cliente.rut), nuevo_id)
+                    eventos.info("cliente.creado", "Cliente '{nombre}' creado exitosamente.", nombre=cliente.obtener_nombre_completo())
+                    return nuevo_id
+        except database.IntegrityError as e:
+            eventos.error("cliente.integridad", "Error: El cliente ya existe.")
+            return -1
+        except database.DatabaseError as e:
+            eventos.error("cliente.error_bd", "Error de base de datos: {error}", error=e)
             raise
     
     @staticmethod
+    @en_cache("cliente")
     def read_by_id(id_cliente: int) -> Optional[Cliente]:
         sql = "SELECT * FROM cliente WHERE id_cliente = :id"
         try:
@@ -31,47 +80,136 @@ class ClienteDAO:
                     cursor.execute(sql, {"id": id_cliente})
                     row = cursor.fetchone()
                     if not row:
-                        print(f"✗ No se encontró cliente con ID {id_cliente}")
+                        eventos.aviso("cliente.no_encontrado", "No se encontró cliente con ID {id_cliente}", id_cliente=id_cliente)
                         return None
-                    return Cliente(*row)
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+                    return Cliente.from_row(row)
+        except database.DatabaseError as e:
+            eventos.error("cliente.error_bd", "Error: {error}", error=e)
             raise
     
+    @staticmethod
+    def read_by_rut(rut: str) -> Optional[Cliente]:
+        """
+        Busca un cliente por RUT (acepta "12.345.678-5", "12345678-5" o "123456785").
+        
+        Si el RUT está en el índice en memoria se resuelve por ID, lo que con la
+        caché de clientes activa no requiere ir a la BD; si no, usa el índice
+        único uk_cliente_rut.
+        """
+        rut = normalizar_rut(rut)
+        id_cliente = ClienteDAO._indice_rut.obtener(rut)
+        if isinstance(id_cliente, int):
+            cliente = ClienteDAO.read_by_id(id_cliente)
+            if cliente is not None and normalizar_rut_guardado(cliente.rut) == rut:
+                return cliente
+            ClienteDAO._indice_rut.invalidar(rut)
+        
+        cliente = ClienteDAO._read_by_unico("rut", rut)
+        if cliente is None:
+            eventos.aviso("cliente.no_encontrado", "No se encontró cliente con RUT {rut}", rut=rut)
+        return cliente
+    
+    @staticmethod
+    def read_by_email(email: str) -> Optional[Cliente]:
+        """Busca un cliente por email usando el índice único uk_cliente_email"""
+        email = (email or "").strip()
+        cliente = ClienteDAO._read_by_unico("email", email)
+        if cliente is None:
+            eventos.aviso("cliente.no_encontrado", "No se encontró cliente con email {email}", email=email)
+        return cliente
+    
+    @staticmethod
+    def cargar_indice_rut(arraysize: Optional[int] = None) -> int:
+        """Precarga el índice RUT -> ID con todos los clientes; retorna cuántos cargó"""
+        sql = "SELECT rut, id_cliente FROM cliente"
+        cargados = 0
+        for rut, id_cliente in iterar_filas(sql, None, arraysize):
+            ClienteDAO._indice_rut.guardar(normalizar_rut_guardado(rut), id_cliente)
+            cargados += 1
+        return cargados
+    
+    @staticmethod
+    def ids_por_rut(ruts: Iterable[str]) -> Dict[str, int]:
+        """
+        Resuelve muchos RUT (ya normalizados) a id_cliente.
+        
+        Usa primero el índice en memoria y trae los faltantes con consultas
+        IN por bloques. Los RUT que no existen no aparecen en el resultado.
+        """
+        resultado: Dict[str, int] = {}
+        faltantes = []
+        for rut in ruts:
+            id_cliente = ClienteDAO._indice_rut.obtener(rut)
+            if isinstance(id_cliente, int):
+                resultado[rut] = id_cliente
+            else:
+                faltantes.append(rut)
+        for rut, id_cliente in ids_por_clave("cliente", "rut", "id_cliente", faltantes).items():
+            ClienteDAO._indice_rut.guardar(rut, id_cliente)
+            resultado[rut] = id_cliente
+        return resultado
+    
+    @staticmethod
+    def read_by_ids(ids: Iterable[int]) -> Dict[int, Optional[Cliente]]:
+        return leer_por_ids("cliente", "id_cliente", ids, Cliente.from_row)
+    
     @staticmethod
     def read_all(limit: int = 100) -> List[Cliente]:
-        sql = f"SELECT * FROM cliente FETCH FIRST {limit} ROWS ONLY"
+        sql = database.backend().limitar("SELECT * FROM cliente", limit)
         clientes = []
         try:
             with get_connection() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute(sql)
                     for row in cursor:
-                        clientes.append(Cliente(*row))
-                    print(f"✓ Se encontraron {len(clientes)} cliente(s).")
+                        clientes.append(Cliente.from_row(row))
+                    eventos.info("cliente.listado", "Se encontraron {cantidad} cliente(s).", cantidad=len(clientes))
                     return clientes
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.DatabaseError as e:
+            eventos.error("cliente.error_bd", "Error: {error}", error=e)
             raise
     
     @staticmethod
+    def iter_all(arraysize: Optional[int] = None) -> Iterator[Cliente]:
+        sql = "SELECT * FROM cliente ORDER BY id_cliente"
+        return (Cliente.from_row(row) for row in iterar_filas(sql, None, arraysize))
+    
+    @staticmethod
+    def read_page(after_id: int = 0, page_size: int = 20) -> List[Cliente]:
+        # Paginación por clave: la página siguiente empieza después del último
+        # id_cliente visto, así el costo no depende de cuántas páginas se saltaron.
+        sql = database.backend().limitar("SELECT * FROM cliente WHERE id_cliente > :after_id ORDER BY id_cliente", page_size)
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql, {"after_id": after_id})
+                    return [Cliente.from_row(row) for row in cursor]
+        except database.DatabaseError as e:
+            eventos.error("cliente.error_bd", "Error: {error}", error=e)
+            raise
+    
+    @staticmethod
+    @invalida_cache("cliente", lambda cliente: cliente.id_cliente)
     def update(cliente: Cliente) -> bool:
         sql = "UPDATE cliente SET rut=:rut, nombres=:nombres, apellidos=:apellidos, telefono=:telefono, email=:email, direccion=:direccion WHERE id_cliente=:id"
         try:
             with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(sql, {"rut": cliente.rut, "nombres": cliente.nombres, "apellidos": cliente.apellidos, "telefono": cliente.telefono, "email": cliente.email, "direccion": cliente.direccion, "id": cliente.id_cliente})
+                    # Un cliente leído con un RUT histórico mal formado se puede
+                    # actualizar sin corregirlo (el setter valida los RUT nuevos)
+                    cursor.execute(sql, {"rut": normalizar_rut_guardado(cliente.rut), "nombres": cliente.nombres, "apellidos": cliente.apellidos, "telefono": cliente.telefono, "email": cliente.email, "direccion": cliente.direccion, "id": cliente.id_cliente})
                     if cursor.rowcount == 0:
-                        print(f"✗ No se encontró cliente con ID {cliente.id_cliente}")
+                        eventos.aviso("cliente.no_encontrado", "No se encontró cliente con ID {id_cliente}", id_cliente=cliente.id_cliente)
                         return False
                     conn.commit()
-                    print(f"✓ Cliente ID {cliente.id_cliente} actualizado.")
+                    eventos.info("cliente.actualizado", "Cliente ID {id_cliente} actualizado.", id_cliente=cliente.id_cliente)
                     return True
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.DatabaseError as e:
+            eventos.error("cliente.error_bd", "Error: {error}", error=e)
             raise
     
     @staticmethod
+    @invalida_cache("cliente", lambda id_cliente: id_cliente, en_cascada=("mascota",), elimina=True)
     def delete(id_cliente: int) -> bool:
         sql = "DELETE FROM cliente WHERE id_cliente = :id"
         try:
@@ -79,26 +217,44 @@ class ClienteDAO:
                 with conn.cursor() as cursor:
                     cursor.execute(sql, {"id": id_cliente})
                     if cursor.rowcount == 0:
-                        print(f"✗ No se encontró cliente con ID {id_cliente}")
+                        eventos.aviso("cliente.no_encontrado", "No se encontró cliente con ID {id_cliente}", id_cliente=id_cliente)
                         return False
                     conn.commit()
-                    print(f"✓ Cliente ID {id_cliente} eliminado.")
+                    eventos.info("cliente.eliminado", "Cliente ID {id_cliente} eliminado.", id_cliente=id_cliente)
                     return True
-        except oracledb.IntegrityError:
-            print(f"✗ Error: No se puede eliminar el cliente porque tiene mascotas asignadas.")
+        except database.IntegrityError:
+            eventos.error("cliente.con_dependientes", "Error: No se puede eliminar el cliente porque tiene mascotas asignadas.")
             return False
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.DatabaseError as e:
+            eventos.error("cliente.error_bd", "Error: {error}", error=e)
             raise
     
     @staticmethod
-    def create_with_sequence() -> int:
-        sql = "SELECT seq_cliente.NEXTVAL FROM DUAL"
+    def _read_by_unico(columna: str, valor: str) -> Optional[Cliente]:
+        # columna es siempre "rut" o "email", nunca un dato del usuario
+        sql = f"SELECT * FROM cliente WHERE {columna} = :valor"
         try:
             with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(sql)
-                    return cursor.fetchone()[0]
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+                    cursor.execute(sql, {"valor": valor})
+                    row = cursor.fetchone()
+                    if not row:
+                        return None
+                    cliente = Cliente.from_row(row)
+                    ClienteDAO._indice_rut.guardar(normalizar_rut_guardado(cliente.rut), cliente.id_cliente)
+                    return cliente
+        except database.DatabaseError as e:
+            eventos.error("cliente.error_bd", "Error: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def create_with_sequence() -> int:
+        try:
+            return asignador.siguiente("seq_cliente")
+        except database.DatabaseError as e:
+            eventos.error("cliente.error_bd", "Error: {error}", error=e)
             return -1
+    
+    @staticmethod
+    def _parametros(cliente: Cliente) -> dict:
+        return {"id": cliente.id_cliente, "rut": normalizar_rut(cliente.rut), "nombres": cliente.nombres, "apellidos": cliente.apellidos, "telefono": cliente.telefono, "email": cliente.email, "direccion": cliente.direccion}
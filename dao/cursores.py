@@ -0,0 +1,140 @@
+"""
+Módulo: dao/cursores.py
+Lecturas compartidas por los DAO: streaming y búsqueda por lotes de IDs
+
+iterar_filas() respalda los métodos iter_*: a diferencia de read_all /
+read_by_*, que arman una lista completa, las filas se traen en bloques de
+`arraysize` y se entregan de a una mientras el cursor sigue abierto. La
+conexión vuelve al pool cuando el iterador se agota o se cierra (close()
+o salir del for con break).
+
+leer_por_ids() respalda los métodos read_by_ids: resuelve muchos IDs con
+pocas consultas IN en lugar de un read_by_id por elemento. ids_por_clave()
+hace lo mismo para traducir claves únicas (RUT, email) a IDs.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+import database
+import eventos
+from database import get_connection
+
+# Oracle admite como máximo 1000 expresiones en una lista IN (ORA-01795)
+MAX_IDS_POR_CONSULTA = 1000
+
+
+def iterar_filas(sql: str, parametros: Optional[dict] = None, arraysize: Optional[int] = None) -> Iterator[tuple]:
+    """
+    Ejecuta una consulta y entrega sus filas sin materializar el resultado.
+
+    Args:
+        sql: SELECT con parámetros nombrados
+        parametros: Valores de los parámetros
+        arraysize: Filas por viaje a la BD (por defecto DB_FETCH_ARRAYSIZE)
+
+    Yields:
+        tuple: Cada fila del resultado
+    """
+    tamano = arraysize or database.FETCH_ARRAYSIZE
+    try:
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.arraysize = tamano
+                cursor.prefetchrows = tamano
+                cursor.execute(sql, parametros or {})
+                while True:
+                    filas = cursor.fetchmany()
+                    if not filas:
+                        break
+                    yield from filas
+    except database.DatabaseError as e:
+        eventos.error("consulta.error_bd", "Error: {error}", error=e)
+        raise
+
+
+def leer_por_ids(
+    tabla: str,
+    columna_id: str,
+    ids: Iterable[int],
+    a_modelo: Callable[[tuple], Any]
+) -> Dict[int, Optional[Any]]:
+    """
+    Lee varias filas por clave primaria con consultas IN por bloques.
+
+    Args:
+        tabla: Tabla a consultar
+        columna_id: Columna de clave primaria
+        ids: IDs a buscar (se ignoran los repetidos)
+        a_modelo: Convierte una fila en el objeto del modelo
+
+    Returns:
+        Dict[int, Optional[Any]]: Un elemento por ID pedido, en el orden de
+        `ids`; los IDs inexistentes quedan con valor None.
+    """
+    resultado: Dict[int, Optional[Any]] = dict.fromkeys(ids)
+    pendientes = list(resultado)
+    if not pendientes:
+        return resultado
+
+    try:
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                for inicio in range(0, len(pendientes), MAX_IDS_POR_CONSULTA):
+                    bloque = pendientes[inicio:inicio + MAX_IDS_POR_CONSULTA]
+                    sql, parametros = _consulta_in(tabla, columna_id, bloque)
+                    cursor.execute(sql, parametros)
+                    for row in cursor:
+                        resultado[row[0]] = a_modelo(row)
+    except database.DatabaseError as e:
+        eventos.error("consulta.error_bd", "Error: {error}", error=e)
+        raise
+    return resultado
+
+
+def ids_por_clave(tabla: str, columna: str, columna_id: str, claves: Iterable[Any]) -> Dict[Any, int]:
+    """
+    Traduce valores de una columna única a sus IDs con consultas IN por bloques.
+
+    Returns:
+        Dict[Any, int]: Clave -> ID, sólo para las claves que existen
+    """
+    pendientes = list(dict.fromkeys(claves))
+    resultado: Dict[Any, int] = {}
+    if not pendientes:
+        return resultado
+
+    try:
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                for inicio in range(0, len(pendientes), MAX_IDS_POR_CONSULTA):
+                    marcadores, parametros = lista_in(pendientes[inicio:inicio + MAX_IDS_POR_CONSULTA], "clave")
+                    cursor.execute(f"SELECT {columna}, {columna_id} FROM {tabla} WHERE {columna} IN ({marcadores})", parametros)
+                    resultado.update(cursor.fetchall())
+    except database.DatabaseError as e:
+        eventos.error("consulta.error_bd", "Error: {error}", error=e)
+        raise
+    return resultado
+
+
+def lista_in(valores: list, prefijo: str = "id"):
+    """
+    Arma los marcadores de una lista IN y sus parámetros.
+
+    La lista se rellena hasta una potencia de 2 repitiendo el último valor:
+    así hay pocas variantes del SQL y el caché de sentencias las reutiliza.
+    `valores` debe tener entre 1 y MAX_IDS_POR_CONSULTA elementos.
+
+    Returns:
+        (str, dict): ":id0, :id1, ..." y {"id0": ..., "id1": ...}
+    """
+    tamano = 8
+    while tamano < len(valores):
+        tamano *= 2
+    tamano = min(tamano, MAX_IDS_POR_CONSULTA)
+    valores = list(valores) + [valores[-1]] * (tamano - len(valores))
+    marcadores = ", ".join(f":{prefijo}{i}" for i in range(tamano))
+    return marcadores, {f"{prefijo}{i}": valor for i, valor in enumerate(valores)}
+
+
+def _consulta_in(tabla: str, columna_id: str, bloque: list):
+    marcadores, parametros = lista_in(bloque)
+    return f"SELECT * FROM {tabla} WHERE {columna_id} IN ({marcadores})", parametros
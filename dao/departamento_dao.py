@@ -4,15 +4,25 @@ Data Access Object para la entidad Departamento
 Maneja todas las operaciones CRUD con la base de datos
 """
 
-import oracledb
-from typing import List, Optional
+import database
+import eventos
+from typing import Iterable, Iterator, List, Optional
 from models.departamento import Departamento
 from database import get_connection
+from dao.lotes import ResultadoLote, insertar_en_lotes
+from dao.secuencias import asignador
+from dao.cache import en_cache, invalida_cache
+from dao.cursores import iterar_filas
 
 
 class DepartamentoDAO:
     """Clase para manejar operaciones CRUD de Departamento"""
     
+    _SQL_INSERT = """
+        INSERT INTO departamento (id_departamento, nombre, ubicacion, presupuesto)
+        VALUES (:id_departamento, :nombre, :ubicacion, :presupuesto)
+    """
+    
     @staticmethod
     def create(departamento: Departamento) -> bool:
         """
@@ -25,34 +35,74 @@ class DepartamentoDAO:
             bool: True si se creó exitosamente
             
         Raises:
-            oracledb.DatabaseError: Si hay error en la BD
-        """
-        sql = """
-            INSERT INTO departamento (id_departamento, nombre, ubicacion, presupuesto)
-            VALUES (:id_departamento, :nombre, :ubicacion, :presupuesto)
+            database.DatabaseError: Si hay error en la BD
         """
+        sql = DepartamentoDAO._SQL_INSERT
         
         try:
             with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(sql, {
-                        "id_departamento": departamento.id_departamento,
-                        "nombre": departamento.nombre,
-                        "ubicacion": departamento.ubicacion,
-                        "presupuesto": departamento.presupuesto
-                    })
+                    cursor.execute(sql, DepartamentoDAO._parametros(departamento))
                     conn.commit()
-                    print(f"✓ Departamento '{departamento.nombre}' creado exitosamente.")
+                    eventos.info("departamento.creado", "Departamento '{nombre}' creado exitosamente.", nombre=departamento.nombre)
                     return True
-        except oracledb.IntegrityError as e:
-            print(f"✗ Error: El departamento ya existe o hay un problema de integridad.")
-            print(f"   Detalles: {e}")
+        except database.IntegrityError as e:
+            eventos.error("departamento.integridad", "Error: El departamento ya existe o hay un problema de integridad.\n   Detalles: {error}", error=e)
             return False
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error de base de datos al crear departamento: {e}")
+        except database.DatabaseError as e:
+            eventos.error("departamento.error_bd", "Error de base de datos al crear departamento: {error}", error=e)
             raise
     
     @staticmethod
+    def create_many(departamentos: Iterable[Departamento], batch_size: int = 1000) -> ResultadoLote:
+        """
+        Inserta departamento(s) en lotes con array binding y un commit por lote.
+        
+        Acepta generadores: sólo se mantiene en memoria un lote a la vez.
+        Las filas rechazadas se informan en ResultadoLote.errores.
+        """
+        sql = DepartamentoDAO._SQL_INSERT
+        
+        try:
+            resultado = insertar_en_lotes(sql, departamentos, DepartamentoDAO._parametros, batch_size)
+            eventos.info("departamento.lote_insertado", "{insertados} departamento(s) insertado(s) en {lotes} lote(s).", insertados=resultado.insertados, lotes=resultado.lotes)
+            if resultado.errores:
+                eventos.aviso("departamento.lote_rechazos", "{rechazadas} fila(s) rechazada(s).", rechazadas=len(resultado.errores))
+            return resultado
+        except database.DatabaseError as e:
+            eventos.error("departamento.error_lote", "Error en inserción masiva: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def create_returning_id(departamento: Departamento) -> int:
+        """
+        Inserta un departamento tomando el ID de seq_departamento en la misma sentencia
+        (INSERT ... RETURNING), sin un viaje previo para obtener el ID.
+        
+        Returns:
+            int: ID asignado o -1 si hay un problema de integridad
+        """
+        sql = DepartamentoDAO._SQL_INSERT
+        
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    nuevo_id = database.backend().insertar_retornando_id(
+                        cursor, sql, DepartamentoDAO._parametros(departamento), "id_departamento", "seq_departamento", "id_departamento"
+                    )
+                    conn.commit()
+                    departamento.id_departamento = nuevo_id
+                    eventos.info("departamento.creado", "Departamento '{nombre}' creado exitosamente.", nombre=departamento.nombre)
+                    return nuevo_id
+        except database.IntegrityError as e:
+            eventos.error("departamento.integridad", "Error: El departamento ya existe o hay un problema de integridad.\n   Detalles: {error}", error=e)
+            return -1
+        except database.DatabaseError as e:
+            eventos.error("departamento.error_bd", "Error de base de datos al crear departamento: {error}", error=e)
+            raise
+    
+    @staticmethod
+    @en_cache("departamento")
     def read_by_id(id_departamento: int) -> Optional[Departamento]:
         """
         Lee un departamento por su ID
@@ -72,7 +122,7 @@ class DepartamentoDAO:
                     row = cursor.fetchone()
                     
                     if not row:
-                        print(f"✗ No se encontró departamento con ID {id_departamento}")
+                        eventos.aviso("departamento.no_encontrado", "No se encontró departamento con ID {id_departamento}", id_departamento=id_departamento)
                         return None
                     
                     # Desempaquetar la fila
@@ -84,8 +134,8 @@ class DepartamentoDAO:
                         ubicacion=ubicacion,
                         presupuesto=float(presupuesto) if presupuesto else 0.0
                     )
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al leer departamento: {e}")
+        except database.DatabaseError as e:
+            eventos.error("departamento.error_bd", "Error al leer departamento: {error}", error=e)
             raise
     
     @staticmethod
@@ -99,7 +149,7 @@ class DepartamentoDAO:
         Returns:
             List[Departamento]: Lista de departamentos
         """
-        sql = f"SELECT * FROM departamento FETCH FIRST {limit} ROWS ONLY"
+        sql = database.backend().limitar("SELECT * FROM departamento", limit)
         departamentos = []
         
         try:
@@ -117,13 +167,20 @@ class DepartamentoDAO:
                         )
                         departamentos.append(dept)
                     
-                    print(f"✓ Se encontraron {len(departamentos)} departamento(s).")
+                    eventos.info("departamento.listado", "Se encontraron {cantidad} departamento(s).", cantidad=len(departamentos))
                     return departamentos
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al listar departamentos: {e}")
+        except database.DatabaseError as e:
+            eventos.error("departamento.error_bd", "Error al listar departamentos: {error}", error=e)
             raise
     
     @staticmethod
+    def iter_all(arraysize: Optional[int] = None) -> Iterator[Departamento]:
+        """Recorre todos los departamentos sin materializar la lista (ver dao/cursores.py)"""
+        sql = "SELECT * FROM departamento ORDER BY id_departamento"
+        return (DepartamentoDAO._row_to_departamento(row) for row in iterar_filas(sql, None, arraysize))
+    
+    @staticmethod
+    @invalida_cache("departamento", lambda departamento: departamento.id_departamento)
     def update(departamento: Departamento) -> bool:
         """
         Actualiza un departamento existente
@@ -153,17 +210,18 @@ class DepartamentoDAO:
                     })
                     
                     if cursor.rowcount == 0:
-                        print(f"✗ No se encontró departamento con ID {departamento.id_departamento}")
+                        eventos.aviso("departamento.no_encontrado", "No se encontró departamento con ID {id_departamento}", id_departamento=departamento.id_departamento)
                         return False
                     
                     conn.commit()
-                    print(f"✓ Departamento ID {departamento.id_departamento} actualizado.")
+                    eventos.info("departamento.actualizado", "Departamento ID {id_departamento} actualizado.", id_departamento=departamento.id_departamento)
                     return True
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al actualizar departamento: {e}")
+        except database.DatabaseError as e:
+            eventos.error("departamento.error_bd", "Error al actualizar departamento: {error}", error=e)
             raise
     
     @staticmethod
+    @invalida_cache("departamento", lambda id_departamento: id_departamento, elimina=True)
     def delete(id_departamento: int) -> bool:
         """
         Elimina un departamento por su ID
@@ -182,18 +240,17 @@ class DepartamentoDAO:
                     cursor.execute(sql, {"id_departamento": id_departamento})
                     
                     if cursor.rowcount == 0:
-                        print(f"✗ No se encontró departamento con ID {id_departamento}")
+                        eventos.aviso("departamento.no_encontrado", "No se encontró departamento con ID {id_departamento}", id_departamento=id_departamento)
                         return False
                     
                     conn.commit()
-                    print(f"✓ Departamento ID {id_departamento} eliminado.")
+                    eventos.info("departamento.eliminado", "Departamento ID {id_departamento} eliminado.", id_departamento=id_departamento)
                     return True
-        except oracledb.IntegrityError as e:
-            print(f"✗ Error: No se puede eliminar el departamento porque tiene empleados asignados.")
-            print(f"   Detalles: {e}")
+        except database.IntegrityError as e:
+            eventos.error("departamento.con_dependientes", "Error: No se puede eliminar el departamento porque tiene empleados asignados.\n   Detalles: {error}", error=e)
             return False
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al eliminar departamento: {e}")
+        except database.DatabaseError as e:
+            eventos.error("departamento.error_bd", "Error al eliminar departamento: {error}", error=e)
             raise
     
     @staticmethod
@@ -205,14 +262,29 @@ class DepartamentoDAO:
         Returns:
             int: ID del nuevo departamento o -1 si hay error
         """
-        sql = "SELECT seq_departamento.NEXTVAL FROM DUAL"
-        
         try:
-            with get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute(sql)
-                    nuevo_id = cursor.fetchone()[0]
-                    return nuevo_id
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al obtener siguiente ID: {e}")
+            return asignador.siguiente("seq_departamento")
+        except database.DatabaseError as e:
+            eventos.error("departamento.error_secuencia", "Error al obtener siguiente ID: {error}", error=e)
             return -1
+    
+    @staticmethod
+    def _parametros(departamento: Departamento) -> dict:
+        """Convierte un Departamento en los parámetros del INSERT"""
+        return {
+            "id_departamento": departamento.id_departamento,
+            "nombre": departamento.nombre,
+            "ubicacion": departamento.ubicacion,
+            "presupuesto": departamento.presupuesto
+        }
+    
+    @staticmethod
+    def _row_to_departamento(row) -> Departamento:
+        """Convierte una fila de la BD a objeto Departamento"""
+        id_dep, nombre, ubicacion, presupuesto = row
+        return Departamento(
+            id_departamento=id_dep,
+            nombre=nombre,
+            ubicacion=ubicacion,
+            presupuesto=float(presupuesto) if presupuesto else 0.0
+        )
@@ -0,0 +1,209 @@
+"""
+Módulo: dao/disponibilidad.py
+Índice de disponibilidad de veterinarios para detectar dobles reservas
+
+Mantiene en memoria, por día y por veterinario, la lista ordenada de horas
+de inicio (en minutos) de las citas no canceladas. Cada día se carga con una
+sola consulta por rango y luego se actualiza de forma incremental desde
+CitaDAO.create/update/delete, de modo que "¿está libre este horario?" se
+responde con una búsqueda binaria en lugar de recorrer las citas del
+veterinario.
+
+El índice es una optimización: no ve las reservas de otros procesos hasta
+que el día se vuelve a leer. La garantía contra reservas concurrentes está
+en la BD: CitaDAO vuelve a buscar cruces dentro de la transacción del
+INSERT/UPDATE, con la agenda del veterinario bloqueada
+(Backend.bloquear_veterinario). Las citas canceladas no ocupan horario.
+"""
+
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import database
+from models.cita import Cita
+from dao.cursores import iterar_filas
+
+
+def _dia(fecha) -> date:
+    # Oracle retorna las columnas DATE como datetime
+    return fecha.date() if isinstance(fecha, datetime) else fecha
+
+
+class IndiceDisponibilidad:
+    """
+    Índice por (día, veterinario) de las citas no canceladas (thread-safe).
+
+    Args:
+        duracion: Minutos que ocupa cada cita
+        apertura: Hora de inicio de la jornada ("HH:MM")
+        cierre: Hora de término de la jornada ("HH:MM")
+        vigencia: Segundos tras los cuales un día cargado se vuelve a leer de
+            la BD, para recoger cambios hechos por otros procesos (0 = nunca)
+    """
+
+    def __init__(self, duracion: int = 30, apertura: str = "09:00", cierre: str = "18:00", vigencia: float = 60.0):
+        if duracion < 1:
+            raise ValueError("La duración de la cita debe ser mayor a 0")
+        self._duracion = duracion
+        self._apertura = Cita.hora_a_minutos(apertura)
+        self._cierre = Cita.hora_a_minutos(cierre)
+        self._vigencia = vigencia
+        # {día: {id_veterinario: [(minuto, id_cita), ...] ordenada}}
+        self._dias: Dict[date, Dict[int, List[Tuple[int, int]]]] = {}
+        self._cargado_en: Dict[date, float] = {}
+        # {id_cita: (día, id_veterinario, minuto)} para quitar citas por ID
+        self._citas: Dict[int, Tuple[date, int, int]] = {}
+        self._backend = None
+        self._lock = threading.RLock()
+
+    @property
+    def duracion(self) -> int:
+        return self._duracion
+
+    def cargar(self, desde: date, hasta: date):
+        """Carga (o recarga) los días de `desde` a `hasta`, ambos incluidos, con una consulta"""
+        desde, hasta = _dia(desde), _dia(hasta)
+        sql = ("SELECT id_cita, id_veterinario, fecha, hora FROM cita "
+               "WHERE estado <> 'CANCELADA' AND fecha >= :desde AND fecha < :hasta")
+        filas = list(iterar_filas(sql, {"desde": desde, "hasta": hasta + timedelta(days=1)}))
+
+        with self._lock:
+            self._verificar_backend()
+            ahora = time.monotonic()
+            dia = desde
+            while dia <= hasta:
+                self._vaciar(dia)
+                self._dias[dia] = {}
+                self._cargado_en[dia] = ahora
+                dia += timedelta(days=1)
+            for id_cita, id_vet, fecha, hora in filas:
+                self._agregar(id_cita, id_vet, _dia(fecha), Cita.hora_a_minutos(hora))
+
+    def esta_libre(self, id_vet: int, fecha: date, hora: str, excluir: Optional[int] = None) -> bool:
+        """
+        True si el veterinario no tiene otra cita que se cruce con `hora`.
+
+        Args:
+            excluir: ID de una cita a ignorar (la propia cita al actualizarla)
+        """
+        minuto = Cita.hora_a_minutos(hora)
+        with self._lock:
+            ocupadas = self._dia_cargado(_dia(fecha)).get(id_vet, ())
+            return self._libre(ocupadas, minuto, excluir)
+
+    def proximos_libres(self, especialidad: str, desde: date, cantidad: int = 5,
+                        dias: int = 14) -> List[Tuple[date, str, int]]:
+        """
+        Primeros `cantidad` horarios libres con veterinarios de la especialidad.
+
+        Recorre los días desde `desde` (a lo sumo `dias` días) cargando todo
+        el rango con una consulta.
+
+        Returns:
+            List[Tuple[date, str, int]]: (fecha, hora "HH:MM", id_veterinario)
+        """
+        sql = "SELECT id_veterinario FROM veterinario WHERE UPPER(especialidad) = UPPER(:especialidad) ORDER BY id_veterinario"
+        veterinarios = [fila[0] for fila in iterar_filas(sql, {"especialidad": especialidad.strip()})]
+        desde = _dia(desde)
+        libres = []
+        if not veterinarios:
+            return libres
+
+        self._cargar_faltantes(desde, desde + timedelta(days=dias - 1))
+        with self._lock:
+            for desplazamiento in range(dias):
+                dia = desde + timedelta(days=desplazamiento)
+                agenda = self._dias.get(dia, {})
+                for minuto in range(self._apertura, self._cierre - self._duracion + 1, self._duracion):
+                    for id_vet in veterinarios:
+                        if self._libre(agenda.get(id_vet, ()), minuto):
+                            libres.append((dia, Cita.minutos_a_hora(minuto), id_vet))
+                            if len(libres) == cantidad:
+                                return libres
+        return libres
+
+    def registrar(self, cita: Cita):
+        """Refleja en el índice una cita creada o actualizada"""
+        with self._lock:
+            self._quitar(cita.id_cita)
+            dia = _dia(cita.fecha)
+            if cita.estado != Cita.ESTADO_CANCELADA and dia in self._dias:
+                self._agregar(cita.id_cita, cita.id_veterinario, dia, cita.minutos)
+
+    def quitar(self, id_cita: int):
+        """Refleja en el índice una cita eliminada"""
+        with self._lock:
+            self._quitar(id_cita)
+
+    def olvidar(self, fecha: Optional[date] = None):
+        """Descarta un día (o todos) para que se vuelva a leer de la BD al consultarlo"""
+        with self._lock:
+            dias = [_dia(fecha)] if fecha is not None else list(self._dias)
+            for dia in dias:
+                self._vaciar(dia)
+                self._dias.pop(dia, None)
+                self._cargado_en.pop(dia, None)
+
+    def _libre(self, ocupadas, minuto: int, excluir: Optional[int] = None) -> bool:
+        # Sólo pueden cruzarse las citas que empiezan en (minuto - duración, minuto + duración)
+        i = bisect_left(ocupadas, (minuto - self._duracion + 1,))
+        while i < len(ocupadas) and ocupadas[i][0] < minuto + self._duracion:
+            if ocupadas[i][1] != excluir:
+                return False
+            i += 1
+        return True
+
+    def _dia_cargado(self, dia: date) -> dict:
+        self._verificar_backend()
+        if self._vencido(dia):
+            self.cargar(dia, dia)
+        return self._dias[dia]
+
+    def _cargar_faltantes(self, desde: date, hasta: date):
+        with self._lock:
+            self._verificar_backend()
+            dias = (desde + timedelta(days=n) for n in range((hasta - desde).days + 1))
+            faltan = [dia for dia in dias if self._vencido(dia)]
+        if faltan:
+            self.cargar(faltan[0], faltan[-1])
+
+    def _vencido(self, dia: date) -> bool:
+        cargado_en = self._cargado_en.get(dia)
+        if cargado_en is None:
+            return True
+        return bool(self._vigencia) and time.monotonic() - cargado_en >= self._vigencia
+
+    def _verificar_backend(self):
+        # Igual que el asignador de IDs: el índice pertenece a una base de datos
+        motor = database.backend()
+        if motor is not self._backend:
+            self._dias.clear()
+            self._cargado_en.clear()
+            self._citas.clear()
+            self._backend = motor
+
+    def _vaciar(self, dia: date):
+        for ocupadas in self._dias.get(dia, {}).values():
+            for _, id_cita in ocupadas:
+                self._citas.pop(id_cita, None)
+
+    def _agregar(self, id_cita: int, id_vet: int, dia: date, minuto: int):
+        insort(self._dias[dia].setdefault(id_vet, []), (minuto, id_cita))
+        self._citas[id_cita] = (dia, id_vet, minuto)
+
+    def _quitar(self, id_cita: int):
+        ubicacion = self._citas.pop(id_cita, None)
+        if ubicacion is None:
+            return
+        dia, id_vet, minuto = ubicacion
+        ocupadas = self._dias.get(dia, {}).get(id_vet)
+        if ocupadas:
+            i = bisect_left(ocupadas, (minuto, id_cita))
+            if i < len(ocupadas) and ocupadas[i] == (minuto, id_cita):
+                del ocupadas[i]
+
+
+# Índice compartido por CitaDAO y los menús del proceso
+disponibilidad = IndiceDisponibilidad()
@@ -3,51 +3,94 @@ Módulo: dao/empleado_dao.py
 Data Access Object para la entidad Empleado
 """
 
-import oracledb
-from typing import List, Optional
+import database
+import eventos
+from typing import Dict, Iterable, Iterator, List, Optional
 from datetime import datetime
 from models.empleado import Empleado
 from database import get_connection
+from dao.lotes import ResultadoLote, insertar_en_lotes
+from dao.secuencias import asignador
+from dao.cursores import iterar_filas, leer_por_ids
 
 
 class EmpleadoDAO:
     """Clase para manejar operaciones CRUD de Empleado"""
     
+    _SQL_INSERT = """
+        INSERT INTO empleado 
+        (id_empleado, rut, nombres, apellidos, email, telefono, 
+         fecha_contratacion, salario, id_departamento)
+        VALUES 
+        (:id_empleado, :rut, :nombres, :apellidos, :email, :telefono,
+         :fecha_contratacion, :salario, :id_departamento)
+    """
+    
     @staticmethod
     def create(empleado: Empleado) -> bool:
         """Crea un nuevo empleado en la base de datos"""
-        sql = """
-            INSERT INTO empleado 
-            (id_empleado, rut, nombres, apellidos, email, telefono, 
-             fecha_contratacion, salario, id_departamento)
-            VALUES 
-            (:id_empleado, :rut, :nombres, :apellidos, :email, :telefono,
-             :fecha_contratacion, :salario, :id_departamento)
-        """
+        sql = EmpleadoDAO._SQL_INSERT
         
         try:
             with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(sql, {
-                        "id_empleado": empleado.id_empleado,
-                        "rut": empleado.rut,
-                        "nombres": empleado.nombres,
-                        "apellidos": empleado.apellidos,
-                        "email": empleado.email,
-                        "telefono": empleado.telefono,
-                        "fecha_contratacion": empleado.fecha_contratacion,
-                        "salario": empleado.salario,
-                        "id_departamento": empleado.id_departamento
-                    })
+                    cursor.execute(sql, EmpleadoDAO._parametros(empleado))
                     conn.commit()
-                    print(f"✓ Empleado '{empleado.obtener_nombre_completo()}' creado exitosamente.")
+                    eventos.info("empleado.creado", "Empleado '{nombre}' creado exitosamente.", nombre=empleado.obtener_nombre_completo())
                     return True
-        except oracledb.IntegrityError as e:
-            print(f"✗ Error: El empleado ya existe o hay un problema de integridad.")
-            print(f"   Detalles: {e}")
+        except database.IntegrityError as e:
+            eventos.error("empleado.integridad", "Error: El empleado ya existe o hay un problema de integridad.\n   Detalles: {error}", error=e)
             return False
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error de base de datos: {e}")
+        except database.DatabaseError as e:
+            eventos.error("empleado.error_bd", "Error de base de datos: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def create_many(empleados: Iterable[Empleado], batch_size: int = 1000) -> ResultadoLote:
+        """
+        Inserta empleado(s) en lotes con array binding y un commit por lote.
+        
+        Acepta generadores: sólo se mantiene en memoria un lote a la vez.
+        Las filas rechazadas se informan en ResultadoLote.errores.
+        """
+        sql = EmpleadoDAO._SQL_INSERT
+        
+        try:
+            resultado = insertar_en_lotes(sql, empleados, EmpleadoDAO._parametros, batch_size)
+            eventos.info("empleado.lote_insertado", "{insertados} empleado(s) insertado(s) en {lotes} lote(s).", insertados=resultado.insertados, lotes=resultado.lotes)
+            if resultado.errores:
+                eventos.aviso("empleado.lote_rechazos", "{rechazadas} fila(s) rechazada(s).", rechazadas=len(resultado.errores))
+            return resultado
+        except database.DatabaseError as e:
+            eventos.error("empleado.error_lote", "Error en inserción masiva: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def create_returning_id(empleado: Empleado) -> int:
+        """
+        Inserta un empleado tomando el ID de seq_empleado en la misma sentencia
+        (INSERT ... RETURNING), sin un viaje previo para obtener el ID.
+        
+        Returns:
+            int: ID asignado o -1 si hay un problema de integridad
+        """
+        sql = EmpleadoDAO._SQL_INSERT
+        
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    nuevo_id = database.backend().insertar_retornando_id(
+                        cursor, sql, EmpleadoDAO._parametros(empleado), "id_empleado", "seq_empleado", "id_empleado"
+                    )
+                    conn.commit()
+                    empleado.id_empleado = nuevo_id
+                    eventos.info("empleado.creado", "Empleado '{nombre}' creado exitosamente.", nombre=empleado.obtener_nombre_completo())
+                    return nuevo_id
+        except database.IntegrityError as e:
+            eventos.error("empleado.integridad", "Error: El empleado ya existe o hay un problema de integridad.\n   Detalles: {error}", error=e)
+            return -1
+        except database.DatabaseError as e:
+            eventos.error("empleado.error_bd", "Error de base de datos: {error}", error=e)
             raise
     
     @staticmethod
@@ -62,18 +105,23 @@ class EmpleadoDAO:
                     row = cursor.fetchone()
                     
                     if not row:
-                        print(f"✗ No se encontró empleado con ID {id_empleado}")
+                        eventos.aviso("empleado.no_encontrado", "No se encontró empleado con ID {id_empleado}", id_empleado=id_empleado)
                         return None
                     
                     return EmpleadoDAO._row_to_empleado(row)
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al leer empleado: {e}")
+        except database.DatabaseError as e:
+            eventos.error("empleado.error_bd", "Error al leer empleado: {error}", error=e)
             raise
     
+    @staticmethod
+    def read_by_ids(ids: Iterable[int]) -> Dict[int, Optional[Empleado]]:
+        """Lee varios empleados por ID en pocas consultas (None si no existe)"""
+        return leer_por_ids("empleado", "id_empleado", ids, EmpleadoDAO._row_to_empleado)
+    
     @staticmethod
     def read_all(limit: int = 100) -> List[Empleado]:
         """Lee todos los empleados"""
-        sql = f"SELECT * FROM empleado FETCH FIRST {limit} ROWS ONLY"
+        sql = database.backend().limitar("SELECT * FROM empleado", limit)
         empleados = []
         
         try:
@@ -84,12 +132,18 @@ class EmpleadoDAO:
                     for row in cursor:
                         empleados.append(EmpleadoDAO._row_to_empleado(row))
                     
-                    print(f"✓ Se encontraron {len(empleados)} empleado(s).")
+                    eventos.info("empleado.listado", "Se encontraron {cantidad} empleado(s).", cantidad=len(empleados))
                     return empleados
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al listar empleados: {e}")
+        except database.DatabaseError as e:
+            eventos.error("empleado.error_bd", "Error al listar empleados: {error}", error=e)
             raise
     
+    @staticmethod
+    def iter_all(arraysize: Optional[int] = None) -> Iterator[Empleado]:
+        """Recorre todos los empleados sin materializar la lista (ver dao/cursores.py)"""
+        sql = "SELECT * FROM empleado ORDER BY id_empleado"
+        return (EmpleadoDAO._row_to_empleado(row) for row in iterar_filas(sql, None, arraysize))
+    
     @staticmethod
     def update(empleado: Empleado) -> bool:
         """Actualiza un empleado existente"""
@@ -122,14 +176,14 @@ class EmpleadoDAO:
                     })
                     
                     if cursor.rowcount == 0:
-                        print(f"✗ No se encontró empleado con ID {empleado.id_empleado}")
+                        eventos.aviso("empleado.no_encontrado", "No se encontró empleado con ID {id_empleado}", id_empleado=empleado.id_empleado)
                         return False
                     
                     conn.commit()
-                    print(f"✓ Empleado ID {empleado.id_empleado} actualizado.")
+                    eventos.info("empleado.actualizado", "Empleado ID {id_empleado} actualizado.", id_empleado=empleado.id_empleado)
                     return True
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al actualizar empleado: {e}")
+        except database.DatabaseError as e:
+            eventos.error("empleado.error_bd", "Error al actualizar empleado: {error}", error=e)
             raise
     
     @staticmethod
@@ -143,17 +197,17 @@ class EmpleadoDAO:
                     cursor.execute(sql, {"id_empleado": id_empleado})
                     
                     if cursor.rowcount == 0:
-                        print(f"✗ No se encontró empleado con ID {id_empleado}")
+                        eventos.aviso("empleado.no_encontrado", "No se encontró empleado con ID {id_empleado}", id_empleado=id_empleado)
                         return False
                     
                     conn.commit()
-                    print(f"✓ Empleado ID {id_empleado} eliminado.")
+                    eventos.info("empleado.eliminado", "Empleado ID {id_empleado} eliminado.", id_empleado=id_empleado)
                     return True
-        except oracledb.IntegrityError as e:
-            print(f"✗ Error: No se puede eliminar el empleado porque tiene registros asociados.")
+        except database.IntegrityError as e:
+            eventos.error("empleado.con_dependientes", "Error: No se puede eliminar el empleado porque tiene registros asociados.")
             return False
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al eliminar empleado: {e}")
+        except database.DatabaseError as e:
+            eventos.error("empleado.error_bd", "Error al eliminar empleado: {error}", error=e)
             raise
     
     @staticmethod
@@ -171,10 +225,16 @@ class EmpleadoDAO:
                         empleados.append(EmpleadoDAO._row_to_empleado(row))
                     
                     return empleados
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al leer empleados por departamento: {e}")
+        except database.DatabaseError as e:
+            eventos.error("empleado.error_bd", "Error al leer empleados por departamento: {error}", error=e)
             raise
     
+    @staticmethod
+    def iter_by_departamento(id_departamento: int, arraysize: Optional[int] = None) -> Iterator[Empleado]:
+        """Recorre los empleados de un departamento sin materializar la lista (ver dao/cursores.py)"""
+        sql = "SELECT * FROM empleado WHERE id_departamento = :id_departamento"
+        return (EmpleadoDAO._row_to_empleado(row) for row in iterar_filas(sql, {"id_departamento": id_departamento}, arraysize))
+    
     @staticmethod
     def _row_to_empleado(row) -> Empleado:
         """Convierte una fila de la BD a objeto Empleado"""
@@ -196,13 +256,23 @@ class EmpleadoDAO:
     @staticmethod
     def create_with_sequence() -> int:
         """Obtiene el siguiente ID de la secuencia"""
-        sql = "SELECT seq_empleado.NEXTVAL FROM DUAL"
-        
         try:
-            with get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute(sql)
-                    return cursor.fetchone()[0]
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al obtener siguiente ID: {e}")
+            return asignador.siguiente("seq_empleado")
+        except database.DatabaseError as e:
+            eventos.error("empleado.error_secuencia", "Error al obtener siguiente ID: {error}", error=e)
             return -1
+    
+    @staticmethod
+    def _parametros(empleado: Empleado) -> dict:
+        """Convierte un Empleado en los parámetros del INSERT"""
+        return {
+            "id_empleado": empleado.id_empleado,
+            "rut": empleado.rut,
+            "nombres": empleado.nombres,
+            "apellidos": empleado.apellidos,
+            "email": empleado.email,
+            "telefono": empleado.telefono,
+            "fecha_contratacion": empleado.fecha_contratacion,
+            "salario": empleado.salario,
+            "id_departamento": empleado.id_departamento
+        }
@@ -0,0 +1,248 @@
+"""
+Módulo: dao/exportacion.py
+Exportación en streaming de tablas completas a CSV o JSONL
+
+Las filas se leen con un cursor de `arraysize` grande y se escriben por
+bloques directamente desde las tuplas del cursor, sin crear objetos del
+modelo: en memoria sólo hay un bloque de filas a la vez, sin importar el
+tamaño de la tabla. La salida pasa por un buffer y, opcionalmente, por gzip.
+
+Modos de selección:
+- completo: toda la tabla
+- rango de fechas: filas cuya columna de fecha está entre `desde` y `hasta`
+- incremental: sólo lo nuevo desde la exportación anterior, según un
+  archivo de estado. En cita se usa la marca `modificado` (altas y
+  cambios); en las demás tablas, las filas con ID mayor al último
+  exportado (sólo altas).
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+import time
+from contextlib import closing, contextmanager
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+import database
+import eventos
+from database import get_connection
+
+# Tabla -> (columna ID, columna de fecha para rangos, columna de cambios para el modo incremental)
+TABLAS: Dict[str, Tuple[str, Optional[str], Optional[str]]] = {
+    "cliente": ("id_cliente", None, None),
+    "mascota": ("id_mascota", None, None),
+    "veterinario": ("id_veterinario", None, None),
+    "cita": ("id_cita", "fecha", "modificado"),
+    "empleado": ("id_empleado", "fecha_contratacion", None),
+    "proyecto": ("id_proyecto", "fecha_inicio", None),
+    "registro_tiempo": ("id_registro", "fecha", None),
+}
+
+# Filas por viaje a la BD (y por bloque escrito)
+ARRAYSIZE = 10000
+
+# Buffer de escritura del archivo de salida
+BUFFER = 1 << 20
+
+# Las marcas `modificado` se comparan con este margen, como en la agenda,
+# para no perder cambios de transacciones que confirmaron tarde. Las filas
+# modificadas dentro del margen pueden repetirse en la exportación siguiente.
+MARGEN = timedelta(seconds=1)
+
+
+class ResultadoExportacion:
+    """Resultado de una exportación"""
+
+    def __init__(self, tabla: str):
+        self.tabla = tabla
+        self.filas = 0
+        self.segundos = 0.0
+
+    @property
+    def filas_por_segundo(self) -> float:
+        return self.filas / self.segundos if self.segundos else 0.0
+
+    def __str__(self) -> str:
+        return f"ResultadoExportacion({self.tabla}: {self.filas} fila(s), {self.filas_por_segundo:,.0f} filas/s)"
+
+
+def exportar(
+    tabla: str,
+    ruta: str,
+    formato: Optional[str] = None,
+    comprimir: Optional[bool] = None,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    estado: Optional[str] = None,
+    arraysize: int = ARRAYSIZE
+) -> ResultadoExportacion:
+    """
+    Exporta una tabla en streaming.
+
+    Args:
+        tabla: Una de TABLAS
+        ruta: Archivo de salida ("-" para la salida estándar)
+        formato: "csv" o "jsonl"; por defecto según la extensión de `ruta`
+            (ignorando .gz), o csv
+        comprimir: Escribir con gzip; por defecto si `ruta` termina en .gz
+        desde, hasta: Rango de fechas (inclusive) sobre la columna de fecha de la tabla
+        estado: Archivo JSON del modo incremental; se actualiza al terminar
+        arraysize: Filas por viaje a la BD
+
+    Returns:
+        ResultadoExportacion: Filas escritas y filas por segundo
+
+    Raises:
+        ValueError: Si la tabla, el formato o el rango no son válidos
+        database.DatabaseError: Si falla la consulta
+    """
+    if tabla not in TABLAS:
+        raise ValueError(f"Tabla inválida. Debe ser: {', '.join(TABLAS)}")
+    columna_id, columna_fecha, columna_cambios = TABLAS[tabla]
+    if (desde or hasta) and columna_fecha is None:
+        raise ValueError(f"La tabla {tabla} no tiene columna de fecha para filtrar por rango")
+    base = ruta[:-3] if ruta.endswith(".gz") else ruta
+    formato = (formato or os.path.splitext(base)[1].lstrip(".") or "csv").lower()
+    if formato not in ("csv", "jsonl"):
+        raise ValueError("Formato inválido. Debe ser: csv, jsonl")
+    if comprimir is None:
+        comprimir = ruta.endswith(".gz")
+
+    condiciones: List[str] = []
+    parametros: Dict[str, Any] = {}
+    if desde:
+        condiciones.append(f"{columna_fecha} >= :desde")
+        parametros["desde"] = desde
+    if hasta:
+        # Menor al día siguiente: incluye las columnas DATE de Oracle con hora
+        condiciones.append(f"{columna_fecha} < :hasta")
+        parametros["hasta"] = hasta + timedelta(days=1)
+
+    columna_marca = columna_cambios or columna_id
+    marca_anterior = _leer_estado(estado, tabla, columna_marca) if estado else None
+    if marca_anterior is not None:
+        condiciones.append(f"{columna_marca} > :marca")
+        parametros["marca"] = marca_anterior - MARGEN if columna_cambios else marca_anterior
+
+    sql = f"SELECT * FROM {tabla}" + (" WHERE " + " AND ".join(condiciones) if condiciones else "")
+
+    resultado = ResultadoExportacion(tabla)
+    marca = marca_anterior
+    inicio = time.perf_counter()
+    try:
+        # closing(): si la escritura falla, el cursor se cierra y la conexión vuelve al pool
+        with _abrir(ruta, comprimir) as salida, closing(_bloques(sql, parametros, arraysize)) as bloques:
+            columnas = next(bloques)
+            posicion_marca = columnas.index(columna_marca) if estado else None
+            escribir = _escritor_csv(salida, columnas) if formato == "csv" else _escritor_jsonl(salida, columnas)
+            for filas in bloques:
+                escribir(filas)
+                resultado.filas += len(filas)
+                if posicion_marca is not None:
+                    # Filas sin marca (modificado NULL en datos antiguos) se
+                    # exportan, pero no cuentan para la marca siguiente
+                    maximo = max((fila[posicion_marca] for fila in filas if fila[posicion_marca] is not None),
+                                 default=None)
+                    if maximo is not None and (marca is None or maximo > marca):
+                        marca = maximo
+                # Se suelta el bloque antes de leer el siguiente: en memoria hay uno solo
+                del filas
+    except BaseException:
+        # No se deja un archivo a medias que parezca una exportación completa
+        if ruta != "-" and os.path.exists(ruta):
+            os.remove(ruta)
+        raise
+    resultado.segundos = time.perf_counter() - inicio
+
+    if estado and marca is not None:
+        _guardar_estado(estado, tabla, columna_marca, marca)
+    return resultado
+
+
+def _bloques(sql: str, parametros: dict, arraysize: int) -> Iterator[Any]:
+    # Primero entrega los nombres de columna y luego bloques de `arraysize` filas
+    try:
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.arraysize = arraysize
+                cursor.prefetchrows = arraysize
+                cursor.execute(sql, parametros)
+                yield [descripcion[0].lower() for descripcion in cursor.description]
+                while True:
+                    filas = cursor.fetchmany()
+                    if not filas:
+                        break
+                    yield filas
+                    del filas
+    except database.DatabaseError as e:
+        eventos.error("exportacion.error_bd", "Error: {error}", error=e)
+        raise
+
+
+@contextmanager
+def _abrir(ruta: str, comprimir: bool) -> Iterator[TextIO]:
+    if ruta == "-":
+        yield sys.stdout
+        sys.stdout.flush()
+        return
+    if comprimir:
+        # Nivel 6: casi la misma compresión que 9 en bastante menos tiempo
+        with gzip.GzipFile(ruta, "wb", compresslevel=6) as binario:
+            with io.TextIOWrapper(io.BufferedWriter(binario, BUFFER), encoding="utf-8", newline="") as salida:
+                yield salida
+        return
+    with open(ruta, "w", encoding="utf-8", newline="", buffering=BUFFER) as salida:
+        yield salida
+
+
+def _escritor_csv(salida: TextIO, columnas: List[str]):
+    escritor = csv.writer(salida)
+    escritor.writerow(columnas)
+    return escritor.writerows
+
+
+def _escritor_jsonl(salida: TextIO, columnas: List[str]):
+    codificar = json.JSONEncoder(ensure_ascii=False, default=_a_texto).encode
+
+    def escribir(filas):
+        # Línea a línea al buffer de salida: sin armar el texto de todo el bloque
+        salida.writelines(codificar(dict(zip(columnas, fila))) + "\n" for fila in filas)
+    return escribir
+
+
+def _a_texto(valor: Any) -> Any:
+    # Fechas y Decimal de Oracle: mismo texto que en el CSV
+    if isinstance(valor, Decimal):
+        return float(valor)
+    return str(valor)
+
+
+def _leer_estado(estado: str, tabla: str, columna: str) -> Any:
+    if not os.path.exists(estado):
+        return None
+    with open(estado, encoding="utf-8") as archivo:
+        marcas = json.load(archivo)
+    marca = marcas.get(tabla)
+    if not marca or marca.get("columna") != columna:
+        return None
+    valor = marca["valor"]
+    return datetime.fromisoformat(valor) if isinstance(valor, str) else valor
+
+
+def _guardar_estado(estado: str, tabla: str, columna: str, valor: Any):
+    marcas = {}
+    if os.path.exists(estado):
+        with open(estado, encoding="utf-8") as archivo:
+            marcas = json.load(archivo)
+    if isinstance(valor, str):
+        # SQLite sin conversión de tipos entrega las marcas como texto
+        valor = datetime.fromisoformat(valor)
+    marcas[tabla] = {"columna": columna, "valor": valor.isoformat() if isinstance(valor, datetime) else valor}
+    temporal = f"{estado}.tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump(marcas, archivo, indent=2)
+    os.replace(temporal, estado)
@@ -0,0 +1,399 @@
+"""
+Módulo: dao/importacion.py
+Importación masiva de clientes, mascotas y citas desde archivos CSV o JSONL
+
+El archivo se procesa en streaming por tres etapas que corren en paralelo,
+unidas por colas acotadas:
+
+    lectura (parseo)  ->  validación + claves foráneas  ->  inserción por lotes
+
+Cada cola admite a lo sumo `profundidad` lotes, así que la memoria usada
+depende del tamaño de lote y no del tamaño del archivo: si la BD es más
+lenta que la lectura, el lector se bloquea hasta que haya espacio.
+
+Columnas esperadas (encabezado del CSV o claves de cada línea JSONL):
+- clientes: rut, nombres, apellidos, telefono, email, direccion
+- mascotas: nombre, especie, raza, edad, color, peso y rut_cliente (o id_cliente)
+- citas:    id_mascota, email_veterinario (o id_veterinario), fecha (AAAA-MM-DD),
+            hora (HH:MM), motivo, estado, diagnostico
+
+Con `checkpoint` se guarda, tras el commit de cada lote, cuántas filas del
+archivo ya se procesaron; si la importación se interrumpe, la siguiente
+ejecución con el mismo checkpoint continúa desde ahí. Un corte entre el
+commit y la escritura del checkpoint puede repetir ese último lote: en
+clientes los duplicados los rechaza uk_cliente_rut, en mascotas y citas
+conviene revisar el último lote antes de reanudar.
+"""
+
+import csv
+import json
+import os
+import queue
+import threading
+import time
+from datetime import date
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from models.cita import Cita
+from models.cliente import Cliente
+from models.mascota import Mascota
+from models.rut import normalizar_rut
+from models.validacion import describir, validar_columnas
+from dao.cita_dao import CitaDAO
+from dao.cliente_dao import ClienteDAO
+from dao.mascota_dao import MascotaDAO
+from dao.veterinario_dao import VeterinarioDAO
+from dao.disponibilidad import disponibilidad
+from dao.lotes import insertar_en_lotes
+from dao.secuencias import asignador
+
+ENTIDADES = ("clientes", "mascotas", "citas")
+
+# Rechazos que se conservan en el resultado (el total se cuenta igual)
+MAX_RECHAZOS = 1000
+
+# Marca de fin de datos en las colas
+_FIN = object()
+
+Fila = Tuple[int, Dict[str, Any]]  # (número de fila en el archivo, valores)
+
+
+class ResultadoImportacion:
+    """Resultado de una importación"""
+
+    def __init__(self, entidad: str, saltadas: int = 0):
+        self.entidad = entidad
+        self.saltadas = saltadas  # filas ya importadas según el checkpoint
+        self.leidas = 0
+        self.insertadas = 0
+        self.rechazadas = 0
+        self.lotes = 0
+        self.segundos = 0.0
+        # Pares (número de fila, mensaje); se guardan hasta MAX_RECHAZOS
+        self.rechazos: List[Tuple[int, str]] = []
+
+    @property
+    def filas_por_segundo(self) -> float:
+        return self.leidas / self.segundos if self.segundos else 0.0
+
+    def rechazar(self, fila: int, mensaje: str):
+        self.rechazadas += 1
+        if len(self.rechazos) < MAX_RECHAZOS:
+            self.rechazos.append((fila, mensaje))
+
+    def __str__(self) -> str:
+        return (f"ResultadoImportacion({self.entidad}: Leídas: {self.leidas}, Insertadas: {self.insertadas}, "
+                f"Rechazadas: {self.rechazadas}, {self.filas_por_segundo:,.0f} filas/s)")
+
+
+def importar(
+    entidad: str,
+    ruta: str,
+    formato: Optional[str] = None,
+    batch_size: int = 1000,
+    profundidad: int = 4,
+    checkpoint: Optional[str] = None,
+    rechazos: Optional[str] = None
+) -> ResultadoImportacion:
+    """
+    Importa un archivo CSV o JSONL en streaming.
+
+    Args:
+        entidad: "clientes", "mascotas" o "citas"
+        ruta: Archivo a importar
+        formato: "csv" o "jsonl"; por defecto según la extensión de `ruta`
+        batch_size: Filas por lote (validación, executemany y commit)
+        profundidad: Lotes que admite cada cola entre etapas
+        checkpoint: Archivo JSON de avance para reanudar; se borra al terminar
+        rechazos: Archivo JSONL donde anotar cada fila rechazada con su motivo
+
+    Returns:
+        ResultadoImportacion: Conteos, rechazos y filas por segundo
+
+    Raises:
+        ValueError: Si la entidad o el formato no son válidos
+        database.DatabaseError: Si falla algo distinto de una fila individual
+    """
+    if entidad not in ENTIDADES:
+        raise ValueError(f"Entidad inválida. Debe ser: {', '.join(ENTIDADES)}")
+    if batch_size < 1 or profundidad < 1:
+        raise ValueError("batch_size y profundidad deben ser mayores a 0")
+    formato = (formato or os.path.splitext(ruta)[1].lstrip(".")).lower()
+    if formato not in ("csv", "jsonl"):
+        raise ValueError("Formato inválido. Debe ser: csv, jsonl")
+
+    saltar = _leer_checkpoint(checkpoint, entidad, ruta)
+    resultado = ResultadoImportacion(entidad, saltar)
+    preparar = _PREPARAR[entidad]
+    sql, a_parametros = _INSERCION[entidad]
+
+    por_validar: queue.Queue = queue.Queue(maxsize=profundidad)
+    por_insertar: queue.Queue = queue.Queue(maxsize=profundidad)
+    detener = threading.Event()
+    fallas: List[BaseException] = []
+
+    def etapa(trabajo: Callable[[], None], salida: queue.Queue):
+        # Un error en una etapa se informa a la siguiente con la marca de fin
+        try:
+            trabajo()
+        except BaseException as e:
+            fallas.append(e)
+        finally:
+            _poner(salida, _FIN, detener)
+
+    def leer():
+        for lote in _lotes(_filas(ruta, formato), batch_size, saltar):
+            if not _poner(por_validar, lote, detener):
+                return
+
+    def validar():
+        while True:
+            lote = _tomar(por_validar, detener)
+            if lote is _FIN:
+                return
+            if not _poner(por_insertar, (preparar(lote), lote[-1][0]), detener):
+                return
+
+    hilos = [threading.Thread(target=etapa, args=(leer, por_validar), name="importar-lectura", daemon=True),
+             threading.Thread(target=etapa, args=(validar, por_insertar), name="importar-validacion", daemon=True)]
+    salida_rechazos = open(rechazos, "a", encoding="utf-8") if rechazos else None
+    inicio = time.perf_counter()
+    try:
+        for hilo in hilos:
+            hilo.start()
+        while True:
+            elemento = _tomar(por_insertar, detener)
+            if elemento is _FIN:
+                break
+            (objetos, filas, malas), ultima_fila = elemento
+            resultado.leidas += len(objetos) + len(malas)
+            if objetos:
+                lote = insertar_en_lotes(sql, objetos, a_parametros, len(objetos))
+                resultado.insertadas += lote.insertados
+                malas.extend((filas[pos], mensaje) for pos, mensaje in lote.errores)
+            resultado.lotes += 1
+            for fila, mensaje in sorted(malas):
+                resultado.rechazar(fila, mensaje)
+                if salida_rechazos:
+                    salida_rechazos.write(json.dumps({"fila": fila, "error": mensaje}, ensure_ascii=False) + "\n")
+            _guardar_checkpoint(checkpoint, entidad, ruta, ultima_fila)
+        if fallas:
+            raise fallas[0]
+    finally:
+        detener.set()
+        for hilo in hilos:
+            hilo.join()
+        if salida_rechazos:
+            salida_rechazos.close()
+        resultado.segundos = time.perf_counter() - inicio
+        if entidad == "citas" and resultado.insertadas:
+            disponibilidad.olvidar()
+
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return resultado
+
+
+# ---------------- Lectura ----------------
+
+def _filas(ruta: str, formato: str) -> Iterator[Fila]:
+    # Numeración desde 1 para las filas de datos (sin contar el encabezado del CSV)
+    with open(ruta, newline="", encoding="utf-8-sig") as archivo:
+        if formato == "csv":
+            yield from enumerate(csv.DictReader(archivo), start=1)
+            return
+        numero = 0
+        for linea in archivo:
+            if not linea.strip():
+                continue
+            numero += 1
+            try:
+                valores = json.loads(linea)
+            except ValueError as e:
+                valores = {"__error__": f"JSON inválido: {e}"}
+            yield numero, valores if isinstance(valores, dict) else {"__error__": "Se esperaba un objeto JSON"}
+
+
+def _lotes(filas: Iterator[Fila], batch_size: int, saltar: int) -> Iterator[List[Fila]]:
+    lote: List[Fila] = []
+    for fila in filas:
+        if fila[0] <= saltar:
+            continue
+        lote.append(fila)
+        if len(lote) == batch_size:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+# ---------------- Validación y claves foráneas ----------------
+#
+# Cada función recibe un lote de filas y retorna (objetos, filas, malas):
+# los objetos listos para insertar, el número de fila de cada objeto y los
+# pares (fila, mensaje) de las filas rechazadas.
+
+Preparado = Tuple[List[Any], List[int], List[Tuple[int, str]]]
+
+
+def _preparar_clientes(lote: List[Fila]) -> Preparado:
+    columnas = _columnas(lote, ("rut", "nombres", "apellidos", "telefono", "email", "direccion"))
+    errores = validar_columnas(email=columnas["email"], rut=columnas["rut"])
+    mensajes = [_mensaje(valores, errores[i], ("nombres", "apellidos"), columnas, i)
+                for i, (_, valores) in enumerate(lote)]
+    return _construir(lote, mensajes, "seq_cliente", lambda id_cliente, i: Cliente(
+        id_cliente, normalizar_rut(columnas["rut"][i]), columnas["nombres"][i], columnas["apellidos"][i],
+        columnas["telefono"][i], columnas["email"][i], columnas["direccion"][i]))
+
+
+def _preparar_mascotas(lote: List[Fila]) -> Preparado:
+    columnas = _columnas(lote, ("nombre", "especie", "raza", "edad", "color", "peso", "rut_cliente", "id_cliente"))
+    errores = validar_columnas(especie=columnas["especie"], edad=columnas["edad"], peso=columnas["peso"])
+    clientes = _resolver(columnas["rut_cliente"], columnas["id_cliente"], normalizar_rut, ClienteDAO.ids_por_rut)
+    mensajes = []
+    for i, (_, valores) in enumerate(lote):
+        mensaje = _mensaje(valores, errores[i], ("nombre",), columnas, i)
+        if not mensaje and clientes[i] is None:
+            mensaje = _sin_referencia("cliente", "rut_cliente", columnas["rut_cliente"][i] or columnas["id_cliente"][i])
+        mensajes.append(mensaje)
+    return _construir(lote, mensajes, "seq_mascota", lambda id_mascota, i: Mascota(
+        id_mascota, columnas["nombre"][i], columnas["especie"][i].strip().upper(), columnas["raza"][i],
+        int(float(columnas["edad"][i])), columnas["color"][i],
+        float(columnas["peso"][i]) if columnas["peso"][i] is not None else None, clientes[i]))
+
+
+def _preparar_citas(lote: List[Fila]) -> Preparado:
+    columnas = _columnas(lote, ("id_mascota", "email_veterinario", "id_veterinario", "fecha", "hora",
+                                "motivo", "estado", "diagnostico"))
+    errores = validar_columnas(estado=columnas["estado"])
+    veterinarios = _resolver(columnas["email_veterinario"], columnas["id_veterinario"], str.strip,
+                             VeterinarioDAO.ids_por_email)
+    mensajes = []
+    valores_cita: Dict[int, tuple] = {}
+    for i, (_, valores) in enumerate(lote):
+        mensaje = _mensaje(valores, errores[i], ("id_mascota", "fecha", "hora"), columnas, i)
+        if not mensaje and veterinarios[i] is None:
+            mensaje = _sin_referencia("veterinario", "email_veterinario",
+                                      columnas["email_veterinario"][i] or columnas["id_veterinario"][i])
+        if not mensaje:
+            # Sin reglas de reserva: se importan también citas históricas, a
+            # cualquier hora; la BD sólo rechaza dos citas activas con el mismo inicio
+            try:
+                valores_cita[i] = (int(columnas["id_mascota"][i]), date.fromisoformat(str(columnas["fecha"][i]).strip()),
+                                   Cita.minutos_a_hora(Cita.hora_a_minutos(columnas["hora"][i])))
+            except (TypeError, ValueError) as e:
+                mensaje = f"Fecha, hora o mascota inválida: {e}"
+        mensajes.append(mensaje)
+    return _construir(lote, mensajes, "seq_cita", lambda id_cita, i: Cita(
+        id_cita, valores_cita[i][0], veterinarios[i], valores_cita[i][1], valores_cita[i][2],
+        columnas["motivo"][i] or "", (columnas["estado"][i] or Cita.ESTADO_PENDIENTE).strip(),
+        columnas["diagnostico"][i] or None))
+
+
+def _construir(lote: List[Fila], mensajes: List[Optional[str]], secuencia: str,
+               crear: Callable[[int, int], Any]) -> Preparado:
+    # Los IDs se reservan sólo para las filas válidas, sin dejar huecos por los rechazos
+    validas = [i for i, mensaje in enumerate(mensajes) if not mensaje]
+    ids = asignador.reservar(secuencia, len(validas)) if validas else []
+    objetos = [crear(id_nuevo, i) for id_nuevo, i in zip(ids, validas)]
+    filas = [lote[i][0] for i in validas]
+    malas = [(lote[i][0], mensaje) for i, mensaje in enumerate(mensajes) if mensaje]
+    return objetos, filas, malas
+
+
+def _columnas(lote: List[Fila], nombres: Tuple[str, ...]) -> Dict[str, List[Any]]:
+    # De filas (diccionarios) a columnas; los vacíos del CSV quedan como None
+    return {nombre: [valores.get(nombre) if valores.get(nombre) != "" else None for _, valores in lote]
+            for nombre in nombres}
+
+
+def _mensaje(valores: Dict[str, Any], codigo: int, obligatorias: Tuple[str, ...],
+             columnas: Dict[str, List[Any]], i: int) -> Optional[str]:
+    if "__error__" in valores:
+        return valores["__error__"]
+    faltantes = [nombre for nombre in obligatorias if columnas[nombre][i] is None]
+    mensajes = describir(int(codigo)) + [f"Falta el campo '{nombre}'" for nombre in faltantes]
+    return "; ".join(mensajes) or None
+
+
+def _sin_referencia(tabla: str, campo: str, valor: Any) -> str:
+    if valor is None:
+        return f"Falta el campo '{campo}'"
+    return f"No existe el {tabla} {valor}"
+
+
+def _resolver(claves: List[Any], ids: List[Any], normalizar: Callable[[str], str],
+              buscar: Callable[[List[str]], Dict[str, int]]) -> List[Optional[int]]:
+    # Clave foránea por fila: el ID explícito si viene, si no la clave natural
+    # (RUT o email) traducida con una consulta IN por lote
+    normalizadas: List[Optional[str]] = []
+    for clave in claves:
+        try:
+            normalizadas.append(normalizar(str(clave)) if clave is not None else None)
+        except ValueError:
+            normalizadas.append(None)
+    encontrados = buscar([clave for clave in set(normalizadas) if clave])
+    resultado = []
+    for clave, id_explicito in zip(normalizadas, ids):
+        if id_explicito is not None:
+            try:
+                resultado.append(int(id_explicito))
+                continue
+            except (TypeError, ValueError):
+                pass
+        resultado.append(encontrados.get(clave) if clave else None)
+    return resultado
+
+
+_PREPARAR: Dict[str, Callable[[List[Fila]], Preparado]] = {
+    "clientes": _preparar_clientes,
+    "mascotas": _preparar_mascotas,
+    "citas": _preparar_citas,
+}
+
+_INSERCION = {
+    "clientes": (ClienteDAO._SQL_INSERT, ClienteDAO._parametros),
+    "mascotas": (MascotaDAO._SQL_INSERT, MascotaDAO._parametros),
+    "citas": (CitaDAO._SQL_INSERT, CitaDAO._parametros),
+}
+
+
+# ---------------- Colas y checkpoint ----------------
+
+def _poner(cola: queue.Queue, elemento: Any, detener: threading.Event) -> bool:
+    # Espera espacio en la cola salvo que la importación se haya detenido
+    while not detener.is_set():
+        try:
+            cola.put(elemento, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _tomar(cola: queue.Queue, detener: threading.Event) -> Any:
+    while not detener.is_set():
+        try:
+            return cola.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _FIN
+
+
+def _leer_checkpoint(checkpoint: Optional[str], entidad: str, ruta: str) -> int:
+    if not checkpoint or not os.path.exists(checkpoint):
+        return 0
+    with open(checkpoint, encoding="utf-8") as archivo:
+        avance = json.load(archivo)
+    if avance.get("entidad") != entidad or avance.get("archivo") != os.path.abspath(ruta):
+        raise ValueError(f"El checkpoint {checkpoint} corresponde a otra importación")
+    return int(avance.get("filas", 0))
+
+
+def _guardar_checkpoint(checkpoint: Optional[str], entidad: str, ruta: str, filas: int):
+    if not checkpoint:
+        return
+    # Se escribe a un temporal y se reemplaza, para no dejar un checkpoint a medias
+    temporal = f"{checkpoint}.tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump({"entidad": entidad, "archivo": os.path.abspath(ruta), "filas": filas}, archivo)
+    os.replace(temporal, checkpoint)
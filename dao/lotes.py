@@ -0,0 +1,113 @@
+"""
+Módulo: dao/lotes.py
+Inserción masiva con array binding para los DAO
+
+Los DAO exponen create_many(), que convierte cada objeto en su diccionario
+de parámetros y delega aquí la ejecución por lotes: un executemany y un
+commit por lote, con los errores por fila recolectados en lugar de abortar.
+"""
+
+from itertools import islice
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+import database
+from database import get_connection
+
+
+class ResultadoLote:
+    """Resultado de una inserción masiva"""
+
+    def __init__(self):
+        self.insertados = 0
+        self.lotes = 0
+        # Pares (posición en el iterable de entrada, mensaje de error)
+        self.errores: List[Tuple[int, str]] = []
+
+    @property
+    def total(self) -> int:
+        return self.insertados + len(self.errores)
+
+    def __str__(self) -> str:
+        return (f"ResultadoLote(Insertados: {self.insertados}, "
+                f"Errores: {len(self.errores)}, Lotes: {self.lotes})")
+
+
+def insertar_en_lotes(
+    sql: str,
+    objetos: Iterable[Any],
+    a_parametros: Callable[[Any], dict],
+    batch_size: int = 1000,
+    atomico: bool = False,
+    cursor: Optional[Any] = None
+) -> ResultadoLote:
+    """
+    Inserta objetos en lotes de `batch_size` filas.
+
+    Consume `objetos` de a un lote por vez, de modo que acepta generadores
+    sin materializar toda la entrada en memoria.
+
+    Args:
+        sql: INSERT con parámetros nombrados
+        objetos: Iterable (o generador) de objetos del modelo
+        a_parametros: Convierte un objeto en el diccionario de parámetros
+        batch_size: Filas por executemany y por commit
+        atomico: Un solo commit al final; si alguna fila falla se deshace
+            todo y `insertados` queda en 0
+        cursor: Cursor de una transacción ya abierta por quien llama: las
+            filas se insertan en ella y no se confirma ni deshace nada
+
+    Returns:
+        ResultadoLote: Filas insertadas y errores por fila (también los
+            ValueError/TypeError de `a_parametros`)
+
+    Raises:
+        database.DatabaseError: Si falla algo distinto de una fila individual
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size debe ser mayor a 0")
+
+    if cursor is not None:
+        return _insertar(cursor, sql, objetos, a_parametros, batch_size, None)
+
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            resultado = _insertar(cursor, sql, objetos, a_parametros, batch_size, None if atomico else conn.commit)
+            if atomico:
+                if resultado.errores:
+                    conn.rollback()
+                    resultado.insertados = 0
+                else:
+                    conn.commit()
+    return resultado
+
+
+def _insertar(cursor: Any, sql: str, objetos: Iterable[Any], a_parametros: Callable[[Any], dict],
+              batch_size: int, confirmar: Optional[Callable[[], None]]) -> ResultadoLote:
+    # Un executemany por lote; `confirmar` (si se da) se llama tras cada uno
+    resultado = ResultadoLote()
+    motor = database.backend()
+    iterador = iter(objetos)
+    desplazamiento = 0
+    while True:
+        lote = list(islice(iterador, batch_size))
+        if not lote:
+            break
+        # Un objeto que no se puede convertir (p. ej. un RUT inválido) es un
+        # error de su fila, igual que una violación de restricción
+        filas, posiciones, errores = [], [], []
+        for pos, obj in enumerate(lote):
+            try:
+                filas.append(a_parametros(obj))
+                posiciones.append(pos)
+            except (ValueError, TypeError) as e:
+                errores.append((pos, str(e)))
+        if filas:
+            errores.extend((posiciones[pos], msg) for pos, msg in motor.ejecutar_lote(cursor, sql, filas))
+            errores.sort()
+            if confirmar is not None:
+                confirmar()
+            resultado.lotes += 1
+
+        resultado.insertados += len(lote) - len(errores)
+        resultado.errores.extend((desplazamiento + pos, msg) for pos, msg in errores)
+        desplazamiento += len(lote)
+    return resultado
@@ -1,28 +1,69 @@
 """DAO para Mascota"""
-import oracledb
-from typing import List, Optional
+import database
+import eventos
+from typing import Dict, Iterable, Iterator, List, Optional
 from models.mascota import Mascota
 from database import get_connection
+from dao.lotes import ResultadoLote, insertar_en_lotes
+from dao.secuencias import asignador
+from dao.cache import en_cache, invalida_cache
+from dao.cursores import iterar_filas, leer_por_ids
 
 class MascotaDAO:
+    _SQL_INSERT = "INSERT INTO mascota (id_mascota, nombre, especie, raza, edad, color, peso, id_cliente) VALUES (:id, :nombre, :especie, :raza, :edad, :color, :peso, :id_cliente)"
+    
     @staticmethod
     def create(mascota: Mascota) -> bool:
-        sql = "INSERT INTO mascota (id_mascota, nombre, especie, raza, edad, color, peso, id_cliente) VALUES (:id, :nombre, :especie, :raza, :edad, :color, :peso, :id_cliente)"
+        sql = MascotaDAO._SQL_INSERT
         try:
             with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(sql, {"id": mascota.id_mascota, "nombre": mascota.nombre, "especie": mascota.especie, "raza": mascota.raza, "edad": mascota.edad, "color": mascota.color, "peso": mascota.peso, "id_cliente": mascota.id_cliente})
+                    cursor.execute(sql, MascotaDAO._parametros(mascota))
                     conn.commit()
-                    print(f"✓ Mascota '{mascota.nombre}' creada exitosamente.")
+                    eventos.info("mascota.creado", "Mascota '{nombre}' creada exitosamente.", nombre=mascota.nombre)
                     return True
-        except oracledb.IntegrityError:
-            print(f"✗ Error: La mascota ya existe o el cliente no existe.")
+        except database.IntegrityError:
+            eventos.error("mascota.integridad", "Error: La mascota ya existe o el cliente no existe.")
             return False
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.DatabaseError as e:
+            eventos.error("mascota.error_bd", "Error: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def create_many(mascotas: Iterable[Mascota], batch_size: int = 1000) -> ResultadoLote:
+        sql = MascotaDAO._SQL_INSERT
+        try:
+            resultado = insertar_en_lotes(sql, mascotas, MascotaDAO._parametros, batch_size)
+            eventos.info("mascota.lote_insertado", "{insertados} mascota(s) insertado(s) en {lotes} lote(s).", insertados=resultado.insertados, lotes=resultado.lotes)
+            if resultado.errores:
+                eventos.aviso("mascota.lote_rechazos", "{rechazadas} fila(s) rechazada(s).", rechazadas=len(resultado.errores))
+            return resultado
+        except database.DatabaseError as e:
+            eventos.error("mascota.error_bd", "Error: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def create_returning_id(mascota: Mascota) -> int:
+        sql = MascotaDAO._SQL_INSERT
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    nuevo_id = database.backend().insertar_retornando_id(
+                        cursor, sql, MascotaDAO._parametros(mascota), "id", "seq_mascota", "id_mascota"
+                    )
+                    conn.commit()
+                    mascota.id_mascota = nuevo_id
+                    eventos.info("mascota.creado", "Mascota '{nombre}' creada exitosamente.", nombre=mascota.nombre)
+                    return nuevo_id
+        except database.IntegrityError:
+            eventos.error("mascota.integridad", "Error: La mascota ya existe o el cliente no existe.")
+            return -1
+        except database.DatabaseError as e:
+            eventos.error("mascota.error_bd", "Error: {error}", error=e)
             raise
     
     @staticmethod
+    @en_cache("mascota")
     def read_by_id(id_mascota: int) -> Optional[Mascota]:
         sql = "SELECT * FROM mascota WHERE id_mascota = :id"
         try:
@@ -31,27 +72,50 @@ class MascotaDAO:
                     cursor.execute(sql, {"id": id_mascota})
                     row = cursor.fetchone()
                     if not row:
-                        print(f"✗ No se encontró mascota con ID {id_mascota}")
+                        eventos.aviso("mascota.no_encontrado", "No se encontró mascota con ID {id_mascota}", id_mascota=id_mascota)
                         return None
-                    return Mascota(*row)
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+                    return Mascota.from_row(row)
+        except database.DatabaseError as e:
+            eventos.error("mascota.error_bd", "Error: {error}", error=e)
             raise
     
+    @staticmethod
+    def read_by_ids(ids: Iterable[int]) -> Dict[int, Optional[Mascota]]:
+        return leer_por_ids("mascota", "id_mascota", ids, Mascota.from_row)
+    
     @staticmethod
     def read_all(limit: int = 100) -> List[Mascota]:
-        sql = f"SELECT * FROM mascota FETCH FIRST {limit} ROWS ONLY"
+        sql = database.backend().limitar("SELECT * FROM mascota", limit)
         mascotas = []
         try:
             with get_connection() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute(sql)
                     for row in cursor:
-                        mascotas.append(Mascota(*row))
-                    print(f"✓ Se encontraron {len(mascotas)} mascota(s).")
+                        mascotas.append(Mascota.from_row(row))
+                    eventos.info("mascota.listado", "Se encontraron {cantidad} mascota(s).", cantidad=len(mascotas))
                     return mascotas
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.DatabaseError as e:
+            eventos.error("mascota.error_bd", "Error: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def iter_all(arraysize: Optional[int] = None) -> Iterator[Mascota]:
+        sql = "SELECT * FROM mascota ORDER BY id_mascota"
+        return (Mascota.from_row(row) for row in iterar_filas(sql, None, arraysize))
+    
+    @staticmethod
+    def read_page(after_id: int = 0, page_size: int = 20) -> List[Mascota]:
+        # Paginación por clave: la página siguiente empieza después del último
+        # id_mascota visto, así el costo no depende de cuántas páginas se saltaron.
+        sql = database.backend().limitar("SELECT * FROM mascota WHERE id_mascota > :after_id ORDER BY id_mascota", page_size)
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql, {"after_id": after_id})
+                    return [Mascota.from_row(row) for row in cursor]
+        except database.DatabaseError as e:
+            eventos.error("mascota.error_bd", "Error: {error}", error=e)
             raise
     
     @staticmethod
@@ -63,13 +127,19 @@ class MascotaDAO:
                 with conn.cursor() as cursor:
                     cursor.execute(sql, {"id": id_cliente})
                     for row in cursor:
-                        mascotas.append(Mascota(*row))
+                        mascotas.append(Mascota.from_row(row))
                     return mascotas
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.DatabaseError as e:
+            eventos.error("mascota.error_bd", "Error: {error}", error=e)
             raise
     
     @staticmethod
+    def iter_by_cliente(id_cliente: int, arraysize: Optional[int] = None) -> Iterator[Mascota]:
+        sql = "SELECT * FROM mascota WHERE id_cliente = :id"
+        return (Mascota.from_row(row) for row in iterar_filas(sql, {"id": id_cliente}, arraysize))
+    
+    @staticmethod
+    @invalida_cache("mascota", lambda mascota: mascota.id_mascota)
     def update(mascota: Mascota) -> bool:
         sql = "UPDATE mascota SET nombre=:nombre, especie=:especie, raza=:raza, edad=:edad, color=:color, peso=:peso, id_cliente=:id_cliente WHERE id_mascota=:id"
         try:
@@ -77,16 +147,17 @@ class MascotaDAO:
                 with conn.cursor() as cursor:
                     cursor.execute(sql, {"nombre": mascota.nombre, "especie": mascota.especie, "raza": mascota.raza, "edad": mascota.edad, "color": mascota.color, "peso": mascota.peso, "id_cliente": mascota.id_cliente, "id": mascota.id_mascota})
                     if cursor.rowcount == 0:
-                        print(f"✗ No se encontró mascota con ID {mascota.id_mascota}")
+                        eventos.aviso("mascota.no_encontrado", "No se encontró mascota con ID {id_mascota}", id_mascota=mascota.id_mascota)
                         return False
                     conn.commit()
-                    print(f"✓ Mascota ID {mascota.id_mascota} actualizada.")
+                    eventos.info("mascota.actualizado", "Mascota ID {id_mascota} actualizada.", id_mascota=mascota.id_mascota)
                     return True
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.DatabaseError as e:
+            eventos.error("mascota.error_bd", "Error: {error}", error=e)
             raise
     
     @staticmethod
+    @invalida_cache("mascota", lambda id_mascota: id_mascota, elimina=True)
     def delete(id_mascota: int) -> bool:
         sql = "DELETE FROM mascota WHERE id_mascota = :id"
         try:
@@ -94,26 +165,26 @@ class MascotaDAO:
                 with conn.cursor() as cursor:
                     cursor.execute(sql, {"id": id_mascota})
                     if cursor.rowcount == 0:
-                        print(f"✗ No se encontró mascota con ID {id_mascota}")
+                        eventos.aviso("mascota.no_encontrado", "No se encontró mascota con ID {id_mascota}", id_mascota=id_mascota)
                         return False
                     conn.commit()
-                    print(f"✓ Mascota ID {id_mascota} eliminada.")
+                    eventos.info("mascota.eliminado", "Mascota ID {id_mascota} eliminada.", id_mascota=id_mascota)
                     return True
-        except oracledb.IntegrityError:
-            print(f"✗ Error: No se puede eliminar la mascota porque tiene citas asociadas.")
+        except database.IntegrityError:
+            eventos.error("mascota.con_dependientes", "Error: No se puede eliminar la mascota porque tiene citas asociadas.")
             return False
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.DatabaseError as e:
+            eventos.error("mascota.error_bd", "Error: {error}", error=e)
             raise
     
     @staticmethod
     def create_with_sequence() -> int:
-        sql = "SELECT seq_mascota.NEXTVAL FROM DUAL"
         try:
-            with get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute(sql)
-                    return cursor.fetchone()[0]
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+            return asignador.siguiente("seq_mascota")
+        except database.DatabaseError as e:
+            eventos.error("mascota.error_bd", "Error: {error}", error=e)
             return -1
+    
+    @staticmethod
+    def _parametros(mascota: Mascota) -> dict:
+        return {"id": mascota.id_mascota, "nombre": mascota.nombre, "especie": mascota.especie, "raza": mascota.raza, "edad": mascota.edad, "color": mascota.color, "peso": mascota.peso, "id_cliente": mascota.id_cliente}
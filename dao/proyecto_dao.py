@@ -3,45 +3,91 @@ Módulo: dao/proyecto_dao.py
 Data Access Object para la entidad Proyecto
 """
 
-import oracledb
-from typing import List, Optional
+import database
+import eventos
+from typing import Dict, Iterable, Iterator, List, Optional
 from models.proyecto import Proyecto
 from database import get_connection
+from dao.lotes import ResultadoLote, insertar_en_lotes
+from dao.secuencias import asignador
+from dao.cursores import iterar_filas, leer_por_ids
 
 
 class ProyectoDAO:
     """Clase para manejar operaciones CRUD de Proyecto"""
     
+    _SQL_INSERT = """
+        INSERT INTO proyecto 
+        (id_proyecto, nombre, descripcion, fecha_inicio, fecha_fin, presupuesto, estado)
+        VALUES 
+        (:id_proyecto, :nombre, :descripcion, :fecha_inicio, :fecha_fin, :presupuesto, :estado)
+    """
+    
     @staticmethod
     def create(proyecto: Proyecto) -> bool:
         """Crea un nuevo proyecto en la base de datos"""
-        sql = """
-            INSERT INTO proyecto 
-            (id_proyecto, nombre, descripcion, fecha_inicio, fecha_fin, presupuesto, estado)
-            VALUES 
-            (:id_proyecto, :nombre, :descripcion, :fecha_inicio, :fecha_fin, :presupuesto, :estado)
-        """
+        sql = ProyectoDAO._SQL_INSERT
         
         try:
             with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(sql, {
-                        "id_proyecto": proyecto.id_proyecto,
-                        "nombre": proyecto.nombre,
-                        "descripcion": proyecto.descripcion,
-                        "fecha_inicio": proyecto.fecha_inicio,
-                        "fecha_fin": proyecto.fecha_fin,
-                        "presupuesto": proyecto.presupuesto,
-                        "estado": proyecto.estado
-                    })
+                    cursor.execute(sql, ProyectoDAO._parametros(proyecto))
                     conn.commit()
-                    print(f"✓ Proyecto '{proyecto.nombre}' creado exitosamente.")
+                    eventos.info("proyecto.creado", "Proyecto '{nombre}' creado exitosamente.", nombre=proyecto.nombre)
                     return True
-        except oracledb.IntegrityError as e:
-            print(f"✗ Error: El proyecto ya existe.")
+        except database.IntegrityError as e:
+            eventos.error("proyecto.integridad", "Error: El proyecto ya existe.")
             return False
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error de base de datos: {e}")
+        except database.DatabaseError as e:
+            eventos.error("proyecto.error_bd", "Error de base de datos: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def create_many(proyectos: Iterable[Proyecto], batch_size: int = 1000) -> ResultadoLote:
+        """
+        Inserta proyecto(s) en lotes con array binding y un commit por lote.
+        
+        Acepta generadores: sólo se mantiene en memoria un lote a la vez.
+        Las filas rechazadas se informan en ResultadoLote.errores.
+        """
+        sql = ProyectoDAO._SQL_INSERT
+        
+        try:
+            resultado = insertar_en_lotes(sql, proyectos, ProyectoDAO._parametros, batch_size)
+            eventos.info("proyecto.lote_insertado", "{insertados} proyecto(s) insertado(s) en {lotes} lote(s).", insertados=resultado.insertados, lotes=resultado.lotes)
+            if resultado.errores:
+                eventos.aviso("proyecto.lote_rechazos", "{rechazadas} fila(s) rechazada(s).", rechazadas=len(resultado.errores))
+            return resultado
+        except database.DatabaseError as e:
+            eventos.error("proyecto.error_lote", "Error en inserción masiva: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def create_returning_id(proyecto: Proyecto) -> int:
+        """
+        Inserta un proyecto tomando el ID de seq_proyecto en la misma sentencia
+        (INSERT ... RETURNING), sin un viaje previo para obtener el ID.
+        
+        Returns:
+            int: ID asignado o -1 si hay un problema de integridad
+        """
+        sql = ProyectoDAO._SQL_INSERT
+        
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    nuevo_id = database.backend().insertar_retornando_id(
+                        cursor, sql, ProyectoDAO._parametros(proyecto), "id_proyecto", "seq_proyecto", "id_proyecto"
+                    )
+                    conn.commit()
+                    proyecto.id_proyecto = nuevo_id
+                    eventos.info("proyecto.creado", "Proyecto '{nombre}' creado exitosamente.", nombre=proyecto.nombre)
+                    return nuevo_id
+        except database.IntegrityError as e:
+            eventos.error("proyecto.integridad", "Error: El proyecto ya existe.")
+            return -1
+        except database.DatabaseError as e:
+            eventos.error("proyecto.error_bd", "Error de base de datos: {error}", error=e)
             raise
     
     @staticmethod
@@ -56,18 +102,23 @@ class ProyectoDAO:
                     row = cursor.fetchone()
                     
                     if not row:
-                        print(f"✗ No se encontró proyecto con ID {id_proyecto}")
+                        eventos.aviso("proyecto.no_encontrado", "No se encontró proyecto con ID {id_proyecto}", id_proyecto=id_proyecto)
                         return None
                     
                     return ProyectoDAO._row_to_proyecto(row)
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al leer proyecto: {e}")
+        except database.DatabaseError as e:
+            eventos.error("proyecto.error_bd", "Error al leer proyecto: {error}", error=e)
             raise
     
+    @staticmethod
+    def read_by_ids(ids: Iterable[int]) -> Dict[int, Optional[Proyecto]]:
+        """Lee varios proyectos por ID en pocas consultas (None si no existe)"""
+        return leer_por_ids("proyecto", "id_proyecto", ids, ProyectoDAO._row_to_proyecto)
+    
     @staticmethod
     def read_all(limit: int = 100) -> List[Proyecto]:
         """Lee todos los proyectos"""
-        sql = f"SELECT * FROM proyecto FETCH FIRST {limit} ROWS ONLY"
+        sql = database.backend().limitar("SELECT * FROM proyecto", limit)
         proyectos = []
         
         try:
@@ -78,12 +129,18 @@ class ProyectoDAO:
                     for row in cursor:
                         proyectos.append(ProyectoDAO._row_to_proyecto(row))
                     
-                    print(f"✓ Se encontraron {len(proyectos)} proyecto(s).")
+                    eventos.info("proyecto.listado", "Se encontraron {cantidad} proyecto(s).", cantidad=len(proyectos))
                     return proyectos
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al listar proyectos: {e}")
+        except database.DatabaseError as e:
+            eventos.error("proyecto.error_bd", "Error al listar proyectos: {error}", error=e)
             raise
     
+    @staticmethod
+    def iter_all(arraysize: Optional[int] = None) -> Iterator[Proyecto]:
+        """Recorre todos los proyectos sin materializar la lista (ver dao/cursores.py)"""
+        sql = "SELECT * FROM proyecto ORDER BY id_proyecto"
+        return (ProyectoDAO._row_to_proyecto(row) for row in iterar_filas(sql, None, arraysize))
+    
     @staticmethod
     def update(proyecto: Proyecto) -> bool:
         """Actualiza un proyecto existente"""
@@ -112,14 +169,14 @@ class ProyectoDAO:
                     })
                     
                     if cursor.rowcount == 0:
-                        print(f"✗ No se encontró proyecto con ID {proyecto.id_proyecto}")
+                        eventos.aviso("proyecto.no_encontrado", "No se encontró proyecto con ID {id_proyecto}", id_proyecto=proyecto.id_proyecto)
                         return False
                     
                     conn.commit()
-                    print(f"✓ Proyecto ID {proyecto.id_proyecto} actualizado.")
+                    eventos.info("proyecto.actualizado", "Proyecto ID {id_proyecto} actualizado.", id_proyecto=proyecto.id_proyecto)
                     return True
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al actualizar proyecto: {e}")
+        except database.DatabaseError as e:
+            eventos.error("proyecto.error_bd", "Error al actualizar proyecto: {error}", error=e)
             raise
     
     @staticmethod
@@ -133,17 +190,17 @@ class ProyectoDAO:
                     cursor.execute(sql, {"id_proyecto": id_proyecto})
                     
                     if cursor.rowcount == 0:
-                        print(f"✗ No se encontró proyecto con ID {id_proyecto}")
+                        eventos.aviso("proyecto.no_encontrado", "No se encontró proyecto con ID {id_proyecto}", id_proyecto=id_proyecto)
                         return False
                     
                     conn.commit()
-                    print(f"✓ Proyecto ID {id_proyecto} eliminado.")
+                    eventos.info("proyecto.eliminado", "Proyecto ID {id_proyecto} eliminado.", id_proyecto=id_proyecto)
                     return True
-        except oracledb.IntegrityError:
-            print(f"✗ Error: No se puede eliminar el proyecto porque tiene registros asociados.")
+        except database.IntegrityError:
+            eventos.error("proyecto.con_dependientes", "Error: No se puede eliminar el proyecto porque tiene registros asociados.")
             return False
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al eliminar proyecto: {e}")
+        except database.DatabaseError as e:
+            eventos.error("proyecto.error_bd", "Error al eliminar proyecto: {error}", error=e)
             raise
     
     @staticmethod
@@ -165,13 +222,21 @@ class ProyectoDAO:
     @staticmethod
     def create_with_sequence() -> int:
         """Obtiene el siguiente ID de la secuencia"""
-        sql = "SELECT seq_proyecto.NEXTVAL FROM DUAL"
-        
         try:
-            with get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute(sql)
-                    return cursor.fetchone()[0]
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al obtener siguiente ID: {e}")
+            return asignador.siguiente("seq_proyecto")
+        except database.DatabaseError as e:
+            eventos.error("proyecto.error_secuencia", "Error al obtener siguiente ID: {error}", error=e)
             return -1
+    
+    @staticmethod
+    def _parametros(proyecto: Proyecto) -> dict:
+        """Convierte un Proyecto en los parámetros del INSERT"""
+        return {
+            "id_proyecto": proyecto.id_proyecto,
+            "nombre": proyecto.nombre,
+            "descripcion": proyecto.descripcion,
+            "fecha_inicio": proyecto.fecha_inicio,
+            "fecha_fin": proyecto.fecha_fin,
+            "presupuesto": proyecto.presupuesto,
+            "estado": proyecto.estado
+        }
@@ -3,44 +3,91 @@ Módulo: dao/registro_tiempo_dao.py
 Data Access Object para la entidad RegistroTiempo
 """
 
-import oracledb
-from typing import List, Optional
+import database
+import eventos
+from typing import Iterable, Iterator, List, Optional
 from models.registro_tiempo import RegistroTiempo
 from database import get_connection
+from dao.lotes import ResultadoLote, insertar_en_lotes
+from dao.secuencias import asignador
+from dao.cursores import iterar_filas
 
 
 class RegistroTiempoDAO:
     """Clase para manejar operaciones CRUD de RegistroTiempo"""
     
+    _SQL_INSERT = """
+        INSERT INTO registro_tiempo 
+        (id_registro, id_empleado, id_proyecto, fecha, horas_trabajadas, descripcion_actividad)
+        VALUES 
+        (:id_registro, :id_empleado, :id_proyecto, :fecha, :horas_trabajadas, :descripcion_actividad)
+    """
+    
     @staticmethod
     def create(registro: RegistroTiempo) -> bool:
         """Crea un nuevo registro de tiempo en la base de datos"""
-        sql = """
-            INSERT INTO registro_tiempo 
-            (id_registro, id_empleado, id_proyecto, fecha, horas_trabajadas, descripcion_actividad)
-            VALUES 
-            (:id_registro, :id_empleado, :id_proyecto, :fecha, :horas_trabajadas, :descripcion_actividad)
-        """
+        sql = RegistroTiempoDAO._SQL_INSERT
         
         try:
             with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(sql, {
-                        "id_registro": registro.id_registro,
-                        "id_empleado": registro.id_empleado,
-                        "id_proyecto": registro.id_proyecto,
-                        "fecha": registro.fecha,
-                        "horas_trabajadas": registro.horas_trabajadas,
-                        "descripcion_actividad": registro.descripcion_actividad
-                    })
+                    cursor.execute(sql, RegistroTiempoDAO._parametros(registro))
                     conn.commit()
-                    print(f"✓ Registro de tiempo creado exitosamente.")
+                    eventos.info("registro_tiempo.creado", "Registro de tiempo creado exitosamente.")
                     return True
-        except oracledb.IntegrityError as e:
-            print(f"✗ Error: Problema de integridad al crear registro.")
+        except database.IntegrityError as e:
+            eventos.error("registro_tiempo.integridad", "Error: Problema de integridad al crear registro.")
             return False
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error de base de datos: {e}")
+        except database.DatabaseError as e:
+            eventos.error("registro_tiempo.error_bd", "Error de base de datos: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def create_many(registros: Iterable[RegistroTiempo], batch_size: int = 1000) -> ResultadoLote:
+        """
+        Inserta registro(s) en lotes con array binding y un commit por lote.
+        
+        Acepta generadores: sólo se mantiene en memoria un lote a la vez.
+        Las filas rechazadas se informan en ResultadoLote.errores.
+        """
+        sql = RegistroTiempoDAO._SQL_INSERT
+        
+        try:
+            resultado = insertar_en_lotes(sql, registros, RegistroTiempoDAO._parametros, batch_size)
+            eventos.info("registro_tiempo.lote_insertado", "{insertados} registro(s) insertado(s) en {lotes} lote(s).", insertados=resultado.insertados, lotes=resultado.lotes)
+            if resultado.errores:
+                eventos.aviso("registro_tiempo.lote_rechazos", "{rechazadas} fila(s) rechazada(s).", rechazadas=len(resultado.errores))
+            return resultado
+        except database.DatabaseError as e:
+            eventos.error("registro_tiempo.error_lote", "Error en inserción masiva: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def create_returning_id(registro: RegistroTiempo) -> int:
+        """
+        Inserta un registro de tiempo tomando el ID de seq_registro en la misma sentencia
+        (INSERT ... RETURNING), sin un viaje previo para obtener el ID.
+        
+        Returns:
+            int: ID asignado o -1 si hay un problema de integridad
+        """
+        sql = RegistroTiempoDAO._SQL_INSERT
+        
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    nuevo_id = database.backend().insertar_retornando_id(
+                        cursor, sql, RegistroTiempoDAO._parametros(registro), "id_registro", "seq_registro", "id_registro"
+                    )
+                    conn.commit()
+                    registro.id_registro = nuevo_id
+                    eventos.info("registro_tiempo.creado", "Registro de tiempo creado exitosamente.")
+                    return nuevo_id
+        except database.IntegrityError as e:
+            eventos.error("registro_tiempo.integridad", "Error: Problema de integridad al crear registro.")
+            return -1
+        except database.DatabaseError as e:
+            eventos.error("registro_tiempo.error_bd", "Error de base de datos: {error}", error=e)
             raise
     
     @staticmethod
@@ -55,18 +102,18 @@ class RegistroTiempoDAO:
                     row = cursor.fetchone()
                     
                     if not row:
-                        print(f"✗ No se encontró registro con ID {id_registro}")
+                        eventos.aviso("registro_tiempo.no_encontrado", "No se encontró registro con ID {id_registro}", id_registro=id_registro)
                         return None
                     
                     return RegistroTiempoDAO._row_to_registro(row)
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al leer registro: {e}")
+        except database.DatabaseError as e:
+            eventos.error("registro_tiempo.error_bd", "Error al leer registro: {error}", error=e)
             raise
     
     @staticmethod
     def read_all(limit: int = 100) -> List[RegistroTiempo]:
         """Lee todos los registros de tiempo"""
-        sql = f"SELECT * FROM registro_tiempo FETCH FIRST {limit} ROWS ONLY"
+        sql = database.backend().limitar("SELECT * FROM registro_tiempo", limit)
         registros = []
         
         try:
@@ -77,12 +124,18 @@ class RegistroTiempoDAO:
                     for row in cursor:
                         registros.append(RegistroTiempoDAO._row_to_registro(row))
                     
-                    print(f"✓ Se encontraron {len(registros)} registro(s).")
+                    eventos.info("registro_tiempo.listado", "Se encontraron {cantidad} registro(s).", cantidad=len(registros))
                     return registros
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al listar registros: {e}")
+        except database.DatabaseError as e:
+            eventos.error("registro_tiempo.error_bd", "Error al listar registros: {error}", error=e)
             raise
     
+    @staticmethod
+    def iter_all(arraysize: Optional[int] = None) -> Iterator[RegistroTiempo]:
+        """Recorre todos los registros de tiempo sin materializar la lista (ver dao/cursores.py)"""
+        sql = "SELECT * FROM registro_tiempo ORDER BY id_registro"
+        return (RegistroTiempoDAO._row_to_registro(row) for row in iterar_filas(sql, None, arraysize))
+    
     @staticmethod
     def read_by_empleado(id_empleado: int) -> List[RegistroTiempo]:
         """Lee todos los registros de un empleado"""
@@ -98,10 +151,16 @@ class RegistroTiempoDAO:
                         registros.append(RegistroTiempoDAO._row_to_registro(row))
                     
                     return registros
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al leer registros por empleado: {e}")
+        except database.DatabaseError as e:
+            eventos.error("registro_tiempo.error_bd", "Error al leer registros por empleado: {error}", error=e)
             raise
     
+    @staticmethod
+    def iter_by_empleado(id_empleado: int, arraysize: Optional[int] = None) -> Iterator[RegistroTiempo]:
+        """Recorre los registros de un empleado sin materializar la lista (ver dao/cursores.py)"""
+        sql = "SELECT * FROM registro_tiempo WHERE id_empleado = :id_empleado"
+        return (RegistroTiempoDAO._row_to_registro(row) for row in iterar_filas(sql, {"id_empleado": id_empleado}, arraysize))
+    
     @staticmethod
     def read_by_proyecto(id_proyecto: int) -> List[RegistroTiempo]:
         """Lee todos los registros de un proyecto"""
@@ -117,10 +176,16 @@ class RegistroTiempoDAO:
                         registros.append(RegistroTiempoDAO._row_to_registro(row))
                     
                     return registros
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al leer registros por proyecto: {e}")
+        except database.DatabaseError as e:
+            eventos.error("registro_tiempo.error_bd", "Error al leer registros por proyecto: {error}", error=e)
             raise
     
+    @staticmethod
+    def iter_by_proyecto(id_proyecto: int, arraysize: Optional[int] = None) -> Iterator[RegistroTiempo]:
+        """Recorre los registros de un proyecto sin materializar la lista (ver dao/cursores.py)"""
+        sql = "SELECT * FROM registro_tiempo WHERE id_proyecto = :id_proyecto"
+        return (RegistroTiempoDAO._row_to_registro(row) for row in iterar_filas(sql, {"id_proyecto": id_proyecto}, arraysize))
+    
     @staticmethod
     def update(registro: RegistroTiempo) -> bool:
         """Actualiza un registro de tiempo existente"""
@@ -147,14 +212,14 @@ class RegistroTiempoDAO:
                     })
                     
                     if cursor.rowcount == 0:
-                        print(f"✗ No se encontró registro con ID {registro.id_registro}")
+                        eventos.aviso("registro_tiempo.no_encontrado", "No se encontró registro con ID {id_registro}", id_registro=registro.id_registro)
                         return False
                     
                     conn.commit()
-                    print(f"✓ Registro ID {registro.id_registro} actualizado.")
+                    eventos.info("registro_tiempo.actualizado", "Registro ID {id_registro} actualizado.", id_registro=registro.id_registro)
                     return True
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al actualizar registro: {e}")
+        except database.DatabaseError as e:
+            eventos.error("registro_tiempo.error_bd", "Error al actualizar registro: {error}", error=e)
             raise
     
     @staticmethod
@@ -168,14 +233,14 @@ class RegistroTiempoDAO:
                     cursor.execute(sql, {"id_registro": id_registro})
                     
                     if cursor.rowcount == 0:
-                        print(f"✗ No se encontró registro con ID {id_registro}")
+                        eventos.aviso("registro_tiempo.no_encontrado", "No se encontró registro con ID {id_registro}", id_registro=id_registro)
                         return False
                     
                     conn.commit()
-                    print(f"✓ Registro ID {id_registro} eliminado.")
+                    eventos.info("registro_tiempo.eliminado", "Registro ID {id_registro} eliminado.", id_registro=id_registro)
                     return True
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al eliminar registro: {e}")
+        except database.DatabaseError as e:
+            eventos.error("registro_tiempo.error_bd", "Error al eliminar registro: {error}", error=e)
             raise
     
     @staticmethod
@@ -195,13 +260,20 @@ class RegistroTiempoDAO:
     @staticmethod
     def create_with_sequence() -> int:
         """Obtiene el siguiente ID de la secuencia"""
-        sql = "SELECT seq_registro.NEXTVAL FROM DUAL"
-        
         try:
-            with get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute(sql)
-                    return cursor.fetchone()[0]
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error al obtener siguiente ID: {e}")
+            return asignador.siguiente("seq_registro")
+        except database.DatabaseError as e:
+            eventos.error("registro_tiempo.error_secuencia", "Error al obtener siguiente ID: {error}", error=e)
             return -1
+    
+    @staticmethod
+    def _parametros(registro: RegistroTiempo) -> dict:
+        """Convierte un RegistroTiempo en los parámetros del INSERT"""
+        return {
+            "id_registro": registro.id_registro,
+            "id_empleado": registro.id_empleado,
+            "id_proyecto": registro.id_proyecto,
+            "fecha": registro.fecha,
+            "horas_trabajadas": registro.horas_trabajadas,
+            "descripcion_actividad": registro.descripcion_actividad
+        }
@@ -0,0 +1,90 @@
+"""
+Módulo: dao/secuencias.py
+Asignador de IDs por bloques para las secuencias de la base de datos
+
+En lugar de un viaje a la BD por cada NEXTVAL, el asignador reserva un
+bloque de valores de la secuencia en una sola consulta y los entrega desde
+memoria. Los valores reservados que no se usan antes de terminar el proceso
+quedan como huecos en la numeración, igual que con el caché de secuencias
+de Oracle.
+"""
+
+import threading
+from collections import deque
+from typing import Dict, List
+import database
+from database import get_connection
+
+
+class AsignadorIds:
+    """
+    Entrega IDs de secuencias reservándolos en bloques (thread-safe).
+
+    Args:
+        tamano_bloque: Cantidad de valores a reservar por viaje a la BD
+    """
+
+    def __init__(self, tamano_bloque: int = database.ID_BLOCK_SIZE):
+        if tamano_bloque < 1:
+            raise ValueError("El tamaño de bloque debe ser mayor a 0")
+        self._tamano_bloque = tamano_bloque
+        self._disponibles: Dict[str, deque] = {}
+        self._backend = None
+        self._lock = threading.Lock()
+        self._reservas = 0
+
+    @property
+    def tamano_bloque(self) -> int:
+        return self._tamano_bloque
+
+    @property
+    def reservas(self) -> int:
+        """Cantidad de viajes a la BD realizados para reservar bloques"""
+        return self._reservas
+
+    def siguiente(self, secuencia: str) -> int:
+        """Retorna el siguiente ID de la secuencia, reservando un bloque si hace falta"""
+        with self._lock:
+            disponibles = self._cola(secuencia)
+            if not disponibles:
+                disponibles.extend(self._reservar(secuencia, self._tamano_bloque))
+            return disponibles.popleft()
+
+    def reservar(self, secuencia: str, cantidad: int) -> List[int]:
+        """
+        Retorna `cantidad` IDs de la secuencia usando primero los ya reservados.
+
+        Útil para create_many(): los IDs de un lote completo salen de a lo
+        sumo un viaje a la BD.
+        """
+        with self._lock:
+            disponibles = self._cola(secuencia)
+            faltan = cantidad - len(disponibles)
+            if faltan > 0:
+                disponibles.extend(self._reservar(secuencia, max(faltan, self._tamano_bloque)))
+            return [disponibles.popleft() for _ in range(cantidad)]
+
+    def descartar(self):
+        """Olvida los IDs reservados (p. ej. tras recrear las secuencias)"""
+        with self._lock:
+            self._disponibles.clear()
+
+    def _cola(self, secuencia: str) -> deque:
+        # Los bloques pertenecen a una base de datos: si cambia el backend
+        # activo, los valores reservados dejan de ser válidos.
+        motor = database.backend()
+        if motor is not self._backend:
+            self._disponibles.clear()
+            self._backend = motor
+        return self._disponibles.setdefault(secuencia, deque())
+
+    def _reservar(self, secuencia: str, cantidad: int) -> List[int]:
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                valores = self._backend.reservar_valores(cursor, secuencia, cantidad)
+        self._reservas += 1
+        return valores
+
+
+# Asignador compartido por los DAO del proceso
+asignador = AsignadorIds()
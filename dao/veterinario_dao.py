@@ -1,28 +1,69 @@
 """DAO para Veterinario"""
-import oracledb
-from typing import List, Optional
+import database
+import eventos
+from typing import Dict, Iterable, Iterator, List, Optional
 from models.veterinario import Veterinario
 from database import get_connection
+from dao.lotes import ResultadoLote, insertar_en_lotes
+from dao.secuencias import asignador
+from dao.cache import en_cache, invalida_cache
+from dao.cursores import ids_por_clave, iterar_filas, leer_por_ids
 
 class VeterinarioDAO:
+    _SQL_INSERT = "INSERT INTO veterinario (id_veterinario, nombre, apellido, especialidad, telefono, email) VALUES (:id, :nombre, :apellido, :especialidad, :telefono, :email)"
+    
     @staticmethod
     def create(vet: Veterinario) -> bool:
-        sql = "INSERT INTO veterinario (id_veterinario, nombre, apellido, especialidad, telefono, email) VALUES (:id, :nombre, :apellido, :especialidad, :telefono, :email)"
+        sql = VeterinarioDAO._SQL_INSERT
         try:
             with get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(sql, {"id": vet.id_veterinario, "nombre": vet.nombre, "apellido": vet.apellido, "especialidad": vet.especialidad, "telefono": vet.telefono, "email": vet.email})
+                    cursor.execute(sql, VeterinarioDAO._parametros(vet))
                     conn.commit()
-                    print(f"✓ Veterinario '{vet.obtener_nombre_completo()}' creado exitosamente.")
+                    eventos.info("veterinario.creado", "Veterinario '{nombre}' creado exitosamente.", nombre=vet.obtener_nombre_completo())
                     return True
-        except oracledb.IntegrityError:
-            print(f"✗ Error: El veterinario ya existe.")
+        except database.IntegrityError:
+            eventos.error("veterinario.integridad", "Error: El veterinario ya existe.")
             return False
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.DatabaseError as e:
+            eventos.error("veterinario.error_bd", "Error: {error}", error=e)
+            raise
+    
+    @staticmethod
+    def create_many(vets: Iterable[Veterinario], batch_size: int = 1000) -> ResultadoLote:
+        sql = VeterinarioDAO._SQL_INSERT
+        try:
+            resultado = insertar_en_lotes(sql, vets, VeterinarioDAO._parametros, batch_size)
+            eventos.info("veterinario.lote_insertado", "{insertados} veterinario(s) insertado(s) en {lotes} lote(s).", insertados=resultado.insertados, lotes=resultado.lotes)
+            if resultado.errores:
+                eventos.aviso("veterinario.lote_rechazos", "{rechazadas} fila(s) rechazada(s).", rechazadas=len(resultado.errores))
+            return resultado
+        except database.DatabaseError as e:
+            eventos.error("veterinario.error_bd", "Error: {error}", error=e)
             raise
     
     @staticmethod
+    def create_returning_id(vet: Veterinario) -> int:
+        sql = VeterinarioDAO._SQL_INSERT
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    nuevo_id = database.backend().insertar_retornando_id(
+                        cursor, sql, VeterinarioDAO._parametros(vet), "id", "seq_veterinario", "id_veterinario"
+                    )
+                    conn.commit()
+                    vet.id_veterinario = nuevo_id
+                    eventos.info("veterinario.creado", "Veterinario '{nombre}' creado exitosamente.", nombre=vet.obtener_nombre_completo())
+                    return nuevo_id
+        except database.IntegrityError:
+            eventos.error("veterinario.integridad", "Error: El veterinario ya existe.")
+            return -1
+        except database.DatabaseError as e:
+            eventos.error("veterinario.error_bd", "Error: {error}", error=e)
+            raise
+    
+    @staticmethod
+    @en_cache("veterinario")
     def read_by_id(id_vet: int) -> Optional[Veterinario]:
         sql = "SELECT * FROM veterinario WHERE id_veterinario = :id"
         try:
@@ -31,30 +72,59 @@ class VeterinarioDAO:
                     cursor.execute(sql, {"id": id_vet})
                     row = cursor.fetchone()
                     if not row:
-                        print(f"✗ No se encontró veterinario con ID {id_vet}")
+                        eventos.aviso("veterinario.no_encontrado", "No se encontró veterinario con ID {id_veterinario}", id_veterinario=id_vet)
                         return None
-                    return Veterinario(*row)
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+                    return Veterinario.from_row(row)
+        except database.DatabaseError as e:
+            eventos.error("veterinario.error_bd", "Error: {error}", error=e)
             raise
     
+    @staticmethod
+    def ids_por_email(emails: Iterable[str]) -> Dict[str, int]:
+        """Resuelve muchos emails a id_veterinario (índice único uk_veterinario_email)"""
+        return ids_por_clave("veterinario", "email", "id_veterinario", emails)
+    
+    @staticmethod
+    def read_by_ids(ids: Iterable[int]) -> Dict[int, Optional[Veterinario]]:
+        return leer_por_ids("veterinario", "id_veterinario", ids, Veterinario.from_row)
+    
     @staticmethod
     def read_all(limit: int = 100) -> List[Veterinario]:
-        sql = f"SELECT * FROM veterinario FETCH FIRST {limit} ROWS ONLY"
+        sql = database.backend().limitar("SELECT * FROM veterinario", limit)
         vets = []
         try:
             with get_connection() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute(sql)
                     for row in cursor:
-                        vets.append(Veterinario(*row))
-                    print(f"✓ Se encontraron {len(vets)} veterinario(s).")
+                        vets.append(Veterinario.from_row(row))
+                    eventos.info("veterinario.listado", "Se encontraron {cantidad} veterinario(s).", cantidad=len(vets))
                     return vets
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.DatabaseError as e:
+            eventos.error("veterinario.error_bd", "Error: {error}", error=e)
             raise
     
     @staticmethod
+    def iter_all(arraysize: Optional[int] = None) -> Iterator[Veterinario]:
+        sql = "SELECT * FROM veterinario ORDER BY id_veterinario"
+        return (Veterinario.from_row(row) for row in iterar_filas(sql, None, arraysize))
+    
+    @staticmethod
+    def read_page(after_id: int = 0, page_size: int = 20) -> List[Veterinario]:
+        # Paginación por clave: la página siguiente empieza después del último
+        # id_veterinario visto, así el costo no depende de cuántas páginas se saltaron.
+        sql = database.backend().limitar("SELECT * FROM veterinario WHERE id_veterinario > :after_id ORDER BY id_veterinario", page_size)
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql, {"after_id": after_id})
+                    return [Veterinario.from_row(row) for row in cursor]
+        except database.DatabaseError as e:
+            eventos.error("veterinario.error_bd", "Error: {error}", error=e)
+            raise
+    
+    @staticmethod
+    @invalida_cache("veterinario", lambda vet: vet.id_veterinario)
     def update(vet: Veterinario) -> bool:
         sql = "UPDATE veterinario SET nombre=:nombre, apellido=:apellido, especialidad=:especialidad, telefono=:telefono, email=:email WHERE id_veterinario=:id"
         try:
@@ -62,16 +132,17 @@ class VeterinarioDAO:
                 with conn.cursor() as cursor:
                     cursor.execute(sql, {"nombre": vet.nombre, "apellido": vet.apellido, "especialidad": vet.especialidad, "telefono": vet.telefono, "email": vet.email, "id": vet.id_veterinario})
                     if cursor.rowcount == 0:
-                        print(f"✗ No se encontró veterinario con ID {vet.id_veterinario}")
+                        eventos.aviso("veterinario.no_encontrado", "No se encontró veterinario con ID {id_veterinario}", id_veterinario=vet.id_veterinario)
                         return False
                     conn.commit()
-                    print(f"✓ Veterinario ID {vet.id_veterinario} actualizado.")
+                    eventos.info("veterinario.actualizado", "Veterinario ID {id_veterinario} actualizado.", id_veterinario=vet.id_veterinario)
                     return True
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.DatabaseError as e:
+            eventos.error("veterinario.error_bd", "Error: {error}", error=e)
             raise
     
     @staticmethod
+    @invalida_cache("veterinario", lambda id_veterinario: id_veterinario, elimina=True)
     def delete(id_vet: int) -> bool:
         sql = "DELETE FROM veterinario WHERE id_veterinario = :id"
         try:
@@ -79,26 +150,26 @@ class VeterinarioDAO:
                 with conn.cursor() as cursor:
                     cursor.execute(sql, {"id": id_vet})
                     if cursor.rowcount == 0:
-                        print(f"✗ No se encontró veterinario con ID {id_vet}")
+                        eventos.aviso("veterinario.no_encontrado", "No se encontró veterinario con ID {id_veterinario}", id_veterinario=id_vet)
                         return False
                     conn.commit()
-                    print(f"✓ Veterinario ID {id_vet} eliminado.")
+                    eventos.info("veterinario.eliminado", "Veterinario ID {id_veterinario} eliminado.", id_veterinario=id_vet)
                     return True
-        except oracledb.IntegrityError:
-            print(f"✗ Error: No se puede eliminar el veterinario porque tiene citas asignadas.")
+        except database.IntegrityError:
+            eventos.error("veterinario.con_dependientes", "Error: No se puede eliminar el veterinario porque tiene citas asignadas.")
             return False
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+        except database.DatabaseError as e:
+            eventos.error("veterinario.error_bd", "Error: {error}", error=e)
             raise
     
     @staticmethod
     def create_with_sequence() -> int:
-        sql = "SELECT seq_veterinario.NEXTVAL FROM DUAL"
         try:
-            with get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute(sql)
-                    return cursor.fetchone()[0]
-        except oracledb.DatabaseError as e:
-            print(f"✗ Error: {e}")
+            return asignador.siguiente("seq_veterinario")
+        except database.DatabaseError as e:
+            eventos.error("veterinario.error_bd", "Error: {error}", error=e)
             return -1
+    
+    @staticmethod
+    def _parametros(vet: Veterinario) -> dict:
+        return {"id": vet.id_veterinario, "nombre": vet.nombre, "apellido": vet.apellido, "especialidad": vet.especialidad, "telefono": vet.telefono, "email": vet.email}
@@ -1,63 +1,272 @@
 """
 Módulo de configuración de base de datos
 Proporciona la conexión segura a Oracle Database
+
+Las conexiones se obtienen de un pool administrado (ver pool.py), de modo
+que cada llamada a get_connection() reutiliza una sesión ya autenticada en
+lugar de abrir una nueva.
+
+El motor se elige con DB_BACKEND ("oracle" por defecto o "sqlite"); las
+diferencias de dialecto viven en el paquete backends. Los DAO capturan
+`database.DatabaseError` / `database.IntegrityError`, que se resuelven a
+las excepciones del driver del backend activo.
 """
 
-import oracledb
+import atexit
+import threading
 import os
-from dotenv import load_dotenv
+from typing import Callable, Optional, Union
+import eventos
+import instrumentacion
+from backends import Backend, crear_backend
+from pool import PoolConexiones, ConexionPool, error_agotado
+
+
+def _cargar_env():
+    # Busca .env desde esta carpeta hacia arriba, como load_dotenv(); si no
+    # hay ninguno (variables definidas en el entorno, cron) no se importa dotenv
+    carpeta = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        ruta = os.path.join(carpeta, ".env")
+        if os.path.isfile(ruta):
+            from dotenv import load_dotenv
+            load_dotenv(ruta)
+            return
+        superior = os.path.dirname(carpeta)
+        if superior == carpeta:
+            return
+        carpeta = superior
+
 
 # Cargar variables de entorno
-load_dotenv()
+_cargar_env()
 
 # Credenciales de la base de datos
 ORACLE_USER = os.getenv("ORACLE_USER")
 ORACLE_PASSWORD = os.getenv("ORACLE_PASSWORD")
 ORACLE_DSN = os.getenv("ORACLE_DSN")
 
+# Motor de base de datos: "oracle" o "sqlite"
+DB_BACKEND = os.getenv("DB_BACKEND", "oracle")
+SQLITE_PATH = os.getenv("SQLITE_PATH", ":memory:")
+
+# Parámetros del pool de conexiones
+POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+POOL_MAX = int(os.getenv("DB_POOL_MAX", "4"))
+POOL_INCREMENT = int(os.getenv("DB_POOL_INCREMENT", "1"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+POOL_PING_INTERVAL = float(os.getenv("DB_POOL_PING_INTERVAL", "60"))
+
+# Filas por viaje a la BD al recorrer resultados con los métodos iter_*
+FETCH_ARRAYSIZE = int(os.getenv("DB_FETCH_ARRAYSIZE", "500"))
+
+# IDs que el asignador de secuencias reserva por viaje a la BD
+ID_BLOCK_SIZE = int(os.getenv("DB_ID_BLOCK_SIZE", "20"))
+
+# Métricas de sentencias (ver instrumentacion.py): archivo donde escribirlas
+# al salir (.json, .prom o texto) y/o puerto HTTP donde publicarlas
+METRICAS_ARCHIVO = os.getenv("DB_METRICAS")
+METRICAS_PUERTO = os.getenv("DB_METRICAS_PUERTO")
+
+# Registro de consultas lentas (ver consultas_lentas.py): umbral en ms,
+# archivo JSONL y captura del plan de ejecución ("1" para activarla)
+LENTAS_MS = os.getenv("DB_LENTAS_MS")
+LENTAS_ARCHIVO = os.getenv("DB_LENTAS_ARCHIVO", "consultas_lentas.jsonl")
+LENTAS_PLAN = os.getenv("DB_LENTAS_PLAN", "0") == "1"
+
+_backend: Optional[Backend] = None
+_pool: Optional[PoolConexiones] = None
+_pool_lock = threading.Lock()
+_init_lock = threading.Lock()
+
+
+def _backend_por_defecto() -> Backend:
+    if DB_BACKEND.lower() == "sqlite":
+        return crear_backend("sqlite", ruta=SQLITE_PATH)
+    return crear_backend("oracle", user=ORACLE_USER, password=ORACLE_PASSWORD, dsn=ORACLE_DSN)
+
 
-def get_connection():
+def configurar_backend(backend: Union[Backend, str], **opciones) -> Backend:
     """
-    Establece y retorna una conexión a la base de datos Oracle.
-    
+    Selecciona el motor de base de datos y descarta el pool anterior.
+
+    Args:
+        backend: Instancia de Backend o nombre ("oracle", "sqlite")
+        **opciones: Parámetros del backend si se pasa por nombre
+            (p. ej. ruta=":memory:" para SQLite)
+
+    Returns:
+        Backend: El backend activo
+    """
+    global _backend
+    if isinstance(backend, str):
+        backend = crear_backend(backend, **opciones)
+    cerrar_pool()
+    _backend = backend
+    return backend
+
+
+def backend() -> Backend:
+    """Retorna el backend activo, creándolo según DB_BACKEND si hace falta"""
+    global _backend
+    if _backend is None:
+        with _init_lock:
+            if _backend is None:
+                _backend = _backend_por_defecto()
+    return _backend
+
+
+def __getattr__(nombre: str):
+    # database.DatabaseError / database.IntegrityError siguen al backend activo
+    if nombre in ("DatabaseError", "IntegrityError"):
+        return getattr(backend(), nombre)
+    raise AttributeError(f"module 'database' has no attribute '{nombre}'")
+
+
+def configurar_pool(
+    conectar: Optional[Callable] = None,
+    minimo: int = POOL_MIN,
+    maximo: int = POOL_MAX,
+    incremento: int = POOL_INCREMENT,
+    timeout: float = POOL_TIMEOUT,
+    ping_intervalo: float = POOL_PING_INTERVAL,
+    validar: Optional[Callable] = None
+) -> PoolConexiones:
+    """
+    Crea (o reemplaza) el pool usado por get_connection().
+
+    Args:
+        conectar: Función que abre una conexión física. Por defecto la
+            del backend activo; permite usar un driver de reemplazo en pruebas.
+        minimo, maximo, incremento: Tamaño del pool
+        timeout: Segundos de espera máxima por una conexión libre
+        ping_intervalo: Segundos de inactividad antes de validar una conexión
+        validar: Función de validación de conexiones (por defecto la del backend)
+
     Returns:
-        oracledb.Connection: Objeto de conexión a Oracle
-        
+        PoolConexiones: El pool recién creado
+    """
+    global _pool
+    motor = backend()
+    nuevo = PoolConexiones(
+        conectar or motor.conectar,
+        minimo=minimo,
+        maximo=maximo,
+        incremento=incremento,
+        timeout=timeout,
+        ping_intervalo=ping_intervalo,
+        validar=validar or (motor.validar if conectar is None else None),
+        error=error_agotado(motor.DatabaseError)
+    )
+    with _pool_lock:
+        anterior, _pool = _pool, nuevo
+    if anterior is not None:
+        anterior.cerrar()
+    return nuevo
+
+
+def obtener_pool() -> PoolConexiones:
+    """Retorna el pool activo, creándolo con la configuración por defecto"""
+    if _pool is None:
+        with _init_lock:
+            if _pool is None:
+                configurar_pool()
+    return _pool
+
+
+def cerrar_pool():
+    """Cierra el pool activo y todas sus conexiones libres"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.cerrar()
+
+
+atexit.register(cerrar_pool)
+
+if METRICAS_ARCHIVO or METRICAS_PUERTO:
+    instrumentacion.activar()
+    if METRICAS_ARCHIVO:
+        atexit.register(instrumentacion.escribir, METRICAS_ARCHIVO)
+    if METRICAS_PUERTO:
+        instrumentacion.servir(int(METRICAS_PUERTO))
+
+if LENTAS_MS:
+    import consultas_lentas
+    consultas_lentas.activar(float(LENTAS_MS), LENTAS_ARCHIVO, plan=LENTAS_PLAN)
+
+
+def get_connection() -> ConexionPool:
+    """
+    Obtiene una conexión del pool de conexiones del backend activo.
+
+    La conexión se devuelve al pool al cerrarla o al salir del bloque
+    ``with``; los cambios no confirmados se deshacen al devolverla.
+
+    Con la instrumentación activa, la conexión se entrega envuelta para
+    medir sus sentencias (ver instrumentacion.py).
+
+    Returns:
+        ConexionPool: Conexión prestada por el pool
+
     Raises:
-        oracledb.DatabaseError: Si hay un error al conectar
+        DatabaseError: Si hay un error al conectar (excepción del driver) o
+            no hay conexiones libres dentro del timeout (pool.PoolAgotadoError,
+            que también es DatabaseError del backend)
     """
+    motor = backend()
     try:
-        connection = oracledb.connect(
-            user=ORACLE_USER,
-            password=ORACLE_PASSWORD,
-            dsn=ORACLE_DSN
-        )
-        return connection
-    except oracledb.DatabaseError as e:
-        error, = e.args
-        print(f"Error de conexión a Oracle: {error.message}")
+        if instrumentacion.ACTIVA:
+            return instrumentacion.medir_conexion(obtener_pool().adquirir)
+        return obtener_pool().adquirir()
+    except motor.DatabaseError as e:
+        eventos.error("conexion.error", "Error de conexión a {motor}: {error}",
+                      motor=motor.descripcion, error=motor.mensaje_error(e))
         raise
 
 
+def verificar_conexion() -> bool:
+    """
+    Comprueba que se puede conectar sin una consulta de prueba aparte.
+
+    La conexión que se abre para comprobarlo es la primera del pool y queda
+    libre para la primera operación de los DAO.
+
+    Returns:
+        bool: True si se pudo conectar
+    """
+    motor = backend()
+    try:
+        with get_connection():
+            pass
+        print(f"✓ Conexión exitosa a {motor.descripcion}.")
+        return True
+    except Exception as e:
+        print(f"✗ Error al conectar con {motor.descripcion}: {e}")
+        return False
+
+
 def test_connection() -> bool:
     """
     Prueba la conexión a la base de datos.
-    
+
     Returns:
         bool: True si la conexión es exitosa, False en caso contrario
     """
+    motor = backend()
     try:
         with get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("SELECT SYSDATE FROM DUAL")
+                cursor.execute(motor.sql_fecha_servidor)
                 result = cursor.fetchone()
-                print(f"✓ Conexión exitosa a Oracle. Fecha del servidor: {result[0]}")
+                print(f"✓ Conexión exitosa a {motor.descripcion}. Fecha del servidor: {result[0]}")
                 return True
     except Exception as e:
-        print(f"✗ Error al conectar con Oracle: {e}")
+        print(f"✗ Error al conectar con {motor.descripcion}: {e}")
         return False
 
 
 if __name__ == "__main__":
-    print("Probando conexión a Oracle Database...")
+    print(f"Probando conexión a {backend().descripcion}...")
     test_connection()
@@ -0,0 +1,147 @@
+"""
+Módulo: eventos.py
+Canal de eventos de los DAO
+
+Los DAO no escriben en consola: informan cada resultado (creado, no
+encontrado, error de BD, ...) como un Evento con nivel, tipo y datos. Quien
+quiera mostrarlos se suscribe con agregar_oyente(): el menú interactivo los
+imprime como antes (✓ / ✗), el modo por comandos los envía a la salida de
+errores y oyente_logging() los pasa al módulo logging.
+
+Sin oyentes (scripts, importaciones, uso como biblioteca) emitir() retorna
+de inmediato: el mensaje ni siquiera se arma.
+
+Los niveles usan los mismos valores que logging.
+
+Ejemplo:
+    import eventos
+    eventos.agregar_oyente(eventos.imprimir)
+    ClienteDAO.read_by_id(99)    # ✗ No se encontró cliente con ID 99
+"""
+
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, TextIO, Tuple
+
+DEBUG = 10
+INFO = 20
+AVISO = 30
+ERROR = 40
+
+NOMBRES_NIVEL = {DEBUG: "DEBUG", INFO: "INFO", AVISO: "AVISO", ERROR: "ERROR"}
+
+# Nivel mínimo que algún oyente quiere recibir; sin oyentes, ninguno
+_SIN_OYENTES = ERROR + 1
+
+_oyentes: Tuple[Tuple[Callable[["Evento"], None], int], ...] = ()
+_minimo = _SIN_OYENTES
+_lock = threading.Lock()
+
+
+class Evento:
+    """
+    Resultado informado por un DAO.
+
+    Atributos:
+        nivel: DEBUG, INFO (operación exitosa), AVISO (p. ej. no encontrado) o ERROR
+        tipo: Identificador estable, "<entidad>.<resultado>" (p. ej. "cliente.creado")
+        plantilla: Texto con campos {nombre} que se completan con `datos`
+        datos: Valores del evento (IDs, cantidades, la excepción en `error`)
+    """
+
+    __slots__ = ("nivel", "tipo", "plantilla", "datos")
+
+    def __init__(self, nivel: int, tipo: str, plantilla: str, datos: Dict[str, Any]):
+        self.nivel = nivel
+        self.tipo = tipo
+        self.plantilla = plantilla
+        self.datos = datos
+
+    @property
+    def mensaje(self) -> str:
+        return self.plantilla.format(**self.datos) if self.datos else self.plantilla
+
+    def to_dict(self) -> dict:
+        return {
+            "nivel": NOMBRES_NIVEL.get(self.nivel, self.nivel),
+            "tipo": self.tipo,
+            "mensaje": self.mensaje,
+            **{nombre: str(valor) if isinstance(valor, BaseException) else valor
+               for nombre, valor in self.datos.items()},
+        }
+
+    def __str__(self) -> str:
+        return f"Evento({NOMBRES_NIVEL.get(self.nivel, self.nivel)} {self.tipo}: {self.mensaje})"
+
+
+def agregar_oyente(oyente: Callable[[Evento], None], nivel: int = INFO):
+    """Registra una función que recibe los eventos de nivel `nivel` o mayor"""
+    global _oyentes
+    with _lock:
+        _oyentes = tuple((o, n) for o, n in _oyentes if o is not oyente) + ((oyente, nivel),)
+        _actualizar()
+
+
+def quitar_oyente(oyente: Callable[[Evento], None]):
+    global _oyentes
+    with _lock:
+        _oyentes = tuple((o, n) for o, n in _oyentes if o is not oyente)
+        _actualizar()
+
+
+def _actualizar():
+    global _minimo
+    _minimo = min((nivel for _, nivel in _oyentes), default=_SIN_OYENTES)
+
+
+@contextmanager
+def escuchando(oyente: Callable[[Evento], None], nivel: int = INFO):
+    """Suscribe `oyente` mientras dure el bloque with (si ya estaba suscrito, restaura su nivel)"""
+    anterior = next((n for o, n in _oyentes if o is oyente), None)
+    agregar_oyente(oyente, nivel)
+    try:
+        yield oyente
+    finally:
+        if anterior is None:
+            quitar_oyente(oyente)
+        else:
+            agregar_oyente(oyente, anterior)
+
+
+def emitir(nivel: int, tipo: str, plantilla: str, **datos):
+    """Entrega un evento a los oyentes interesados en su nivel"""
+    if nivel < _minimo:
+        return
+    evento = Evento(nivel, tipo, plantilla, datos)
+    for oyente, minimo in _oyentes:
+        if nivel >= minimo:
+            oyente(evento)
+
+
+def info(tipo: str, plantilla: str, **datos):
+    emitir(INFO, tipo, plantilla, **datos)
+
+
+def aviso(tipo: str, plantilla: str, **datos):
+    emitir(AVISO, tipo, plantilla, **datos)
+
+
+def error(tipo: str, plantilla: str, **datos):
+    emitir(ERROR, tipo, plantilla, **datos)
+
+
+def imprimir(evento: Evento, salida: Optional[TextIO] = None):
+    """Oyente que muestra el evento en consola: ✓ si es informativo, ✗ si no"""
+    marca = "✓" if evento.nivel < AVISO else "✗"
+    print(f"{marca} {evento.mensaje}", file=salida or sys.stdout)
+
+
+def oyente_logging(nombre: str = "veterinaria.dao") -> Callable[[Evento], None]:
+    """Oyente que reenvía los eventos a un logger (tipo y datos en `extra`)"""
+    import logging
+    logger = logging.getLogger(nombre)
+
+    def reenviar(evento: Evento):
+        logger.log(evento.nivel, evento.mensaje, extra={"tipo": evento.tipo, "datos": evento.datos})
+    return reenviar
@@ -0,0 +1,641 @@
+"""
+Módulo: instrumentacion.py
+Métricas de las sentencias SQL ejecutadas por los DAO
+
+Con la instrumentación activa, get_connection() entrega la conexión del pool
+envuelta en ConexionMedida, cuyos cursores miden cada sentencia. Por huella
+de la sentencia (el SQL normalizado: espacios colapsados, literales como ?
+y listas IN como (...)) se registran:
+
+- llamadas y filas leídas (o afectadas, en INSERT/UPDATE/DELETE)
+- adquisición: espera por la conexión del pool (se atribuye a la primera
+  sentencia ejecutada con esa conexión)
+- ejecución: duración de execute / executemany
+- lectura: duración de fetchone / fetchmany / fetchall / iteración
+
+Los tiempos se guardan en histogramas de tipo HDR (buckets log-lineales con
+error relativo acotado), de los que se obtienen percentiles.
+
+Desactivada (lo normal), get_connection() sólo revisa ACTIVA y entrega la
+conexión sin envolver: los DAO no pagan nada.
+
+Además de las métricas, otros módulos pueden recibir cada sentencia
+terminada (Medicion) con agregar_oyente(); así funciona el registro de
+consultas lentas (consultas_lentas.py).
+
+Exportación: reporte() en texto, a_json() y a_prometheus() (formato de
+exposición de Prometheus), a un archivo con escribir() o por HTTP con servir().
+
+Ejemplo:
+    import instrumentacion
+    instrumentacion.activar()
+    ...
+    print(instrumentacion.reporte())
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Se consulta en cada get_connection(): True si hay métricas activas u
+# oyentes registrados (usar activar() / agregar_oyente())
+ACTIVA = False
+
+# Fases medidas por sentencia
+FASES = ("adquisicion", "ejecucion", "lectura")
+
+# Bits de sub-bucket del histograma: 2**5 = 32 buckets por potencia de 2
+# (error relativo máximo ~3%)
+SUB_BITS = 5
+
+# Límites de los buckets exportados a Prometheus, en segundos
+LIMITES_PROMETHEUS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                      0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Huellas distintas recordadas por texto SQL (ver huella())
+MAX_HUELLAS = 2048
+
+_SUB = 1 << SUB_BITS
+_ESPACIOS = re.compile(r"\s+")
+_LISTA_IN = re.compile(r"\bIN\s*\(\s*:\w+(?:\s*,\s*:\w+)*\s*\)", re.IGNORECASE)
+_TEXTO = re.compile(r"'(?:[^']|'')*'")
+_NUMERO = re.compile(r"(?<![\w:])\d+(?:\.\d+)?\b")
+
+_lock = threading.Lock()
+_sentencias: Dict[str, "EstadisticaSentencia"] = {}
+_huellas: Dict[str, str] = {}
+_escrituras: Dict[str, bool] = {}
+# Texto SQL -> estadística de su huella
+_por_sql: Dict[str, "EstadisticaSentencia"] = {}
+_metricas = False
+_oyentes: List[Callable[["Medicion"], None]] = []
+
+
+class Histograma:
+    """
+    Histograma de latencias en microsegundos con buckets log-lineales.
+
+    Los valores menores a 2 * 2**SUB_BITS se guardan exactos; desde ahí cada
+    potencia de 2 se divide en 2**SUB_BITS buckets, así el error relativo no
+    depende de la magnitud (como en HdrHistogram). No es thread-safe: el
+    registro se hace con el lock del módulo.
+    """
+
+    __slots__ = ("conteos", "cantidad", "suma", "minimo", "maximo")
+
+    def __init__(self):
+        self.conteos: Dict[int, int] = {}
+        self.cantidad = 0
+        self.suma = 0
+        self.minimo = 0
+        self.maximo = 0
+
+    def registrar(self, microsegundos: int):
+        valor = microsegundos if microsegundos > 0 else 0
+        if valor < 2 * _SUB:
+            indice = valor
+        else:
+            exponente = valor.bit_length() - SUB_BITS - 1
+            indice = (exponente + 1) * _SUB + (valor >> exponente) - _SUB
+        self.conteos[indice] = self.conteos.get(indice, 0) + 1
+        if not self.cantidad or valor < self.minimo:
+            self.minimo = valor
+        if valor > self.maximo:
+            self.maximo = valor
+        self.cantidad += 1
+        self.suma += valor
+
+    @staticmethod
+    def limite_superior(indice: int) -> int:
+        """Mayor valor (µs) que cae en el bucket `indice`"""
+        if indice < 2 * _SUB:
+            return indice
+        exponente = indice // _SUB - 1
+        mantisa = indice % _SUB + _SUB
+        return ((mantisa + 1) << exponente) - 1
+
+    def percentil(self, p: float) -> int:
+        """Valor (µs) bajo el cual está el p% de los registros"""
+        if not self.cantidad:
+            return 0
+        objetivo = max(1, -(-self.cantidad * p // 100))
+        acumulado = 0
+        for indice in sorted(self.conteos):
+            acumulado += self.conteos[indice]
+            if acumulado >= objetivo:
+                return min(self.limite_superior(indice), self.maximo)
+        return self.maximo
+
+    def acumulados(self, limites_us: List[int]) -> List[int]:
+        """Registros menores o iguales a cada límite (para buckets de Prometheus)"""
+        resultado = []
+        ordenados = sorted(self.conteos.items())
+        posicion = acumulado = 0
+        for limite in limites_us:
+            while posicion < len(ordenados) and self.limite_superior(ordenados[posicion][0]) <= limite:
+                acumulado += ordenados[posicion][1]
+                posicion += 1
+            resultado.append(acumulado)
+        return resultado
+
+    def a_dict(self) -> dict:
+        return {
+            "cantidad": self.cantidad,
+            "suma_us": self.suma,
+            "min_us": self.minimo,
+            "p50_us": self.percentil(50),
+            "p90_us": self.percentil(90),
+            "p99_us": self.percentil(99),
+            "max_us": self.maximo,
+        }
+
+
+class EstadisticaSentencia:
+    """Contadores e histogramas de una huella de sentencia"""
+
+    __slots__ = ("huella", "llamadas", "filas", "errores", "histogramas")
+
+    def __init__(self, huella: str):
+        self.huella = huella
+        self.llamadas = 0
+        self.filas = 0
+        self.errores = 0
+        self.histogramas = {fase: Histograma() for fase in FASES}
+
+    @property
+    def id(self) -> str:
+        return id_huella(self.huella)
+
+    def a_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "sentencia": self.huella,
+            "llamadas": self.llamadas,
+            "filas": self.filas,
+            "errores": self.errores,
+            **{fase: histograma.a_dict() for fase, histograma in self.histogramas.items()},
+        }
+
+
+# Espera por conexiones del pool, de todas las sentencias
+_adquisicion = Histograma()
+
+
+def activar():
+    """Activa la medición de sentencias para las conexiones obtenidas desde ahora"""
+    global _metricas
+    _metricas = True
+    _actualizar()
+
+
+def desactivar():
+    """Desactiva la medición; las métricas registradas se conservan"""
+    global _metricas
+    _metricas = False
+    _actualizar()
+
+
+def agregar_oyente(oyente: Callable[["Medicion"], None]):
+    """
+    Registra una función que recibe cada Medicion al terminar la sentencia.
+
+    Los oyentes funcionan aunque las métricas estén desactivadas (ver
+    consultas_lentas.py) y se ejecutan en el hilo que usa el cursor.
+    """
+    if oyente not in _oyentes:
+        _oyentes.append(oyente)
+    _actualizar()
+
+
+def quitar_oyente(oyente: Callable[["Medicion"], None]):
+    if oyente in _oyentes:
+        _oyentes.remove(oyente)
+    _actualizar()
+
+
+def _actualizar():
+    # Las conexiones se envuelven sólo si alguien usa las mediciones
+    global ACTIVA
+    ACTIVA = _metricas or bool(_oyentes)
+
+
+def reiniciar():
+    """Descarta todas las métricas registradas"""
+    global _adquisicion
+    with _lock:
+        _sentencias.clear()
+        _por_sql.clear()
+        _adquisicion = Histograma()
+
+
+def huella(sql: str) -> str:
+    """
+    Normaliza un SQL para agrupar sus ejecuciones.
+
+    Las listas IN de parámetros (ver dao.cursores.lista_in) quedan como
+    IN (...), y los literales de texto y números como ?.
+    """
+    resultado = _huellas.get(sql)
+    if resultado is None:
+        resultado = _ESPACIOS.sub(" ", sql).strip()
+        resultado = _LISTA_IN.sub("IN (...)", resultado)
+        resultado = _TEXTO.sub("?", resultado)
+        resultado = _NUMERO.sub("?", resultado)
+        if len(_huellas) >= MAX_HUELLAS:
+            # SQL armado con valores incrustados: no dejar crecer el mapa
+            _huellas.clear()
+        _huellas[sql] = resultado
+    return resultado
+
+
+def id_huella(texto: str) -> str:
+    """Identificador corto y estable de una huella"""
+    return hashlib.sha1(texto.encode()).hexdigest()[:12]
+
+
+def medir_conexion(adquirir: Callable[[], Any]) -> "ConexionMedida":
+    """Obtiene una conexión con `adquirir` midiendo la espera"""
+    inicio = time.perf_counter()
+    conexion = adquirir()
+    segundos = time.perf_counter() - inicio
+    if _metricas:
+        with _lock:
+            _adquisicion.registrar(int(segundos * 1e6))
+    return ConexionMedida(conexion, segundos)
+
+
+class Medicion:
+    """
+    Una ejecución de sentencia con su desglose de tiempos (en segundos).
+
+    Atributos:
+        sql, parametros: Sentencia y parámetros tal como se ejecutaron
+            (en executemany, la lista de filas)
+        lote: True si se ejecutó con executemany
+        adquisicion: Espera por la conexión (sólo en la primera sentencia
+            de cada conexión; None en las demás)
+        ejecucion, lectura: Duración de execute y de los fetch posteriores
+        filas: Filas leídas, o afectadas en INSERT/UPDATE/DELETE
+        error: Excepción de execute, si falló
+        conexion: Conexión del pool con la que se ejecutó
+    """
+
+    __slots__ = ("sql", "parametros", "lote", "adquisicion", "ejecucion", "lectura", "filas", "error", "conexion")
+
+    def __init__(self, sql: str, parametros: Any, lote: bool, adquisicion: Optional[float], conexion: Any):
+        self.sql = sql
+        self.parametros = parametros
+        self.lote = lote
+        self.adquisicion = adquisicion
+        self.ejecucion = 0.0
+        self.lectura = 0.0
+        self.filas = 0
+        self.error: Optional[BaseException] = None
+        self.conexion = conexion
+
+    @property
+    def huella(self) -> str:
+        return huella(self.sql)
+
+    @property
+    def total(self) -> float:
+        """Ejecución más lectura (sin la espera por la conexión)"""
+        return self.ejecucion + self.lectura
+
+
+def _publicar(medicion: Medicion):
+    if _metricas:
+        _registrar(medicion)
+    for oyente in _oyentes:
+        oyente(medicion)
+
+
+def _es_escritura(sql: str) -> bool:
+    escritura = _escrituras.get(sql)
+    if escritura is None:
+        if len(_escrituras) >= MAX_HUELLAS:
+            _escrituras.clear()
+        escritura = _escrituras[sql] = sql.lstrip()[:6].upper() in ("INSERT", "UPDATE", "DELETE")
+    return escritura
+
+
+def _registrar(medicion: Medicion):
+    with _lock:
+        estadistica = _por_sql.get(medicion.sql)
+        if estadistica is None:
+            clave = huella(medicion.sql)
+            estadistica = _sentencias.get(clave)
+            if estadistica is None:
+                estadistica = _sentencias[clave] = EstadisticaSentencia(clave)
+            if len(_por_sql) >= MAX_HUELLAS:
+                _por_sql.clear()
+            _por_sql[medicion.sql] = estadistica
+        histogramas = estadistica.histogramas
+        estadistica.llamadas += 1
+        estadistica.filas += medicion.filas
+        histogramas["ejecucion"].registrar(int(medicion.ejecucion * 1e6))
+        if medicion.adquisicion is not None:
+            histogramas["adquisicion"].registrar(int(medicion.adquisicion * 1e6))
+        if medicion.lectura:
+            histogramas["lectura"].registrar(int(medicion.lectura * 1e6))
+        if medicion.error is not None:
+            estadistica.errores += 1
+
+
+class ConexionMedida:
+    """
+    Conexión del pool cuyos cursores miden las sentencias.
+
+    Delega todo en la conexión del pool excepto cursor() y el protocolo de
+    contexto.
+    """
+
+    __slots__ = ("_conexion", "_adquisicion")
+
+    def __init__(self, conexion: Any, adquisicion: float):
+        self._conexion = conexion
+        self._adquisicion = adquisicion
+
+    def cursor(self, *args, **kwargs) -> "CursorMedido":
+        return CursorMedido(self, self._conexion.cursor(*args, **kwargs))
+
+    def tomar_adquisicion(self) -> Optional[float]:
+        # La espera por la conexión se cuenta una sola vez
+        adquisicion, self._adquisicion = self._adquisicion, None
+        return adquisicion
+
+    def close(self):
+        self._conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._conexion.close()
+
+    def __getattr__(self, nombre: str):
+        return getattr(self._conexion, nombre)
+
+
+class CursorMedido:
+    """
+    Cursor que mide execute y las lecturas posteriores.
+
+    El tiempo de lectura y las filas se acumulan en la Medicion de la última
+    sentencia, que se publica al ejecutar la siguiente o al cerrar el cursor.
+    """
+
+    __slots__ = ("_conexion", "_cursor", "_medicion")
+
+    def __init__(self, conexion: ConexionMedida, cursor: Any):
+        object.__setattr__(self, "_conexion", conexion)
+        object.__setattr__(self, "_cursor", cursor)
+        object.__setattr__(self, "_medicion", None)
+
+    def execute(self, sql: str, *args, **kwargs):
+        return self._ejecutar(self._cursor.execute, False, sql, args, kwargs)
+
+    def executemany(self, sql: str, *args, **kwargs):
+        return self._ejecutar(self._cursor.executemany, True, sql, args, kwargs)
+
+    def _ejecutar(self, metodo: Callable, lote: bool, sql: str, args: tuple, kwargs: dict):
+        self._terminar()
+        medicion = Medicion(sql, args[0] if args else kwargs.get("parameters"), lote,
+                            self._conexion.tomar_adquisicion(), self._conexion._conexion)
+        inicio = time.perf_counter()
+        try:
+            resultado = metodo(sql, *args, **kwargs)
+        except BaseException as e:
+            medicion.ejecucion = time.perf_counter() - inicio
+            medicion.error = e
+            _publicar(medicion)
+            raise
+        medicion.ejecucion = time.perf_counter() - inicio
+        if _es_escritura(sql):
+            medicion.filas = max(self._cursor.rowcount or 0, 0)
+        object.__setattr__(self, "_medicion", medicion)
+        # sqlite3 retorna el cursor desde execute(): se mantiene la medición
+        return self if resultado is self._cursor else resultado
+
+    def fetchone(self):
+        inicio = time.perf_counter()
+        fila = self._cursor.fetchone()
+        self._acumular(inicio, 0 if fila is None else 1)
+        return fila
+
+    def fetchmany(self, *args, **kwargs):
+        inicio = time.perf_counter()
+        filas = self._cursor.fetchmany(*args, **kwargs)
+        self._acumular(inicio, len(filas))
+        return filas
+
+    def fetchall(self):
+        inicio = time.perf_counter()
+        filas = self._cursor.fetchall()
+        self._acumular(inicio, len(filas))
+        return filas
+
+    def __iter__(self):
+        # Por bloques de arraysize (lo mismo que trae el driver en cada viaje):
+        # medir fila a fila costaría más que la lectura
+        while True:
+            filas = self.fetchmany()
+            if not filas:
+                return
+            yield from filas
+
+    def _acumular(self, inicio: float, filas: int):
+        medicion = self._medicion
+        if medicion is not None:
+            medicion.lectura += time.perf_counter() - inicio
+            medicion.filas += filas
+
+    def _terminar(self):
+        medicion = self._medicion
+        if medicion is not None:
+            object.__setattr__(self, "_medicion", None)
+            _publicar(medicion)
+
+    def close(self):
+        self._terminar()
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getattr__(self, nombre: str):
+        return getattr(self._cursor, nombre)
+
+    def __setattr__(self, nombre: str, valor: Any):
+        # arraysize, prefetchrows, etc. van al cursor real
+        setattr(self._cursor, nombre, valor)
+
+
+def estadisticas() -> List[EstadisticaSentencia]:
+    """Copia de las estadísticas por huella, de mayor a menor tiempo total de ejecución"""
+    with _lock:
+        copia = []
+        for estadistica in _sentencias.values():
+            duplicada = EstadisticaSentencia(estadistica.huella)
+            duplicada.llamadas = estadistica.llamadas
+            duplicada.filas = estadistica.filas
+            duplicada.errores = estadistica.errores
+            for fase, histograma in estadistica.histogramas.items():
+                nuevo = duplicada.histogramas[fase]
+                nuevo.conteos = dict(histograma.conteos)
+                nuevo.cantidad, nuevo.suma = histograma.cantidad, histograma.suma
+                nuevo.minimo, nuevo.maximo = histograma.minimo, histograma.maximo
+            copia.append(duplicada)
+    return sorted(copia, key=lambda e: -(e.histogramas["ejecucion"].suma + e.histogramas["lectura"].suma))
+
+
+def a_json() -> dict:
+    """Métricas como diccionario serializable a JSON"""
+    with _lock:
+        adquisicion = _adquisicion.a_dict()
+    return {
+        "activa": _metricas,
+        "adquisicion": adquisicion,
+        "sentencias": [estadistica.a_dict() for estadistica in estadisticas()],
+    }
+
+
+def reporte(limite: int = 20) -> str:
+    """Reporte en texto de las `limite` sentencias con más tiempo acumulado"""
+    lineas = [
+        f"{'llamadas':>9} {'filas':>9} {'total ms':>10} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'max ms':>8} {'lect. ms':>9} {'adq. ms':>8}  sentencia"
+    ]
+    for estadistica in estadisticas()[:limite]:
+        ejecucion = estadistica.histogramas["ejecucion"]
+        lectura = estadistica.histogramas["lectura"]
+        adquisicion = estadistica.histogramas["adquisicion"]
+        sentencia = estadistica.huella if len(estadistica.huella) <= 90 else estadistica.huella[:87] + "..."
+        lineas.append(
+            f"{estadistica.llamadas:>9} {estadistica.filas:>9} {ejecucion.suma / 1000:>10.1f} "
+            f"{ejecucion.percentil(50) / 1000:>8.2f} {ejecucion.percentil(99) / 1000:>8.2f} "
+            f"{ejecucion.maximo / 1000:>8.2f} {lectura.suma / 1000:>9.1f} {adquisicion.suma / 1000:>8.1f}  {sentencia}"
+        )
+    with _lock:
+        adquisicion = _adquisicion.a_dict()
+    lineas.append(
+        f"Conexiones: {adquisicion['cantidad']} adquisición(es), "
+        f"p50 {adquisicion['p50_us'] / 1000:.2f} ms, p99 {adquisicion['p99_us'] / 1000:.2f} ms, "
+        f"max {adquisicion['max_us'] / 1000:.2f} ms"
+    )
+    return "\n".join(lineas)
+
+
+def a_prometheus(prefijo: str = "veterinaria_sql") -> str:
+    """Métricas en el formato de exposición de texto de Prometheus"""
+    limites_us = [int(limite * 1e6) for limite in LIMITES_PROMETHEUS]
+    lineas = [
+        f"# HELP {prefijo}_llamadas_total Ejecuciones por sentencia",
+        f"# TYPE {prefijo}_llamadas_total counter",
+        f"# HELP {prefijo}_filas_total Filas leídas o afectadas por sentencia",
+        f"# TYPE {prefijo}_filas_total counter",
+        f"# HELP {prefijo}_errores_total Ejecuciones fallidas por sentencia",
+        f"# TYPE {prefijo}_errores_total counter",
+        f"# HELP {prefijo}_segundos Duración por sentencia y fase (adquisicion, ejecucion, lectura)",
+        f"# TYPE {prefijo}_segundos histogram",
+    ]
+    for estadistica in estadisticas():
+        etiquetas = f'id="{estadistica.id}",sentencia="{_escapar(estadistica.huella)}"'
+        lineas.append(f"{prefijo}_llamadas_total{{{etiquetas}}} {estadistica.llamadas}")
+        lineas.append(f"{prefijo}_filas_total{{{etiquetas}}} {estadistica.filas}")
+        lineas.append(f"{prefijo}_errores_total{{{etiquetas}}} {estadistica.errores}")
+        for fase, histograma in estadistica.histogramas.items():
+            lineas.extend(_histograma_prometheus(f"{prefijo}_segundos", f'{etiquetas},fase="{fase}"',
+                                                 histograma, limites_us))
+    lineas.append(f"# HELP {prefijo}_adquisicion_segundos Espera por una conexión del pool")
+    lineas.append(f"# TYPE {prefijo}_adquisicion_segundos histogram")
+    with _lock:
+        lineas.extend(_histograma_prometheus(f"{prefijo}_adquisicion_segundos", "", _adquisicion, limites_us))
+    return "\n".join(lineas) + "\n"
+
+
+def _histograma_prometheus(nombre: str, etiquetas: str, histograma: Histograma, limites_us: List[int]) -> List[str]:
+    separador = "," if etiquetas else ""
+    lineas = [
+        f'{nombre}_bucket{{{etiquetas}{separador}le="{limite}"}} {acumulado}'
+        for limite, acumulado in zip(LIMITES_PROMETHEUS, histograma.acumulados(limites_us))
+    ]
+    lineas.append(f'{nombre}_bucket{{{etiquetas}{separador}le="+Inf"}} {histograma.cantidad}')
+    sufijo = f"{{{etiquetas}}}" if etiquetas else ""
+    lineas.append(f"{nombre}_sum{sufijo} {histograma.suma / 1e6}")
+    lineas.append(f"{nombre}_count{sufijo} {histograma.cantidad}")
+    return lineas
+
+
+def _escapar(texto: str) -> str:
+    return texto.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def escribir(ruta: str, formato: Optional[str] = None):
+    """
+    Escribe las métricas en un archivo (reemplazándolo de forma atómica).
+
+    Args:
+        ruta: Archivo de salida
+        formato: "texto", "json" o "prometheus"; por defecto según la
+            extensión (.json, .prom), o texto
+    """
+    if formato is None:
+        extension = os.path.splitext(ruta)[1].lower()
+        formato = {".json": "json", ".prom": "prometheus"}.get(extension, "texto")
+    if formato == "json":
+        contenido = json.dumps(a_json(), indent=2, ensure_ascii=False)
+    elif formato == "prometheus":
+        contenido = a_prometheus()
+    elif formato == "texto":
+        contenido = reporte() + "\n"
+    else:
+        raise ValueError("Formato inválido. Debe ser: texto, json, prometheus")
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        archivo.write(contenido)
+    os.replace(temporal, ruta)
+
+
+def servir(puerto: int, host: str = "127.0.0.1"):
+    """
+    Publica las métricas por HTTP en un hilo de fondo.
+
+    Rutas: /metrics (Prometheus), /metrics.json y / (reporte en texto).
+
+    Returns:
+        El servidor HTTP (detener con shutdown())
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Manejador(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                cuerpo, tipo = a_prometheus(), "text/plain; version=0.0.4; charset=utf-8"
+            elif self.path == "/metrics.json":
+                cuerpo, tipo = json.dumps(a_json(), ensure_ascii=False), "application/json"
+            elif self.path == "/":
+                cuerpo, tipo = reporte() + "\n", "text/plain; charset=utf-8"
+            else:
+                self.send_error(404)
+                return
+            datos = cuerpo.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", tipo)
+            self.send_header("Content-Length", str(len(datos)))
+            self.end_headers()
+            self.wfile.write(datos)
+
+        def log_message(self, formato, *args):
+            pass
+
+    servidor = ThreadingHTTPServer((host, puerto), Manejador)
+    threading.Thread(target=servidor.serve_forever, name="metricas-sql", daemon=True).start()
+    return servidor
@@ -5,10 +5,12 @@ Mauricio Bustamante - INACAP
 """
 
 import os
+import sys
 from datetime import datetime, date
-from database import test_connection
-from dao import ClienteDAO, MascotaDAO, VeterinarioDAO, CitaDAO
-from models import Cliente, Mascota, Veterinario, Cita
+import eventos
+
+# Los DAO y modelos se importan dentro de cada menú: el modo por comandos
+# (ver el final del archivo) no paga la carga de lo que usa el menú
 
 
 def limpiar_pantalla():
@@ -21,12 +23,66 @@ def pausar():
     input("\nPresione ENTER para continuar...")
 
 
+TAMANO_PAGINA = 20
+
+
+def navegar_paginas(titulo, leer_pagina, clave_de, mostrar, mensaje_vacio):
+    """
+    Muestra un listado paginado con navegación siguiente/anterior.
+    
+    Args:
+        titulo: Encabezado del listado
+        leer_pagina: Función (clave, cantidad) -> lista; clave None = primera página
+        clave_de: Función que obtiene la clave de paginación de un elemento
+        mostrar: Función que imprime un elemento
+        mensaje_vacio: Texto a mostrar si no hay registros
+    """
+    # Clave de inicio de cada página visitada, para poder volver atrás
+    inicios = [None]
+    while True:
+        limpiar_pantalla()
+        print(f"=== {titulo} (página {len(inicios)}) ===\n")
+        try:
+            # Se pide un elemento extra sólo para saber si hay página siguiente
+            elementos = leer_pagina(inicios[-1], TAMANO_PAGINA + 1)
+        except Exception as e:
+            print(f"✗ Error: {e}")
+            pausar()
+            return
+        
+        hay_siguiente = len(elementos) > TAMANO_PAGINA
+        pagina = elementos[:TAMANO_PAGINA]
+        if not pagina:
+            print(mensaje_vacio)
+            pausar()
+            return
+        for elemento in pagina:
+            mostrar(elemento)
+        
+        opciones = []
+        if hay_siguiente:
+            opciones.append("[S]iguiente")
+        if len(inicios) > 1:
+            opciones.append("[A]nterior")
+        opciones.append("[V]olver")
+        opcion = input(f"\n{' '.join(opciones)}: ").strip().lower()
+        
+        if opcion == "s" and hay_siguiente:
+            inicios.append(clave_de(pagina[-1]))
+        elif opcion == "a" and len(inicios) > 1:
+            inicios.pop()
+        elif opcion in ("v", "0", ""):
+            return
+
+
 # ============================================
 # MENÚ CRUD: CLIENTES
 # ============================================
 
 def menu_clientes():
     """Menú CRUD para gestión de clientes"""
+    from dao import ClienteDAO
+    from models import Cliente
     while True:
         limpiar_pantalla()
         print("""
@@ -38,11 +94,12 @@ def menu_clientes():
         | 3. Buscar cliente por ID         |
         | 4. Actualizar cliente            |
         | 5. Eliminar cliente              |
+        | 6. Buscar cliente por RUT        |
         | 0. Volver al menú principal      |
         ====================================
         """)
         
-        opcion = input("Elige una opción [1-5, 0]: ")
+        opcion = input("Elige una opción [1-6, 0]: ")
         
         if opcion == "1":
             limpiar_pantalla()
@@ -65,18 +122,13 @@ def menu_clientes():
             pausar()
         
         elif opcion == "2":
-            limpiar_pantalla()
-            print("=== LISTADO DE CLIENTES ===\n")
-            try:
-                clientes = ClienteDAO.read_all()
-                if clientes:
-                    for cli in clientes:
-                        print(f"  {cli}")
-                else:
-                    print("No hay clientes registrados.")
-            except Exception as e:
-                print(f"✗ Error: {e}")
-            pausar()
+            navegar_paginas(
+                "LISTADO DE CLIENTES",
+                lambda clave, cantidad: ClienteDAO.read_page(clave or 0, cantidad),
+                lambda cli: cli.id_cliente,
+                lambda cli: print(f"  {cli}"),
+                "No hay clientes registrados."
+            )
         
         elif opcion == "3":
             limpiar_pantalla()
@@ -132,6 +184,19 @@ def menu_clientes():
                 print(f"✗ Error: {e}")
             pausar()
         
+        elif opcion == "6":
+            limpiar_pantalla()
+            print("=== BUSCAR CLIENTE POR RUT ===\n")
+            try:
+                cli = ClienteDAO.read_by_rut(input("RUT: "))
+                if cli:
+                    print(f"\n{cli}")
+            except ValueError as e:
+                print(f"✗ Error de validación: {e}")
+            except Exception as e:
+                print(f"✗ Error: {e}")
+            pausar()
+        
         elif opcion == "0":
             break
         else:
@@ -143,8 +208,19 @@ def menu_clientes():
 # MENÚ CRUD: MASCOTAS
 # ============================================
 
+def mostrar_mascota(masc):
+    """Imprime una mascota del listado con sus indicadores de edad"""
+    print(f"  {masc}")
+    if masc.es_cachorro():
+        print("    → Es cachorro")
+    if masc.es_senior():
+        print("    → Es senior")
+
+
 def menu_mascotas():
     """Menú CRUD para gestión de mascotas"""
+    from dao import MascotaDAO
+    from models import Mascota
     while True:
         limpiar_pantalla()
         print("""
@@ -186,22 +262,13 @@ def menu_mascotas():
             pausar()
         
         elif opcion == "2":
-            limpiar_pantalla()
-            print("=== LISTADO DE MASCOTAS ===\n")
-            try:
-                mascotas = MascotaDAO.read_all()
-                if mascotas:
-                    for masc in mascotas:
-                        print(f"  {masc}")
-                        if masc.es_cachorro():
-                            print("    → Es cachorro")
-                        if masc.es_senior():
-                            print("    → Es senior")
-                else:
-                    print("No hay mascotas registradas.")
-            except Exception as e:
-                print(f"✗ Error: {e}")
-            pausar()
+            navegar_paginas(
+                "LISTADO DE MASCOTAS",
+                lambda clave, cantidad: MascotaDAO.read_page(clave or 0, cantidad),
+                lambda masc: masc.id_mascota,
+                mostrar_mascota,
+                "No hay mascotas registradas."
+            )
         
         elif opcion == "3":
             limpiar_pantalla()
@@ -284,6 +351,8 @@ def menu_mascotas():
 
 def menu_veterinarios():
     """Menú CRUD para gestión de veterinarios"""
+    from dao import VeterinarioDAO
+    from models import Veterinario
     while True:
         limpiar_pantalla()
         print("""
@@ -321,18 +390,13 @@ def menu_veterinarios():
             pausar()
         
         elif opcion == "2":
-            limpiar_pantalla()
-            print("=== LISTADO DE VETERINARIOS ===\n")
-            try:
-                vets = VeterinarioDAO.read_all()
-                if vets:
-                    for vet in vets:
-                        print(f"  {vet}")
-                else:
-                    print("No hay veterinarios registrados.")
-            except Exception as e:
-                print(f"✗ Error: {e}")
-            pausar()
+            navegar_paginas(
+                "LISTADO DE VETERINARIOS",
+                lambda clave, cantidad: VeterinarioDAO.read_page(clave or 0, cantidad),
+                lambda vet: vet.id_veterinario,
+                lambda vet: print(f"  {vet}"),
+                "No hay veterinarios registrados."
+            )
         
         elif opcion == "3":
             limpiar_pantalla()
@@ -397,8 +461,26 @@ def menu_veterinarios():
 # MENÚ CRUD: CITAS
 # ============================================
 
+def pedir_rango_fechas():
+    """Pide un rango de fechas opcional (Enter = sin límite)"""
+    desde_str = input("Desde (YYYY-MM-DD) [sin límite]: ").strip()
+    hasta_str = input("Hasta (YYYY-MM-DD) [sin límite]: ").strip()
+    desde = datetime.strptime(desde_str, "%Y-%m-%d").date() if desde_str else None
+    hasta = datetime.strptime(hasta_str, "%Y-%m-%d").date() if hasta_str else None
+    return desde, hasta
+
+
+def mostrar_cita(cita):
+    """Imprime una cita del listado con un extracto del motivo"""
+    print(f"  {cita}")
+    if cita.motivo:
+        print(f"    Motivo: {cita.motivo[:50]}...")
+
+
 def menu_citas():
     """Menú CRUD para gestión de citas"""
+    from dao import CitaDAO
+    from models import Cita, Recurrencia
     while True:
         limpiar_pantalla()
         print("""
@@ -412,11 +494,13 @@ def menu_citas():
         | 5. Citas por veterinario         |
         | 6. Actualizar cita               |
         | 7. Eliminar cita                 |
+        | 8. Horarios libres               |
+        | 9. Programar serie de citas      |
         | 0. Volver al menú principal      |
         ====================================
         """)
         
-        opcion = input("Elige una opción [1-7, 0]: ")
+        opcion = input("Elige una opción [1-9, 0]: ")
         
         if opcion == "1":
             limpiar_pantalla()
@@ -441,20 +525,13 @@ def menu_citas():
             pausar()
         
         elif opcion == "2":
-            limpiar_pantalla()
-            print("=== LISTADO DE CITAS ===\n")
-            try:
-                citas = CitaDAO.read_all()
-                if citas:
-                    for cita in citas:
-                        print(f"  {cita}")
-                        if cita.motivo:
-                            print(f"    Motivo: {cita.motivo[:50]}...")
-                else:
-                    print("No hay citas registradas.")
-            except Exception as e:
-                print(f"✗ Error: {e}")
-            pausar()
+            navegar_paginas(
+                "LISTADO DE CITAS",
+                lambda clave, cantidad: CitaDAO.read_page(*(clave or (None, 0)), page_size=cantidad),
+                lambda cita: (cita.fecha, cita.id_cita),
+                mostrar_cita,
+                "No hay citas registradas."
+            )
         
         elif opcion == "3":
             limpiar_pantalla()
@@ -476,7 +553,7 @@ def menu_citas():
             print("=== CITAS POR MASCOTA ===\n")
             try:
                 id_masc = int(input("ID de la mascota: "))
-                citas = CitaDAO.read_by_mascota(id_masc)
+                citas = CitaDAO.read_detalle_by_mascota(id_masc)
                 if citas:
                     print(f"\nCitas de la mascota {id_masc}:")
                     for cita in citas:
@@ -493,7 +570,8 @@ def menu_citas():
             print("=== CITAS POR VETERINARIO ===\n")
             try:
                 id_vet = int(input("ID del veterinario: "))
-                citas = CitaDAO.read_by_veterinario(id_vet)
+                desde, hasta = pedir_rango_fechas()
+                citas = CitaDAO.read_detalle_by_veterinario(id_vet, desde, hasta)
                 if citas:
                     print(f"\nCitas del veterinario {id_vet}:")
                     for cita in citas:
@@ -540,6 +618,53 @@ def menu_citas():
                 print(f"✗ Error: {e}")
             pausar()
         
+        elif opcion == "8":
+            limpiar_pantalla()
+            print("=== HORARIOS LIBRES ===\n")
+            try:
+                especialidad = input("Especialidad: ")
+                fecha_str = input("Desde (YYYY-MM-DD) [hoy]: ") or datetime.now().strftime("%Y-%m-%d")
+                desde = datetime.strptime(fecha_str, "%Y-%m-%d").date()
+                libres = CitaDAO.proximos_libres(especialidad, desde, 10)
+                if libres:
+                    print(f"\nPróximos horarios libres ({especialidad}):")
+                    for fecha, hora, id_vet in libres:
+                        print(f"  {fecha} {hora} - Veterinario ID {id_vet}")
+                else:
+                    print("No hay horarios libres para esa especialidad.")
+            except ValueError as e:
+                print(f"✗ Error de validación: {e}")
+            except Exception as e:
+                print(f"✗ Error: {e}")
+            pausar()
+        
+        elif opcion == "9":
+            limpiar_pantalla()
+            print("=== PROGRAMAR SERIE DE CITAS ===\n")
+            try:
+                id_mascota = int(input("ID de la mascota: "))
+                id_vet = int(input("ID del veterinario: "))
+                fecha_str = input("Primera fecha (YYYY-MM-DD) [hoy]: ") or datetime.now().strftime("%Y-%m-%d")
+                inicio = datetime.strptime(fecha_str, "%Y-%m-%d").date()
+                hora = input("Hora (ej: 10:00): ")
+                repeticiones = int(input("Cantidad de citas: "))
+                unidad = input("Intervalo en [D]ías o [M]eses [D]: ").strip().upper() or "D"
+                intervalo = int(input("Cada cuántos: "))
+                motivo = input("Motivo (ej: Vacuna antirrábica): ")
+                
+                if unidad == "M":
+                    regla = Recurrencia(inicio, hora, repeticiones, cada_meses=intervalo)
+                else:
+                    regla = Recurrencia(inicio, hora, repeticiones, cada_dias=intervalo)
+                resultado = CitaDAO.create_programadas(regla.expandir(id_mascota, id_vet, motivo))
+                for _, mensaje in resultado.errores:
+                    print(f"  {mensaje}")
+            except ValueError as e:
+                print(f"✗ Error de validación: {e}")
+            except Exception as e:
+                print(f"✗ Error: {e}")
+            pausar()
+        
         elif opcion == "0":
             break
         else:
@@ -547,12 +672,61 @@ def menu_citas():
             pausar()
 
 
+# ============================================
+# AGENDA
+# ============================================
+
+def menu_agenda():
+    """Agenda del día o de la semana de todos los veterinarios"""
+    from dao.agenda import agenda
+    mensaje = ""
+    while True:
+        limpiar_pantalla()
+        try:
+            if mensaje != "recargada":
+                cambios = agenda.refrescar()
+                mensaje = f"{cambios} cambio(s) desde la última lectura"
+        except Exception as e:
+            print(f"✗ Error: {e}")
+            pausar()
+            return
+        
+        titulo = "DEL DÍA" if agenda.dias == 1 else "DE LA SEMANA"
+        print(f"=== AGENDA {titulo}: {agenda.desde} a {agenda.hasta} ===")
+        print(f"({mensaje})\n")
+        por_veterinario = agenda.por_veterinario()
+        if not por_veterinario:
+            print("No hay citas agendadas.")
+        for citas in por_veterinario.values():
+            print(f"Dr(a). {citas[0].nombre_veterinario} ({citas[0].especialidad}) - {len(citas)} cita(s)")
+            for cita in citas:
+                fecha = "" if agenda.dias == 1 else f"{cita.fecha:%d/%m} "
+                print(f"  {fecha}{cita.hora} | {cita.estado:<10} | {cita.nombre_mascota} ({cita.especie}) "
+                      f"| {cita.nombre_cliente} {cita.telefono_cliente or ''}")
+            print()
+        
+        opcion = input("[R]efrescar  [D]ía/[S]emana  [V]olver: ").strip().upper()
+        mensaje = ""
+        if opcion in ("D", "S"):
+            try:
+                agenda.cargar(dias=1 if opcion == "D" else 7)
+                mensaje = "recargada"
+            except Exception as e:
+                print(f"✗ Error: {e}")
+                pausar()
+        elif opcion == "V":
+            break
+
+
 # ============================================
 # MENÚ PRINCIPAL
 # ============================================
 
 def main():
     """Función principal del sistema"""
+    from database import verificar_conexion
+    # Los resultados de los DAO (✓ creado, ✗ no encontrado, ...) se muestran en pantalla
+    eventos.agregar_oyente(eventos.imprimir)
     limpiar_pantalla()
     print("=" * 50)
     print("SISTEMA DE GESTIÓN VETERINARIA")
@@ -560,7 +734,7 @@ def main():
     print("=" * 50)
     print("\nProbando conexión a la base de datos...")
     
-    if not test_connection():
+    if not verificar_conexion():
         print("\n✗ No se pudo conectar a la base de datos.")
         print("Verifique la configuración en el archivo .env")
         pausar()
@@ -576,11 +750,12 @@ def main():
         | 2. Gestionar Mascotas            |
         | 3. Gestionar Veterinarios        |
         | 4. Gestionar Citas               |
+        | 5. Agenda del día                |
         | 0. Salir del sistema             |
         ====================================
         """)
         
-        opcion = input("Elige una opción [1-4, 0]: ")
+        opcion = input("Elige una opción [1-5, 0]: ")
         
         if opcion == "1":
             menu_clientes()
@@ -590,6 +765,8 @@ def main():
             menu_veterinarios()
         elif opcion == "4":
             menu_citas()
+        elif opcion == "5":
+            menu_agenda()
         elif opcion == "0":
             limpiar_pantalla()
             print("\n¡Gracias por usar el sistema!")
@@ -601,4 +778,8 @@ def main():
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Modo por comandos (scripts, cron): ver comandos.py
+        import comandos
+        sys.exit(comandos.ejecutar(sys.argv[1:]))
     main()
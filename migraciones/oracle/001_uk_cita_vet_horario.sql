@@ -0,0 +1,57 @@
+-- ============================================
+-- Migración 001: índice único de horario por veterinario
+-- Sistema de Gestión Veterinaria
+-- ============================================
+-- Primero normaliza las horas antiguas como '9:00' al formato que escribe
+-- la aplicación ('09:00'); si no, '9:00' y '09:00' del mismo veterinario y
+-- día no chocarían en el índice y lo harían después, al normalizarlas.
+--
+-- Si ya existen dobles reservas (la misma hora normalizada), la migración
+-- se detiene antes de modificar nada e indica cuántas hay. Se listan con:
+--   SELECT id_veterinario, fecha,
+--          LPAD(TO_NUMBER(SUBSTR(TRIM(hora), 1, INSTR(TRIM(hora), ':') - 1)), 2, '0') || ':' ||
+--          LPAD(TO_NUMBER(SUBSTR(TRIM(hora), INSTR(TRIM(hora), ':') + 1)), 2, '0') AS hora,
+--          COUNT(*)
+--     FROM cita WHERE estado <> 'CANCELADA'
+--    GROUP BY id_veterinario, fecha,
+--          LPAD(TO_NUMBER(SUBSTR(TRIM(hora), 1, INSTR(TRIM(hora), ':') - 1)), 2, '0') || ':' ||
+--          LPAD(TO_NUMBER(SUBSTR(TRIM(hora), INSTR(TRIM(hora), ':') + 1)), 2, '0')
+--   HAVING COUNT(*) > 1;
+-- Una vez canceladas o movidas, se vuelve a aplicar (la normalización no
+-- cambia las horas que ya están en formato HH:MM).
+
+DECLARE
+    v_dobles NUMBER;
+BEGIN
+    SELECT COUNT(*) INTO v_dobles
+      FROM (SELECT 1
+              FROM cita
+             WHERE estado <> 'CANCELADA'
+             GROUP BY id_veterinario, fecha,
+                      TO_NUMBER(SUBSTR(TRIM(hora), 1, INSTR(TRIM(hora), ':') - 1)) * 60
+                      + TO_NUMBER(SUBSTR(TRIM(hora), INSTR(TRIM(hora), ':') + 1))
+            HAVING COUNT(*) > 1);
+    IF v_dobles > 0 THEN
+        RAISE_APPLICATION_ERROR(-20001, v_dobles || ' horario(s) con más de una cita no cancelada. '
+            || 'Resuélvalos antes de aplicar la migración 001 (ver la consulta del encabezado).');
+    END IF;
+END;
+/
+
+UPDATE cita
+   SET hora = LPAD(TO_NUMBER(SUBSTR(TRIM(hora), 1, INSTR(TRIM(hora), ':') - 1)), 2, '0') || ':' ||
+              LPAD(TO_NUMBER(SUBSTR(TRIM(hora), INSTR(TRIM(hora), ':') + 1)), 2, '0')
+ WHERE hora <> LPAD(TO_NUMBER(SUBSTR(TRIM(hora), 1, INSTR(TRIM(hora), ':') - 1)), 2, '0') || ':' ||
+              LPAD(TO_NUMBER(SUBSTR(TRIM(hora), INSTR(TRIM(hora), ':') + 1)), 2, '0');
+
+COMMIT;
+
+-- Un veterinario no puede tener dos citas no canceladas con la misma hora de
+-- inicio. Los cruces parciales (10:00 y 10:15) los rechaza CitaDAO dentro de
+-- la transacción, con la agenda del veterinario bloqueada.
+-- Las filas CANCELADA producen una clave toda NULL y no entran al índice.
+CREATE UNIQUE INDEX uk_cita_vet_horario ON cita (
+    CASE WHEN estado <> 'CANCELADA' THEN id_veterinario END,
+    CASE WHEN estado <> 'CANCELADA' THEN fecha END,
+    CASE WHEN estado <> 'CANCELADA' THEN hora END
+);
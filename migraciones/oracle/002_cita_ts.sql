@@ -0,0 +1,43 @@
+-- ============================================
+-- Migración 002: columna ts (fecha + hora) en CITA
+-- Sistema de Gestión Veterinaria
+-- ============================================
+-- Agrega la fecha y hora combinadas de la cita, la completa para las filas
+-- existentes a partir de fecha y hora y crea el índice compuesto usado por
+-- la agenda y las consultas por rango de cada veterinario.
+-- Las horas ya quedaron normalizadas en la migración 001; igual ts se
+-- calcula interpretando 'H:MM', sin volver a escribir hora.
+-- Cada DDL se confirma solo: los pasos toleran haberse ejecutado antes, de
+-- modo que si la migración se interrumpe se puede volver a aplicar.
+
+BEGIN
+   EXECUTE IMMEDIATE 'ALTER TABLE cita ADD ts DATE';
+EXCEPTION
+   -- ORA-01430: la columna ya existe
+   WHEN OTHERS THEN IF SQLCODE <> -1430 THEN RAISE; END IF;
+END;
+/
+
+UPDATE cita
+   SET ts = TRUNC(fecha)
+          + (TO_NUMBER(SUBSTR(TRIM(hora), 1, INSTR(TRIM(hora), ':') - 1)) * 60
+             + TO_NUMBER(SUBSTR(TRIM(hora), INSTR(TRIM(hora), ':') + 1))) / 1440
+ WHERE ts IS NULL;
+
+COMMIT;
+
+BEGIN
+   EXECUTE IMMEDIATE 'ALTER TABLE cita MODIFY ts NOT NULL';
+EXCEPTION
+   -- ORA-01442: la columna ya es NOT NULL
+   WHEN OTHERS THEN IF SQLCODE <> -1442 THEN RAISE; END IF;
+END;
+/
+
+BEGIN
+   EXECUTE IMMEDIATE 'CREATE INDEX ix_cita_vet_ts ON cita (id_veterinario, ts)';
+EXCEPTION
+   -- ORA-00955: el índice ya existe
+   WHEN OTHERS THEN IF SQLCODE <> -955 THEN RAISE; END IF;
+END;
+/
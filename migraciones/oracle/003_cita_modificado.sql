@@ -0,0 +1,26 @@
+-- ============================================
+-- Migración 003: marca de cambio en CITA
+-- Sistema de Gestión Veterinaria
+-- ============================================
+-- La agenda en memoria (dao/agenda.py) relee sólo las citas con
+-- modificado posterior a su última carga. Las filas existentes quedan con
+-- la fecha de aplicación de la migración.
+-- Cada DDL se confirma solo: los pasos toleran haberse ejecutado antes, de
+-- modo que si la migración se interrumpe se puede volver a aplicar.
+
+BEGIN
+   EXECUTE IMMEDIATE 'ALTER TABLE cita ADD modificado TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL';
+EXCEPTION
+   -- ORA-01430: la columna ya existe
+   WHEN OTHERS THEN IF SQLCODE <> -1430 THEN RAISE; END IF;
+END;
+/
+
+BEGIN
+   EXECUTE IMMEDIATE 'CREATE INDEX ix_cita_modificado ON cita (modificado)';
+EXCEPTION
+   -- ORA-00955: el índice ya existe
+   -- ORA-01408: la columna ya tiene un índice con otro nombre
+   WHEN OTHERS THEN IF SQLCODE NOT IN (-955, -1408) THEN RAISE; END IF;
+END;
+/
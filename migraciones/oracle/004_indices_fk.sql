@@ -0,0 +1,40 @@
+-- ============================================
+-- Migración 004: índices de claves foráneas y filtros frecuentes
+-- Sistema de Gestión Veterinaria
+-- ============================================
+-- Oracle no indexa las claves foráneas. Sin estos índices:
+--   - MascotaDAO.read_by_cliente recorre toda MASCOTA
+--   - CitaDAO.read_by_mascota (WHERE id_mascota = :id ORDER BY ts DESC)
+--     recorre toda CITA y ordena
+--   - ON DELETE CASCADE de cliente y mascota recorre completas las tablas
+--     hijas (y bloquea la tabla hija completa durante el borrado)
+--   - CitaDAO.read_page (ORDER BY fecha, id_cita) ordena la tabla completa
+-- id_veterinario ya está cubierto por ix_cita_vet_ts (id_veterinario, ts),
+-- que Oracle recorre en orden descendente para ORDER BY ts DESC.
+-- En Enterprise Edition se puede agregar ONLINE para no bloquear escrituras.
+-- Cada DDL se confirma solo: los pasos toleran haberse ejecutado antes, de
+-- modo que si la migración se interrumpe se puede volver a aplicar.
+
+BEGIN
+   EXECUTE IMMEDIATE 'CREATE INDEX ix_mascota_cliente ON mascota (id_cliente)';
+EXCEPTION
+   -- ORA-00955: el índice ya existe
+   WHEN OTHERS THEN IF SQLCODE <> -955 THEN RAISE; END IF;
+END;
+/
+
+BEGIN
+   EXECUTE IMMEDIATE 'CREATE INDEX ix_cita_mascota_ts ON cita (id_mascota, ts)';
+EXCEPTION
+   -- ORA-00955: el índice ya existe
+   WHEN OTHERS THEN IF SQLCODE <> -955 THEN RAISE; END IF;
+END;
+/
+
+BEGIN
+   EXECUTE IMMEDIATE 'CREATE INDEX ix_cita_fecha ON cita (fecha, id_cita)';
+EXCEPTION
+   -- ORA-00955: el índice ya existe
+   WHEN OTHERS THEN IF SQLCODE <> -955 THEN RAISE; END IF;
+END;
+/
@@ -0,0 +1,20 @@
+-- ============================================
+-- Migración 005: RUT de clientes en formato normalizado
+-- Sistema de Gestión Veterinaria
+-- ============================================
+-- read_by_rut e ids_por_rut buscan el RUT normalizado (models/rut.py:
+-- "12.345.678-k" -> "12345678-K"). Los clientes guardados antes con puntos,
+-- sin guion o con "k" minúscula no se encontraban. Esta migración los deja
+-- en el mismo formato; los valores que no tienen forma de RUT no se tocan.
+-- Antes de aplicarla, verificar que no haya dos formatos del mismo RUT
+-- (chocarían con uk_cliente_rut):
+--   SELECT LTRIM(UPPER(REGEXP_REPLACE(rut, '[. -]', '')), '0'), COUNT(*)
+--     FROM cliente GROUP BY LTRIM(UPPER(REGEXP_REPLACE(rut, '[. -]', '')), '0')
+--   HAVING COUNT(*) > 1;
+
+UPDATE cliente
+   SET rut = REGEXP_REPLACE(UPPER(REGEXP_REPLACE(rut, '[. -]', '')), '^0*([0-9]+)([0-9K])$', '\1-\2')
+ WHERE REGEXP_LIKE(UPPER(REGEXP_REPLACE(rut, '[. -]', '')), '^[0-9]+[0-9K]$')
+   AND rut <> REGEXP_REPLACE(UPPER(REGEXP_REPLACE(rut, '[. -]', '')), '^0*([0-9]+)([0-9K])$', '\1-\2');
+
+COMMIT;
@@ -0,0 +1,42 @@
+-- ============================================
+-- Migración 006: registro de citas eliminadas o movidas de día
+-- Sistema de Gestión Veterinaria
+-- ============================================
+-- Agenda.refrescar lee sólo lo que cambió en su rango: las citas con
+-- `modificado` reciente y, en CITA_BAJA, las que se eliminaron o cambiaron
+-- de fecha (con la fecha anterior), que ya no aparecen en ese rango.
+-- El trigger registra también los borrados en cascada y los de otros
+-- programas. Las filas sólo sirven para refrescos recientes: se pueden
+-- purgar las de más de un día.
+-- Cada DDL se confirma solo: los pasos toleran haberse ejecutado antes, de
+-- modo que si la migración se interrumpe se puede volver a aplicar.
+
+BEGIN
+   EXECUTE IMMEDIATE 'CREATE TABLE cita_baja (
+      id_cita NUMBER NOT NULL,
+      fecha DATE NOT NULL,
+      momento TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL
+   )';
+EXCEPTION
+   -- ORA-00955: la tabla ya existe
+   WHEN OTHERS THEN IF SQLCODE <> -955 THEN RAISE; END IF;
+END;
+/
+
+BEGIN
+   EXECUTE IMMEDIATE 'CREATE INDEX ix_cita_baja_momento ON cita_baja (momento)';
+EXCEPTION
+   -- ORA-00955: el índice ya existe
+   WHEN OTHERS THEN IF SQLCODE <> -955 THEN RAISE; END IF;
+END;
+/
+
+-- Al eliminar, NEW.fecha es NULL
+CREATE OR REPLACE TRIGGER tr_cita_baja
+AFTER DELETE OR UPDATE OF fecha ON cita
+FOR EACH ROW
+WHEN (NEW.fecha IS NULL OR NEW.fecha <> OLD.fecha)
+BEGIN
+   INSERT INTO cita_baja (id_cita, fecha) VALUES (:OLD.id_cita, :OLD.fecha);
+END;
+/
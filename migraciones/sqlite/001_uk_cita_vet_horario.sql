@@ -0,0 +1,31 @@
+-- ============================================
+-- Migración 001: índice único de horario por veterinario
+-- Sistema de Gestión Veterinaria
+-- ============================================
+-- Primero normaliza las horas antiguas como '9:00' al formato que escribe
+-- la aplicación ('09:00'); si no, '9:00' y '09:00' del mismo veterinario y
+-- día no chocarían en el índice y lo harían después, al normalizarlas.
+--
+-- Si ya existen dobles reservas (la misma hora normalizada), el índice no se
+-- puede crear y la migración completa se deshace. Se listan con:
+--   SELECT id_veterinario, fecha,
+--          printf('%02d:%02d', CAST(substr(trim(hora), 1, instr(trim(hora), ':') - 1) AS INTEGER),
+--                              CAST(substr(trim(hora), instr(trim(hora), ':') + 1) AS INTEGER)) AS hora,
+--          COUNT(*)
+--     FROM cita WHERE estado <> 'CANCELADA'
+--    GROUP BY 1, 2, 3 HAVING COUNT(*) > 1;
+-- Una vez canceladas o movidas, se vuelve a aplicar.
+
+UPDATE cita
+   SET hora = printf('%02d:%02d',
+                     CAST(substr(trim(hora), 1, instr(trim(hora), ':') - 1) AS INTEGER),
+                     CAST(substr(trim(hora), instr(trim(hora), ':') + 1) AS INTEGER))
+ WHERE hora <> printf('%02d:%02d',
+                      CAST(substr(trim(hora), 1, instr(trim(hora), ':') - 1) AS INTEGER),
+                      CAST(substr(trim(hora), instr(trim(hora), ':') + 1) AS INTEGER));
+
+-- Un veterinario no puede tener dos citas no canceladas con la misma hora de
+-- inicio. Los cruces parciales (10:00 y 10:15) los rechaza CitaDAO dentro de
+-- la transacción, con la agenda del veterinario bloqueada
+CREATE UNIQUE INDEX uk_cita_vet_horario ON cita (id_veterinario, fecha, hora)
+    WHERE estado <> 'CANCELADA';
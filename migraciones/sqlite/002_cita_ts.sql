@@ -0,0 +1,21 @@
+-- ============================================
+-- Migración 002: columna ts (fecha + hora) en CITA
+-- Sistema de Gestión Veterinaria
+-- ============================================
+-- Agrega la fecha y hora combinadas de la cita, la completa para las filas
+-- existentes a partir de fecha y hora y crea el índice compuesto usado por
+-- la agenda y las consultas por rango de cada veterinario.
+-- Las horas ya quedaron normalizadas en la migración 001; igual ts se
+-- calcula interpretando 'H:MM', sin volver a escribir hora.
+-- SQLite no permite agregar NOT NULL sin valor por defecto: la aplicación
+-- siempre escribe ts.
+
+ALTER TABLE cita ADD COLUMN ts TIMESTAMP;
+
+UPDATE cita
+   SET ts = substr(fecha, 1, 10) || ' ' ||
+            printf('%02d:%02d:00',
+                   CAST(substr(trim(hora), 1, instr(trim(hora), ':') - 1) AS INTEGER),
+                   CAST(substr(trim(hora), instr(trim(hora), ':') + 1) AS INTEGER));
+
+CREATE INDEX ix_cita_vet_ts ON cita (id_veterinario, ts);
@@ -0,0 +1,21 @@
+-- ============================================
+-- Migración 003: marca de cambio en CITA
+-- Sistema de Gestión Veterinaria
+-- ============================================
+-- La agenda en memoria (dao/agenda.py) relee sólo las citas con
+-- modificado posterior a su última carga. SQLite no admite un DEFAULT no
+-- constante en ALTER TABLE ADD COLUMN, así que un trigger lo asigna al
+-- insertar (en un esquema nuevo lo hace el DEFAULT de la columna).
+
+ALTER TABLE cita ADD COLUMN modificado TIMESTAMP;
+
+UPDATE cita SET modificado = strftime('%Y-%m-%d %H:%M:%f', 'now');
+
+CREATE TRIGGER tr_cita_modificado AFTER INSERT ON cita
+WHEN NEW.modificado IS NULL
+BEGIN
+    UPDATE cita SET modificado = strftime('%Y-%m-%d %H:%M:%f', 'now')
+     WHERE id_cita = NEW.id_cita;
+END;
+
+CREATE INDEX ix_cita_modificado ON cita (modificado);
@@ -0,0 +1,13 @@
+-- ============================================
+-- Migración 004: índices de claves foráneas y filtros frecuentes
+-- Sistema de Gestión Veterinaria
+-- ============================================
+-- Ver migraciones/oracle/004_indices_fk.sql. SQLite tampoco indexa las
+-- claves foráneas: sin estos índices cada ON DELETE CASCADE recorre la
+-- tabla hija completa.
+
+CREATE INDEX ix_mascota_cliente ON mascota (id_cliente);
+
+CREATE INDEX ix_cita_mascota_ts ON cita (id_mascota, ts);
+
+CREATE INDEX ix_cita_fecha ON cita (fecha, id_cita);
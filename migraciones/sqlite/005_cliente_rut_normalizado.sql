@@ -0,0 +1,28 @@
+-- ============================================
+-- Migración 005: RUT de clientes en formato normalizado
+-- Sistema de Gestión Veterinaria
+-- ============================================
+-- read_by_rut e ids_por_rut buscan el RUT normalizado (models/rut.py:
+-- "12.345.678-k" -> "12345678-K"). Los clientes guardados antes con puntos,
+-- sin guion o con "k" minúscula no se encontraban. Esta migración los deja
+-- en el mismo formato; los valores que no tienen forma de RUT no se tocan.
+-- Antes de aplicarla, verificar que no haya dos formatos del mismo RUT
+-- (chocarían con uk_cliente_rut):
+--   SELECT ltrim(upper(replace(replace(replace(rut, '.', ''), '-', ''), ' ', '')), '0'), COUNT(*)
+--     FROM cliente GROUP BY 1 HAVING COUNT(*) > 1;
+
+UPDATE cliente
+   SET rut = n.rut
+  FROM (SELECT id_cliente,
+               CASE WHEN ltrim(substr(limpio, 1, length(limpio) - 1), '0') = '' THEN '0'
+                    ELSE ltrim(substr(limpio, 1, length(limpio) - 1), '0')
+               END || '-' || substr(limpio, -1) AS rut,
+               limpio
+          FROM (SELECT id_cliente,
+                       upper(replace(replace(replace(rut, '.', ''), '-', ''), ' ', '')) AS limpio
+                  FROM cliente)) AS n
+ WHERE n.id_cliente = cliente.id_cliente
+   AND length(n.limpio) >= 2
+   AND substr(n.limpio, 1, length(n.limpio) - 1) NOT GLOB '*[^0-9]*'
+   AND substr(n.limpio, -1) GLOB '[0-9K]'
+   AND cliente.rut <> n.rut;
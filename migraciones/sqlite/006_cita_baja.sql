@@ -0,0 +1,29 @@
+-- ============================================
+-- Migración 006: registro de citas eliminadas o movidas de día
+-- Sistema de Gestión Veterinaria
+-- ============================================
+-- Agenda.refrescar lee sólo lo que cambió en su rango: las citas con
+-- `modificado` reciente y, en cita_baja, las que se eliminaron o cambiaron
+-- de fecha (con la fecha anterior), que ya no aparecen en ese rango.
+-- Los triggers registran también los borrados en cascada y los de otros
+-- programas. Las filas sólo sirven para refrescos recientes: se pueden
+-- purgar las de más de un día.
+
+CREATE TABLE cita_baja (
+    id_cita INTEGER NOT NULL,
+    fecha DATE NOT NULL,
+    momento TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+);
+
+CREATE INDEX ix_cita_baja_momento ON cita_baja (momento);
+
+CREATE TRIGGER tr_cita_baja_eliminada AFTER DELETE ON cita
+BEGIN
+    INSERT INTO cita_baja (id_cita, fecha) VALUES (OLD.id_cita, OLD.fecha);
+END;
+
+CREATE TRIGGER tr_cita_baja_movida AFTER UPDATE OF fecha ON cita
+WHEN NEW.fecha <> OLD.fecha
+BEGIN
+    INSERT INTO cita_baja (id_cita, fecha) VALUES (OLD.id_cita, OLD.fecha);
+END;
@@ -0,0 +1,249 @@
+"""
+Módulo: migrar.py
+Migraciones versionadas del esquema
+
+Los scripts de migraciones/<motor>/ se llaman NNN_descripcion.sql; NNN es
+la versión. La tabla esquema_version registra las aplicadas, y aplicar()
+ejecuta en orden las pendientes, registrando cada una al terminar.
+
+- SQLite: cada migración y su registro van en una sola transacción; si
+  falla no queda nada a medias.
+- Oracle: cada DDL se confirma solo. Si una migración falla a mitad de
+  camino hay que deshacer a mano lo que alcanzó a crear antes de
+  reintentarla; la versión no queda registrada.
+
+schema.sql y schema_sqlite.sql crean la tabla ya con las versiones que
+incluyen. Las migraciones 001 a 003 son anteriores a este módulo y se
+aplicaban a mano: en una BD sin esquema_version, aplicar() reconoce cuáles
+tiene por los índices y columnas que dejan (_HUELLAS), crea la tabla con
+esas versiones y sigue con las demás. Si el esquema no corresponde a
+ninguna versión (una migración a medias, por ejemplo), se indica la base
+con --base N: las versiones 1..N se registran sin ejecutarse.
+
+Uso:
+    python migrar.py              # aplica las pendientes
+    python migrar.py --estado     # aplicadas y pendientes
+    python migrar.py --hasta 3    # aplica hasta la versión 3
+    python migrar.py --base 3     # registra 001..003 sin ejecutarlas
+"""
+
+import argparse
+import os
+import re
+import sys
+from typing import Dict, List, NamedTuple, Optional
+import database
+import eventos
+from database import get_connection
+
+CARPETA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migraciones")
+
+_NOMBRE = re.compile(r"^(\d+)_\w+\.sql$")
+
+# Objetos que deja cada migración anterior a migrar.py, para reconocerlas
+# en una BD sin esquema_version: ("indice", nombre) o ("columna", "tabla.columna")
+_HUELLAS = {
+    1: (("indice", "uk_cita_vet_horario"),),
+    2: (("columna", "cita.ts"), ("indice", "ix_cita_vet_ts")),
+    3: (("columna", "cita.modificado"), ("indice", "ix_cita_modificado")),
+}
+
+_BD_VACIA = "La BD está vacía: cree el esquema con schema.sql antes de migrar."
+
+
+class Migracion(NamedTuple):
+    version: int
+    nombre: str
+    ruta: str
+
+
+class EsquemaSinVersionError(Exception):
+    """La BD no tiene esquema_version y no se reconoce su versión: indicar la base"""
+
+
+def migraciones(motor: Optional[str] = None) -> List[Migracion]:
+    """Migraciones disponibles para el motor (por defecto el activo), en orden"""
+    carpeta = os.path.join(CARPETA, motor or database.backend().nombre)
+    encontradas = []
+    for nombre in os.listdir(carpeta):
+        coincide = _NOMBRE.match(nombre)
+        if coincide:
+            encontradas.append(Migracion(int(coincide.group(1)), nombre, os.path.join(carpeta, nombre)))
+    encontradas.sort()
+    versiones = [migracion.version for migracion in encontradas]
+    if len(set(versiones)) != len(versiones):
+        raise ValueError(f"Hay versiones repetidas en {carpeta}")
+    return encontradas
+
+
+def aplicadas() -> Dict[int, str]:
+    """Versiones registradas en esquema_version (versión -> archivo)"""
+    motor = database.backend()
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            if not motor.existe_tabla(cursor, "esquema_version"):
+                if motor.existe_tabla(cursor, "cliente"):
+                    raise EsquemaSinVersionError(
+                        "La BD no tiene la tabla esquema_version. Indique con --base N "
+                        "la última migración que ya tiene aplicada (0 si ninguna)."
+                    )
+                raise EsquemaSinVersionError(_BD_VACIA)
+            cursor.execute("SELECT version, nombre FROM esquema_version ORDER BY version")
+            return {int(version): nombre for version, nombre in cursor.fetchall()}
+
+
+def detectar_base() -> int:
+    """
+    Última migración aplicada en una BD sin esquema_version, según los
+    objetos de _HUELLAS que tiene.
+
+    Raises:
+        EsquemaSinVersionError: Si la BD está vacía o sus objetos no
+            corresponden a una versión (una migración a medias o salteada)
+    """
+    motor = database.backend()
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            if not motor.existe_tabla(cursor, "cliente"):
+                raise EsquemaSinVersionError(_BD_VACIA)
+            encontradas = {
+                version: [_existe(motor, cursor, tipo, nombre) for tipo, nombre in huellas]
+                for version, huellas in _HUELLAS.items()
+            }
+    base = 0
+    while all(encontradas.get(base + 1, [False])):
+        base += 1
+    for version, objetos in encontradas.items():
+        if version > base and any(objetos):
+            raise EsquemaSinVersionError(
+                f"El esquema no corresponde a ninguna versión: la migración {version} está a medias "
+                f"o falta una anterior. Indique con --base N la última migración que ya tiene aplicada."
+            )
+    return base
+
+
+def _existe(motor, cursor, tipo: str, nombre: str) -> bool:
+    if tipo == "indice":
+        return motor.existe_indice(cursor, nombre)
+    tabla, columna = nombre.split(".")
+    return motor.existe_columna(cursor, tabla, columna)
+
+
+def pendientes() -> List[Migracion]:
+    registradas = aplicadas()
+    return [migracion for migracion in migraciones() if migracion.version not in registradas]
+
+
+def aplicar(hasta: Optional[int] = None) -> List[Migracion]:
+    """
+    Aplica en orden las migraciones pendientes.
+
+    Args:
+        hasta: Última versión a aplicar (por defecto todas)
+
+    Returns:
+        List[Migracion]: Migraciones aplicadas
+
+    Raises:
+        EsquemaSinVersionError: Si la BD no tiene esquema_version y no se
+            reconoce su versión
+        database.DatabaseError: Si falla una migración (las anteriores quedan aplicadas)
+    """
+    motor = database.backend()
+    try:
+        por_aplicar = pendientes()
+    except EsquemaSinVersionError:
+        # BD anterior a migrar.py: se registran las migraciones que ya tiene
+        base = detectar_base()
+        eventos.info("migracion.base_detectada",
+                     "La BD no tenía esquema_version: por su esquema está en la versión {version}.",
+                     version=base)
+        marcar_base(base)
+        por_aplicar = pendientes()
+    hechas = []
+    for migracion in por_aplicar:
+        if hasta is not None and migracion.version > hasta:
+            break
+        with open(migracion.ruta, encoding="utf-8") as archivo:
+            script = archivo.read()
+        with get_connection() as conn:
+            try:
+                motor.ejecutar_script(conn, script)
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "INSERT INTO esquema_version (version, nombre) VALUES (:version, :nombre)",
+                        {"version": migracion.version, "nombre": migracion.nombre}
+                    )
+                conn.commit()
+            except database.DatabaseError as e:
+                conn.rollback()
+                eventos.error("migracion.error", "Error en la migración {nombre}: {error}",
+                              nombre=migracion.nombre, error=e)
+                raise
+        eventos.info("migracion.aplicada", "Migración {nombre} aplicada.", nombre=migracion.nombre)
+        hechas.append(migracion)
+    return hechas
+
+
+def marcar_base(version: int):
+    """
+    Crea esquema_version en una BD existente y registra como aplicadas las
+    migraciones hasta `version`, sin ejecutarlas.
+    """
+    motor = database.backend()
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            if motor.existe_tabla(cursor, "esquema_version"):
+                raise ValueError("La tabla esquema_version ya existe")
+            cursor.execute(motor.sql_tabla_versiones)
+            for migracion in migraciones():
+                if migracion.version <= version:
+                    cursor.execute(
+                        "INSERT INTO esquema_version (version, nombre) VALUES (:version, :nombre)",
+                        {"version": migracion.version, "nombre": migracion.nombre}
+                    )
+        conn.commit()
+    eventos.info("migracion.base", "Versión base {version} registrada.", version=version)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="migrar.py", description="Migraciones versionadas del esquema")
+    parser.add_argument("--estado", action="store_true", help="Muestra las migraciones aplicadas y pendientes")
+    parser.add_argument("--hasta", type=int, help="Última versión a aplicar")
+    parser.add_argument("--base", type=int,
+                        help="Registra 1..N como aplicadas en una BD sin esquema_version (si no se reconoce sola)")
+    args = parser.parse_args(argv)
+
+    eventos.agregar_oyente(eventos.imprimir)
+    motor = database.backend()
+    try:
+        if args.base is not None:
+            marcar_base(args.base)
+            return 0
+        if args.estado:
+            try:
+                registradas = aplicadas()
+            except EsquemaSinVersionError:
+                # Lo que aplicar() daría por aplicado (sin crear la tabla todavía)
+                base = detectar_base()
+                print(f"  (sin esquema_version: por su esquema la BD está en la versión {base})")
+                registradas = {migracion.version: migracion.nombre
+                               for migracion in migraciones() if migracion.version <= base}
+            for migracion in migraciones():
+                marca = "aplicada " if migracion.version in registradas else "pendiente"
+                print(f"  {marca}  {migracion.nombre}")
+            return 0
+        hechas = aplicar(args.hasta)
+        if not hechas:
+            print(f"✓ El esquema de {motor.descripcion} está al día.")
+        return 0
+    except (EsquemaSinVersionError, ValueError) as e:
+        print(f"✗ {e}")
+        return 1
+    except database.DatabaseError:
+        # El error ya se informó como evento
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,5 +3,17 @@ from .cliente import Cliente
 from .mascota import Mascota
 from .veterinario import Veterinario
 from .cita import Cita
+from .cita_detalle import CitaDetalle
+from .recurrencia import Recurrencia
 
-__all__ = ["Cliente", "Mascota", "Veterinario", "Cita"]
+
+def __getattr__(nombre: str):
+    # CitaBatch carga NumPy (si está instalado): se importa sólo al usarla
+    if nombre == "CitaBatch":
+        from .cita_batch import CitaBatch
+        globals()[nombre] = CitaBatch
+        return CitaBatch
+    raise AttributeError(f"module 'models' has no attribute '{nombre}'")
+
+
+__all__ = ["Cliente", "Mascota", "Veterinario", "Cita", "CitaDetalle", "Recurrencia", "CitaBatch"]
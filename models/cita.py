@@ -1,6 +1,6 @@
 """Módulo: models/cita.py - Clase Cita"""
-from datetime import date, datetime
-from typing import Optional
+from datetime import date, datetime, time
+from typing import Dict, Optional
 
 class Cita:
     """Clase que representa una cita veterinaria"""
@@ -11,15 +11,39 @@ class Cita:
     ESTADO_CANCELADA = "CANCELADA"
     ESTADOS_VALIDOS = [ESTADO_PENDIENTE, ESTADO_CONFIRMADA, ESTADO_COMPLETADA, ESTADO_CANCELADA]
     
-    def __init__(self, id_cita: int, id_mascota: int, id_veterinario: int, fecha: date, hora: str, motivo: str, estado: str = ESTADO_PENDIENTE, diagnostico: Optional[str] = None):
+    # Sin __dict__ por instancia: menos memoria al cargar miles de filas
+    __slots__ = ("_id_cita", "_id_mascota", "_id_veterinario", "_fecha", "_minutos", "_motivo", "_estado",
+                 "_diagnostico", "_modificado")
+    
+    # Hora en texto -> minutos, para no volver a interpretar las horas repetidas en from_row
+    _MINUTOS_POR_HORA: Dict[str, int] = {}
+    
+    def __init__(self, id_cita: int, id_mascota: int, id_veterinario: int, fecha: date, hora: str, motivo: str, estado: str = ESTADO_PENDIENTE, diagnostico: Optional[str] = None, ts: Optional[datetime] = None, modificado: Optional[datetime] = None):
+        # ts es la columna derivada fecha + hora de la BD; se recalcula desde
+        # fecha y hora, así que al leer filas con SELECT * sólo se descarta.
+        # modificado lo asigna la BD en cada insert/update.
         self._id_cita = id_cita
         self._id_mascota = id_mascota
         self._id_veterinario = id_veterinario
         self._fecha = fecha
-        self._hora = hora
+        # La hora se interpreta una sola vez: minutos desde medianoche
+        self._minutos = Cita.hora_a_minutos(hora)
         self._motivo = motivo
         self._estado = estado
         self._diagnostico = diagnostico
+        self._modificado = modificado
+    
+    @classmethod
+    def from_row(cls, row) -> "Cita":
+        """Construye desde una fila de la BD (SELECT *) sin pasar por los setters"""
+        cita = cls.__new__(cls)
+        (cita._id_cita, cita._id_mascota, cita._id_veterinario, cita._fecha, hora,
+         cita._motivo, cita._estado, cita._diagnostico, _, cita._modificado) = row
+        minutos = cls._MINUTOS_POR_HORA.get(hora)
+        if minutos is None:
+            minutos = cls._MINUTOS_POR_HORA[hora] = cls.hora_a_minutos(hora)
+        cita._minutos = minutos
+        return cita
     
     @property
     def id_cita(self) -> int:
@@ -61,11 +85,22 @@ class Cita:
     
     @property
     def hora(self) -> str:
-        return self._hora
+        return Cita.minutos_a_hora(self._minutos)
     
     @hora.setter
     def hora(self, value: str):
-        self._hora = value.strip()
+        self._minutos = Cita.hora_a_minutos(value)
+    
+    @property
+    def minutos(self) -> int:
+        """Hora de la cita en minutos desde medianoche"""
+        return self._minutos
+    
+    @property
+    def ts(self) -> datetime:
+        """Fecha y hora de la cita (columna ts de la BD)"""
+        dia = self._fecha.date() if isinstance(self._fecha, datetime) else self._fecha
+        return datetime.combine(dia, time(self._minutos // 60, self._minutos % 60))
     
     @property
     def motivo(self) -> str:
@@ -93,6 +128,28 @@ class Cita:
     def diagnostico(self, value: Optional[str]):
         self._diagnostico = value.strip() if value else None
     
+    @staticmethod
+    def hora_a_minutos(hora: str) -> int:
+        """Convierte "HH:MM" (o "H:MM") en minutos desde medianoche"""
+        try:
+            horas, minutos = hora.strip().split(":")
+            horas, minutos = int(horas), int(minutos)
+        except (AttributeError, ValueError):
+            raise ValueError(f"Hora inválida: {hora!r}. Use el formato HH:MM")
+        if not (0 <= horas < 24 and 0 <= minutos < 60):
+            raise ValueError(f"Hora fuera de rango: {hora!r}")
+        return horas * 60 + minutos
+    
+    @staticmethod
+    def minutos_a_hora(minutos: int) -> str:
+        """Convierte minutos desde medianoche en texto HH:MM"""
+        return f"{minutos // 60:02d}:{minutos % 60:02d}"
+    
+    @property
+    def modificado(self) -> Optional[datetime]:
+        """Momento del último insert/update en la BD (None si no se ha guardado)"""
+        return self._modificado
+    
     def esta_pendiente(self) -> bool:
         return self._estado == self.ESTADO_PENDIENTE
     
@@ -100,12 +157,12 @@ class Cita:
         return self._estado == self.ESTADO_COMPLETADA
     
     def __str__(self) -> str:
-        return f"Cita(ID: {self._id_cita}, Mascota ID: {self._id_mascota}, Veterinario ID: {self._id_veterinario}, Fecha: {self._fecha}, Hora: {self._hora}, Estado: {self._estado})"
+        return f"Cita(ID: {self._id_cita}, Mascota ID: {self._id_mascota}, Veterinario ID: {self._id_veterinario}, Fecha: {self._fecha}, Hora: {self.hora}, Estado: {self._estado})"
     
     def to_dict(self) -> dict:
         return {
             "id_cita": self._id_cita, "id_mascota": self._id_mascota, "id_veterinario": self._id_veterinario,
-            "fecha": self._fecha.isoformat() if self._fecha else None, "hora": self._hora, "motivo": self._motivo,
+            "fecha": self._fecha.isoformat() if self._fecha else None, "hora": self.hora, "motivo": self._motivo,
             "estado": self._estado, "diagnostico": self._diagnostico,
             "esta_pendiente": self.esta_pendiente(), "esta_completada": self.esta_completada()
         }
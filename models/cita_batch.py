@@ -0,0 +1,204 @@
+"""
+Módulo: models/cita_batch.py
+Clase CitaBatch: historial de citas en columnas para análisis en memoria
+
+En lugar de un objeto Cita por fila, cada campo se guarda en un array
+tipado: IDs y fechas como enteros, la hora en minutos, el estado como
+código de categoría y el motivo como índice a una tabla de textos únicos.
+Los filtros y agrupaciones trabajan sobre las columnas completas (con
+NumPy si está instalado) sin crear instancias de Cita.
+"""
+
+import operator
+from array import array
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from .cita import Cita
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se recorren los arrays en Python
+    np = None
+
+_EPOCA = date(1970, 1, 1).toordinal()
+_OPERADORES = {"==": operator.eq, ">=": operator.ge, "<=": operator.le}
+
+
+class CitaBatch:
+    """
+    Contenedor columnar de citas.
+
+    Columnas: id_cita, id_mascota, id_veterinario, fecha (ordinal del día),
+    minutos (hora desde medianoche), estado (código en Cita.ESTADOS_VALIDOS,
+    o CODIGO_DESCONOCIDO) y motivo (código en la tabla `motivos`).
+    """
+
+    # Orden de columnas que espera agregar_filas()
+    COLUMNAS_SQL = "id_cita, id_mascota, id_veterinario, fecha, hora, motivo, estado"
+
+    ESTADOS = tuple(Cita.ESTADOS_VALIDOS)
+    _CODIGO_ESTADO = {estado: codigo for codigo, estado in enumerate(ESTADOS)}
+
+    # Estado NULL o fuera de ESTADOS (filas antiguas o cargadas sin el CHECK):
+    # se conserva la fila y en conteos y citas su estado es None
+    CODIGO_DESCONOCIDO = -1
+
+    def __init__(self, motivos: Optional[List[str]] = None):
+        self.id_cita = array("q")
+        self.id_mascota = array("q")
+        self.id_veterinario = array("q")
+        self.fecha = array("l")
+        self.minutos = array("h")
+        self.estado = array("b")
+        self.motivo = array("l")
+        self._motivos: List[str] = list(motivos) if motivos else []
+        self._codigo_motivo: Dict[str, int] = {texto: i for i, texto in enumerate(self._motivos)}
+        # Las mismas fechas y horas se repiten mucho: se convierten una vez
+        self._ordinales: Dict[Any, int] = {}
+        self._horas: Dict[str, int] = {}
+
+    @property
+    def motivos(self) -> List[str]:
+        """Tabla de motivos únicos; la columna motivo guarda índices a esta lista"""
+        return self._motivos
+
+    def __len__(self) -> int:
+        return len(self.id_cita)
+
+    def agregar_filas(self, filas: Iterable[Sequence]):
+        """Agrega filas con el orden de COLUMNAS_SQL (tal como las entrega el cursor)"""
+        for id_cita, id_mascota, id_vet, fecha, hora, motivo, estado in filas:
+            self.id_cita.append(id_cita)
+            self.id_mascota.append(id_mascota)
+            self.id_veterinario.append(id_vet)
+            ordinal = self._ordinales.get(fecha)
+            if ordinal is None:
+                ordinal = self._ordinales[fecha] = (fecha.date() if isinstance(fecha, datetime) else fecha).toordinal()
+            self.fecha.append(ordinal)
+            minutos = self._horas.get(hora)
+            if minutos is None:
+                minutos = self._horas[hora] = Cita.hora_a_minutos(hora)
+            self.minutos.append(minutos)
+            self.estado.append(self._CODIGO_ESTADO.get(estado, self.CODIGO_DESCONOCIDO))
+            self.motivo.append(self._codigo_de_motivo(motivo or ""))
+
+    def columna(self, nombre: str):
+        """Columna como arreglo NumPy (sin copiar) o, sin NumPy, como array"""
+        datos = getattr(self, nombre)
+        return np.frombuffer(datos, dtype=datos.typecode) if np is not None else datos
+
+    # ---------------- Filtros ----------------
+
+    def mascara(self, estado: Optional[str] = None, id_veterinario: Optional[int] = None,
+                desde: Optional[date] = None, hasta: Optional[date] = None) -> Sequence[bool]:
+        """Filas que cumplen todas las condiciones dadas (fechas inclusive)"""
+        condiciones = []
+        if estado is not None:
+            condiciones.append(("estado", "==", self._CODIGO_ESTADO[estado]))
+        if id_veterinario is not None:
+            condiciones.append(("id_veterinario", "==", id_veterinario))
+        if desde is not None:
+            condiciones.append(("fecha", ">=", desde.toordinal()))
+        if hasta is not None:
+            condiciones.append(("fecha", "<=", hasta.toordinal()))
+
+        if np is not None:
+            mascara = np.ones(len(self), dtype=bool)
+            for nombre, operador, valor in condiciones:
+                mascara &= _OPERADORES[operador](self.columna(nombre), valor)
+            return mascara
+
+        mascara = [True] * len(self)
+        for nombre, operador, valor in condiciones:
+            comparar = _OPERADORES[operador]
+            mascara = [m and comparar(v, valor) for m, v in zip(mascara, getattr(self, nombre))]
+        return mascara
+
+    def filtrar(self, **condiciones) -> "CitaBatch":
+        """Nuevo CitaBatch con las filas que cumplen mascara(**condiciones)"""
+        return self.seleccionar(self.mascara(**condiciones))
+
+    def seleccionar(self, mascara: Sequence[bool]) -> "CitaBatch":
+        """Nuevo CitaBatch con las filas marcadas (conserva los códigos de motivo)"""
+        resultado = CitaBatch(self._motivos)
+        for nombre in ("id_cita", "id_mascota", "id_veterinario", "fecha", "minutos", "estado", "motivo"):
+            origen = getattr(self, nombre)
+            if np is not None:
+                seleccion = array(origen.typecode, self.columna(nombre)[np.asarray(mascara, dtype=bool)].tobytes())
+            else:
+                seleccion = array(origen.typecode, (v for v, m in zip(origen, mascara) if m))
+            setattr(resultado, nombre, seleccion)
+        return resultado
+
+    # ---------------- Agrupaciones ----------------
+
+    def contar_por_veterinario(self) -> Dict[int, int]:
+        return self._contar(self.id_veterinario)
+
+    def contar_por_estado(self) -> Dict[Optional[str], int]:
+        return {self._nombre_estado(codigo): total for codigo, total in self._contar(self.estado).items()}
+
+    def contar_por_motivo(self) -> Dict[str, int]:
+        return {self._motivos[codigo]: total for codigo, total in self._contar(self.motivo).items()}
+
+    def contar_por_mes(self) -> Dict[Tuple[int, int], int]:
+        """Citas por (año, mes)"""
+        if np is not None:
+            dias = (self.columna("fecha") - _EPOCA).astype("datetime64[D]")
+            meses = dias.astype("datetime64[M]").astype("int64")  # meses desde 1970-01
+            valores, totales = np.unique(meses, return_counts=True)
+            return {(1970 + int(m) // 12, int(m) % 12 + 1): int(t) for m, t in zip(valores, totales)}
+        por_dia = self._contar(self.fecha)
+        resultado: Dict[Tuple[int, int], int] = {}
+        for ordinal, total in por_dia.items():
+            dia = date.fromordinal(ordinal)
+            clave = (dia.year, dia.month)
+            resultado[clave] = resultado.get(clave, 0) + total
+        return resultado
+
+    def contar_por_veterinario_y_estado(self) -> Dict[Tuple[int, Optional[str]], int]:
+        """Citas por (id_veterinario, estado)"""
+        # Los códigos se desplazan en 1 para que CODIGO_DESCONOCIDO (-1) quede en 0
+        n_estados = len(self.ESTADOS) + 1
+        if np is not None:
+            claves = self.columna("id_veterinario") * n_estados + self.columna("estado") + 1
+            valores, totales = np.unique(claves, return_counts=True)
+            pares = ((int(v) // n_estados, int(v) % n_estados - 1, int(t)) for v, t in zip(valores, totales))
+        else:
+            combinadas = self._contar(v * n_estados + e + 1 for v, e in zip(self.id_veterinario, self.estado))
+            pares = ((v // n_estados, v % n_estados - 1, t) for v, t in combinadas.items())
+        return {(id_vet, self._nombre_estado(codigo)): total for id_vet, codigo, total in pares}
+
+    # ---------------- Acceso por fila ----------------
+
+    def cita(self, i: int) -> Cita:
+        """Materializa la fila i como Cita (sin diagnóstico)"""
+        return Cita(self.id_cita[i], self.id_mascota[i], self.id_veterinario[i], date.fromordinal(self.fecha[i]),
+                    Cita.minutos_a_hora(self.minutos[i]), self._motivos[self.motivo[i]], self._nombre_estado(self.estado[i]))
+
+    def memoria(self) -> int:
+        """Bytes ocupados por las columnas (sin contar la tabla de motivos)"""
+        return sum(columna.itemsize * len(columna) for columna in
+                   (self.id_cita, self.id_mascota, self.id_veterinario, self.fecha, self.minutos, self.estado, self.motivo))
+
+    def _nombre_estado(self, codigo: int) -> Optional[str]:
+        return self.ESTADOS[codigo] if codigo != self.CODIGO_DESCONOCIDO else None
+
+    def _codigo_de_motivo(self, motivo: str) -> int:
+        codigo = self._codigo_motivo.get(motivo)
+        if codigo is None:
+            codigo = self._codigo_motivo[motivo] = len(self._motivos)
+            self._motivos.append(motivo)
+        return codigo
+
+    def _contar(self, valores) -> Dict[int, int]:
+        if np is not None and isinstance(valores, array):
+            unicos, totales = np.unique(np.frombuffer(valores, dtype=valores.typecode), return_counts=True)
+            return {int(v): int(t) for v, t in zip(unicos, totales)}
+        conteo: Dict[int, int] = {}
+        for valor in valores:
+            conteo[valor] = conteo.get(valor, 0) + 1
+        return conteo
+
+    def __str__(self) -> str:
+        return f"CitaBatch({len(self)} cita(s), {len(self._motivos)} motivo(s) distintos)"
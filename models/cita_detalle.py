@@ -0,0 +1,118 @@
+"""Módulo: models/cita_detalle.py - Clase CitaDetalle (vista de solo lectura)"""
+from datetime import date
+from typing import Optional
+
+
+class CitaDetalle:
+    """
+    Cita con los datos de su mascota, dueño y veterinario.
+
+    Se construye desde una sola consulta con JOIN (CitaDAO.read_detalle_*)
+    para mostrar agendas sin resolver cada ID por separado. Es de solo
+    lectura: para modificar una cita se usa Cita y CitaDAO.update.
+    """
+
+    __slots__ = (
+        "_id_cita", "_fecha", "_hora", "_motivo", "_estado", "_diagnostico",
+        "_id_mascota", "_nombre_mascota", "_especie",
+        "_id_cliente", "_nombres_cliente", "_apellidos_cliente", "_telefono_cliente",
+        "_id_veterinario", "_nombre_veterinario", "_apellido_veterinario", "_especialidad",
+    )
+
+    def __init__(self, id_cita: int, fecha: date, hora: str, motivo: str, estado: str, diagnostico: Optional[str],
+                 id_mascota: int, nombre_mascota: str, especie: str,
+                 id_cliente: int, nombres_cliente: str, apellidos_cliente: str, telefono_cliente: str,
+                 id_veterinario: int, nombre_veterinario: str, apellido_veterinario: str, especialidad: str):
+        self._id_cita = id_cita
+        self._fecha = fecha
+        self._hora = hora
+        self._motivo = motivo
+        self._estado = estado
+        self._diagnostico = diagnostico
+        self._id_mascota = id_mascota
+        self._nombre_mascota = nombre_mascota
+        self._especie = especie
+        self._id_cliente = id_cliente
+        self._nombres_cliente = nombres_cliente
+        self._apellidos_cliente = apellidos_cliente
+        self._telefono_cliente = telefono_cliente
+        self._id_veterinario = id_veterinario
+        self._nombre_veterinario = nombre_veterinario
+        self._apellido_veterinario = apellido_veterinario
+        self._especialidad = especialidad
+
+    @property
+    def id_cita(self) -> int:
+        return self._id_cita
+
+    @property
+    def fecha(self) -> date:
+        return self._fecha
+
+    @property
+    def hora(self) -> str:
+        return self._hora
+
+    @property
+    def motivo(self) -> str:
+        return self._motivo
+
+    @property
+    def estado(self) -> str:
+        return self._estado
+
+    @property
+    def diagnostico(self) -> Optional[str]:
+        return self._diagnostico
+
+    @property
+    def id_mascota(self) -> int:
+        return self._id_mascota
+
+    @property
+    def nombre_mascota(self) -> str:
+        return self._nombre_mascota
+
+    @property
+    def especie(self) -> str:
+        return self._especie
+
+    @property
+    def id_cliente(self) -> int:
+        return self._id_cliente
+
+    @property
+    def nombre_cliente(self) -> str:
+        return f"{self._nombres_cliente} {self._apellidos_cliente}"
+
+    @property
+    def telefono_cliente(self) -> str:
+        return self._telefono_cliente
+
+    @property
+    def id_veterinario(self) -> int:
+        return self._id_veterinario
+
+    @property
+    def nombre_veterinario(self) -> str:
+        return f"{self._nombre_veterinario} {self._apellido_veterinario}"
+
+    @property
+    def especialidad(self) -> str:
+        return self._especialidad
+
+    def __str__(self) -> str:
+        return (f"Cita {self._id_cita} | {self._fecha} {self._hora} | {self._estado} | "
+                f"{self._nombre_mascota} ({self._especie}) | Dueño: {self.nombre_cliente} "
+                f"{self._telefono_cliente or ''} | Vet: {self.nombre_veterinario} ({self._especialidad})")
+
+    def to_dict(self) -> dict:
+        return {
+            "id_cita": self._id_cita, "fecha": self._fecha.isoformat() if self._fecha else None,
+            "hora": self._hora, "motivo": self._motivo, "estado": self._estado, "diagnostico": self._diagnostico,
+            "id_mascota": self._id_mascota, "nombre_mascota": self._nombre_mascota, "especie": self._especie,
+            "id_cliente": self._id_cliente, "nombre_cliente": self.nombre_cliente,
+            "telefono_cliente": self._telefono_cliente,
+            "id_veterinario": self._id_veterinario, "nombre_veterinario": self.nombre_veterinario,
+            "especialidad": self._especialidad
+        }
@@ -4,11 +4,15 @@ Clase que representa un Cliente (dueño de mascotas)
 """
 
 from typing import Optional
+from .rut import normalizar_rut
 
 
 class Cliente:
     """Clase que representa un cliente de la veterinaria"""
     
+    # Sin __dict__ por instancia: menos memoria al cargar miles de filas
+    __slots__ = ("_id_cliente", "_rut", "_nombres", "_apellidos", "_telefono", "_email", "_direccion")
+    
     def __init__(
         self,
         id_cliente: int,
@@ -27,6 +31,13 @@ class Cliente:
         self._email = email
         self._direccion = direccion
     
+    @classmethod
+    def from_row(cls, row) -> "Cliente":
+        """Construye desde una fila de la BD (SELECT *) sin pasar por los setters"""
+        cliente = cls.__new__(cls)
+        (cliente._id_cliente, cliente._rut, cliente._nombres, cliente._apellidos, cliente._telefono, cliente._email, cliente._direccion) = row
+        return cliente
+    
     @property
     def id_cliente(self) -> int:
         return self._id_cliente
@@ -45,7 +56,7 @@ class Cliente:
     def rut(self, value: str):
         if not value or len(value.strip()) == 0:
             raise ValueError("El RUT no puede estar vacío")
-        self._rut = value.strip()
+        self._rut = normalizar_rut(value)
     
     @property
     def nombres(self) -> str:
@@ -11,6 +11,9 @@ class Mascota:
     ESPECIE_HAMSTER = "HAMSTER"
     ESPECIES_VALIDAS = [ESPECIE_PERRO, ESPECIE_GATO, ESPECIE_AVE, ESPECIE_CONEJO, ESPECIE_HAMSTER]
     
+    # Sin __dict__ por instancia: menos memoria al cargar miles de filas
+    __slots__ = ("_id_mascota", "_nombre", "_especie", "_raza", "_edad", "_color", "_peso", "_id_cliente")
+    
     def __init__(self, id_mascota: int, nombre: str, especie: str, raza: str, edad: int, color: str, peso: float, id_cliente: int):
         self._id_mascota = id_mascota
         self._nombre = nombre
@@ -21,6 +24,13 @@ class Mascota:
         self._peso = peso
         self._id_cliente = id_cliente
     
+    @classmethod
+    def from_row(cls, row) -> "Mascota":
+        """Construye desde una fila de la BD (SELECT *) sin pasar por los setters"""
+        mascota = cls.__new__(cls)
+        (mascota._id_mascota, mascota._nombre, mascota._especie, mascota._raza, mascota._edad, mascota._color, mascota._peso, mascota._id_cliente) = row
+        return mascota
+    
     @property
     def id_mascota(self) -> int:
         return self._id_mascota
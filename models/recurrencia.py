@@ -0,0 +1,68 @@
+"""Módulo: models/recurrencia.py - Clase Recurrencia (regla de citas periódicas)"""
+import calendar
+from datetime import date, timedelta
+from typing import List
+from .cita import Cita
+
+
+class Recurrencia:
+    """
+    Regla para generar una serie de citas: `repeticiones` citas a la misma
+    hora, separadas por `cada_dias` días o `cada_meses` meses.
+
+    Ejemplos:
+        Recurrencia(date(2025, 3, 1), "10:00", 3, cada_dias=21)   # 3 dosis cada 21 días
+        Recurrencia(date(2025, 3, 1), "10:00", 5, cada_meses=12)  # refuerzo anual
+    """
+
+    def __init__(self, inicio: date, hora: str, repeticiones: int, cada_dias: int = 0, cada_meses: int = 0):
+        if repeticiones < 1:
+            raise ValueError("Las repeticiones deben ser al menos 1")
+        if cada_dias < 0 or cada_meses < 0 or (repeticiones > 1 and not (cada_dias or cada_meses)):
+            raise ValueError("Debe indicar un intervalo en días o en meses")
+        if cada_dias and cada_meses:
+            raise ValueError("Indique el intervalo en días o en meses, no ambos")
+        self._inicio = inicio
+        self._minutos = Cita.hora_a_minutos(hora)
+        self._repeticiones = repeticiones
+        self._cada_dias = cada_dias
+        self._cada_meses = cada_meses
+
+    @property
+    def inicio(self) -> date:
+        return self._inicio
+
+    @property
+    def hora(self) -> str:
+        return Cita.minutos_a_hora(self._minutos)
+
+    @property
+    def repeticiones(self) -> int:
+        return self._repeticiones
+
+    def fechas(self) -> List[date]:
+        """Fechas de la serie; al sumar meses, el día se ajusta al último del mes si no existe"""
+        if self._cada_meses:
+            return [self._sumar_meses(self._inicio, n * self._cada_meses) for n in range(self._repeticiones)]
+        return [self._inicio + timedelta(days=n * self._cada_dias) for n in range(self._repeticiones)]
+
+    def expandir(self, id_mascota: int, id_veterinario: int, motivo: str,
+                 estado: str = Cita.ESTADO_PENDIENTE) -> List[Cita]:
+        """
+        Genera las citas de la serie para una mascota.
+
+        Las citas quedan sin ID (0): CitaDAO.create_programadas los asigna
+        en bloque al insertarlas.
+        """
+        hora = self.hora
+        return [Cita(0, id_mascota, id_veterinario, fecha, hora, motivo, estado) for fecha in self.fechas()]
+
+    @staticmethod
+    def _sumar_meses(fecha: date, meses: int) -> date:
+        total = fecha.month - 1 + meses
+        anio, mes = fecha.year + total // 12, total % 12 + 1
+        return date(anio, mes, min(fecha.day, calendar.monthrange(anio, mes)[1]))
+
+    def __str__(self) -> str:
+        intervalo = f"cada {self._cada_meses} mes(es)" if self._cada_meses else f"cada {self._cada_dias} día(s)"
+        return f"Recurrencia({self._repeticiones} cita(s) {intervalo} desde {self._inicio} a las {self.hora})"
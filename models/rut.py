@@ -0,0 +1,51 @@
+"""Módulo: models/rut.py - Normalización y validación de RUT chileno"""
+
+
+def normalizar_rut(rut: str) -> str:
+    """
+    Lleva un RUT al formato almacenado en la BD: cuerpo sin puntos, guion y
+    dígito verificador en mayúscula ("12.345.678-k" -> "12345678-K").
+
+    Raises:
+        ValueError: Si el texto no tiene forma de RUT
+    """
+    if not rut:
+        raise ValueError("El RUT no puede estar vacío")
+    limpio = rut.replace(".", "").replace("-", "").replace(" ", "").upper()
+    cuerpo, dv = limpio[:-1], limpio[-1:]
+    if not cuerpo.isdigit() or not (dv.isdigit() or dv == "K"):
+        raise ValueError(f"RUT inválido: {rut}")
+    return f"{int(cuerpo)}-{dv}"
+
+
+def normalizar_rut_guardado(rut: str) -> str:
+    """
+    Como normalizar_rut, para RUT leídos de la BD: los valores históricos
+    que no tienen forma de RUT se retornan tal cual en vez de fallar, de
+    modo que esas filas se puedan leer y actualizar.
+    """
+    try:
+        return normalizar_rut(rut)
+    except ValueError:
+        return rut
+
+
+def digito_verificador(cuerpo: int) -> str:
+    """Calcula el dígito verificador (módulo 11) del cuerpo de un RUT"""
+    suma = 0
+    factor = 2
+    while cuerpo:
+        suma += (cuerpo % 10) * factor
+        cuerpo //= 10
+        factor = factor + 1 if factor < 7 else 2
+    resto = 11 - suma % 11
+    return "0" if resto == 11 else "K" if resto == 10 else str(resto)
+
+
+def rut_valido(rut: str) -> bool:
+    """True si el RUT tiene formato correcto y su dígito verificador coincide"""
+    try:
+        cuerpo, dv = normalizar_rut(rut).split("-")
+    except ValueError:
+        return False
+    return digito_verificador(int(cuerpo)) == dv
@@ -0,0 +1,216 @@
+"""
+Módulo: models/validacion.py
+Validación por lotes de los campos de los modelos
+
+Los setters de los modelos validan un valor a la vez y lanzan ValueError en
+el primer problema. Para importaciones masivas, validar_columnas() recibe
+columnas completas de valores candidatos y retorna, por fila, una máscara
+de bits con las reglas que no se cumplen (0 = fila válida), de modo que las
+filas malas se descartan antes de ir a la base de datos.
+
+Las reglas replican las restricciones de schema.sql:
+- especie:  ck_mascota_especie (obligatoria, sin distinguir mayúsculas)
+- estado:   ck_cita_estado (vacío = PENDIENTE, el DEFAULT de la columna)
+- edad:     ck_mascota_edad, entero entre 0 y 50 (obligatoria)
+- peso:     ck_mascota_peso, mayor a 0 y hasta 500 (vacío permitido)
+- email:    usuario@dominio.tld (vacío permitido)
+- rut:      formato y dígito verificador (obligatorio)
+"""
+
+import math
+import re
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from .cita import Cita
+from .mascota import Mascota
+from .rut import digito_verificador
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él las comparaciones se hacen en Python
+    np = None
+
+ERROR_ESPECIE = 1
+ERROR_ESTADO = 2
+ERROR_EDAD = 4
+ERROR_PESO = 8
+ERROR_EMAIL = 16
+ERROR_RUT = 32
+
+MENSAJES = {
+    ERROR_ESPECIE: f"Especie inválida. Debe ser: {', '.join(Mascota.ESPECIES_VALIDAS)}",
+    ERROR_ESTADO: f"Estado inválido. Debe ser: {', '.join(Cita.ESTADOS_VALIDOS)}",
+    ERROR_EDAD: "La edad debe ser un entero entre 0 y 50",
+    ERROR_PESO: "El peso debe ser mayor a 0 y como máximo 500",
+    ERROR_EMAIL: "El email debe tener formato válido",
+    ERROR_RUT: "RUT inválido o con dígito verificador incorrecto",
+}
+
+_PATRON_EMAIL = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+_ESPECIES = frozenset(Mascota.ESPECIES_VALIDAS)
+_ESTADOS = frozenset(Cita.ESTADOS_VALIDOS)
+_LIMPIAR_RUT = str.maketrans("", "", ". -")
+
+
+def validar_columnas(
+    especie: Optional[Sequence] = None,
+    estado: Optional[Sequence] = None,
+    edad: Optional[Sequence] = None,
+    peso: Optional[Sequence] = None,
+    email: Optional[Sequence] = None,
+    rut: Optional[Sequence] = None,
+) -> Sequence[int]:
+    """
+    Valida columnas de valores candidatos (todas del mismo largo).
+
+    Sólo se validan las columnas entregadas. Los valores pueden venir como
+    texto (p. ej. leídos de un CSV).
+
+    Returns:
+        Máscara por fila: combinación de ERROR_* (ndarray uint8 con NumPy,
+        array('B') sin él). 0 indica una fila válida.
+
+    Ejemplo:
+        errores = validar_columnas(especie=especies, edad=edades, peso=pesos)
+        validas = filas_validas(errores)
+    """
+    columnas = {nombre: valores for nombre, valores in
+                (("especie", especie), ("estado", estado), ("edad", edad),
+                 ("peso", peso), ("email", email), ("rut", rut)) if valores is not None}
+    largos = {len(valores) for valores in columnas.values()}
+    if len(largos) > 1:
+        raise ValueError("Todas las columnas deben tener la misma cantidad de filas")
+    n = largos.pop() if largos else 0
+
+    fallos: List[Tuple[int, Sequence[bool]]] = []
+    if especie is not None:
+        fallos.append((ERROR_ESPECIE, _por_valor(especie, lambda v: not v or str(v).strip().upper() not in _ESPECIES)))
+    if estado is not None:
+        fallos.append((ERROR_ESTADO, _por_valor(estado, lambda v: bool(v) and str(v).strip() not in _ESTADOS)))
+    if edad is not None:
+        numeros, invalidos = _a_numeros(edad)
+        fallos.append((ERROR_EDAD, _fuera_de_rango(numeros, invalidos, 0, 50, incluir_minimo=True,
+                                                   nulo_valido=False, entero=True)))
+    if peso is not None:
+        numeros, invalidos = _a_numeros(peso)
+        fallos.append((ERROR_PESO, _fuera_de_rango(numeros, invalidos, 0, 500, incluir_minimo=False,
+                                                   nulo_valido=True, entero=False)))
+    if email is not None:
+        coincide = _PATRON_EMAIL.fullmatch
+        fallos.append((ERROR_EMAIL, [bool(v) and not coincide(str(v).strip()) for v in email]))
+    if rut is not None:
+        fallos.append((ERROR_RUT, _ruts_invalidos(rut)))
+
+    if np is not None:
+        errores = np.zeros(n, dtype=np.uint8)
+        for bit, mascara in fallos:
+            errores |= np.asarray(mascara, dtype=bool).astype(np.uint8) * np.uint8(bit)
+        return errores
+
+    errores = array("B", bytes(n))
+    for bit, mascara in fallos:
+        errores = array("B", (e | bit if falla else e for e, falla in zip(errores, mascara)))
+    return errores
+
+
+def filas_validas(errores: Sequence[int]) -> List[int]:
+    """Posiciones de las filas sin errores"""
+    if np is not None and isinstance(errores, np.ndarray):
+        return np.flatnonzero(errores == 0).tolist()
+    return [i for i, codigo in enumerate(errores) if not codigo]
+
+
+def describir(codigo: int) -> List[str]:
+    """Mensajes de los errores contenidos en un código de la máscara"""
+    return [mensaje for bit, mensaje in MENSAJES.items() if codigo & bit]
+
+
+def resumen(errores: Sequence[int]) -> Dict[str, int]:
+    """Cantidad de filas que fallan cada regla"""
+    if np is not None and isinstance(errores, np.ndarray):
+        return {MENSAJES[bit]: int(np.count_nonzero(errores & bit)) for bit in MENSAJES}
+    return {MENSAJES[bit]: sum(1 for codigo in errores if codigo & bit) for bit in MENSAJES}
+
+
+def _por_valor(valores: Sequence, falla: Callable[[object], bool]) -> List[bool]:
+    # Columnas con pocos valores distintos (especie, estado, dominios de
+    # email repetidos): cada valor se evalúa una sola vez
+    cache: Dict[object, bool] = {}
+    resultado = []
+    for valor in valores:
+        error = cache.get(valor)
+        if error is None:
+            error = cache[valor] = falla(valor)
+        resultado.append(error)
+    return resultado
+
+
+def _ruts_invalidos(valores: Sequence) -> Sequence[bool]:
+    # Se separa cada RUT en cuerpo y dígito verificador; el cálculo módulo 11
+    # se hace sobre la columna completa de cuerpos
+    cuerpos = array("q")
+    digitos = array("b")  # dígito verificador informado; K = 10, formato inválido = -1
+    for valor in valores:
+        texto = str(valor).translate(_LIMPIAR_RUT).upper() if valor else ""
+        cuerpo, dv = texto[:-1], texto[-1:]
+        if cuerpo.isdecimal() and len(cuerpo) <= 12 and (dv.isdecimal() or dv == "K"):
+            cuerpos.append(int(cuerpo))
+            digitos.append(10 if dv == "K" else int(dv))
+        else:
+            cuerpos.append(0)
+            digitos.append(-1)
+
+    if np is None:
+        return [dv < 0 or digito_verificador(cuerpo) != ("K" if dv == 10 else str(dv))
+                for cuerpo, dv in zip(cuerpos, digitos)]
+
+    resto = np.frombuffer(cuerpos, dtype=np.int64).copy()
+    suma = np.zeros(len(resto), dtype=np.int64)
+    for posicion in range(12):
+        suma += (resto % 10) * (2 + posicion % 6)
+        resto //= 10
+    esperado = 11 - suma % 11
+    esperado[esperado == 11] = 0
+    informado = np.frombuffer(digitos, dtype=np.int8)
+    return (informado < 0) | (informado != esperado)
+
+
+def _a_numeros(valores: Sequence) -> Tuple[array, List[bool]]:
+    # Convierte a float; vacíos quedan como NaN y los textos no numéricos se marcan aparte
+    numeros = array("d")
+    invalidos = []
+    for valor in valores:
+        if valor is None or (isinstance(valor, str) and not valor.strip()):
+            numeros.append(math.nan)
+            invalidos.append(False)
+            continue
+        try:
+            numeros.append(float(valor))
+            invalidos.append(False)
+        except (TypeError, ValueError):
+            numeros.append(math.nan)
+            invalidos.append(True)
+    return numeros, invalidos
+
+
+def _fuera_de_rango(numeros: array, invalidos: List[bool], minimo: float, maximo: float,
+                    incluir_minimo: bool, nulo_valido: bool, entero: bool) -> Sequence[bool]:
+    if np is not None:
+        x = np.frombuffer(numeros, dtype=np.float64)
+        nulos = np.isnan(x)
+        with np.errstate(invalid="ignore"):
+            fuera = (x < minimo if incluir_minimo else x <= minimo) | (x > maximo)
+            if entero:
+                fuera |= x != np.floor(x)
+        return np.where(nulos, not nulo_valido, fuera) | np.asarray(invalidos, dtype=bool)
+
+    resultado = []
+    for x, invalido in zip(numeros, invalidos):
+        if invalido:
+            resultado.append(True)
+        elif math.isnan(x):
+            resultado.append(not nulo_valido)
+        else:
+            resultado.append((x < minimo if incluir_minimo else x <= minimo) or x > maximo
+                             or (entero and x != math.floor(x)))
+    return resultado
@@ -4,6 +4,9 @@ from typing import Optional
 class Veterinario:
     """Clase que representa un veterinario"""
     
+    # Sin __dict__ por instancia: menos memoria al cargar miles de filas
+    __slots__ = ("_id_veterinario", "_nombre", "_apellido", "_especialidad", "_telefono", "_email")
+    
     def __init__(self, id_veterinario: int, nombre: str, apellido: str, especialidad: str, telefono: str, email: str):
         self._id_veterinario = id_veterinario
         self._nombre = nombre
@@ -12,6 +15,13 @@ class Veterinario:
         self._telefono = telefono
         self._email = email
     
+    @classmethod
+    def from_row(cls, row) -> "Veterinario":
+        """Construye desde una fila de la BD (SELECT *) sin pasar por los setters"""
+        veterinario = cls.__new__(cls)
+        (veterinario._id_veterinario, veterinario._nombre, veterinario._apellido, veterinario._especialidad, veterinario._telefono, veterinario._email) = row
+        return veterinario
+    
     @property
     def id_veterinario(self) -> int:
         return self._id_veterinario
@@ -0,0 +1,288 @@
+"""
+Módulo: pool.py
+Pool de conexiones reutilizables para el acceso a datos
+
+El pool no depende del driver: recibe una función que abre conexiones
+nuevas (por ejemplo ``oracledb.connect``) y entrega conexiones envueltas
+cuyo ``close()`` las devuelve al pool en lugar de cerrarlas. Así los DAO
+pueden seguir usando ``with get_connection() as conn:`` sin cambios.
+"""
+
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+
+class PoolAgotadoError(Exception):
+    """Se agotó el tiempo de espera para obtener una conexión del pool"""
+
+
+class ConexionDevueltaError(Exception):
+    """Se usó una conexión después de devolverla al pool"""
+
+
+@lru_cache(maxsize=None)
+def error_agotado(base: type) -> type:
+    """
+    Subclase de PoolAgotadoError que además hereda de `base` (el
+    DatabaseError del driver), para que quien captura errores de BD
+    también capture el pool agotado.
+    """
+    if issubclass(PoolAgotadoError, base):
+        return PoolAgotadoError
+    return type("PoolAgotadoError", (PoolAgotadoError, base), {"__module__": __name__})
+
+
+class ConexionPool:
+    """
+    Envoltorio de una conexión prestada por el pool.
+
+    Delega todo en la conexión real excepto ``close()`` y el protocolo de
+    contexto, que devuelven la conexión al pool. Una vez devuelta, la
+    conexión real puede estar prestada a otro hilo: usarla lanza
+    ConexionDevueltaError.
+    """
+
+    __slots__ = ("_pool", "_conexion", "_devuelta")
+
+    def __init__(self, pool: "PoolConexiones", conexion: Any):
+        self._pool = pool
+        self._conexion = conexion
+        self._devuelta = False
+
+    @property
+    def conexion_real(self) -> Any:
+        return self._conexion
+
+    def close(self):
+        """Devuelve la conexión al pool (idempotente)"""
+        if not self._devuelta:
+            self._devuelta = True
+            self._pool.liberar(self._conexion)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getattr__(self, nombre: str):
+        if self._devuelta:
+            raise ConexionDevueltaError(f"La conexión ya se devolvió al pool (acceso a '{nombre}')")
+        return getattr(self._conexion, nombre)
+
+
+class PoolConexiones:
+    """
+    Pool de conexiones con tamaño mínimo, máximo e incremento.
+
+    Args:
+        conectar: Función sin argumentos que abre una conexión nueva
+        minimo: Conexiones abiertas al crear el pool
+        maximo: Tope de conexiones abiertas simultáneamente
+        incremento: Conexiones a abrir cada vez que el pool debe crecer
+        timeout: Segundos máximos de espera por una conexión libre
+        ping_intervalo: Segundos de inactividad tras los cuales se valida
+            la conexión antes de entregarla (0 = validar siempre, <0 = nunca)
+        validar: Función que recibe la conexión y lanza excepción si está
+            caída. Por defecto usa ``conn.ping()`` si el driver lo soporta.
+        error: Excepción que se lanza al agotarse el timeout o con el pool
+            cerrado; PoolAgotadoError o una subclase (ver error_agotado)
+    """
+
+    def __init__(
+        self,
+        conectar: Callable[[], Any],
+        minimo: int = 1,
+        maximo: int = 4,
+        incremento: int = 1,
+        timeout: float = 5.0,
+        ping_intervalo: float = 60.0,
+        validar: Optional[Callable[[Any], None]] = None,
+        error: type = PoolAgotadoError
+    ):
+        if minimo < 0 or maximo < 1 or minimo > maximo:
+            raise ValueError("Tamaño de pool inválido (0 <= mínimo <= máximo, máximo >= 1)")
+        if incremento < 1:
+            raise ValueError("El incremento del pool debe ser al menos 1")
+
+        self._conectar = conectar
+        self._minimo = minimo
+        self._maximo = maximo
+        self._incremento = incremento
+        self._timeout = timeout
+        self._ping_intervalo = ping_intervalo
+        self._validar = validar or _validar_por_defecto
+        self._error = error
+
+        self._condicion = threading.Condition(threading.Lock())
+        self._libres = deque()  # pares (conexion, instante_de_devolucion)
+        self._abiertas = 0
+        self._cerrado = False
+
+        self._adquisiciones = 0
+        self._esperas = 0
+        self._descartadas = 0
+
+        for _ in range(minimo):
+            self._libres.append((self._abrir(), time.monotonic()))
+            self._abiertas += 1
+
+    @property
+    def abiertas(self) -> int:
+        return self._abiertas
+
+    @property
+    def ocupadas(self) -> int:
+        return self._abiertas - len(self._libres)
+
+    def adquirir(self) -> ConexionPool:
+        """
+        Obtiene una conexión del pool, creando nuevas si hay capacidad.
+
+        Returns:
+            ConexionPool: Conexión prestada; se devuelve con close() o al salir del with
+
+        Raises:
+            PoolAgotadoError: Si no hay conexión disponible dentro del timeout
+                (la clase dada en `error`)
+        """
+        limite = time.monotonic() + self._timeout
+        while True:
+            a_abrir = 0
+            with self._condicion:
+                if self._cerrado:
+                    raise self._error("El pool de conexiones está cerrado")
+                while not self._libres and self._abiertas >= self._maximo:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        raise self._error(
+                            f"Tiempo de espera agotado ({self._timeout}s) "
+                            f"con {self._abiertas} conexión(es) en uso"
+                        )
+                    self._esperas += 1
+                    self._condicion.wait(restante)
+                    if self._cerrado:
+                        raise self._error("El pool de conexiones está cerrado")
+
+                # Se cuenta al elegir la conexión, con el lock tomado; si luego
+                # falla al abrirse o está caída, se descuenta
+                self._adquisiciones += 1
+                if self._libres:
+                    conexion, devuelta_en = self._libres.pop()
+                else:
+                    # Reservar los cupos antes de soltar el lock para no
+                    # sobrepasar el máximo mientras se abren las conexiones
+                    a_abrir = min(self._incremento, self._maximo - self._abiertas)
+                    self._abiertas += a_abrir
+                    conexion = None
+
+            if conexion is None:
+                conexion = self._crecer(a_abrir)
+            elif not self._sigue_viva(conexion, devuelta_en):
+                self._descartar(conexion, adquirida=True)
+                continue
+
+            return ConexionPool(self, conexion)
+
+    def liberar(self, conexion: Any):
+        """Devuelve una conexión al pool deshaciendo cambios sin confirmar"""
+        try:
+            conexion.rollback()
+        except Exception:
+            self._descartar(conexion)
+            return
+
+        with self._condicion:
+            if self._cerrado:
+                self._abiertas -= 1
+                _cerrar_silencioso(conexion)
+                return
+            self._libres.append((conexion, time.monotonic()))
+            self._condicion.notify()
+
+    def cerrar(self):
+        """Cierra todas las conexiones libres y rechaza nuevas adquisiciones"""
+        with self._condicion:
+            self._cerrado = True
+            libres = list(self._libres)
+            self._libres.clear()
+            self._abiertas -= len(libres)
+            self._condicion.notify_all()
+        for conexion, _ in libres:
+            _cerrar_silencioso(conexion)
+
+    def estadisticas(self) -> dict:
+        with self._condicion:
+            return {
+                "abiertas": self._abiertas, "libres": len(self._libres),
+                "ocupadas": self._abiertas - len(self._libres),
+                "minimo": self._minimo, "maximo": self._maximo,
+                "adquisiciones": self._adquisiciones, "esperas": self._esperas,
+                "descartadas": self._descartadas
+            }
+
+    def _abrir(self) -> Any:
+        return self._conectar()
+
+    def _crecer(self, cantidad: int) -> Any:
+        """Abre `cantidad` conexiones: retorna una y deja el resto libres"""
+        try:
+            conexion = self._abrir()
+        except Exception:
+            with self._condicion:
+                self._abiertas -= cantidad
+                self._adquisiciones -= 1
+                self._condicion.notify_all()
+            raise
+
+        # Las conexiones extra del incremento se abren en el mejor esfuerzo
+        extras = []
+        for _ in range(cantidad - 1):
+            try:
+                extras.append(self._abrir())
+            except Exception:
+                break
+        with self._condicion:
+            self._abiertas -= cantidad - 1 - len(extras)
+            ahora = time.monotonic()
+            for extra in extras:
+                self._libres.append((extra, ahora))
+            self._condicion.notify_all()
+        return conexion
+
+    def _sigue_viva(self, conexion: Any, devuelta_en: float) -> bool:
+        if self._ping_intervalo < 0:
+            return True
+        if time.monotonic() - devuelta_en < self._ping_intervalo:
+            return True
+        try:
+            self._validar(conexion)
+            return True
+        except Exception:
+            return False
+
+    def _descartar(self, conexion: Any, adquirida: bool = False):
+        _cerrar_silencioso(conexion)
+        with self._condicion:
+            self._abiertas -= 1
+            self._descartadas += 1
+            if adquirida:
+                # adquirir() vuelve a intentarlo y la contará de nuevo
+                self._adquisiciones -= 1
+            self._condicion.notify()
+
+
+def _validar_por_defecto(conexion: Any):
+    ping = getattr(conexion, "ping", None)
+    if ping is not None:
+        ping()
+
+
+def _cerrar_silencioso(conexion: Any):
+    try:
+        conexion.close()
+    except Exception:
+        pass
@@ -12,6 +12,12 @@ BEGIN
 END;
 /
 
+BEGIN
+   EXECUTE IMMEDIATE 'DROP TABLE cita_baja';
+   EXCEPTION WHEN OTHERS THEN NULL;
+END;
+/
+
 BEGIN
    EXECUTE IMMEDIATE 'DROP TABLE mascota CASCADE CONSTRAINTS';
    EXCEPTION WHEN OTHERS THEN NULL;
@@ -30,6 +36,12 @@ BEGIN
 END;
 /
 
+BEGIN
+   EXECUTE IMMEDIATE 'DROP TABLE esquema_version';
+   EXCEPTION WHEN OTHERS THEN NULL;
+END;
+/
+
 -- ============================================
 -- Tabla: CLIENTE (Dueño de mascotas)
 -- ============================================
@@ -94,6 +106,10 @@ CREATE TABLE cita (
     motivo VARCHAR2(500),
     estado VARCHAR2(20) DEFAULT 'PENDIENTE',
     diagnostico VARCHAR2(1000),
+    -- Fecha y hora combinadas para rangos por veterinario (ix_cita_vet_ts)
+    ts DATE NOT NULL,
+    -- Marca de cambio para refrescar agendas de forma incremental
+    modificado TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL,
     CONSTRAINT fk_cita_mascota 
         FOREIGN KEY (id_mascota) 
         REFERENCES mascota(id_mascota)
@@ -106,6 +122,63 @@ CREATE TABLE cita (
         CHECK (estado IN ('PENDIENTE', 'CONFIRMADA', 'COMPLETADA', 'CANCELADA'))
 );
 
+-- Un veterinario no puede tener dos citas no canceladas con la misma hora de
+-- inicio. Los cruces parciales (10:00 y 10:15) los rechaza CitaDAO dentro de
+-- la transacción, con la agenda del veterinario bloqueada.
+-- Las filas CANCELADA producen una clave toda NULL y no entran al índice.
+CREATE UNIQUE INDEX uk_cita_vet_horario ON cita (
+    CASE WHEN estado <> 'CANCELADA' THEN id_veterinario END,
+    CASE WHEN estado <> 'CANCELADA' THEN fecha END,
+    CASE WHEN estado <> 'CANCELADA' THEN hora END
+);
+
+-- Agenda y rangos de fechas por veterinario
+CREATE INDEX ix_cita_vet_ts ON cita (id_veterinario, ts);
+
+-- Cambios recientes (Agenda.refrescar)
+CREATE INDEX ix_cita_modificado ON cita (modificado);
+
+-- Claves foráneas (read_by_cliente, read_by_mascota, ON DELETE CASCADE)
+-- y paginación por fecha (read_page)
+CREATE INDEX ix_mascota_cliente ON mascota (id_cliente);
+CREATE INDEX ix_cita_mascota_ts ON cita (id_mascota, ts);
+CREATE INDEX ix_cita_fecha ON cita (fecha, id_cita);
+
+-- Citas eliminadas o movidas de día, con su fecha anterior (Agenda.refrescar)
+CREATE TABLE cita_baja (
+    id_cita NUMBER NOT NULL,
+    fecha DATE NOT NULL,
+    momento TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL
+);
+
+CREATE INDEX ix_cita_baja_momento ON cita_baja (momento);
+
+CREATE OR REPLACE TRIGGER tr_cita_baja
+AFTER DELETE OR UPDATE OF fecha ON cita
+FOR EACH ROW
+WHEN (NEW.fecha IS NULL OR NEW.fecha <> OLD.fecha)
+BEGIN
+    INSERT INTO cita_baja (id_cita, fecha) VALUES (:OLD.id_cita, :OLD.fecha);
+END;
+/
+
+-- ============================================
+-- Versión del esquema (ver migrar.py): este script ya incluye las
+-- migraciones de migraciones/oracle/ hasta la indicada
+-- ============================================
+CREATE TABLE esquema_version (
+    version NUMBER PRIMARY KEY,
+    nombre VARCHAR2(200) NOT NULL,
+    aplicada TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL
+);
+
+INSERT INTO esquema_version (version, nombre) VALUES (1, '001_uk_cita_vet_horario.sql');
+INSERT INTO esquema_version (version, nombre) VALUES (2, '002_cita_ts.sql');
+INSERT INTO esquema_version (version, nombre) VALUES (3, '003_cita_modificado.sql');
+INSERT INTO esquema_version (version, nombre) VALUES (4, '004_indices_fk.sql');
+INSERT INTO esquema_version (version, nombre) VALUES (5, '005_cliente_rut_normalizado.sql');
+INSERT INTO esquema_version (version, nombre) VALUES (6, '006_cita_baja.sql');
+
 -- ============================================
 -- Secuencias para generar IDs automáticos
 -- ============================================
@@ -139,12 +212,12 @@ INSERT INTO veterinario VALUES (seq_veterinario.NEXTVAL, 'Dra. Patricia', 'Torre
 INSERT INTO veterinario VALUES (seq_veterinario.NEXTVAL, 'Dr. Roberto', 'Morales', 'Cardiología', '+56989012345', 'roberto.morales@vetclinic.cl');
 
 -- Citas
-INSERT INTO cita VALUES (seq_cita.NEXTVAL, 1, 1, TO_DATE('2024-12-10', 'YYYY-MM-DD'), '10:00', 'Control de vacunas', 'CONFIRMADA', NULL);
-INSERT INTO cita VALUES (seq_cita.NEXTVAL, 2, 3, TO_DATE('2024-12-11', 'YYYY-MM-DD'), '11:30', 'Revisión de piel', 'PENDIENTE', NULL);
-INSERT INTO cita VALUES (seq_cita.NEXTVAL, 3, 2, TO_DATE('2024-12-12', 'YYYY-MM-DD'), '15:00', 'Castración', 'CONFIRMADA', NULL);
-INSERT INTO cita VALUES (seq_cita.NEXTVAL, 4, 1, TO_DATE('2024-12-13', 'YYYY-MM-DD'), '09:00', 'Consulta general', 'PENDIENTE', NULL);
-INSERT INTO cita VALUES (seq_cita.NEXTVAL, 5, 4, TO_DATE('2024-12-14', 'YYYY-MM-DD'), '14:00', 'Chequeo cardíaco', 'CONFIRMADA', NULL);
-INSERT INTO cita VALUES (seq_cita.NEXTVAL, 1, 1, TO_DATE('2024-11-20', 'YYYY-MM-DD'), '10:00', 'Vacuna antirrábica', 'COMPLETADA', 'Vacuna aplicada correctamente. Próxima dosis en 1 año.');
+INSERT INTO cita VALUES (seq_cita.NEXTVAL, 1, 1, TO_DATE('2024-12-10', 'YYYY-MM-DD'), '10:00', 'Control de vacunas', 'CONFIRMADA', NULL, TO_DATE('2024-12-10 10:00', 'YYYY-MM-DD HH24:MI'), SYSTIMESTAMP);
+INSERT INTO cita VALUES (seq_cita.NEXTVAL, 2, 3, TO_DATE('2024-12-11', 'YYYY-MM-DD'), '11:30', 'Revisión de piel', 'PENDIENTE', NULL, TO_DATE('2024-12-11 11:30', 'YYYY-MM-DD HH24:MI'), SYSTIMESTAMP);
+INSERT INTO cita VALUES (seq_cita.NEXTVAL, 3, 2, TO_DATE('2024-12-12', 'YYYY-MM-DD'), '15:00', 'Castración', 'CONFIRMADA', NULL, TO_DATE('2024-12-12 15:00', 'YYYY-MM-DD HH24:MI'), SYSTIMESTAMP);
+INSERT INTO cita VALUES (seq_cita.NEXTVAL, 4, 1, TO_DATE('2024-12-13', 'YYYY-MM-DD'), '09:00', 'Consulta general', 'PENDIENTE', NULL, TO_DATE('2024-12-13 09:00', 'YYYY-MM-DD HH24:MI'), SYSTIMESTAMP);
+INSERT INTO cita VALUES (seq_cita.NEXTVAL, 5, 4, TO_DATE('2024-12-14', 'YYYY-MM-DD'), '14:00', 'Chequeo cardíaco', 'CONFIRMADA', NULL, TO_DATE('2024-12-14 14:00', 'YYYY-MM-DD HH24:MI'), SYSTIMESTAMP);
+INSERT INTO cita VALUES (seq_cita.NEXTVAL, 1, 1, TO_DATE('2024-11-20', 'YYYY-MM-DD'), '10:00', 'Vacuna antirrábica', 'COMPLETADA', 'Vacuna aplicada correctamente. Próxima dosis en 1 año.', TO_DATE('2024-11-20 10:00', 'YYYY-MM-DD HH24:MI'), SYSTIMESTAMP);
 
 COMMIT;
 
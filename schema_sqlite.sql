@@ -0,0 +1,153 @@
+-- ============================================
+-- Script de creación de Base de Datos (SQLite)
+-- Sistema de Gestión Veterinaria
+-- Equivalente a schema.sql para ejecuciones locales y benchmarks
+-- ============================================
+
+-- ============================================
+-- Tabla: CLIENTE (Dueño de mascotas)
+-- ============================================
+CREATE TABLE cliente (
+    id_cliente INTEGER PRIMARY KEY,
+    rut VARCHAR(12) NOT NULL,
+    nombres VARCHAR(100) NOT NULL,
+    apellidos VARCHAR(100) NOT NULL,
+    telefono VARCHAR(20),
+    email VARCHAR(100),
+    direccion VARCHAR(200),
+    CONSTRAINT uk_cliente_rut UNIQUE (rut),
+    CONSTRAINT uk_cliente_email UNIQUE (email)
+);
+
+-- ============================================
+-- Tabla: MASCOTA (Paciente)
+-- ============================================
+CREATE TABLE mascota (
+    id_mascota INTEGER PRIMARY KEY,
+    nombre VARCHAR(50) NOT NULL,
+    especie VARCHAR(20) NOT NULL,
+    raza VARCHAR(50),
+    edad INTEGER NOT NULL,
+    color VARCHAR(30),
+    peso REAL,
+    id_cliente INTEGER NOT NULL,
+    CONSTRAINT fk_mascota_cliente
+        FOREIGN KEY (id_cliente)
+        REFERENCES cliente(id_cliente)
+        ON DELETE CASCADE,
+    CONSTRAINT ck_mascota_especie
+        CHECK (especie IN ('PERRO', 'GATO', 'AVE', 'CONEJO', 'HAMSTER')),
+    CONSTRAINT ck_mascota_edad
+        CHECK (edad >= 0 AND edad <= 50),
+    CONSTRAINT ck_mascota_peso
+        CHECK (peso > 0 AND peso <= 500)
+);
+
+-- ============================================
+-- Tabla: VETERINARIO (Doctor)
+-- ============================================
+CREATE TABLE veterinario (
+    id_veterinario INTEGER PRIMARY KEY,
+    nombre VARCHAR(100) NOT NULL,
+    apellido VARCHAR(100) NOT NULL,
+    especialidad VARCHAR(100),
+    telefono VARCHAR(20),
+    email VARCHAR(100),
+    CONSTRAINT uk_veterinario_email UNIQUE (email)
+);
+
+-- ============================================
+-- Tabla: CITA (Consulta médica)
+-- ============================================
+CREATE TABLE cita (
+    id_cita INTEGER PRIMARY KEY,
+    id_mascota INTEGER NOT NULL,
+    id_veterinario INTEGER NOT NULL,
+    fecha DATE NOT NULL,
+    hora VARCHAR(10) NOT NULL,
+    motivo VARCHAR(500),
+    estado VARCHAR(20) DEFAULT 'PENDIENTE',
+    diagnostico VARCHAR(1000),
+    -- Fecha y hora combinadas para rangos por veterinario (ix_cita_vet_ts)
+    ts TIMESTAMP NOT NULL,
+    -- Marca de cambio para refrescar agendas de forma incremental
+    modificado TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+    CONSTRAINT fk_cita_mascota
+        FOREIGN KEY (id_mascota)
+        REFERENCES mascota(id_mascota)
+        ON DELETE CASCADE,
+    CONSTRAINT fk_cita_veterinario
+        FOREIGN KEY (id_veterinario)
+        REFERENCES veterinario(id_veterinario)
+        ON DELETE CASCADE,
+    CONSTRAINT ck_cita_estado
+        CHECK (estado IN ('PENDIENTE', 'CONFIRMADA', 'COMPLETADA', 'CANCELADA'))
+);
+
+-- Un veterinario no puede tener dos citas no canceladas con la misma hora de
+-- inicio. Los cruces parciales (10:00 y 10:15) los rechaza CitaDAO dentro de
+-- la transacción, con la agenda del veterinario bloqueada
+CREATE UNIQUE INDEX uk_cita_vet_horario ON cita (id_veterinario, fecha, hora)
+    WHERE estado <> 'CANCELADA';
+
+-- Agenda y rangos de fechas por veterinario
+CREATE INDEX ix_cita_vet_ts ON cita (id_veterinario, ts);
+
+-- Cambios recientes (Agenda.refrescar)
+CREATE INDEX ix_cita_modificado ON cita (modificado);
+
+-- Claves foráneas (read_by_cliente, read_by_mascota, ON DELETE CASCADE)
+-- y paginación por fecha (read_page)
+CREATE INDEX ix_mascota_cliente ON mascota (id_cliente);
+CREATE INDEX ix_cita_mascota_ts ON cita (id_mascota, ts);
+CREATE INDEX ix_cita_fecha ON cita (fecha, id_cita);
+
+-- Citas eliminadas o movidas de día, con su fecha anterior (Agenda.refrescar)
+CREATE TABLE cita_baja (
+    id_cita INTEGER NOT NULL,
+    fecha DATE NOT NULL,
+    momento TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+);
+
+CREATE INDEX ix_cita_baja_momento ON cita_baja (momento);
+
+CREATE TRIGGER tr_cita_baja_eliminada AFTER DELETE ON cita
+BEGIN
+    INSERT INTO cita_baja (id_cita, fecha) VALUES (OLD.id_cita, OLD.fecha);
+END;
+
+CREATE TRIGGER tr_cita_baja_movida AFTER UPDATE OF fecha ON cita
+WHEN NEW.fecha <> OLD.fecha
+BEGIN
+    INSERT INTO cita_baja (id_cita, fecha) VALUES (OLD.id_cita, OLD.fecha);
+END;
+
+-- ============================================
+-- Versión del esquema (ver migrar.py): este script ya incluye las
+-- migraciones de migraciones/sqlite/ hasta la indicada
+-- ============================================
+CREATE TABLE esquema_version (
+    version INTEGER PRIMARY KEY,
+    nombre VARCHAR(200) NOT NULL,
+    aplicada TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+);
+
+INSERT INTO esquema_version (version, nombre) VALUES (1, '001_uk_cita_vet_horario.sql');
+INSERT INTO esquema_version (version, nombre) VALUES (2, '002_cita_ts.sql');
+INSERT INTO esquema_version (version, nombre) VALUES (3, '003_cita_modificado.sql');
+INSERT INTO esquema_version (version, nombre) VALUES (4, '004_indices_fk.sql');
+INSERT INTO esquema_version (version, nombre) VALUES (5, '005_cliente_rut_normalizado.sql');
+INSERT INTO esquema_version (version, nombre) VALUES (6, '006_cita_baja.sql');
+
+-- ============================================
+-- Secuencias (emuladas: una fila por secuencia)
+-- ============================================
+CREATE TABLE secuencia (
+    nombre VARCHAR(30) PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+
+INSERT INTO secuencia (nombre, valor) VALUES ('seq_cliente', 0);
+INSERT INTO secuencia (nombre, valor) VALUES ('seq_mascota', 0);
+INSERT INTO secuencia (nombre, valor) VALUES ('seq_veterinario', 0);
+INSERT INTO secuencia (nombre, valor) VALUES ('seq_cita', 0);
@@ -0,0 +1,81 @@
+"""
+Pruebas: refresco incremental de la agenda sobre SQLite en memoria
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import unittest
+from datetime import date, timedelta
+
+import database
+from dao import CitaDAO, MascotaDAO
+from dao.agenda import Agenda
+from dao.disponibilidad import disponibilidad
+from models import Cita
+
+DIA = date(2030, 1, 7)
+
+
+class TestRefrescarAgenda(unittest.TestCase):
+
+    def setUp(self):
+        database.configurar_backend("sqlite")
+        with database.get_connection() as conn:
+            conn.execute("INSERT INTO cliente VALUES (1, '1-9', 'Ana', 'Pérez', '', 'ana@test.cl', '')")
+            conn.execute("INSERT INTO mascota VALUES (1, 'Max', 'PERRO', '', 3, '', 10.0, 1)")
+            conn.execute("INSERT INTO mascota VALUES (2, 'Luna', 'GATO', '', 2, '', 4.0, 1)")
+            conn.execute("INSERT INTO veterinario VALUES (1, 'Luis', 'Soto', 'General', '', 'luis@test.cl')")
+            conn.commit()
+        CitaDAO.create(Cita(1, 1, 1, DIA, "09:00", "Control"))
+        CitaDAO.create(Cita(2, 2, 1, DIA, "10:00", "Vacuna"))
+        # Fuera del rango de la agenda
+        CitaDAO.create(Cita(3, 1, 1, DIA + timedelta(days=3), "09:00", "Control"))
+        self.agenda = Agenda(dias=2)
+        self.agenda.cargar(DIA)
+
+    def tearDown(self):
+        database.cerrar_pool()
+        disponibilidad.olvidar()
+
+    def ids(self):
+        return [cita.id_cita for cita in self.agenda.citas()]
+
+    def test_carga_sólo_el_rango(self):
+        self.assertEqual(self.ids(), [1, 2])
+
+    def test_eliminada_sale_sin_recargar(self):
+        CitaDAO.delete(1)
+        self.assertEqual(self.agenda.refrescar(), 1)
+        self.assertEqual(self.ids(), [2])
+        self.assertEqual(self.agenda.cargas, 1)
+
+    def test_borrado_en_cascada_de_otro_programa(self):
+        with database.get_connection() as conn:
+            conn.execute("DELETE FROM mascota WHERE id_mascota = 2")
+            conn.commit()
+        self.agenda.refrescar()
+        self.assertEqual(self.ids(), [1])
+
+    def test_movida_fuera_y_dentro_del_rango(self):
+        cita = CitaDAO.read_by_id(1)
+        cita.fecha = DIA + timedelta(days=5)
+        CitaDAO.update(cita)
+        entrante = CitaDAO.read_by_id(3)
+        entrante.fecha = DIA + timedelta(days=1)
+        CitaDAO.update(entrante)
+        self.agenda.refrescar()
+        self.assertEqual(self.ids(), [2, 3])
+
+    def test_cambio_fuera_del_rango_no_se_lee(self):
+        cita = CitaDAO.read_by_id(3)
+        cita.motivo = "Otro"
+        CitaDAO.update(cita)
+        self.assertEqual(self.agenda.refrescar(), 0)
+        self.assertEqual(self.agenda.refrescar(), 0)
+        self.assertEqual(self.ids(), [1, 2])
+        self.assertEqual(self.agenda.cargas, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
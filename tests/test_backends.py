@@ -0,0 +1,30 @@
+"""
+Pruebas: interfaz común de los backends
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import unittest
+
+from backends import Backend, crear_backend
+
+
+class TestInterfazBackend(unittest.TestCase):
+
+    def test_backend_incompleto_no_se_instancia(self):
+        class SoloConexion(Backend):
+            def conectar(self):
+                return None
+
+        with self.assertRaises(TypeError) as capturado:
+            SoloConexion()
+        self.assertIn("bloquear_veterinario", str(capturado.exception))
+
+    def test_sqlite_implementa_toda_la_interfaz(self):
+        motor = crear_backend("sqlite")
+        self.assertEqual(Backend.__abstractmethods__ - set(vars(type(motor))), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
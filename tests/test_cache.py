@@ -0,0 +1,116 @@
+"""
+Pruebas: caché LRU con TTL y mapa de identidad de los DAO sobre SQLite en memoria
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import unittest
+
+import database
+from dao import ClienteDAO, MascotaDAO, VeterinarioDAO
+from dao.cache import CacheLRU, activar_cache, desactivar_cache, estadisticas_cache, obtener_cache, unidad_de_trabajo
+
+
+class Reloj:
+    """Reloj manual para controlar el TTL"""
+
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self) -> float:
+        return self.ahora
+
+
+class TestCacheLRU(unittest.TestCase):
+
+    def test_desaloja_la_menos_usada(self):
+        cache = CacheLRU(capacidad=2, ttl=0)
+        cache.guardar(1, "a")
+        cache.guardar(2, "b")
+        cache.obtener(1)
+        cache.guardar(3, "c")
+        self.assertEqual(cache.obtener(1), "a")
+        self.assertEqual(cache.obtener(3), "c")
+        self.assertIsNot(cache.obtener(2), "b")
+        self.assertEqual((len(cache), cache.desalojos), (2, 1))
+
+    def test_expira_por_ttl(self):
+        reloj = Reloj()
+        cache = CacheLRU(capacidad=10, ttl=5, reloj=reloj)
+        cache.guardar(1, "a")
+        reloj.ahora = 4.9
+        self.assertEqual(cache.obtener(1), "a")
+        reloj.ahora = 5.0
+        self.assertIsNot(cache.obtener(1), "a")
+        self.assertEqual(len(cache), 0)
+        estadisticas = cache.estadisticas()
+        self.assertEqual((estadisticas["aciertos"], estadisticas["fallos"], estadisticas["expirados"]), (1, 1, 1))
+        self.assertEqual(estadisticas["tasa_aciertos"], 0.5)
+
+    def test_capacidad_invalida(self):
+        with self.assertRaises(ValueError):
+            CacheLRU(capacidad=0)
+
+
+class TestCacheDeLosDAO(unittest.TestCase):
+
+    def setUp(self):
+        database.configurar_backend("sqlite")
+        with database.get_connection() as conn:
+            conn.execute("INSERT INTO cliente VALUES (1, '1-9', 'Ana', 'Pérez', '', 'ana@test.cl', '')")
+            conn.execute("INSERT INTO mascota VALUES (1, 'Max', 'PERRO', '', 3, '', 10.0, 1)")
+            conn.execute("INSERT INTO veterinario VALUES (1, 'Luis', 'Soto', 'General', '', 'luis@test.cl')")
+            conn.commit()
+        activar_cache("veterinario", "mascota", capacidad=10, ttl=60)
+
+    def tearDown(self):
+        desactivar_cache()
+        database.cerrar_pool()
+
+    def test_segunda_lectura_desde_la_cache_como_copia(self):
+        primero = VeterinarioDAO.read_by_id(1)
+        primero.especialidad = "Cirugía"
+        segundo = VeterinarioDAO.read_by_id(1)
+        self.assertIsNot(primero, segundo)
+        self.assertEqual(segundo.especialidad, "General")
+        estadisticas = estadisticas_cache()["veterinario"]
+        self.assertEqual((estadisticas["aciertos"], estadisticas["fallos"]), (1, 1))
+
+    def test_no_guarda_busquedas_sin_resultado(self):
+        self.assertIsNone(VeterinarioDAO.read_by_id(2))
+        with database.get_connection() as conn:
+            conn.execute("INSERT INTO veterinario VALUES (2, 'Eva', 'Rojas', 'General', '', 'eva@test.cl')")
+            conn.commit()
+        self.assertEqual(VeterinarioDAO.read_by_id(2).nombre, "Eva")
+
+    def test_update_y_delete_invalidan(self):
+        vet = VeterinarioDAO.read_by_id(1)
+        vet.especialidad = "Cirugía"
+        self.assertTrue(VeterinarioDAO.update(vet))
+        self.assertEqual(VeterinarioDAO.read_by_id(1).especialidad, "Cirugía")
+        self.assertTrue(VeterinarioDAO.delete(1))
+        self.assertIsNone(VeterinarioDAO.read_by_id(1))
+        self.assertEqual(estadisticas_cache()["veterinario"]["invalidaciones"], 2)
+
+    def test_delete_de_cliente_vacia_la_cache_de_mascotas(self):
+        self.assertIsNotNone(MascotaDAO.read_by_id(1))
+        self.assertEqual(len(obtener_cache("mascota")), 1)
+        self.assertTrue(ClienteDAO.delete(1))
+        self.assertEqual(len(obtener_cache("mascota")), 0)
+        self.assertIsNone(MascotaDAO.read_by_id(1))
+
+    def test_mapa_de_identidad(self):
+        with unidad_de_trabajo():
+            primero = VeterinarioDAO.read_by_id(1)
+            self.assertIs(VeterinarioDAO.read_by_id(1), primero)
+            VeterinarioDAO.delete(1)
+            self.assertIsNone(VeterinarioDAO.read_by_id(1))
+        with unidad_de_trabajo():
+            self.assertIs(MascotaDAO.read_by_id(1), MascotaDAO.read_by_id(1))
+        # Fuera de la unidad de trabajo cada lectura es una copia nueva
+        self.assertIsNot(MascotaDAO.read_by_id(1), MascotaDAO.read_by_id(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
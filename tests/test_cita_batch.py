@@ -0,0 +1,43 @@
+"""
+Pruebas: CitaBatch con estados NULL o desconocidos
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import unittest
+from datetime import date
+
+from models.cita_batch import CitaBatch
+
+DIA = date(2024, 5, 6)
+
+
+class TestEstadoDesconocido(unittest.TestCase):
+
+    def setUp(self):
+        self.lote = CitaBatch()
+        self.lote.agregar_filas([
+            (1, 1, 1, DIA, "09:00", "Control", "PENDIENTE"),
+            (2, 1, 1, DIA, "10:00", "Vacuna", None),
+            (3, 1, 2, DIA, "11:00", None, "EN_ESPERA"),
+            (4, 1, 2, DIA, "12:00", "Control", "COMPLETADA"),
+        ])
+
+    def test_se_agregan_con_el_codigo_reservado(self):
+        self.assertEqual(len(self.lote), 4)
+        self.assertEqual(list(self.lote.estado)[1:3], [CitaBatch.CODIGO_DESCONOCIDO] * 2)
+
+    def test_conteos(self):
+        self.assertEqual(self.lote.contar_por_estado(), {"PENDIENTE": 1, None: 2, "COMPLETADA": 1})
+        self.assertEqual(self.lote.contar_por_veterinario_y_estado(),
+                         {(1, "PENDIENTE"): 1, (1, None): 1, (2, None): 1, (2, "COMPLETADA"): 1})
+
+    def test_filtros_y_citas(self):
+        self.assertEqual(list(self.lote.filtrar(estado="PENDIENTE").id_cita), [1])
+        self.assertIsNone(self.lote.cita(1).estado)
+        self.assertEqual(self.lote.cita(3).estado, "COMPLETADA")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Pruebas: códigos de salida del modo por comandos y de batch sobre SQLite en memoria
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import io
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+import comandos
+import database
+from dao import ClienteDAO
+
+
+class TestCodigosDeSalida(unittest.TestCase):
+
+    def setUp(self):
+        database.configurar_backend("sqlite")
+        with database.get_connection() as conn:
+            conn.execute("INSERT INTO cliente VALUES (1, '1-9', 'Ana', 'Pérez', '', 'ana@test.cl', '')")
+            conn.commit()
+        self.salida = io.StringIO()
+        self.errores = io.StringIO()
+
+    def tearDown(self):
+        database.cerrar_pool()
+
+    def ejecutar(self, *argv: str) -> int:
+        with redirect_stdout(self.salida), redirect_stderr(self.errores):
+            return comandos.ejecutar(list(argv))
+
+    def lote(self, lineas: str, detener: bool = False) -> int:
+        with redirect_stdout(self.salida), redirect_stderr(self.errores):
+            return comandos.ejecutar_lote(io.StringIO(lineas), self.salida, detener)
+
+    def test_comando_exitoso(self):
+        self.assertEqual(self.ejecutar("clientes", "get", "1", "--json"), 0)
+        self.assertIn('"nombres": "Ana"', self.salida.getvalue())
+
+    def test_sin_resultados(self):
+        self.assertEqual(self.ejecutar("clientes", "get", "99"), 1)
+        self.assertEqual(self.salida.getvalue(), "")
+
+    def test_comando_mal_escrito(self):
+        self.assertEqual(self.ejecutar("clientes", "get", "uno"), 2)
+        self.assertEqual(self.ejecutar("export", "nada", "-"), 2)
+        self.assertIn("tabla inválida", self.errores.getvalue())
+
+    def test_error_de_validacion(self):
+        self.assertEqual(self.ejecutar("clientes", "create", "--rut", "bad-rut", "--nombres", "Eva",
+                                       "--apellidos", "Rojas"), 1)
+
+    def test_ayuda(self):
+        with self.assertRaises(SystemExit) as salida:
+            self.ejecutar("clientes", "--help")
+        self.assertEqual(salida.exception.code, 0)
+
+    def test_batch_sigue_tras_cada_error(self):
+        lineas = ("clientes get 1\n"
+                  "# comentario\n"
+                  "\n"
+                  "clientes --help\n"
+                  "clientes get 99\n"
+                  "clientes get uno\n"
+                  "batch\n"
+                  "clientes rut 1-9\n"
+                  "clientes get 1\n")
+        with mock.patch.object(ClienteDAO, "read_by_rut", side_effect=RuntimeError("sin conexión")):
+            self.assertEqual(self.lote(lineas), 1)
+        self.assertEqual(self.salida.getvalue().count("Ana"), 2)
+        errores = self.errores.getvalue()
+        self.assertIn("usage:", errores)
+        self.assertIn("Línea 8: error inesperado: RuntimeError: sin conexión", errores)
+        self.assertIn("7 comando(s) ejecutado(s), 4 con error", errores)
+
+    def test_batch_sin_errores(self):
+        self.assertEqual(self.lote("clientes get 1\nclientes --help\n"), 0)
+
+    def test_batch_detener_en_error(self):
+        self.assertEqual(self.lote("clientes get 99\nclientes get 1\n", detener=True), 1)
+        self.assertEqual(self.salida.getvalue(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Pruebas: control de dobles reservas de CitaDAO sobre SQLite
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from datetime import date
+
+import database
+import eventos
+from dao import CitaDAO
+from dao.disponibilidad import disponibilidad
+from models import Cita
+
+DIA = date(2030, 1, 7)
+
+
+class TestDobleReserva(unittest.TestCase):
+
+    def setUp(self):
+        # En archivo: cada conexión del pool es una sesión distinta, como dos terminales
+        self.carpeta = tempfile.TemporaryDirectory()
+        database.configurar_backend("sqlite", ruta=os.path.join(self.carpeta.name, "citas.db"))
+        with database.get_connection() as conn:
+            conn.execute("INSERT INTO cliente VALUES (1, '1-9', 'Ana', 'Pérez', '', 'ana@test.cl', '')")
+            conn.execute("INSERT INTO mascota VALUES (1, 'Max', 'PERRO', '', 3, '', 10.0, 1)")
+            conn.execute("INSERT INTO veterinario VALUES (1, 'Luis', 'Soto', 'General', '', 'luis@test.cl')")
+            conn.commit()
+
+    def tearDown(self):
+        database.cerrar_pool()
+        disponibilidad.olvidar()
+        self.carpeta.cleanup()
+
+    def horas(self):
+        with database.get_connection() as conn:
+            return [fila[0] for fila in conn.execute("SELECT hora FROM cita ORDER BY hora")]
+
+    def test_cualquier_hora_de_inicio(self):
+        self.assertTrue(CitaDAO.create(Cita(1, 1, 1, DIA, "10:15", "Control")))
+        self.assertTrue(CitaDAO.create(Cita(2, 1, 1, DIA, "08:00", "Control")))
+        self.assertEqual(self.horas(), ["08:00", "10:15"])
+
+    def test_cruce_parcial_se_rechaza(self):
+        self.assertTrue(CitaDAO.create(Cita(1, 1, 1, DIA, "10:00", "Control")))
+        self.assertFalse(CitaDAO.create(Cita(2, 1, 1, DIA, "10:15", "Control")))
+        self.assertTrue(CitaDAO.create(Cita(3, 1, 1, DIA, "10:30", "Control")))
+
+    def test_reserva_de_otro_proceso_con_indice_desactualizado(self):
+        # El día ya está en el índice en memoria cuando otro proceso reserva 10:00
+        self.assertTrue(disponibilidad.esta_libre(1, DIA, "10:15"))
+        with database.get_connection() as conn:
+            conn.execute("INSERT INTO cita (id_cita, id_mascota, id_veterinario, fecha, hora, ts, motivo, estado) "
+                         "VALUES (9, 1, 1, '2030-01-07', '10:00', '2030-01-07 10:00:00', '', 'PENDIENTE')")
+            conn.commit()
+        self.assertFalse(CitaDAO.create(Cita(1, 1, 1, DIA, "10:15", "Control")))
+        self.assertEqual(self.horas(), ["10:00"])
+
+    def test_actualizar_a_un_horario_que_se_cruza(self):
+        self.assertTrue(CitaDAO.create(Cita(1, 1, 1, DIA, "10:00", "Control")))
+        self.assertTrue(CitaDAO.create(Cita(2, 1, 1, DIA, "11:00", "Control")))
+        cita = CitaDAO.read_by_id(2)
+        cita.hora = "10:20"
+        self.assertFalse(CitaDAO.update(cita))
+        cita.estado = Cita.ESTADO_CANCELADA
+        self.assertTrue(CitaDAO.update(cita))
+
+    def test_error_de_integridad_no_es_horario_ocupado(self):
+        self.assertTrue(CitaDAO.create(Cita(1, 1, 1, DIA, "10:00", "Control")))
+        cita = CitaDAO.read_by_id(1)
+        cita.id_mascota = 99
+        recibidos = []
+        with eventos.escuchando(recibidos.append):
+            self.assertFalse(CitaDAO.update(cita))
+        self.assertEqual([evento.tipo for evento in recibidos], ["cita.integridad"])
+        self.assertIn("FOREIGN KEY", recibidos[0].mensaje)
+
+    def test_violacion_del_indice_unico(self):
+        fila = ("INSERT INTO cita (id_cita, id_mascota, id_veterinario, fecha, hora, ts, motivo, estado) "
+                "VALUES (:id, 1, 1, '2030-01-07', '10:00', '2030-01-07 10:00:00', '', 'PENDIENTE')")
+        with database.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(fila, {"id": 1})
+                with self.assertRaises(database.IntegrityError) as unico:
+                    cursor.execute(fila, {"id": 2})
+                with self.assertRaises(database.IntegrityError) as clave:
+                    cursor.execute(fila, {"id": 1})
+                motor = database.backend()
+                self.assertTrue(motor.viola_indice(cursor, unico.exception, "uk_cita_vet_horario"))
+                self.assertFalse(motor.viola_indice(cursor, clave.exception, "uk_cita_vet_horario"))
+            conn.rollback()
+
+    def test_reservas_concurrentes_que_se_cruzan(self):
+        barrera = threading.Barrier(2)
+        resultados = []
+
+        def reservar(id_cita: int, hora: str):
+            barrera.wait()
+            resultados.append(CitaDAO.create(Cita(id_cita, 1, 1, DIA, hora, "Control")))
+
+        # Sin el índice en memoria (vigencia vencida) ambas pasarían la verificación previa
+        disponibilidad.olvidar()
+        hilos = [threading.Thread(target=reservar, args=(1, "10:00")),
+                 threading.Thread(target=reservar, args=(2, "10:15"))]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(sorted(resultados), [False, True])
+        self.assertEqual(len(self.horas()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
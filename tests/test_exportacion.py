@@ -0,0 +1,85 @@
+"""
+Pruebas: exportación por rango de fechas e incremental sobre SQLite en memoria
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import csv
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+
+import database
+from dao.exportacion import exportar
+
+CITA = ("INSERT INTO cita (id_cita, id_mascota, id_veterinario, fecha, hora, ts, motivo, estado, modificado) "
+        "VALUES (:id, 1, 1, :fecha, '10:00', :fecha || ' 10:00:00', 'Control', 'PENDIENTE', :modificado)")
+
+
+class TestExportar(unittest.TestCase):
+
+    def setUp(self):
+        database.configurar_backend("sqlite")
+        with database.get_connection() as conn:
+            conn.execute("INSERT INTO cliente VALUES (1, '1-9', 'Ana', 'Pérez', '', 'ana@test.cl', '')")
+            conn.execute("INSERT INTO mascota VALUES (1, 'Max', 'PERRO', '', 3, '', 10.0, 1)")
+            conn.execute("INSERT INTO veterinario VALUES (1, 'Luis', 'Soto', 'General', '', 'luis@test.cl')")
+            for id_cita, fecha, modificado in ((1, "2025-01-10", "2025-01-10 09:00:00.000"),
+                                               (2, "2025-02-10", "2025-02-10 09:00:00.000"),
+                                               (3, "2025-03-10", None)):
+                conn.execute(CITA, {"id": id_cita, "fecha": fecha, "modificado": modificado})
+            conn.commit()
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.estado = os.path.join(self.carpeta.name, "export.json")
+
+    def tearDown(self):
+        database.cerrar_pool()
+        self.carpeta.cleanup()
+
+    def ids(self, tabla: str, **opciones) -> list:
+        ruta = os.path.join(self.carpeta.name, f"{tabla}.csv")
+        resultado = exportar(tabla, ruta, **opciones)
+        with open(ruta, encoding="utf-8", newline="") as archivo:
+            filas = list(csv.DictReader(archivo))
+        self.assertEqual(resultado.filas, len(filas))
+        return sorted(int(fila[f"id_{tabla}"]) for fila in filas)
+
+    def test_rango_de_fechas_inclusive(self):
+        self.assertEqual(self.ids("cita", desde=date(2025, 1, 10), hasta=date(2025, 2, 10)), [1, 2])
+        self.assertEqual(self.ids("cita", desde=date(2025, 2, 11)), [3])
+        with self.assertRaises(ValueError):
+            exportar("cliente", os.path.join(self.carpeta.name, "c.csv"), desde=date(2025, 1, 1))
+
+    def test_incremental_por_marca_de_cambio(self):
+        # La cita 3 no tiene marca: se exporta, pero la marca guardada es la de la 2
+        self.assertEqual(self.ids("cita", estado=self.estado), [1, 2, 3])
+        with open(self.estado, encoding="utf-8") as archivo:
+            self.assertEqual(json.load(archivo)["cita"]["valor"], "2025-02-10T09:00:00")
+        with database.get_connection() as conn:
+            conn.execute("UPDATE cita SET modificado = '2025-04-01 12:00:00.000' WHERE id_cita = 1")
+            conn.commit()
+        # Lo modificado dentro del MARGEN de la marca anterior se repite
+        self.assertEqual(self.ids("cita", estado=self.estado), [1, 2])
+        self.assertEqual(self.ids("cita", estado=self.estado), [1])
+
+    def test_incremental_sin_marcas(self):
+        with database.get_connection() as conn:
+            conn.execute("UPDATE cita SET modificado = NULL")
+            conn.commit()
+        self.assertEqual(self.ids("cita", estado=self.estado), [1, 2, 3])
+        self.assertFalse(os.path.exists(self.estado))
+
+    def test_incremental_por_id(self):
+        self.assertEqual(self.ids("cliente", estado=self.estado), [1])
+        with database.get_connection() as conn:
+            conn.execute("INSERT INTO cliente VALUES (2, '2-7', 'Eva', 'Rojas', '', 'eva@test.cl', '')")
+            conn.commit()
+        self.assertEqual(self.ids("cliente", estado=self.estado), [2])
+        self.assertEqual(self.ids("cliente", estado=self.estado), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Pruebas: percentiles y buckets del histograma de latencias
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import unittest
+
+from instrumentacion import SUB_BITS, Histograma
+
+
+def con_valores(valores) -> Histograma:
+    histograma = Histograma()
+    for valor in valores:
+        histograma.registrar(valor)
+    return histograma
+
+
+class TestHistograma(unittest.TestCase):
+
+    def test_vacio(self):
+        histograma = Histograma()
+        self.assertEqual(histograma.percentil(50), 0)
+        self.assertEqual(histograma.a_dict()["p99_us"], 0)
+
+    def test_valores_chicos_son_exactos(self):
+        histograma = con_valores(range(1, 61))
+        self.assertEqual([histograma.percentil(p) for p in (0, 10, 50, 90, 100)], [1, 6, 30, 54, 60])
+
+    def test_percentil_redondea_hacia_arriba(self):
+        # p50 de 3 registros es el segundo: ceil(3 * 0.5) = 2
+        histograma = con_valores([10, 20, 30])
+        self.assertEqual(histograma.percentil(50), 20)
+        self.assertEqual(histograma.percentil(34), 20)
+        self.assertEqual(histograma.percentil(33), 10)
+
+    def test_percentiles_sobre_buckets(self):
+        # Desde 64 µs los buckets tienen ancho 2, 4, ...: se informa su límite superior
+        histograma = con_valores(range(1, 101))
+        self.assertEqual(histograma.percentil(50), 50)
+        self.assertEqual(histograma.percentil(90), 91)
+        self.assertEqual(histograma.percentil(99), 99)
+        # Nunca sobre el máximo registrado
+        self.assertEqual(histograma.percentil(100), 100)
+
+    def test_error_relativo_acotado(self):
+        for valor in (64, 65, 127, 128, 1000, 4095, 123_456, 10_000_000, 2**40 + 12345):
+            histograma = con_valores([valor])
+            (indice,) = histograma.conteos
+            limite = Histograma.limite_superior(indice)
+            self.assertGreaterEqual(limite, valor)
+            self.assertLessEqual(limite - valor, valor / 2**SUB_BITS)
+            if indice > 0:
+                self.assertLess(Histograma.limite_superior(indice - 1), valor)
+
+    def test_negativos_cuentan_como_cero(self):
+        histograma = con_valores([-5, 7])
+        self.assertEqual((histograma.minimo, histograma.maximo, histograma.suma), (0, 7, 7))
+        self.assertEqual(histograma.percentil(50), 0)
+
+    def test_acumulados(self):
+        histograma = con_valores([50, 96, 240, 960, 5000])
+        self.assertEqual(histograma.acumulados([100, 250, 1000, 10_000]), [2, 3, 4, 5])
+        self.assertEqual(histograma.acumulados([10]), [0])
+        # Un bucket cuenta en un límite sólo si queda entero bajo él: 100 µs
+        # comparte bucket con 101 y pasa al límite siguiente
+        self.assertEqual(con_valores([100]).acumulados([100, 250]), [0, 1])
+
+    def test_a_dict(self):
+        resumen = con_valores([3, 5, 40]).a_dict()
+        self.assertEqual(resumen, {"cantidad": 3, "suma_us": 48, "min_us": 3, "p50_us": 5,
+                                   "p90_us": 40, "p99_us": 40, "max_us": 40})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Pruebas: importación de citas desde CSV sobre SQLite en memoria
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import database
+from dao import importacion
+from dao.importacion import importar
+from models.rut import digito_verificador
+
+ENCABEZADO = "id_mascota,id_veterinario,fecha,hora,motivo,estado,diagnostico\n"
+
+
+class TestImportarCitas(unittest.TestCase):
+
+    def setUp(self):
+        database.configurar_backend("sqlite")
+        with database.get_connection() as conn:
+            conn.execute("INSERT INTO cliente VALUES (1, '1-9', 'Ana', 'Pérez', '', 'ana@test.cl', '')")
+            conn.execute("INSERT INTO mascota VALUES (1, 'Max', 'PERRO', '', 3, '', 10.0, 1)")
+            conn.execute("INSERT INTO veterinario VALUES (1, 'Luis', 'Soto', 'General', '', 'luis@test.cl')")
+            conn.commit()
+        self.carpeta = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        database.cerrar_pool()
+        self.carpeta.cleanup()
+
+    def archivo(self, nombre: str, filas: str) -> str:
+        ruta = os.path.join(self.carpeta.name, nombre)
+        with open(ruta, "w", encoding="utf-8") as salida:
+            salida.write(ENCABEZADO + filas)
+        return ruta
+
+    def horas(self):
+        with database.get_connection() as conn:
+            return [fila[0] for fila in conn.execute("SELECT hora FROM cita ORDER BY id_cita")]
+
+    def test_citas_historicas_a_cualquier_hora(self):
+        ruta = self.archivo("citas.csv", "1,1,2020-03-02,10:15,Control,COMPLETADA,Sano\n"
+                                         "1,1,2020-03-02,8:05,Vacuna,COMPLETADA,\n")
+        resultado = importar("citas", ruta)
+        self.assertEqual(resultado.rechazos, [])
+        self.assertEqual(resultado.insertadas, 2)
+        self.assertEqual(self.horas(), ["10:15", "08:05"])
+
+    def test_mismo_inicio_activo_se_rechaza(self):
+        ruta = self.archivo("citas.csv", "1,1,2030-03-04,10:15,Control,PENDIENTE,\n"
+                                         "1,1,2030-03-04,10:15,Control,PENDIENTE,\n")
+        resultado = importar("citas", ruta)
+        self.assertEqual(resultado.insertadas, 1)
+        self.assertEqual([fila for fila, _ in resultado.rechazos], [2])
+
+
+class TestReanudarImportacion(unittest.TestCase):
+
+    def setUp(self):
+        database.configurar_backend("sqlite")
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.carpeta.name, "clientes.csv")
+        self.checkpoint = os.path.join(self.carpeta.name, "clientes.ckpt")
+        with open(self.ruta, "w", encoding="utf-8") as salida:
+            salida.write("rut,nombres,apellidos,telefono,email,direccion\n")
+            for i in range(1, 6):
+                salida.write(f"{i}-{digito_verificador(i)},Ana,Pérez,,ana{i}@test.cl,\n")
+
+    def tearDown(self):
+        database.cerrar_pool()
+        self.carpeta.cleanup()
+
+    def ruts(self):
+        with database.get_connection() as conn:
+            return [fila[0] for fila in conn.execute("SELECT rut FROM cliente ORDER BY id_cliente")]
+
+    def test_continua_desde_el_ultimo_lote_confirmado(self):
+        insertar = importacion.insertar_en_lotes
+        llamadas = []
+
+        def cortar_en_el_segundo_lote(*args):
+            llamadas.append(args)
+            if len(llamadas) == 2:
+                raise KeyboardInterrupt
+            return insertar(*args)
+
+        with mock.patch.object(importacion, "insertar_en_lotes", cortar_en_el_segundo_lote):
+            with self.assertRaises(KeyboardInterrupt):
+                importar("clientes", self.ruta, batch_size=2, checkpoint=self.checkpoint)
+        with open(self.checkpoint, encoding="utf-8") as archivo:
+            self.assertEqual(json.load(archivo)["filas"], 2)
+        self.assertEqual(len(self.ruts()), 2)
+
+        resultado = importar("clientes", self.ruta, batch_size=2, checkpoint=self.checkpoint)
+        self.assertEqual((resultado.saltadas, resultado.leidas, resultado.insertadas), (2, 3, 3))
+        self.assertEqual(resultado.rechazos, [])
+        self.assertEqual(len(self.ruts()), 5)
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_checkpoint_de_otro_archivo(self):
+        otra = os.path.join(self.carpeta.name, "otros.csv")
+        with open(self.checkpoint, "w", encoding="utf-8") as archivo:
+            json.dump({"entidad": "clientes", "archivo": os.path.abspath(otra), "filas": 3}, archivo)
+        with self.assertRaises(ValueError):
+            importar("clientes", self.ruta, checkpoint=self.checkpoint)
+        with self.assertRaises(ValueError):
+            importar("mascotas", self.ruta, checkpoint=self.checkpoint)
+        self.assertEqual(self.ruts(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
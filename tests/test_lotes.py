@@ -0,0 +1,86 @@
+"""
+Pruebas: inserción por lotes atómica sobre SQLite en memoria
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import unittest
+from datetime import date
+
+import database
+from dao import CitaDAO, ClienteDAO
+from dao.lotes import insertar_en_lotes
+from models import Cita, Cliente
+
+DIA = date(2030, 1, 7)
+HORAS = ("09:00", "09:30", "10:00", "10:30")
+
+
+class TestLotesAtomicos(unittest.TestCase):
+
+    def setUp(self):
+        database.configurar_backend("sqlite")
+        with database.get_connection() as conn:
+            conn.execute("INSERT INTO cliente VALUES (1, '1-9', 'Ana', 'Pérez', '', 'ana@test.cl', '')")
+            conn.execute("INSERT INTO mascota VALUES (1, 'Max', 'PERRO', '', 3, '', 10.0, 1)")
+            conn.execute("INSERT INTO veterinario VALUES (1, 'Luis', 'Soto', 'General', '', 'luis@test.cl')")
+            conn.commit()
+
+    def tearDown(self):
+        database.cerrar_pool()
+
+    def contar_citas(self) -> int:
+        with database.get_connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM cita").fetchone()[0]
+
+    def citas(self, id_mascota_ultima: int = 1, con_ids: bool = True):
+        # La última cita va en el tercer lote (batch_size=2); sin IDs (0) como
+        # las que genera Recurrencia.expandir para create_programadas
+        citas = [Cita(n if con_ids else 0, 1, 1, DIA, hora, "Control") for n, hora in enumerate(HORAS, 1)]
+        citas.append(Cita(len(HORAS) + 1 if con_ids else 0, id_mascota_ultima, 1, DIA, "11:00", "Control"))
+        return citas
+
+    def test_atomico_deshace_todos_los_lotes(self):
+        resultado = insertar_en_lotes(CitaDAO._SQL_INSERT, self.citas(id_mascota_ultima=99),
+                                      CitaDAO._parametros, batch_size=2, atomico=True)
+        self.assertEqual(resultado.lotes, 3)
+        self.assertEqual(resultado.insertados, 0)
+        self.assertEqual([pos for pos, _ in resultado.errores], [4])
+        self.assertEqual(self.contar_citas(), 0)
+
+    def test_atomico_sin_errores_confirma_todo(self):
+        resultado = insertar_en_lotes(CitaDAO._SQL_INSERT, self.citas(), CitaDAO._parametros,
+                                      batch_size=2, atomico=True)
+        self.assertEqual(resultado.insertados, 5)
+        self.assertEqual(self.contar_citas(), 5)
+
+    def test_no_atomico_conserva_los_lotes_validos(self):
+        resultado = insertar_en_lotes(CitaDAO._SQL_INSERT, self.citas(id_mascota_ultima=99),
+                                      CitaDAO._parametros, batch_size=2)
+        self.assertEqual(resultado.insertados, 4)
+        self.assertEqual(self.contar_citas(), 4)
+
+    def test_create_programadas_no_inserta_ninguna_si_la_bd_rechaza_una(self):
+        resultado = CitaDAO.create_programadas(self.citas(id_mascota_ultima=99, con_ids=False), batch_size=2)
+        self.assertEqual(resultado.insertados, 0)
+        self.assertEqual(len(resultado.errores), 1)
+        self.assertEqual(self.contar_citas(), 0)
+
+    def test_objeto_que_no_se_convierte_es_error_de_su_fila(self):
+        clientes = [Cliente(2, "11.111.111-1", "Eva", "Rojas", "", "eva@test.cl"),
+                    Cliente(3, "bad-rut", "Juan", "Díaz", "", "juan@test.cl"),
+                    Cliente(1, "22.222.222-2", "Ana", "Pérez", "", "otra@test.cl"),
+                    Cliente(4, "5.126.663-3", "Rosa", "Vera", "", "rosa@test.cl")]
+        resultado = ClienteDAO.create_many(clientes, batch_size=3)
+        self.assertEqual(resultado.insertados, 2)
+        self.assertEqual(resultado.lotes, 2)
+        # La 2 no es un RUT válido; la 3 repite el ID 1 ya insertado en setUp
+        self.assertEqual([pos for pos, _ in resultado.errores], [1, 2])
+        with database.get_connection() as conn:
+            ids = [fila[0] for fila in conn.execute("SELECT id_cliente FROM cliente ORDER BY id_cliente")]
+        self.assertEqual(ids, [1, 2, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
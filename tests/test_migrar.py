@@ -0,0 +1,54 @@
+"""
+Pruebas: migrar.py reconoce las migraciones aplicadas a mano en una BD
+sin esquema_version (SQLite en memoria)
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import unittest
+
+import database
+import migrar
+
+
+class TestBaseDetectada(unittest.TestCase):
+
+    def setUp(self):
+        # Esquema actual sin esquema_version ni lo de la 004 y la 006: como una
+        # BD que tenía 001..003 aplicadas a mano antes de existir migrar.py
+        database.configurar_backend("sqlite")
+        with database.get_connection() as conn:
+            for indice in ("ix_mascota_cliente", "ix_cita_mascota_ts", "ix_cita_fecha"):
+                conn.execute(f"DROP INDEX {indice}")
+            conn.execute("DROP TABLE cita_baja")
+            for trigger in ("tr_cita_baja_eliminada", "tr_cita_baja_movida"):
+                conn.execute(f"DROP TRIGGER {trigger}")
+            conn.execute("DROP TABLE esquema_version")
+            conn.commit()
+
+    def tearDown(self):
+        database.cerrar_pool()
+
+    def existe_tabla(self, tabla: str) -> bool:
+        with database.get_connection() as conn:
+            with conn.cursor() as cursor:
+                return database.backend().existe_tabla(cursor, tabla)
+
+    def test_aplicar_registra_001_a_003_y_aplica_el_resto(self):
+        self.assertEqual(migrar.detectar_base(), 3)
+        hechas = migrar.aplicar()
+        self.assertEqual([migracion.version for migracion in hechas], [4, 5, 6])
+        self.assertEqual(sorted(migrar.aplicadas()), [1, 2, 3, 4, 5, 6])
+
+    def test_migracion_a_medias_pide_la_base(self):
+        with database.get_connection() as conn:
+            conn.execute("DROP INDEX ix_cita_vet_ts")
+            conn.commit()
+        with self.assertRaises(migrar.EsquemaSinVersionError):
+            migrar.aplicar()
+        self.assertFalse(self.existe_tabla("esquema_version"))
+
+
+if __name__ == "__main__":
+    unittest.main()
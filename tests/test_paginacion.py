@@ -0,0 +1,81 @@
+"""
+Pruebas: paginación por clave (read_page) sobre SQLite en memoria
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import unittest
+from datetime import date
+
+import database
+from dao import CitaDAO, ClienteDAO
+
+CITA = ("INSERT INTO cita (id_cita, id_mascota, id_veterinario, fecha, hora, ts, motivo, estado) "
+        "VALUES (:id, 1, 1, :fecha, :hora, :fecha || ' ' || :hora || ':00', 'Control', 'PENDIENTE')")
+
+# (id_cita, fecha, hora): varias citas por día y los ID sin el orden de las fechas
+CITAS = ((5, "2030-01-07", "09:00"), (2, "2030-01-07", "10:00"), (1, "2030-01-08", "09:00"),
+         (4, "2030-01-08", "11:00"), (3, "2030-01-09", "09:00"))
+
+
+class TestPaginacionPorClave(unittest.TestCase):
+
+    def setUp(self):
+        database.configurar_backend("sqlite")
+        with database.get_connection() as conn:
+            for id_cliente in (1, 2, 3, 5, 8):
+                conn.execute("INSERT INTO cliente VALUES (:id, :rut, 'Ana', 'Pérez', '', :email, '')",
+                             {"id": id_cliente, "rut": f"{id_cliente}-K", "email": f"c{id_cliente}@test.cl"})
+            conn.execute("INSERT INTO mascota VALUES (1, 'Max', 'PERRO', '', 3, '', 10.0, 1)")
+            conn.execute("INSERT INTO veterinario VALUES (1, 'Luis', 'Soto', 'General', '', 'luis@test.cl')")
+            for id_cita, fecha, hora in CITAS:
+                conn.execute(CITA, {"id": id_cita, "fecha": fecha, "hora": hora})
+            conn.commit()
+
+    def tearDown(self):
+        database.cerrar_pool()
+
+    def paginas_de_citas(self, page_size: int) -> list:
+        paginas, after_fecha, after_id = [], None, 0
+        while True:
+            pagina = CitaDAO.read_page(after_fecha, after_id, page_size)
+            if not pagina:
+                return paginas
+            paginas.append([cita.id_cita for cita in pagina])
+            after_fecha, after_id = pagina[-1].fecha, pagina[-1].id_cita
+
+    def test_clientes_con_huecos_en_los_id(self):
+        paginas, after_id = [], 0
+        while True:
+            pagina = ClienteDAO.read_page(after_id, page_size=2)
+            if not pagina:
+                break
+            paginas.append([cliente.id_cliente for cliente in pagina])
+            after_id = pagina[-1].id_cliente
+        self.assertEqual(paginas, [[1, 2], [3, 5], [8]])
+        self.assertEqual(ClienteDAO.read_page(8), [])
+        self.assertEqual([c.id_cliente for c in ClienteDAO.read_page(4, page_size=10)], [5, 8])
+
+    def test_citas_ordenadas_por_fecha_e_id(self):
+        orden = [2, 5, 1, 4, 3]
+        self.assertEqual(self.paginas_de_citas(2), [[2, 5], [1, 4], [3]])
+        self.assertEqual(sum(self.paginas_de_citas(1), []), orden)
+        self.assertEqual(self.paginas_de_citas(5), [orden])
+
+    def test_el_limite_de_pagina_cae_dentro_de_un_dia(self):
+        # La página termina en (2030-01-07, 2): la siguiente sigue con el 5 del mismo día
+        pagina = CitaDAO.read_page(date(2030, 1, 7), 2, page_size=2)
+        self.assertEqual([cita.id_cita for cita in pagina], [5, 1])
+
+    def test_insercion_anterior_a_la_clave_no_desplaza_la_pagina(self):
+        primera = CitaDAO.read_page(page_size=2)
+        with database.get_connection() as conn:
+            conn.execute(CITA, {"id": 9, "fecha": "2030-01-06", "hora": "09:00"})
+            conn.commit()
+        siguiente = CitaDAO.read_page(primera[-1].fecha, primera[-1].id_cita, page_size=2)
+        self.assertEqual([cita.id_cita for cita in siguiente], [1, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
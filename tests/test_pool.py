@@ -0,0 +1,137 @@
+"""
+Pruebas: pool de conexiones con un driver de reemplazo
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import time
+import unittest
+
+import database
+from pool import ConexionDevueltaError, PoolAgotadoError, PoolConexiones
+
+
+class ConexionFalsa:
+    """Conexión sin BD que registra los rollback y close que recibe"""
+
+    def __init__(self):
+        self.caida = False
+        self.rollbacks = 0
+        self.cerrada = False
+
+    def ping(self):
+        if self.caida:
+            raise OSError("conexión caída")
+
+    def rollback(self):
+        if self.caida:
+            raise OSError("conexión caída")
+        self.rollbacks += 1
+
+    def close(self):
+        self.cerrada = True
+
+    def cursor(self):
+        return None
+
+
+class TestPoolConexiones(unittest.TestCase):
+
+    def test_crece_de_a_incremento_hasta_el_maximo(self):
+        pool = PoolConexiones(ConexionFalsa, minimo=1, maximo=4, incremento=2, timeout=0.05)
+        self.assertEqual(pool.abiertas, 1)
+        prestadas = [pool.adquirir()]
+        self.assertEqual((pool.abiertas, pool.ocupadas), (1, 1))
+        prestadas.append(pool.adquirir())
+        self.assertEqual((pool.abiertas, pool.ocupadas), (3, 2))
+        prestadas.append(pool.adquirir())
+        self.assertEqual((pool.abiertas, pool.ocupadas), (3, 3))
+        # Queda un cupo: el incremento se recorta al máximo
+        prestadas.append(pool.adquirir())
+        self.assertEqual((pool.abiertas, pool.ocupadas), (4, 4))
+        with self.assertRaises(PoolAgotadoError):
+            pool.adquirir()
+        pool.cerrar()
+
+    def test_timeout_al_adquirir(self):
+        pool = PoolConexiones(ConexionFalsa, minimo=1, maximo=1, timeout=0.05)
+        prestada = pool.adquirir()
+        inicio = time.monotonic()
+        with self.assertRaises(PoolAgotadoError):
+            pool.adquirir()
+        self.assertGreaterEqual(time.monotonic() - inicio, 0.05)
+        self.assertEqual(pool.estadisticas()["esperas"], 1)
+        prestada.close()
+        with pool.adquirir() as conn:
+            self.assertIs(conn.conexion_real, prestada.conexion_real)
+        pool.cerrar()
+
+    def test_ping_al_entregar_descarta_la_conexion_caida(self):
+        pool = PoolConexiones(ConexionFalsa, minimo=1, maximo=2, ping_intervalo=0)
+        with pool.adquirir() as conn:
+            caida = conn.conexion_real
+        caida.caida = True
+        with pool.adquirir() as conn:
+            self.assertIsNot(conn.conexion_real, caida)
+        self.assertTrue(caida.cerrada)
+        self.assertEqual(pool.estadisticas()["descartadas"], 1)
+        self.assertEqual(pool.abiertas, 1)
+        pool.cerrar()
+
+    def test_sin_ping_dentro_del_intervalo(self):
+        pool = PoolConexiones(ConexionFalsa, minimo=1, maximo=2, ping_intervalo=60)
+        with pool.adquirir() as conn:
+            real = conn.conexion_real
+        real.caida = True
+        conectada = pool.adquirir()
+        self.assertIs(conectada.conexion_real, real)
+        pool.cerrar()
+
+    def test_rollback_al_devolver(self):
+        pool = PoolConexiones(ConexionFalsa, minimo=0, maximo=1)
+        with pool.adquirir() as conn:
+            real = conn.conexion_real
+        self.assertEqual(real.rollbacks, 1)
+        # Si el rollback falla la conexión no vuelve al pool
+        with pool.adquirir() as conn:
+            conn.conexion_real.caida = True
+        self.assertTrue(real.cerrada)
+        self.assertEqual((pool.abiertas, pool.estadisticas()["libres"]), (0, 0))
+        pool.cerrar()
+
+    def test_conexion_devuelta_no_se_usa(self):
+        pool = PoolConexiones(ConexionFalsa, minimo=1, maximo=1)
+        conn = pool.adquirir()
+        conn.cursor()
+        conn.close()
+        conn.close()
+        with self.assertRaises(ConexionDevueltaError):
+            conn.cursor()
+        pool.cerrar()
+
+
+class TestPoolDelBackend(unittest.TestCase):
+
+    def setUp(self):
+        database.configurar_backend("sqlite")
+        database.configurar_pool(conectar=ConexionFalsa, minimo=1, maximo=1, timeout=0.05)
+
+    def tearDown(self):
+        database.cerrar_pool()
+
+    def test_pool_agotado_es_error_de_bd(self):
+        with database.get_connection():
+            with self.assertRaises(database.DatabaseError) as capturado:
+                database.get_connection()
+        self.assertIsInstance(capturado.exception, PoolAgotadoError)
+
+    def test_pool_cerrado_es_error_de_bd(self):
+        pool = database.obtener_pool()
+        pool.cerrar()
+        with self.assertRaises(database.DatabaseError):
+            pool.adquirir()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Pruebas: lectura de varios IDs por bloques (read_by_ids) sobre SQLite
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import unittest
+from unittest import mock
+
+import database
+from dao import ClienteDAO, cursores
+
+
+class TestReadByIds(unittest.TestCase):
+
+    def setUp(self):
+        database.configurar_backend("sqlite")
+        with database.get_connection() as conn:
+            for i in range(1, 8):
+                conn.execute("INSERT INTO cliente VALUES (:id, :rut, 'Ana', 'Pérez', '', :email, '')",
+                             {"id": i, "rut": f"{i}-9", "email": f"ana{i}@test.cl"})
+            conn.commit()
+
+    def tearDown(self):
+        database.cerrar_pool()
+
+    def test_orden_pedido_e_inexistentes(self):
+        clientes = ClienteDAO.read_by_ids([5, 99, 1, 3])
+        self.assertEqual(list(clientes), [5, 99, 1, 3])
+        self.assertIsNone(clientes[99])
+        self.assertEqual([clientes[i].id_cliente for i in (5, 1, 3)], [5, 1, 3])
+        self.assertEqual(clientes[5].email, "ana5@test.cl")
+
+    def test_repetidos_se_leen_una_vez(self):
+        clientes = ClienteDAO.read_by_ids([2, 2, 4, 2])
+        self.assertEqual(list(clientes), [2, 4])
+
+    def test_sin_ids_no_consulta(self):
+        with mock.patch.object(cursores, "_consulta_in", wraps=cursores._consulta_in) as consulta:
+            self.assertEqual(ClienteDAO.read_by_ids([]), {})
+            self.assertEqual(ClienteDAO.read_by_ids(iter(())), {})
+        consulta.assert_not_called()
+
+    def test_bloques_de_max_ids(self):
+        ids = [7, 6, 5, 4, 3, 2, 1, 50]
+        with mock.patch.object(cursores, "MAX_IDS_POR_CONSULTA", 3), \
+                mock.patch.object(cursores, "_consulta_in", wraps=cursores._consulta_in) as consulta:
+            clientes = ClienteDAO.read_by_ids(ids)
+        bloques = [llamada.args[2] for llamada in consulta.call_args_list]
+        self.assertEqual(bloques, [[7, 6, 5], [4, 3, 2], [1, 50]])
+        self.assertEqual(list(clientes), ids)
+        self.assertEqual([c.id_cliente if c else None for c in clientes.values()], [7, 6, 5, 4, 3, 2, 1, None])
+
+
+class TestListaIn(unittest.TestCase):
+
+    def test_rellena_hasta_potencia_de_2(self):
+        marcadores, parametros = cursores.lista_in([4, 9, 2])
+        self.assertEqual(marcadores, ", ".join(f":id{i}" for i in range(8)))
+        self.assertEqual(list(parametros.values()), [4, 9, 2, 2, 2, 2, 2, 2])
+        _, parametros = cursores.lista_in(list(range(9)))
+        self.assertEqual(len(parametros), 16)
+
+    def test_no_supera_el_maximo(self):
+        _, parametros = cursores.lista_in(list(range(600)), prefijo="c")
+        self.assertEqual(len(parametros), cursores.MAX_IDS_POR_CONSULTA)
+        self.assertEqual(parametros["c999"], 599)
+
+
+if __name__ == "__main__":
+    unittest.main()
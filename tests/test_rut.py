@@ -0,0 +1,82 @@
+"""
+Pruebas: normalización de RUT y búsquedas por RUT de ClienteDAO sobre SQLite en memoria
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import unittest
+
+import database
+from dao import ClienteDAO
+from models.rut import normalizar_rut, normalizar_rut_guardado, rut_valido
+
+
+class TestNormalizarRut(unittest.TestCase):
+
+    def test_formatos_equivalentes(self):
+        for texto in ("12.345.678-5", "12345678-5", "123456785", " 12 345 678-5", "012.345.678-5"):
+            self.assertEqual(normalizar_rut(texto), "12345678-5")
+        self.assertEqual(normalizar_rut("7.654.321-k"), "7654321-K")
+
+    def test_texto_sin_forma_de_rut(self):
+        for texto in ("", "-", "abc", "12.345.678-X", "K"):
+            with self.assertRaises(ValueError):
+                normalizar_rut(texto)
+        self.assertEqual(normalizar_rut_guardado("sin-rut"), "sin-rut")
+        self.assertEqual(normalizar_rut_guardado("12.345.678-5"), "12345678-5")
+
+    def test_digito_verificador(self):
+        self.assertTrue(rut_valido("12.345.678-5"))
+        self.assertTrue(rut_valido("1-9"))
+        self.assertFalse(rut_valido("12.345.678-6"))
+        self.assertFalse(rut_valido("abc"))
+
+
+class TestBuscarPorRut(unittest.TestCase):
+
+    def setUp(self):
+        database.configurar_backend("sqlite")
+        with database.get_connection() as conn:
+            conn.execute("INSERT INTO cliente VALUES (1, '12345678-5', 'Ana', 'Pérez', '', 'ana@test.cl', '')")
+            conn.execute("INSERT INTO cliente VALUES (2, '7654321-K', 'Eva', 'Rojas', '', 'eva@test.cl', '')")
+            conn.commit()
+        # El índice RUT -> ID es del proceso: no debe arrastrar entradas de otra BD
+        ClienteDAO._indice_rut.limpiar()
+
+    def tearDown(self):
+        database.cerrar_pool()
+        ClienteDAO._indice_rut.limpiar()
+
+    def test_cualquier_formato_encuentra_al_cliente(self):
+        for texto in ("12.345.678-5", "123456785", "12345678-5"):
+            self.assertEqual(ClienteDAO.read_by_rut(texto).id_cliente, 1)
+        self.assertEqual(ClienteDAO.read_by_rut("7.654.321-k").id_cliente, 2)
+        self.assertIsNone(ClienteDAO.read_by_rut("11.111.111-1"))
+
+    def test_la_busqueda_llena_el_indice(self):
+        ClienteDAO.read_by_rut("12.345.678-5")
+        self.assertEqual(ClienteDAO._indice_rut.obtener("12345678-5"), 1)
+
+    def test_entrada_desactualizada_del_indice(self):
+        ClienteDAO.read_by_rut("12.345.678-5")
+        # Otro programa cambia el RUT: el índice apunta a un cliente con otro RUT
+        with database.get_connection() as conn:
+            conn.execute("UPDATE cliente SET rut = '11111111-1' WHERE id_cliente = 1")
+            conn.commit()
+        self.assertIsNone(ClienteDAO.read_by_rut("12345678-5"))
+        self.assertEqual(ClienteDAO.read_by_rut("11.111.111-1").id_cliente, 1)
+
+    def test_ids_por_rut(self):
+        self.assertEqual(ClienteDAO.cargar_indice_rut(), 2)
+        with database.get_connection() as conn:
+            conn.execute("INSERT INTO cliente VALUES (3, '11111111-1', 'Rosa', 'Vera', '', 'rosa@test.cl', '')")
+            conn.commit()
+        # 1 y 2 desde el índice, 3 desde la BD; el inexistente no aparece
+        self.assertEqual(ClienteDAO.ids_por_rut(["12345678-5", "7654321-K", "11111111-1", "22222222-2"]),
+                         {"12345678-5": 1, "7654321-K": 2, "11111111-1": 3})
+        self.assertEqual(ClienteDAO._indice_rut.obtener("11111111-1"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
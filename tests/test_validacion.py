@@ -0,0 +1,70 @@
+"""
+Pruebas: máscaras de error de validar_columnas
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import unittest
+from unittest import mock
+
+from models import validacion
+from models.validacion import (ERROR_EDAD, ERROR_EMAIL, ERROR_ESPECIE, ERROR_ESTADO, ERROR_PESO,
+                               ERROR_RUT, describir, filas_validas, resumen, validar_columnas)
+
+
+class TestValidarColumnas(unittest.TestCase):
+
+    def test_una_regla_por_columna(self):
+        self.assertEqual(list(validar_columnas(especie=["perro", " GATO ", "DRAGON", ""])),
+                         [0, 0, ERROR_ESPECIE, ERROR_ESPECIE])
+        self.assertEqual(list(validar_columnas(estado=["", "PENDIENTE", "ANULADA"])),
+                         [0, 0, ERROR_ESTADO])
+        self.assertEqual(list(validar_columnas(edad=["0", 50, "3.5", "51", "-1", "", "tres"])),
+                         [0, 0, ERROR_EDAD, ERROR_EDAD, ERROR_EDAD, ERROR_EDAD, ERROR_EDAD])
+        self.assertEqual(list(validar_columnas(peso=["0.5", 500, "", None, "0", "500.1", "x"])),
+                         [0, 0, 0, 0, ERROR_PESO, ERROR_PESO, ERROR_PESO])
+        self.assertEqual(list(validar_columnas(email=["ana@test.cl", "", "ana@test", "a b@test.cl"])),
+                         [0, 0, ERROR_EMAIL, ERROR_EMAIL])
+        self.assertEqual(list(validar_columnas(rut=["12.345.678-5", "1-9", "12345678-4", "", "abc-k"])),
+                         [0, 0, ERROR_RUT, ERROR_RUT, ERROR_RUT])
+
+    def test_bits_se_combinan_por_fila(self):
+        errores = validar_columnas(
+            especie=["PERRO", "DRAGON", "GATO"],
+            edad=["3", "80", "2"],
+            peso=["10", "-1", "4"],
+            email=["ana@test.cl", "malo", ""],
+            rut=["1-9", "1-8", "12.345.678-5"],
+        )
+        self.assertEqual(list(errores), [0, ERROR_ESPECIE | ERROR_EDAD | ERROR_PESO | ERROR_EMAIL | ERROR_RUT, 0])
+        self.assertEqual(filas_validas(errores), [0, 2])
+        self.assertEqual(len(describir(errores[1])), 5)
+        self.assertEqual(resumen(errores)[validacion.MENSAJES[ERROR_RUT]], 1)
+        self.assertEqual(resumen(errores)[validacion.MENSAJES[ERROR_ESTADO]], 0)
+
+    def test_describir_un_codigo(self):
+        self.assertEqual(describir(ERROR_EDAD | ERROR_RUT),
+                         [validacion.MENSAJES[ERROR_EDAD], validacion.MENSAJES[ERROR_RUT]])
+        self.assertEqual(describir(0), [])
+
+    def test_sin_columnas_o_largos_distintos(self):
+        self.assertEqual(list(validar_columnas()), [])
+        with self.assertRaises(ValueError):
+            validar_columnas(especie=["PERRO"], edad=["1", "2"])
+
+
+@unittest.skipIf(validacion.np is None, "NumPy no está instalado")
+class TestValidarColumnasConNumPy(unittest.TestCase):
+
+    def test_misma_mascara_que_sin_numpy(self):
+        columnas = dict(edad=["0", "3.5", "", "x"], peso=["1", "0", "", "501"],
+                        rut=["1-9", "1-k", "", "12.345.678-5"])
+        con_numpy = validar_columnas(**columnas).tolist()
+        with mock.patch.object(validacion, "np", None):
+            sin_numpy = list(validar_columnas(**columnas))
+        self.assertEqual(con_numpy, sin_numpy)
+
+
+if __name__ == "__main__":
+    unittest.main()